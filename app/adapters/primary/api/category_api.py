@@ -1,10 +1,19 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
+from typing import Optional
+from fastapi import APIRouter, Body, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
 from marshmallow import ValidationError
 from app.adapters.secondary.orm.repositories.category_repository import CategoryRepository
+from app.adapters.secondary.cache.recommendation_cache import get_recommendation_cache
 from app.core.application.usecases.create_category_usecase import CreateCategoryUseCase
+from app.core.application.usecases.bulk_create_category_usecase import BulkCreateCategoriesUseCase
+from app.core.application.usecases.list_categories_usecase import ListCategoriesUseCase
+from app.core.application.usecases.export_categories_usecase import ExportCategoriesUseCase
 from app.adapters.primary.serializers.category_schema import BaseCategorySchema, CategoryResponseSchema
-from app.core.domain.exceptions.exceptions import DuplicateCategoryError
+from app.adapters.primary.serializers.bulk_schema import dump_bulk, load_bulk
+from app.adapters.primary.serializers.catalog_schema import (
+    CatalogQuerySchema, dump_ndjson, encode_catalog_cursor, start_export
+)
+from app.core.domain.exceptions.exceptions import DuplicateCategoryError, ExportLimitError
 
 router = APIRouter()
 
@@ -50,7 +59,7 @@ async def create_category(category: dict):
 
     # Instantiate the repository and use case for category creation
     repository = CategoryRepository()
-    use_case = CreateCategoryUseCase(repository)
+    use_case = CreateCategoryUseCase(repository, get_recommendation_cache())
     try:
         # Execute the use case to create the category
         created_category = await use_case.execute(validated_data["description"])
@@ -61,3 +70,126 @@ async def create_category(category: dict):
     except DuplicateCategoryError as e:
         # Raise an HTTP exception with status 400 if the category already exists
         raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/bulk", response_model=dict)
+async def create_categories_bulk(categories: list = Body(...)):
+    """
+    Create many categories in a single request.
+
+    Every item is validated like in `POST /categories`, existing descriptions are checked with
+    a single query, and the new categories are inserted in chunked transactions.
+
+    - **categories**: A list of up to 1000 dictionaries with the description of each category.
+
+    **Response**:
+    - `created` / `failed`: Number of items created / not created.
+    - `results`: One result per item, in request order, with its `status`:
+      - `created`: The created category is in `category`.
+      - `invalid`: The validation errors of the item are in `errors`.
+      - `error`: The category already exists or is repeated in the request; see `error`.
+
+    **Error Handling**:
+    - If the list is empty or too long, a `400` status code with validation errors will be returned.
+
+    Example request body:
+    ```json
+    [
+      {"description": "Books"},
+      {"description": "Museums"}
+    ]
+    ```
+
+    Example response:
+    ```json
+    {
+      "created": 1,
+      "failed": 1,
+      "results": [
+        {"index": 0, "status": "created", "category": {"id": "unique-uuid-here", "description": "Books"}},
+        {"index": 1, "status": "error", "error": "A category with this description already exists."}
+      ]
+    }
+    ```
+    """
+    try:
+        # Validate every item with BaseCategorySchema
+        valid, errors = load_bulk(BaseCategorySchema(), categories)
+    except ValidationError as err:
+        # Return a 400 response if the batch itself is invalid
+        return JSONResponse(status_code=400, content={"errors": err.messages})
+
+    # Instantiate the repository and use case for the bulk creation
+    use_case = BulkCreateCategoriesUseCase(CategoryRepository(), get_recommendation_cache())
+    results = await use_case.execute([data["description"] for _, data in valid])
+
+    return dump_bulk(len(categories), errors, [index for index, _ in valid], results,
+                     CategoryResponseSchema(), "category")
+
+
+@router.get("/", response_model=dict)
+async def list_categories(status: Optional[str] = None, limit: Optional[str] = None, cursor: Optional[str] = None,
+                          export: Optional[str] = None):
+    """
+    Retrieve the categories one page at a time, or export them all.
+
+    Pages are ordered by creation date, then UUID, and read with keyset pagination: each page
+    starts at the cursor on the creation date index, so every page costs the same however deep it
+    is. Reads go to the read replica when there is one.
+
+    - **status** (optional): Only return the active (`true`) or inactive (`false`) categories.
+    - **limit** (optional): Page size, between 1 and 1000 (default 100).
+    - **cursor** (optional): The `next_cursor` returned by the previous page.
+    - **export** (optional): `ndjson` to stream every category matching `status` as NDJSON, one
+      category per line, instead of a page. The categories are read from a database cursor in chunks,
+      so exports of any size run in constant memory; `limit` and `cursor` are ignored. Exports are
+      sent without the `X-DB-Queries` and `X-DB-Time` headers, as the cursor is read after them.
+
+    **Response**:
+    - `categories`: The categories of the page.
+    - `next_cursor` is the cursor of the next page, or null when there are no more pages.
+
+    **Error Handling**:
+    - If the query parameters are invalid, a `400` status code with validation errors will be returned.
+    - If `EXPORT_MAX_CONCURRENCY` exports are already in progress, a `503` status code with a
+      `Retry-After` header will be returned.
+
+    Example response:
+    ```json
+    {
+      "categories": [
+        {
+          "id": "unique-uuid-here",
+          "description": "Museums",
+          "status": true,
+          "created": "2024-10-02T10:15:00+00:00"
+        }
+      ],
+      "next_cursor": "opaque-cursor"
+    }
+    ```
+    """
+    params = {"status": status, "limit": limit, "cursor": cursor, "export": export}
+    try:
+        # Validate the query parameters with CatalogQuerySchema
+        query = CatalogQuerySchema().load({key: value for key, value in params.items() if value is not None})
+    except ValidationError as err:
+        # Return a 400 response with validation errors if the query parameters are invalid
+        return JSONResponse(status_code=400, content={"errors": err.messages})
+
+    if query["export"] is not None:
+        # La exportación se envía por partes a medida que se lee el cursor
+        try:
+            chunks = await start_export(ExportCategoriesUseCase(CategoryRepository()).execute(query["status"]))
+        except ExportLimitError as e:
+            # Each export holds a database connection until it ends
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+        return StreamingResponse(dump_ndjson(chunks, CategoryResponseSchema()), media_type="application/x-ndjson")
+
+    # Instantiate the repository and use case for the listing
+    use_case = ListCategoriesUseCase(CategoryRepository())
+    page = await use_case.execute(query["status"], query["limit"], query["after"])
+
+    # Una página completa puede tener continuación
+    next_cursor = encode_catalog_cursor(page[-1].cat_created, page[-1].cat_uuid) if len(page) == query["limit"] else None
+    return {"categories": CategoryResponseSchema(many=True).dump(page), "next_cursor": next_cursor}
@@ -1,10 +1,27 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
+from typing import Optional
+from fastapi import APIRouter, Body, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
 from marshmallow import ValidationError
 from app.adapters.secondary.orm.repositories.location_repository import LocationRepository
+from app.adapters.secondary.orm.repositories.location_cluster_repository import LocationClusterRepository
+from app.adapters.secondary.orm.repositories.review_history_repository import ReviewHistoryRepository
+from app.adapters.secondary.archive.review_archive import get_review_archive
+from app.adapters.secondary.cache.recommendation_cache import get_recommendation_cache
 from app.core.application.usecases.create_location_usecase import CreateLocationUseCase
-from app.adapters.primary.serializers.location_schema import BaseLocationSchema, LocationResponseSchema
-from app.core.domain.exceptions.exceptions import DuplicateLocationError
+from app.core.application.usecases.bulk_create_location_usecase import BulkCreateLocationsUseCase
+from app.core.application.usecases.find_nearby_locations_usecase import FindNearbyLocationsUseCase
+from app.core.application.usecases.get_location_tile_usecase import GetLocationTileUseCase
+from app.core.application.usecases.list_locations_usecase import ListLocationsUseCase
+from app.core.application.usecases.export_locations_usecase import ExportLocationsUseCase
+from app.core.application.usecases.get_review_history_usecase import GetReviewHistoryUseCase
+from app.adapters.primary.serializers.location_schema import BaseLocationSchema, LocationResponseSchema, \
+    NearbyLocationQuerySchema, NearbyLocationResponseSchema, TileQuerySchema, LocationClusterResponseSchema
+from app.adapters.primary.serializers.review_schema import ReviewHistoryQuerySchema, stream_review_page
+from app.adapters.primary.serializers.bulk_schema import dump_bulk, load_bulk
+from app.adapters.primary.serializers.catalog_schema import (
+    CatalogQuerySchema, dump_ndjson, encode_catalog_cursor, start_export
+)
+from app.core.domain.exceptions.exceptions import DuplicateLocationError, ExportLimitError
 
 router = APIRouter()
 
@@ -53,7 +70,7 @@ async def create_location(location: dict):
 
     # Instantiate the repository and use case for location creation
     repository = LocationRepository()
-    use_case = CreateLocationUseCase(repository)
+    use_case = CreateLocationUseCase(repository, get_recommendation_cache())
     try:
         # Execute the use case to create the location
         created_location = await use_case.execute(validated_data["description"], validated_data["lat"], validated_data["long"])
@@ -64,3 +81,288 @@ async def create_location(location: dict):
     except DuplicateLocationError as e:
         # Raise an HTTP exception with status 400 if the location already exists
         raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/bulk", response_model=dict)
+async def create_locations_bulk(locations: list = Body(...)):
+    """
+    Create many locations in a single request.
+
+    Every item is validated like in `POST /locations`, existing descriptions are checked with
+    a single query, and the new locations are inserted in chunked transactions.
+
+    - **locations**: A list of up to 1000 dictionaries with the description, latitude (lat) and
+      longitude (long) of each location.
+
+    **Response**:
+    - `created` / `failed`: Number of items created / not created.
+    - `results`: One result per item, in request order, with its `status`:
+      - `created`: The created location is in `location`.
+      - `invalid`: The validation errors of the item are in `errors`.
+      - `error`: The location already exists or is repeated in the request; see `error`.
+
+    **Error Handling**:
+    - If the list is empty or too long, a `400` status code with validation errors will be returned.
+
+    Example request body:
+    ```json
+    [
+      {"description": "New Location", "lat": 40.712776, "long": -74.005974},
+      {"description": "Other Location", "lat": 100, "long": -74.005974}
+    ]
+    ```
+
+    Example response:
+    ```json
+    {
+      "created": 1,
+      "failed": 1,
+      "results": [
+        {"index": 0, "status": "created", "location": {"id": "unique-uuid-here", "description": "New Location"}},
+        {"index": 1, "status": "invalid", "errors": {"lat": ["Invalid value."]}}
+      ]
+    }
+    ```
+    """
+    try:
+        # Validate every item with BaseLocationSchema
+        valid, errors = load_bulk(BaseLocationSchema(), locations)
+    except ValidationError as err:
+        # Return a 400 response if the batch itself is invalid
+        return JSONResponse(status_code=400, content={"errors": err.messages})
+
+    # Instantiate the repository and use case for the bulk creation
+    use_case = BulkCreateLocationsUseCase(LocationRepository(), get_recommendation_cache())
+    results = await use_case.execute([(data["description"], data["lat"], data["long"]) for _, data in valid])
+
+    return dump_bulk(len(locations), errors, [index for index, _ in valid], results,
+                     LocationResponseSchema(), "location")
+
+
+@router.get("/nearby", response_model=dict)
+async def find_nearby_locations(lat: Optional[str] = None, long: Optional[str] = None, radius: Optional[str] = None,
+                                k: Optional[str] = None, limit: Optional[str] = None):
+    """
+    Find the locations near a point, nearest first.
+
+    Only the geohash cells around the point are scanned, and candidates are filtered
+    exactly with the haversine distance.
+
+    - **lat**, **long**: Coordinates of the point.
+    - **radius** (optional): Search radius in kilometres.
+    - **k** (optional): Return the k nearest locations (within `radius` when provided).
+    - **limit** (optional): Maximum number of locations of a radius lookup (default 100).
+
+    **Response**:
+    - Returns the locations with their distance to the point, in kilometres.
+
+    **Error Handling**:
+    - If neither `radius` nor `k` is provided, or the input data is invalid, a `400` status code
+      with validation errors will be returned.
+
+    Example response:
+    ```json
+    {
+      "locations": [
+        {
+          "id": "unique-uuid-here",
+          "description": "New Location",
+          "lat": "40.712776",
+          "long": "-74.005974",
+          "distance": 0.42
+        }
+      ]
+    }
+    ```
+    """
+    params = {"lat": lat, "long": long, "radius": radius, "k": k, "limit": limit}
+    try:
+        # Validate the query parameters with NearbyLocationQuerySchema
+        query = NearbyLocationQuerySchema().load({key: value for key, value in params.items() if value is not None})
+    except ValidationError as err:
+        # Return a 400 response with validation errors if the query parameters are invalid
+        return JSONResponse(status_code=400, content={"errors": err.messages})
+
+    # Instantiate the repository and use case for the proximity lookup
+    repository = LocationRepository()
+    use_case = FindNearbyLocationsUseCase(repository)
+    locations = await use_case.execute(query["lat"], query["long"], query["radius"], query["k"], query["limit"])
+
+    # Serialize the response with NearbyLocationResponseSchema
+    output_schema = NearbyLocationResponseSchema(many=True)
+    return {"locations": output_schema.dump(locations)}
+
+
+@router.get("/tiles/{z}/{x}/{y}", response_model=dict)
+async def get_location_tile(z: str, x: str, y: str, stale: Optional[str] = None):
+    """
+    Retrieve the clustered locations of a map tile.
+
+    Tiles follow the Web Mercator `z/x/y` scheme used by map front-ends. Each tile is split in an
+    8x8 grid, and every cell holding locations is returned as one cluster with its centroid and
+    location count. The clusters are precomputed per zoom level when locations are created.
+
+    - **z**: Zoom level, between 0 and 16.
+    - **x**, **y**: Column and row of the tile, lower than 2^z.
+    - **stale** (optional): When true, each cluster includes the number of location-category
+      pairs needing a review (never reviewed or expired).
+
+    **Response**:
+    - Returns the clusters of the tile.
+
+    **Error Handling**:
+    - If the tile coordinates are invalid, a `400` status code with validation errors will be returned.
+
+    Example response:
+    ```json
+    {
+      "clusters": [
+        {
+          "lat": 4.651,
+          "long": -74.082,
+          "count": 42,
+          "stale": 120
+        }
+      ]
+    }
+    ```
+    """
+    params = {"z": z, "x": x, "y": y, "stale": stale}
+    try:
+        # Validate the tile coordinates with TileQuerySchema
+        query = TileQuerySchema().load({key: value for key, value in params.items() if value is not None})
+    except ValidationError as err:
+        # Return a 400 response with validation errors if the tile coordinates are invalid
+        return JSONResponse(status_code=400, content={"errors": err.messages})
+
+    # Instantiate the repository and use case for the tile lookup
+    use_case = GetLocationTileUseCase(LocationClusterRepository())
+    clusters = await use_case.execute(query["z"], query["x"], query["y"], query["stale"])
+
+    # Serialize the response with LocationClusterResponseSchema
+    return {"clusters": LocationClusterResponseSchema(many=True).dump(clusters)}
+
+
+@router.get("/{loc_uuid}/reviews", response_model=dict)
+async def get_location_reviews(loc_uuid: str, category: Optional[str] = None, limit: Optional[str] = None,
+                               cursor: Optional[str] = None):
+    """
+    Retrieve a page of the reviews of a location, newest first.
+
+    Same as `GET /reviews?location={loc_uuid}`: pages are read with keyset pagination on
+    (creation date, UUID), so every page costs the same however deep it is, and the archived
+    reviews follow the ones still in the database when the archive is enabled.
+
+    - **loc_uuid**: The UUID of the location.
+    - **category** (optional): Only return reviews of this category UUID.
+    - **limit** (optional): Page size, between 1 and 500 (default 100).
+    - **cursor** (optional): The `next_cursor` returned by the previous page.
+
+    **Response**:
+    - `reviews`: The reviews, by creation date (newest first), then UUID. The response is streamed.
+    - `next_cursor` is the cursor of the next page, or null when there are no more pages.
+
+    **Error Handling**:
+    - If the location UUID or the query parameters are invalid, a `400` status code with validation
+      errors will be returned.
+
+    Example response:
+    ```json
+    {
+      "reviews": [
+        {
+          "id": "unique-review-uuid",
+          "recommendation": "Great place to visit!",
+          "created": "2024-10-02T10:15:00+00:00",
+          "category": "unique-category-uuid",
+          "location": "unique-location-uuid"
+        }
+      ],
+      "next_cursor": "opaque-cursor"
+    }
+    ```
+    """
+    params = {"location": loc_uuid, "category": category, "limit": limit, "cursor": cursor}
+    try:
+        # Validate the path and query parameters with ReviewHistoryQuerySchema
+        query = ReviewHistoryQuerySchema().load({key: value for key, value in params.items() if value is not None})
+    except ValidationError as err:
+        # Return a 400 response with validation errors if the parameters are invalid
+        return JSONResponse(status_code=400, content={"errors": err.messages})
+
+    # Instantiate the repository and use case for the review history
+    use_case = GetReviewHistoryUseCase(ReviewHistoryRepository(), get_review_archive())
+    reviews = await use_case.execute(**query)
+
+    # Las revisiones se serializan a medida que se envían
+    return StreamingResponse(stream_review_page(reviews, query["limit"]), media_type="application/json")
+
+
+@router.get("/", response_model=dict)
+async def list_locations(status: Optional[str] = None, limit: Optional[str] = None, cursor: Optional[str] = None,
+                         export: Optional[str] = None):
+    """
+    Retrieve the locations one page at a time, or export them all.
+
+    Pages are ordered by creation date, then UUID, and read with keyset pagination: each page
+    starts at the cursor on the creation date index, so every page costs the same however deep it
+    is. Reads go to the read replica when there is one.
+
+    - **status** (optional): Only return the active (`true`) or inactive (`false`) locations.
+    - **limit** (optional): Page size, between 1 and 1000 (default 100).
+    - **cursor** (optional): The `next_cursor` returned by the previous page.
+    - **export** (optional): `ndjson` to stream every location matching `status` as NDJSON, one
+      location per line, instead of a page. The locations are read from a database cursor in chunks,
+      so exports of any size run in constant memory; `limit` and `cursor` are ignored. Exports are
+      sent without the `X-DB-Queries` and `X-DB-Time` headers, as the cursor is read after them.
+
+    **Response**:
+    - `locations`: The locations of the page.
+    - `next_cursor` is the cursor of the next page, or null when there are no more pages.
+
+    **Error Handling**:
+    - If the query parameters are invalid, a `400` status code with validation errors will be returned.
+    - If `EXPORT_MAX_CONCURRENCY` exports are already in progress, a `503` status code with a
+      `Retry-After` header will be returned.
+
+    Example response:
+    ```json
+    {
+      "locations": [
+        {
+          "id": "unique-uuid-here",
+          "description": "Central Park",
+          "status": true,
+          "created": "2024-10-02T10:15:00+00:00",
+          "lat": 40.785091,
+          "long": -73.968285
+        }
+      ],
+      "next_cursor": "opaque-cursor"
+    }
+    ```
+    """
+    params = {"status": status, "limit": limit, "cursor": cursor, "export": export}
+    try:
+        # Validate the query parameters with CatalogQuerySchema
+        query = CatalogQuerySchema().load({key: value for key, value in params.items() if value is not None})
+    except ValidationError as err:
+        # Return a 400 response with validation errors if the query parameters are invalid
+        return JSONResponse(status_code=400, content={"errors": err.messages})
+
+    if query["export"] is not None:
+        # La exportación se envía por partes a medida que se lee el cursor
+        try:
+            chunks = await start_export(ExportLocationsUseCase(LocationRepository()).execute(query["status"]))
+        except ExportLimitError as e:
+            # Each export holds a database connection until it ends
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+        return StreamingResponse(dump_ndjson(chunks, LocationResponseSchema()), media_type="application/x-ndjson")
+
+    # Instantiate the repository and use case for the listing
+    use_case = ListLocationsUseCase(LocationRepository())
+    page = await use_case.execute(query["status"], query["limit"], query["after"])
+
+    # Una página completa puede tener continuación
+    next_cursor = encode_catalog_cursor(page[-1].loc_created, page[-1].loc_uuid) if len(page) == query["limit"] else None
+    return {"locations": LocationResponseSchema(many=True).dump(page), "next_cursor": next_cursor}
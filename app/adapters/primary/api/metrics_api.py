@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+from app.adapters.secondary.metrics.registry import CONTENT_TYPE, registry
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """
+    Serve the metrics of this process in the Prometheus text format: request latency by route
+    and status, requests in flight, database pool and queries, recommendation computation time,
+    recommendation cache hits and write-behind queue depth.
+    """
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
@@ -1,23 +1,48 @@
+from typing import Optional
 from fastapi import APIRouter, HTTPException
+from marshmallow import ValidationError
 from app.core.application.usecases.get_recommendation_usecase import GetRecommendationsUseCase
+from app.core.application.single_flight import SingleFlight
 from app.adapters.secondary.orm.repositories.recommendation_repository import RecommendationRepository
+from app.adapters.secondary.cache.cached_recommendation_repository import CachedRecommendationRepository
+from app.adapters.secondary.cache.recommendation_cache import get_recommendation_cache
+from app.adapters.primary.serializers.recommendation_schema import RecommendationQuerySchema, encode_cursor
+from app.main_app.config import RECOMMENDATION_STALE_SECONDS
 from fastapi.responses import JSONResponse
 
 router = APIRouter()
 
+# Shared by every request of the process, so concurrent identical requests run a single computation
+recommendation_single_flight = SingleFlight(stale_seconds=RECOMMENDATION_STALE_SECONDS)
+
 @router.get("/", response_model=dict)
-async def get_recommendations():
+async def get_recommendations(limit: Optional[str] = None, cursor: Optional[str] = None,
+                              category: Optional[str] = None, location: Optional[str] = None,
+                              bandera: Optional[str] = None, lat: Optional[str] = None,
+                              long: Optional[str] = None, radius: Optional[str] = None):
     """
-    Retrieve a list of recommendations.
+    Retrieve a page of recommendations.
+
+    This endpoint retrieves location-category combinations that are either unreviewed
+    or have expired reviews (older than 30 days). Never reviewed combinations come first,
+    then expired ones, most recently reviewed first.
 
-    This endpoint retrieves the latest 10 recommendations that are either unreviewed
-    or have expired reviews (older than 30 days).
+    - **limit** (optional): Page size, between 1 and 500 (default 100).
+    - **cursor** (optional): The `next_cursor` returned by the previous page.
+    - **category** (optional): Only return recommendations for this category UUID.
+    - **location** (optional): Only return recommendations for this location UUID.
+    - **bandera** (optional): Only return recommendations with this flag (1 or 2).
+    - **lat**, **long** (optional): A point; only locations near it are recommended, nearest
+      first within each flag, and each recommendation includes its `distance_km`.
+    - **radius** (optional): Search radius around the point, in kilometres (default 50).
 
     **Response**:
     - Returns a list of recommendations with the location UUID, category UUID,
-      and the flag indicating whether it's new, expired, or has been reviewed recently.
+      and the flag indicating whether it's new or expired.
+    - `next_cursor` is the cursor of the next page, or null when there are no more pages.
 
     **Error Handling**:
+    - If the query parameters are invalid, a `400` status code with validation errors will be returned.
     - If there's an error during the process, a `500` status code with the error
       message will be returned.
 
@@ -29,7 +54,7 @@ async def get_recommendations():
           "loc_uuid": "unique-location-uuid",
           "cat_uuid": "unique-category-uuid",
           "bandera": 1,
-          "review_date": "2023-12-10T00:00:00Z"
+          "review_date": null
         },
         {
           "loc_uuid": "unique-location-uuid-2",
@@ -37,7 +62,8 @@ async def get_recommendations():
           "bandera": 2,
           "review_date": "2023-10-15T00:00:00Z"
         }
-      ]
+      ],
+      "next_cursor": "opaque-cursor"
     }
     ```
 
@@ -46,26 +72,63 @@ async def get_recommendations():
     - **bandera**: A flag indicating the state of the review:
       - `1`: Never reviewed.
       - `2`: Review expired (older than 30 days).
-      - `0`: Recently reviewed.
     - **review_date**: The date of the last review, or null if never reviewed.
+    - **distance_km**: Distance from the point to the location, only when a point is given.
     """
+    params = {"limit": limit, "cursor": cursor, "category": category, "location": location, "bandera": bandera,
+              "lat": lat, "long": long, "radius": radius}
+    try:
+        # Validate the query parameters with RecommendationQuerySchema
+        query = RecommendationQuerySchema().load({key: value for key, value in params.items() if value is not None})
+    except ValidationError as err:
+        # Return a 400 response with validation errors if the query parameters are invalid
+        return JSONResponse(status_code=400, content={"errors": err.messages})
+
     # Instanciamos el repositorio y el caso de uso
     recommendation_repository = RecommendationRepository()
-    use_case = GetRecommendationsUseCase(recommendation_repository)
+    cache = get_recommendation_cache()
+    if cache:
+        # Serve from the cache when it is configured
+        recommendation_repository = CachedRecommendationRepository(recommendation_repository, cache)
+    use_case = GetRecommendationsUseCase(recommendation_repository, recommendation_single_flight)
 
     try:
         # Ejecutar el caso de uso para obtener las recomendaciones
-        recommendations = await use_case.execute()
+        recommendations = await use_case.execute(**query)
 
         # Convertir las recomendaciones a un formato serializable (diccionario)
         recommendations_dict = [rec.dict() for rec in recommendations]
 
-        return JSONResponse(content={"recommendations": recommendations_dict})
+        # Una página completa puede tener continuación
+        next_cursor = encode_cursor(recommendations[-1]) if len(recommendations) == query["limit"] else None
+
+        return JSONResponse(content={"recommendations": recommendations_dict, "next_cursor": next_cursor})
     except Exception as e:
         # En caso de error, lanzar una excepción HTTP
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/cache/stats", response_model=dict)
+async def get_recommendation_cache_stats():
+    """
+    Retrieve the recommendation cache counters of this process.
 
+    **Response**:
+    - `enabled`: Whether the cache is configured (`REDIS_URL`).
+    - `hits` / `misses`: Number of requests served from / computed outside the cache.
+    - `hit_ratio`: Fraction of requests served from the cache.
 
-
+    Example response:
+    ```json
+    {
+      "enabled": true,
+      "hits": 120,
+      "misses": 8,
+      "hit_ratio": 0.9375
+    }
+    ```
+    """
+    cache = get_recommendation_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
@@ -1,9 +1,23 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
+from typing import Optional
+from fastapi import APIRouter, Body, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from marshmallow import ValidationError
 from app.adapters.secondary.orm.repositories.review_repository import ReviewRepository
+from app.adapters.secondary.orm.repositories.review_history_repository import ReviewHistoryRepository
+from app.adapters.secondary.cache.recommendation_cache import get_recommendation_cache
+from app.adapters.secondary.queue.write_behind_review_repository import get_review_write_queue
+from app.adapters.secondary.snapshot.reference_filter import get_reference_filter
+from app.adapters.secondary.archive.review_archive import get_review_archive
 from app.core.application.usecases.create_review_usecase import CreateReviewUseCase
-from app.adapters.primary.serializers.review_schema import BaseReviewSchema, ReviewResponseSchema
+from app.core.application.usecases.bulk_create_review_usecase import BulkCreateReviewsUseCase
+from app.core.application.usecases.import_reviews_usecase import ImportReviewsUseCase
+from app.core.application.usecases.get_review_history_usecase import GetReviewHistoryUseCase
+from app.core.domain.entities.import_summary_entity import ImportSummaryEntity
+from app.core.domain.exceptions.exceptions import CategoryNotFoundError, LocationNotFoundError, ReviewQueueFullError
+from app.adapters.primary.serializers.review_schema import (BaseReviewSchema, ReviewHistoryQuerySchema,
+                                                            ReviewResponseSchema, stream_review_page)
+from app.adapters.primary.serializers.bulk_schema import dump_bulk, load_bulk
+from app.adapters.primary.serializers.import_schema import import_format, load_stream
 
 router = APIRouter()
 
@@ -24,8 +38,13 @@ async def create_review(review: dict):
     **Response**:
     - Returns the created review, including the UUID of the review and the provided recommendation.
 
+    When the write-behind mode is enabled (`REVIEW_WRITE_BEHIND_ENABLED`), the review is queued
+    and inserted with the next batch, shortly after the response is sent.
+
     **Error Handling**:
     - If validation fails for the input data, a `400` status code with validation errors will be returned.
+    - If the location or category does not exist, a `404` status code naming it will be returned.
+    - If the write-behind queue is full, a `503` status code with a `Retry-After` header will be returned.
     - If any other error occurs, a `500` status code will be returned.
 
     Example request body:
@@ -56,8 +75,12 @@ async def create_review(review: dict):
         return JSONResponse(status_code=400, content={"errors": err.messages})
 
     # Instantiate the repository and use case for review creation
-    repository = ReviewRepository()
-    use_case = CreateReviewUseCase(repository)
+    queue = get_review_write_queue()
+    if queue is not None:
+        # Queued reviews invalidate the cache once their batch is inserted
+        use_case = CreateReviewUseCase(queue, references=get_reference_filter())
+    else:
+        use_case = CreateReviewUseCase(ReviewRepository(), get_recommendation_cache(), get_reference_filter())
     try:
         # Execute the use case to create the review
         obs = validated_data.get("obs", "")  # Default to an empty string if 'obs' is not provided
@@ -69,3 +92,327 @@ async def create_review(review: dict):
     except ValidationError as e:
         # Raise an HTTP exception with status 400 if the validation fails
         raise HTTPException(status_code=400, detail=str(e))
+    except (LocationNotFoundError, CategoryNotFoundError) as e:
+        # Unknown references are rejected before the review is saved
+        raise HTTPException(status_code=404, detail=str(e))
+    except ReviewQueueFullError as e:
+        # Shed load while the queue drains
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+
+
+@router.get("/", response_model=dict)
+async def get_reviews(location: Optional[str] = None, category: Optional[str] = None,
+                      limit: Optional[str] = None, cursor: Optional[str] = None):
+    """
+    Retrieve a page of the reviews of a location, newest first.
+
+    Pages are read with keyset pagination on (creation date, UUID) from the index of the reviews
+    by location, category and creation date, so every page costs the same however deep it is.
+    When the archive is enabled (`REVIEW_ARCHIVE_DIR`), the archived reviews follow the ones
+    still in the database, in the same pages.
+
+    - **location**: The UUID of the location.
+    - **category** (optional): Only return reviews of this category UUID.
+    - **limit** (optional): Page size, between 1 and 500 (default 100).
+    - **cursor** (optional): The `next_cursor` returned by the previous page.
+
+    **Response**:
+    - `reviews`: The reviews, by creation date (newest first), then UUID. The response is streamed.
+    - `next_cursor` is the cursor of the next page, or null when there are no more pages.
+
+    **Error Handling**:
+    - If the query parameters are invalid, a `400` status code with validation errors will be returned.
+
+    Example response:
+    ```json
+    {
+      "reviews": [
+        {
+          "id": "unique-review-uuid",
+          "recommendation": "Great place to visit!",
+          "created": "2024-10-02T10:15:00+00:00",
+          "category": "unique-category-uuid",
+          "location": "unique-location-uuid"
+        }
+      ],
+      "next_cursor": "opaque-cursor"
+    }
+    ```
+    """
+    params = {"location": location, "category": category, "limit": limit, "cursor": cursor}
+    try:
+        # Validate the query parameters with ReviewHistoryQuerySchema
+        query = ReviewHistoryQuerySchema().load({key: value for key, value in params.items() if value is not None})
+    except ValidationError as err:
+        return JSONResponse(status_code=400, content={"errors": err.messages})
+
+    reviews = await GetReviewHistoryUseCase(ReviewHistoryRepository(), get_review_archive()).execute(**query)
+    return StreamingResponse(stream_review_page(reviews, query["limit"]), media_type="application/json")
+
+
+@router.get("/queue/stats", response_model=dict)
+async def get_review_queue_stats():
+    """
+    Retrieve the write-behind review queue metrics of this process.
+
+    **Response**:
+    - `enabled`: Whether the write-behind mode is enabled (`REVIEW_WRITE_BEHIND_ENABLED`).
+    - `depth` / `capacity`: Number of queued reviews / maximum number of queued reviews.
+    - `queued` / `rejected`: Number of reviews queued / rejected with `503` because the queue was full.
+    - `flushed` / `dropped`: Number of queued reviews inserted / discarded because their location
+      or category does not exist.
+    - `retries`: Number of failed batch insertions, retried after a backoff.
+    - `failed`: Number of queued reviews given up at shutdown because their batch kept failing.
+    - `flushes`, `flush_ms_avg`, `flush_ms_max`: Number of batches inserted and their latency.
+
+    Example response:
+    ```json
+    {
+      "enabled": true,
+      "depth": 12,
+      "capacity": 10000,
+      "queued": 5230,
+      "rejected": 0,
+      "flushed": 5218,
+      "dropped": 0,
+      "retries": 0,
+      "failed": 0,
+      "flushes": 31,
+      "flush_ms_avg": 18.4,
+      "flush_ms_max": 42.9
+    }
+    ```
+    """
+    queue = get_review_write_queue()
+    if queue is None:
+        return {"enabled": False}
+    return {"enabled": True, **queue.stats()}
+
+
+@router.post("/bulk", response_model=dict)
+async def create_reviews_bulk(reviews: list = Body(...)):
+    """
+    Create many reviews in a single request.
+
+    Every item is validated like in `POST /reviews`, the referenced locations and categories
+    are checked with one query per table, and the reviews are inserted in chunked transactions.
+
+    - **reviews**: A list of up to 1000 dictionaries with the recommendation, category, location
+      and optional observation of each review.
+
+    **Response**:
+    - `created` / `failed`: Number of items created / not created.
+    - `results`: One result per item, in request order, with its `status`:
+      - `created`: The created review is in `review`.
+      - `invalid`: The validation errors of the item are in `errors`.
+      - `error`: The location or category does not exist; see `error`.
+
+    **Error Handling**:
+    - If the list is empty or too long, a `400` status code with validation errors will be returned.
+
+    Example request body:
+    ```json
+    [
+      {
+        "recommendation": "Great place to visit!",
+        "category": "unique-category-uuid",
+        "location": "unique-location-uuid"
+      }
+    ]
+    ```
+
+    Example response:
+    ```json
+    {
+      "created": 1,
+      "failed": 0,
+      "results": [
+        {"index": 0, "status": "created", "review": {"id": "unique-review-uuid", "recommendation": "Great place to visit!"}}
+      ]
+    }
+    ```
+    """
+    try:
+        # Validate every item with BaseReviewSchema
+        valid, errors = load_bulk(BaseReviewSchema(), reviews)
+    except ValidationError as err:
+        # Return a 400 response if the batch itself is invalid
+        return JSONResponse(status_code=400, content={"errors": err.messages})
+
+    # Instantiate the repository and use case for the bulk creation
+    use_case = BulkCreateReviewsUseCase(ReviewRepository(), get_recommendation_cache())
+    results = await use_case.execute([
+        (data["recommendation"], data["category"], data["location"], data.get("obs", "")) for _, data in valid
+    ])
+
+    return dump_bulk(len(reviews), errors, [index for index, _ in valid], results,
+                     ReviewResponseSchema(), "review")
+
+
+@router.post("/import", response_model=dict)
+async def import_reviews(request: Request, format: Optional[str] = Query(None, description="ndjson o csv")):
+    """
+    Import reviews from an NDJSON or CSV upload of any size.
+
+    The body is read as it arrives, each row is validated like in `POST /reviews`, and the valid
+    rows are inserted in batches of 1000. The body is not read past a batch until that batch is
+    inserted, so memory use does not grow with the size of the upload.
+
+    - **format** (optional): `ndjson` or `csv`. By default it is taken from the Content-Type
+      (`application/x-ndjson`, `application/jsonl` or `text/csv`).
+    - **body**: One JSON object per line, or a CSV whose first row holds the column names
+      (`recommendation`, `category`, `location` and optionally `obs`).
+
+    **Response**:
+    - `accepted` / `rejected`: Number of rows imported / not imported.
+    - `errors`: The line number and errors of up to 100 rejected rows; `errors_truncated`
+      tells whether there were more.
+
+    **Error Handling**:
+    - If the format is not supported, a `400` status code with validation errors will be returned.
+
+    Example request body (`text/csv`):
+    ```
+    recommendation,category,location,obs
+    Great place to visit!,unique-category-uuid,unique-location-uuid,It is well maintained.
+    ```
+
+    Example response:
+    ```json
+    {"accepted": 1, "rejected": 0, "errors": [], "errors_truncated": false}
+    ```
+    """
+    try:
+        # Resolve the format before reading the body
+        resolved_format = import_format(request.headers.get("content-type"), format)
+    except ValidationError as err:
+        return JSONResponse(status_code=400, content={"errors": err.messages})
+
+    summary = ImportSummaryEntity()
+    rows = load_stream(BaseReviewSchema(), request.stream(), resolved_format, summary)
+    use_case = ImportReviewsUseCase(ReviewRepository(), get_recommendation_cache())
+    await use_case.execute((
+        (line, (data["recommendation"], data["category"], data["location"], data.get("obs", "")))
+        async for line, data in rows
+    ), summary)
+
+    return summary.dict()
+
+
+@router.get("/references/stats", response_model=dict)
+async def get_reference_filter_stats():
+    """
+    Retrieve the counters of the filter rejecting reviews of unknown locations or categories.
+
+    **Response**:
+    - `enabled`: Whether the filter is enabled (`REFERENCE_FILTER_ENABLED`).
+    - `loaded`: Whether the existing UUIDs were loaded at startup; until then every UUID is
+      confirmed with the database.
+    - `entries` / `bytes`: Number of UUIDs added to the Bloom filter / its fixed size in memory.
+    - `rejected`: Number of UUIDs rejected without any query.
+    - `lru_hits`: Number of UUIDs found among those recently confirmed to exist.
+    - `confirmations`: Number of queries confirming UUIDs the Bloom filter may contain.
+    - `refresh_seconds` / `refreshes`: Age after which the UUIDs created by other workers are loaded
+      (`REFERENCE_FILTER_REFRESH_SECONDS`) / number of those loads.
+
+    Example response:
+    ```json
+    {
+      "enabled": true,
+      "loaded": true,
+      "entries": 120430,
+      "bytes": 11981328,
+      "rejected": 5321,
+      "lru_hits": 90211,
+      "confirmations": 712,
+      "refresh_seconds": 2.0,
+      "refreshes": 1840
+    }
+    ```
+    """
+    reference_filter = get_reference_filter()
+    if reference_filter is None:
+        return {"enabled": False}
+    return {"enabled": True, **reference_filter.stats()}
+
+
+@router.get("/archive", response_model=dict)
+async def get_archived_reviews(location: Optional[str] = None, category: Optional[str] = None,
+                               limit: Optional[str] = None, cursor: Optional[str] = None):
+    """
+    Retrieve a page of the archived reviews of a location, newest first.
+
+    Reviews older than `REVIEW_ARCHIVE_MONTHS` are moved out of the database by the archive
+    command (`python -m app.main_app.archive_reviews`) into compressed segment files, and served
+    from them here, without being loaded back into the database.
+
+    - **location**: The UUID of the location.
+    - **category** (optional): Only return reviews of this category UUID.
+    - **limit** (optional): Page size, between 1 and 500 (default 100).
+    - **cursor** (optional): The `next_cursor` returned by the previous page.
+
+    **Response**:
+    - `reviews`: The archived reviews, by creation date (newest first), then UUID.
+    - `next_cursor` is the cursor of the next page, or null when there are no more pages. When the
+      archive is disabled (`REVIEW_ARCHIVE_DIR` not set), the list is always empty.
+
+    **Error Handling**:
+    - If the query parameters are invalid, a `400` status code with validation errors will be returned.
+
+    Example response:
+    ```json
+    {
+      "reviews": [
+        {
+          "id": "unique-review-uuid",
+          "recommendation": "Great place to visit!",
+          "created": "2024-03-02T10:15:00+00:00",
+          "category": "unique-category-uuid",
+          "location": "unique-location-uuid"
+        }
+      ],
+      "next_cursor": "opaque-cursor"
+    }
+    ```
+    """
+    params = {"location": location, "category": category, "limit": limit, "cursor": cursor}
+    try:
+        # Validate the query parameters with ReviewHistoryQuerySchema
+        query = ReviewHistoryQuerySchema().load({key: value for key, value in params.items() if value is not None})
+    except ValidationError as err:
+        return JSONResponse(status_code=400, content={"errors": err.messages})
+
+    archive = get_review_archive()
+    if archive is None:
+        return {"reviews": [], "next_cursor": None}
+
+    reviews = await GetReviewHistoryUseCase(archive).execute(**query)
+    return StreamingResponse(stream_review_page(reviews, query["limit"]), media_type="application/json")
+
+
+@router.get("/archive/stats", response_model=dict)
+async def get_review_archive_stats():
+    """
+    Retrieve the size of the review archive.
+
+    **Response**:
+    - `enabled`: Whether the archive is enabled (`REVIEW_ARCHIVE_DIR`).
+    - `segments`: Number of segment files (one per archived month, or more if archived again).
+    - `pairs` / `reviews`: Number of location-category pairs / reviews archived.
+    - `bytes`: Size of the segment files on disk.
+
+    Example response:
+    ```json
+    {
+      "enabled": true,
+      "segments": 12,
+      "pairs": 83120,
+      "reviews": 1204332,
+      "bytes": 48213004
+    }
+    ```
+    """
+    archive = get_review_archive()
+    if archive is None:
+        return {"enabled": False}
+    return {"enabled": True, **archive.stats()}
@@ -0,0 +1,40 @@
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.adapters.secondary.metrics.app_metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_FLIGHT
+
+# Route label of the requests that match no route, so unknown paths do not create new series
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording the latency of every request, by method, route template and status,
+    and the number of requests in flight.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            # The router stores the matched route in the scope; its path is the template (/locations/{id})
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - started, scope["method"],
+                                          getattr(route, "path", UNMATCHED_ROUTE), status)
@@ -0,0 +1,147 @@
+import asyncio
+import cProfile
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import uuid
+from collections import Counter
+from datetime import datetime
+from typing import Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.main_app.config import (
+    PROFILING_DIR, PROFILING_HEADER, PROFILING_SAMPLE_INTERVAL_MS, PROFILING_SAMPLE_RATE, PROFILING_TOKEN
+)
+
+logger = logging.getLogger(__name__)
+
+
+class StackSampler:
+    """
+    Statistical profiler: a background thread records the call stack of another thread at a
+    fixed interval, and the samples are written in the collapsed-stack format read by
+    flamegraph.pl and speedscope (`frame;frame;frame count` per line, outermost frame first).
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        """
+        :param thread_id: Identifier of the thread to sample (the event loop thread).
+        :param interval: Seconds between samples.
+        """
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling sampled requests, or those sending the profiling header.
+
+    Each profiled request is written to `directory` as a cProfile dump (`.prof`, open it with
+    pstats or snakeviz) and as collapsed stacks sampled every `interval_ms` (`.collapsed`, for
+    flamegraphs), and its name is returned in the `X-Profile-Id` response header.
+
+    A single request is profiled at a time, since Python supports one active cProfile per
+    thread. Both profilers see the whole event loop, so concurrent requests appear in the
+    profile too. The middleware is only installed when profiling is enabled, so it costs
+    nothing otherwise.
+    """
+
+    def __init__(self, app: ASGIApp, directory: str = PROFILING_DIR, sample_rate: float = PROFILING_SAMPLE_RATE,
+                 header: str = PROFILING_HEADER, token: Optional[str] = PROFILING_TOKEN,
+                 interval_ms: float = PROFILING_SAMPLE_INTERVAL_MS):
+        """
+        Initializes the middleware.
+
+        :param app: The wrapped ASGI application.
+        :param directory: Directory where the profiles are written.
+        :param sample_rate: Fraction of the requests profiled, between 0 and 1.
+        :param header: Request header asking for the request to be profiled.
+        :param token: When set, the header must carry this value.
+        :param interval_ms: Milliseconds between the stack samples.
+        """
+        self.app = app
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.header = header
+        self.token = token
+        self.interval = interval_ms / 1000
+        self._active = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._active or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        self._active = True
+        name = self._profile_name(scope)
+
+        async def send_with_profile_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Profile-Id", name)
+            await send(message)
+
+        profile = cProfile.Profile()
+        sampler = StackSampler(threading.get_ident(), self.interval)
+        sampler.start()
+        profile.enable()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profile.disable()
+            sampler.stop()
+            self._active = False
+            # Written outside the event loop, after the response is sent
+            await asyncio.get_running_loop().run_in_executor(None, self._write, name, profile, sampler)
+
+    def _should_profile(self, scope: Scope) -> bool:
+        """
+        Tells whether the request asks to be profiled with the header, or falls in the sample.
+        """
+        requested = Headers(scope=scope).get(self.header)
+        if requested is not None and (not self.token or requested == self.token):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    @staticmethod
+    def _profile_name(scope: Scope) -> str:
+        """
+        Builds a unique file name from the time, method and path of the request.
+        """
+        path = re.sub(r"[^A-Za-z0-9]+", "_", scope["path"]).strip("_") or "root"
+        return f"{datetime.now():%Y%m%d-%H%M%S}-{scope['method']}-{path}-{uuid.uuid4().hex[:8]}"
+
+    def _write(self, name: str, profile: cProfile.Profile, sampler: StackSampler) -> None:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            profile.dump_stats(os.path.join(self.directory, f"{name}.prof"))
+            with open(os.path.join(self.directory, f"{name}.collapsed"), "w") as collapsed:
+                collapsed.write(sampler.collapsed())
+        except OSError as e:
+            logger.warning("Could not write profile %s: %s", name, e)
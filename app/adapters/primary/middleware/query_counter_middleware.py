@@ -0,0 +1,55 @@
+import logging
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.adapters.secondary.orm.query_counter import install_query_counter, track_queries
+from app.main_app.config import DB_QUERY_LOG_THRESHOLD, DB_TIME_LOG_THRESHOLD_MS
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCounterMiddleware:
+    """
+    ASGI middleware reporting the database statements issued by each request.
+
+    The number of statements and the time spent on them are sent in the `X-DB-Queries` and
+    `X-DB-Time` (milliseconds) response headers, and requests over either threshold are logged.
+    Statements issued while the response body is streamed are logged but not in the headers, so
+    responses streamed from a database cursor (the exports) are sent without the headers.
+    """
+
+    def __init__(self, app: ASGIApp, max_queries: int = DB_QUERY_LOG_THRESHOLD,
+                 max_time_ms: float = DB_TIME_LOG_THRESHOLD_MS):
+        """
+        Initializes the middleware.
+
+        :param app: The wrapped ASGI application.
+        :param max_queries: Requests with more statements are logged.
+        :param max_time_ms: Requests spending more milliseconds on the database are logged.
+        """
+        self.app = app
+        self.max_queries = max_queries
+        self.max_time_ms = max_time_ms
+        self._installed = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if not self._installed:
+            # Tortoise is initialized before the first request, so every client class is loaded
+            install_query_counter()
+            self._installed = True
+
+        with track_queries() as stats:
+            async def send_with_headers(message: Message) -> None:
+                if message["type"] == "http.response.start" and not stats.streamed:
+                    headers = MutableHeaders(scope=message)
+                    headers.append("X-DB-Queries", str(stats.count))
+                    headers.append("X-DB-Time", f"{stats.milliseconds:.3f}")
+                await send(message)
+
+            await self.app(scope, receive, send_with_headers)
+
+        if stats.count > self.max_queries or stats.milliseconds > self.max_time_ms:
+            logger.warning("%s %s issued %d database queries in %.1f ms", scope["method"], scope["path"],
+                           stats.count, stats.milliseconds)
@@ -0,0 +1,53 @@
+from typing import Any, Dict, List, Tuple
+from marshmallow import Schema, ValidationError
+
+# Maximum number of items of a bulk request
+BULK_MAX_ITEMS = 1000
+
+
+def load_bulk(schema: Schema, items: List[Any]) -> Tuple[List[Tuple[int, dict]], Dict[int, dict]]:
+    """
+    Validates every item of a bulk request with the schema of the single-item endpoint.
+
+    :param schema: The schema validating one item.
+    :param items: The items of the request body.
+    :return: The (index, validated data) of the valid items and the validation errors by index.
+    :raises ValidationError: If the batch is empty or exceeds `BULK_MAX_ITEMS` items.
+    """
+    if not items:
+        raise ValidationError("At least one item is required.")
+    if len(items) > BULK_MAX_ITEMS:
+        raise ValidationError(f"A bulk request cannot exceed {BULK_MAX_ITEMS} items.")
+
+    valid, errors = [], {}
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, schema.load(item)))
+        except ValidationError as err:
+            errors[index] = err.messages
+    return valid, errors
+
+
+def dump_bulk(size: int, errors: Dict[int, dict], indexes: List[int], results: List[Any],
+              schema: Schema, name: str) -> dict:
+    """
+    Builds the response of a bulk request with one result per item, in request order.
+
+    :param size: Number of items of the request.
+    :param errors: Validation errors by item index.
+    :param indexes: Indexes of the items passed to the use case.
+    :param results: Results of the use case for those items: an entity, or the exception of a failed item.
+    :param schema: The schema serializing a created entity.
+    :param name: Key of the created entity in its result.
+    """
+    items = [None] * size
+    for index, messages in errors.items():
+        items[index] = {"index": index, "status": "invalid", "errors": messages}
+    for index, result in zip(indexes, results):
+        if isinstance(result, Exception):
+            items[index] = {"index": index, "status": "error", "error": str(result)}
+        else:
+            items[index] = {"index": index, "status": "created", name: schema.dump(result)}
+
+    created = sum(1 for item in items if item["status"] == "created")
+    return {"created": created, "failed": size - created, "results": items}
@@ -0,0 +1,84 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import AsyncIterator, List
+from uuid import UUID
+from marshmallow import Schema, fields, validate, ValidationError
+from app.core.domain.entities.catalog_cursor_entity import CatalogCursor
+
+
+def encode_catalog_cursor(created: datetime, uuid: UUID) -> str:
+    """
+    Encodes the position right after the item with the given creation date and UUID as an
+    opaque, URL-safe cursor.
+    """
+    payload = [created.isoformat(), str(uuid)]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+class CatalogCursorField(fields.Field):
+    """
+    Field that deserializes an opaque cursor produced by `encode_catalog_cursor` into a CatalogCursor.
+    """
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        try:
+            created, uuid = json.loads(base64.urlsafe_b64decode(value.encode()))
+            created = datetime.fromisoformat(created)
+            if created.tzinfo is None:
+                raise ValueError("naive date")
+            return CatalogCursor(created=created, uuid=UUID(uuid))
+        except (binascii.Error, TypeError, ValueError, AttributeError):
+            raise ValidationError("Invalid cursor.")
+
+
+class CatalogQuerySchema(Schema):
+    """
+    Schema for validating the query parameters of the location and category listings.
+    """
+    # Only return the items with this status
+    status = fields.Bool(load_default=None, metadata={"description": "Filtrar por estado"})
+
+    # Page size
+    limit = fields.Int(load_default=100, validate=validate.Range(min=1, max=1000),
+                       metadata={"description": "Número máximo de elementos"})
+
+    # Cursor returned as `next_cursor` by the previous page
+    cursor = CatalogCursorField(load_default=None, data_key="cursor", attribute="after",
+                                metadata={"description": "Cursor de la página siguiente"})
+
+    # Stream every item instead of a page
+    export = fields.Str(load_default=None, validate=validate.OneOf(["ndjson"]),
+                        metadata={"description": "Exportar todo en NDJSON"})
+
+
+async def start_export(chunks: AsyncIterator[List]) -> AsyncIterator[List]:
+    """
+    Reads the first chunk of an export right away, so the errors raised when it starts (e.g.
+    ExportLimitError) happen before the response is sent, and returns an iterator over every chunk.
+    """
+    try:
+        first = [await chunks.__anext__()]
+    except StopAsyncIteration:
+        first = []
+
+    async def every_chunk():
+        try:
+            for chunk in first:
+                yield chunk
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            # Closing the response (e.g. the client disconnected) releases the cursor right away
+            await chunks.aclose()
+    return every_chunk()
+
+
+async def dump_ndjson(chunks: AsyncIterator[List], schema: Schema) -> AsyncIterator[str]:
+    """
+    Serializes the chunks of an export as NDJSON, one line per item, one chunk at a time.
+    Decimals (the coordinates) are written as strings, like in the JSON responses.
+    """
+    async for chunk in chunks:
+        yield "".join(json.dumps(item, default=str) + "\n" for item in schema.dump(chunk, many=True))
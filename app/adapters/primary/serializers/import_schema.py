@@ -0,0 +1,163 @@
+import csv
+import json
+from typing import AsyncIterable, AsyncIterator, Optional, Tuple
+from marshmallow import Schema, ValidationError
+from app.core.domain.entities.import_summary_entity import ImportSummaryEntity
+
+# Formats accepted by the import endpoints, by content type
+IMPORT_CONTENT_TYPES = {
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "text/csv": "csv",
+}
+IMPORT_FORMATS = set(IMPORT_CONTENT_TYPES.values())
+
+# Maximum size of a row; longer rows are rejected without being held in memory
+MAX_ROW_BYTES = 64 * 1024
+
+
+def import_format(content_type: Optional[str], requested: Optional[str] = None) -> str:
+    """
+    Resolves the format of an import from the `format` query parameter or the content type.
+
+    :param content_type: The Content-Type header of the request.
+    :param requested: The format requested explicitly, which takes precedence.
+    :return: `ndjson` or `csv`.
+    :raises ValidationError: If the format is not supported.
+    """
+    if requested is not None:
+        if requested not in IMPORT_FORMATS:
+            raise ValidationError({"format": [f"Must be one of: {', '.join(sorted(IMPORT_FORMATS))}."]})
+        return requested
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type not in IMPORT_CONTENT_TYPES:
+        raise ValidationError({"format": [
+            f"Unsupported content type; use {', '.join(sorted(IMPORT_CONTENT_TYPES))} or the format parameter."
+        ]})
+    return IMPORT_CONTENT_TYPES[media_type]
+
+
+async def read_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[Tuple[int, Optional[str], Optional[str]]]:
+    """
+    Splits a stream of bytes into lines as the chunks arrive.
+
+    :param chunks: The body of the request, chunk by chunk.
+    :return: (line number, text, error) for every line; the text is None when the line is
+             longer than `MAX_ROW_BYTES` or is not valid UTF-8.
+    """
+    buffer = bytearray()
+    line_number = 0
+    oversized = False
+    async for chunk in chunks:
+        buffer += chunk
+        start = 0
+        while (end := buffer.find(b"\n", start)) >= 0:
+            line_number += 1
+            yield (line_number, *_decode(buffer[start:end], oversized))
+            oversized = False
+            start = end + 1
+        del buffer[:start]
+        if len(buffer) > MAX_ROW_BYTES:
+            # Drop the rest of the line until its end arrives
+            oversized = True
+            buffer.clear()
+    if buffer or oversized:
+        yield (line_number + 1, *_decode(buffer, oversized))
+
+
+def _decode(line: bytearray, oversized: bool) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Decodes a line, returning (text, None) or (None, error).
+    """
+    if oversized or len(line) > MAX_ROW_BYTES:
+        return None, f"Row exceeds {MAX_ROW_BYTES} bytes."
+    try:
+        return line.decode("utf-8").rstrip("\r"), None
+    except UnicodeDecodeError:
+        return None, "Row is not valid UTF-8."
+
+
+async def read_ndjson(chunks: AsyncIterable[bytes]) -> AsyncIterator[Tuple[int, Optional[dict], Optional[dict]]]:
+    """
+    Parses a stream of JSON objects, one per line. Blank lines are skipped.
+
+    :return: (line number, record, None) for every parsed row, or (line number, None, errors).
+    """
+    async for line_number, text, error in read_lines(chunks):
+        if error:
+            yield line_number, None, {"_schema": [error]}
+        elif text.strip():
+            try:
+                record = json.loads(text)
+            except ValueError:
+                yield line_number, None, {"_schema": ["Invalid JSON."]}
+            else:
+                yield line_number, record, None
+
+
+async def read_csv(chunks: AsyncIterable[bytes]) -> AsyncIterator[Tuple[int, Optional[dict], Optional[dict]]]:
+    """
+    Parses a CSV stream whose first row holds the column names. Blank lines are skipped and
+    quoted values may span several lines.
+
+    :return: (line number, record, None) for every parsed row, or (line number, None, errors).
+    """
+    header = None
+    pending, pending_line = None, None
+    async for line_number, text, error in read_lines(chunks):
+        if error:
+            pending = None
+            yield line_number, None, {"_schema": [error]}
+            continue
+        if pending is not None:
+            text, line_number = f"{pending}\n{text}", pending_line
+            pending = None
+        if text.count('"') % 2:
+            # A quoted value continues on the next line
+            if len(text) > MAX_ROW_BYTES:
+                yield line_number, None, {"_schema": [f"Row exceeds {MAX_ROW_BYTES} bytes."]}
+            else:
+                pending, pending_line = text, line_number
+            continue
+        if not text.strip():
+            continue
+
+        try:
+            row = next(csv.reader([text]))
+        except csv.Error as err:
+            yield line_number, None, {"_schema": [f"Invalid CSV: {err}."]}
+            continue
+        if header is None:
+            header = [column.strip() for column in row]
+        elif len(row) != len(header):
+            yield line_number, None, {"_schema": [f"Expected {len(header)} columns, got {len(row)}."]}
+        else:
+            yield line_number, dict(zip(header, row)), None
+    if pending is not None:
+        yield pending_line, None, {"_schema": ["Unterminated quoted value."]}
+
+
+async def load_stream(schema: Schema, chunks: AsyncIterable[bytes], format: str,
+                      summary: ImportSummaryEntity) -> AsyncIterator[Tuple[int, dict]]:
+    """
+    Validates every row of an import stream with the schema of the single-item endpoint.
+
+    Invalid rows are rejected in the summary; nothing but the current row is held in memory.
+
+    :param schema: The schema validating one row.
+    :param chunks: The body of the request, chunk by chunk.
+    :param format: `ndjson` or `csv`.
+    :param summary: The summary where invalid rows are rejected.
+    :return: (line number, validated data) for every valid row.
+    """
+    rows = read_ndjson(chunks) if format == "ndjson" else read_csv(chunks)
+    async for line_number, record, errors in rows:
+        if errors is None:
+            try:
+                data = schema.load(record)
+            except ValidationError as err:
+                errors = err.messages
+            else:
+                yield line_number, data
+                continue
+        summary.reject(line_number, errors)
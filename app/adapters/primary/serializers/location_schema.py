@@ -1,4 +1,5 @@
-from marshmallow import Schema, fields, validates, ValidationError, pre_dump, post_dump
+from marshmallow import Schema, fields, validate, validates, validates_schema, ValidationError, pre_dump, post_dump
+from app.adapters.secondary.orm.repositories.location_repository import MAX_CLUSTER_ZOOM
 
 
 class BaseLocationSchema(Schema):
@@ -86,3 +87,103 @@ class LocationResponseSchema(Schema):
         This ensures the response only contains fields with values.
         """
         return {key: value for key, value in data.items() if value is not None}
+
+
+class NearbyLocationQuerySchema(Schema):
+    """
+    Schema for validating the query parameters of a proximity lookup.
+    Either a radius, a number of nearest locations (k), or both must be provided.
+    """
+    # Latitude of the point, should be between -90 and 90
+    lat = fields.Float(required=True, validate=validate.Range(min=-90, max=90),
+                       metadata={"description": "Latitud del punto"})
+
+    # Longitude of the point, should be between -180 and 180
+    long = fields.Float(required=True, validate=validate.Range(min=-180, max=180),
+                        metadata={"description": "Longitud del punto"})
+
+    # Search radius in kilometres
+    radius = fields.Float(load_default=None, validate=validate.Range(min=0, min_inclusive=False, max=20038),
+                          metadata={"description": "Radio de búsqueda en kilómetros"})
+
+    # Number of nearest locations
+    k = fields.Int(load_default=None, validate=validate.Range(min=1, max=100),
+                   metadata={"description": "Número de ubicaciones más cercanas"})
+
+    # Maximum number of locations returned by a radius lookup
+    limit = fields.Int(load_default=100, validate=validate.Range(min=1, max=1000),
+                       metadata={"description": "Número máximo de ubicaciones"})
+
+    @validates_schema
+    def validate_lookup(self, data, **kwargs):
+        """
+        Validates that a radius or k is provided.
+        """
+        if data.get("radius") is None and data.get("k") is None:
+            raise ValidationError("Either radius or k must be provided.", "_schema")
+
+
+class NearbyLocationResponseSchema(LocationResponseSchema):
+    """
+    Schema for serializing a location found by a proximity lookup, including its distance to the point.
+    """
+    # Distance to the point in kilometres, dumped only
+    distance = fields.Float(attribute="distance_km", dump_only=True,
+                            metadata={"description": "Distancia al punto en kilómetros"})
+
+    @pre_dump
+    def prepare_data(self, data, **kwargs):
+        """
+        Prepares data for serialization from a (LocationEntity, distance) tuple.
+        """
+        location, distance = data
+        prepared = super().prepare_data(location, **kwargs)
+        prepared["distance_km"] = round(distance, 6)
+        return prepared
+
+
+class TileQuerySchema(Schema):
+    """
+    Schema for validating the coordinates of a map tile and its options.
+    """
+    # Zoom level of the tile
+    z = fields.Int(required=True, validate=validate.Range(min=0, max=MAX_CLUSTER_ZOOM),
+                   metadata={"description": "Nivel de zoom"})
+
+    # Column and row of the tile
+    x = fields.Int(required=True, validate=validate.Range(min=0), metadata={"description": "Columna del tile"})
+    y = fields.Int(required=True, validate=validate.Range(min=0), metadata={"description": "Fila del tile"})
+
+    # Whether to count the pairs needing a review in each cluster
+    stale = fields.Bool(load_default=False, metadata={"description": "Incluir pares pendientes de revisión"})
+
+    @validates_schema
+    def validate_tile(self, data, **kwargs):
+        """
+        Validates that the column and row exist at the zoom level.
+        """
+        if "z" in data and (data.get("x", 0) >= 1 << data["z"] or data.get("y", 0) >= 1 << data["z"]):
+            raise ValidationError("x and y must be lower than 2^z.", "_schema")
+
+
+class LocationClusterResponseSchema(Schema):
+    """
+    Schema for serializing a cluster of locations of a map tile.
+    """
+    # Centroid of the cluster
+    lat = fields.Float(dump_only=True, metadata={"description": "Latitud del centroide"})
+    long = fields.Float(dump_only=True, metadata={"description": "Longitud del centroide"})
+
+    # Number of locations in the cluster
+    count = fields.Int(dump_only=True, metadata={"description": "Número de ubicaciones"})
+
+    # Number of location-category pairs needing a review, when requested
+    stale = fields.Int(attribute="stale_count", dump_only=True,
+                       metadata={"description": "Pares pendientes de revisión"})
+
+    @post_dump
+    def clean_output(self, data, **kwargs):
+        """
+        Removes null or None values from the serialized output.
+        """
+        return {key: value for key, value in data.items() if value is not None}
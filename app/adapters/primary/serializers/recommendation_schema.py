@@ -0,0 +1,83 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from uuid import UUID
+from marshmallow import Schema, fields, validate, validates_schema, ValidationError
+from app.core.domain.entities.recommendation_cursor_entity import RecommendationCursor
+
+
+def encode_cursor(recommendation) -> str:
+    """
+    Encodes the position right after the given recommendation as an opaque, URL-safe cursor.
+    """
+    cursor = RecommendationCursor.from_recommendation(recommendation)
+    payload = [
+        cursor.bandera,
+        cursor.review_date.isoformat() if cursor.review_date else None,
+        str(cursor.loc_uuid),
+        str(cursor.cat_uuid),
+        cursor.distance_km,
+    ]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+class CursorField(fields.Field):
+    """
+    Field that deserializes an opaque cursor produced by `encode_cursor` into a RecommendationCursor.
+    """
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        try:
+            bandera, review_date, loc_uuid, cat_uuid, distance_km = json.loads(base64.urlsafe_b64decode(value.encode()))
+            return RecommendationCursor(
+                bandera=int(bandera),
+                review_date=datetime.fromisoformat(review_date) if review_date else None,
+                loc_uuid=UUID(loc_uuid),
+                cat_uuid=UUID(cat_uuid),
+                distance_km=float(distance_km) if distance_km is not None else None
+            )
+        except (binascii.Error, TypeError, ValueError, AttributeError):
+            raise ValidationError("Invalid cursor.")
+
+
+class RecommendationQuerySchema(Schema):
+    """
+    Schema for validating the query parameters of the recommendations endpoint.
+    """
+    # Page size
+    limit = fields.Int(load_default=100, validate=validate.Range(min=1, max=500),
+                       metadata={"description": "Número máximo de recomendaciones"})
+
+    # Cursor returned as `next_cursor` by the previous page
+    cursor = CursorField(load_default=None, data_key="cursor", attribute="after",
+                         metadata={"description": "Cursor de la página siguiente"})
+
+    # Optional filters
+    category = fields.UUID(load_default=None, metadata={"description": "Filtrar por categoría"})
+    location = fields.UUID(load_default=None, metadata={"description": "Filtrar por ubicación"})
+    bandera = fields.Int(load_default=None, validate=validate.OneOf([1, 2]),
+                         metadata={"description": "Filtrar por bandera (1 = nunca revisada, 2 = vencida)"})
+
+    # Optional point: recommendations near it, ranked by distance
+    lat = fields.Float(load_default=None, validate=validate.Range(min=-90, max=90),
+                       metadata={"description": "Latitud del punto"})
+    long = fields.Float(load_default=None, validate=validate.Range(min=-180, max=180),
+                        metadata={"description": "Longitud del punto"})
+    radius = fields.Float(load_default=None, data_key="radius", attribute="radius_km",
+                          validate=validate.Range(min=0, min_inclusive=False, max=20038),
+                          metadata={"description": "Radio de búsqueda en kilómetros"})
+
+    @validates_schema
+    def validate_point(self, data, **kwargs):
+        """
+        Validates that latitude and longitude are provided together, that a radius comes with them,
+        and that the cursor was issued for the same kind of request.
+        """
+        if (data.get("lat") is None) != (data.get("long") is None):
+            raise ValidationError("lat and long must be provided together.", "_schema")
+        if data.get("radius_km") is not None and data.get("lat") is None:
+            raise ValidationError("radius requires lat and long.", "_schema")
+        after = data.get("after")
+        if after is not None and (after.distance_km is None) != (data.get("lat") is None):
+            raise ValidationError("Invalid cursor.", "cursor")
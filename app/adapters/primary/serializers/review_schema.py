@@ -1,4 +1,36 @@
-from marshmallow import Schema, fields, validates, ValidationError, pre_dump, post_dump
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Iterator, List
+from uuid import UUID
+from marshmallow import Schema, fields, validate, validates, ValidationError, pre_dump, post_dump
+from app.core.domain.entities.review_cursor_entity import ReviewCursor
+
+
+def encode_review_cursor(review) -> str:
+    """
+    Encodes the position right after the given review as an opaque, URL-safe cursor.
+    """
+    cursor = ReviewCursor.from_review(review)
+    payload = [cursor.rev_created.isoformat(), str(cursor.rev_uuid)]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+class ReviewCursorField(fields.Field):
+    """
+    Field that deserializes an opaque cursor produced by `encode_review_cursor` into a ReviewCursor.
+    """
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        try:
+            rev_created, rev_uuid = json.loads(base64.urlsafe_b64decode(value.encode()))
+            rev_created = datetime.fromisoformat(rev_created)
+            if rev_created.tzinfo is None:
+                raise ValueError("naive date")
+            return ReviewCursor(rev_created=rev_created, rev_uuid=UUID(rev_uuid))
+        except (binascii.Error, TypeError, ValueError, AttributeError):
+            raise ValidationError("Invalid cursor.")
 
 
 class BaseReviewSchema(Schema):
@@ -85,3 +117,33 @@ class ReviewResponseSchema(Schema):
         This ensures the response only contains fields with values.
         """
         return {key: value for key, value in data.items() if value is not None}
+
+
+class ReviewHistoryQuerySchema(Schema):
+    """
+    Schema for validating the query parameters of the review history endpoints.
+    """
+    # Location whose reviews are returned, and optional category filter
+    location = fields.UUID(required=True, metadata={"description": "Ubicación de las revisiones"})
+    category = fields.UUID(load_default=None, metadata={"description": "Filtrar por categoría"})
+
+    # Page size
+    limit = fields.Int(load_default=100, validate=validate.Range(min=1, max=500),
+                       metadata={"description": "Número máximo de revisiones"})
+
+    # Cursor returned as `next_cursor` by the previous page
+    cursor = ReviewCursorField(load_default=None, data_key="cursor", attribute="after",
+                               metadata={"description": "Cursor de la página siguiente"})
+
+
+def stream_review_page(reviews: List, limit: int) -> Iterator[str]:
+    """
+    Serializes a page of reviews one review at a time, as the chunks of a streamed JSON response
+    `{"reviews": [...], "next_cursor": ...}`. A full page has a `next_cursor`.
+    """
+    schema = ReviewResponseSchema()
+    yield '{"reviews": ['
+    for index, review in enumerate(reviews):
+        yield ("," if index else "") + json.dumps(schema.dump(review))
+    next_cursor = encode_review_cursor(reviews[-1]) if reviews and len(reviews) == limit else None
+    yield f'], "next_cursor": {json.dumps(next_cursor)}}}'
@@ -0,0 +1,313 @@
+import mmap
+import os
+import re
+import struct
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from uuid import UUID
+import numpy as np
+import pytz
+from app.core.domain.entities.review_cursor_entity import ReviewCursor, epoch_micros
+from app.core.domain.entities.review_entity import ReviewEntity
+from app.core.domain.ports.review_history_ports import ReviewHistoryPort
+from app.main_app.config import REVIEW_ARCHIVE_DIR
+
+# Layout of a segment file, little-endian:
+#   header  MAGIC, month (YYYYMM), number of pairs, number of reviews, offset of the index
+#   blocks  one zlib-compressed columnar block per location-category pair
+#   index   one INDEX_DTYPE record per pair, sorted by key (location UUID bytes + category UUID bytes)
+MAGIC = b"MMWREVS1"
+HEADER = struct.Struct("<8sIIQQ")
+INDEX_DTYPE = np.dtype([
+    ("key", "S32"),
+    ("offset", "<u8"),
+    ("length", "<u4"),
+    ("rows", "<u4"),
+    ("newest", "<i8"),
+    ("oldest", "<i8"),
+])
+
+# Segments are named after the month they hold, numbered when a month is archived more than once
+SEGMENT_NAME = re.compile(r"^reviews_(\d{4})_(\d{2})_(\d+)\.seg$")
+
+# zlib level of the blocks
+COMPRESSION_LEVEL = 6
+
+EPOCH = datetime(1970, 1, 1, tzinfo=pytz.UTC)
+
+
+def encode_block(reviews: List[ReviewEntity]) -> bytes:
+    """
+    Encodes the reviews of a pair, in history order, as a compressed block holding one column
+    after the other: UUIDs, creation dates, recommendation lengths, observation lengths (-1 when
+    missing), then the recommendation and observation texts.
+    """
+    recommendations = [review.rev_recommendation.encode() for review in reviews]
+    observations = [review.rev_obs.encode() if review.rev_obs is not None else None for review in reviews]
+    columns = [
+        b"".join(review.rev_uuid.bytes for review in reviews),
+        np.array([epoch_micros(review.rev_created) for review in reviews], dtype="<i8").tobytes(),
+        np.array([len(text) for text in recommendations], dtype="<u4").tobytes(),
+        np.array([len(text) if text is not None else -1 for text in observations], dtype="<i4").tobytes(),
+        b"".join(recommendations),
+        b"".join(text for text in observations if text is not None),
+    ]
+    return zlib.compress(b"".join(columns), COMPRESSION_LEVEL)
+
+
+def decode_block(block: bytes, rows: int, loc_uuid: UUID, cat_uuid: UUID) -> List[ReviewEntity]:
+    """
+    Decodes a block written by `encode_block` into review entities.
+    """
+    data = zlib.decompress(block)
+    position = 16 * rows
+    created = np.frombuffer(data, dtype="<i8", count=rows, offset=position)
+    position += 8 * rows
+    recommendation_lengths = np.frombuffer(data, dtype="<u4", count=rows, offset=position)
+    position += 4 * rows
+    observation_lengths = np.frombuffer(data, dtype="<i4", count=rows, offset=position)
+    position += 4 * rows
+
+    recommendations = []
+    for length in recommendation_lengths.tolist():
+        recommendations.append(data[position:position + length].decode())
+        position += length
+    observations = []
+    for length in observation_lengths.tolist():
+        observations.append(data[position:position + length].decode() if length >= 0 else None)
+        position += max(length, 0)
+
+    return [
+        ReviewEntity(
+            rev_uuid=UUID(bytes=data[16 * row:16 * row + 16]),
+            rev_recommendation=recommendations[row],
+            rev_obs=observations[row],
+            rev_created=EPOCH + timedelta(microseconds=micros),
+            rev_fk_loc_uuid=loc_uuid,
+            rev_fk_cat_uuid=cat_uuid
+        )
+        for row, micros in enumerate(created.tolist())
+    ]
+
+
+def segment_path(directory: str, month: datetime) -> str:
+    """
+    Returns the path of a new segment of a month: months archived again get the next number.
+    """
+    numbers = [
+        int(match.group(3)) for match in map(SEGMENT_NAME.match, os.listdir(directory))
+        if match and (int(match.group(1)), int(match.group(2))) == (month.year, month.month)
+    ]
+    return os.path.join(directory, f"reviews_{month.year:04d}_{month.month:02d}_{max(numbers, default=0) + 1}.seg")
+
+
+class SegmentWriter:
+    """
+    Writes the archived reviews of a month to a segment file, one location-category pair at a time,
+    so only the reviews of the current pair are held in memory.
+
+    The file is written under a temporary name and renamed by `finish`, so readers never see a
+    partial segment.
+    """
+
+    def __init__(self, path: str, month: datetime):
+        """
+        Opens the segment for writing.
+
+        :param path: Path of the segment file.
+        :param month: First instant of the month of the reviews.
+        """
+        self.path = path
+        self.month = month
+        self.rows = 0
+        self._index = []
+        self._file = open(f"{path}.tmp", "wb")
+        self._file.write(bytes(HEADER.size))
+
+    def add_pair(self, loc_uuid: UUID, cat_uuid: UUID, reviews: List[ReviewEntity]) -> None:
+        """
+        Appends the reviews of a location-category pair. Each pair must be added once.
+        """
+        reviews = sorted(reviews, key=ReviewCursor.sort_key)
+        block = encode_block(reviews)
+        self._index.append((loc_uuid.bytes + cat_uuid.bytes, self._file.tell(), len(block), len(reviews),
+                            epoch_micros(reviews[0].rev_created), epoch_micros(reviews[-1].rev_created)))
+        self._file.write(block)
+        self.rows += len(reviews)
+
+    def finish(self) -> str:
+        """
+        Writes the index and the header, syncs the file to disk and publishes it.
+
+        :return: The path of the segment.
+        """
+        index = np.array(sorted(self._index), dtype=INDEX_DTYPE)
+        index_offset = self._file.tell()
+        self._file.write(index.tobytes())
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, self.month.year * 100 + self.month.month, len(index), self.rows,
+                                     index_offset))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(f"{self.path}.tmp", self.path)
+        return self.path
+
+    def abort(self) -> None:
+        """
+        Discards the segment.
+        """
+        self._file.close()
+        os.remove(f"{self.path}.tmp")
+
+
+class ReviewSegment:
+    """
+    Read side of a segment file. The file is memory-mapped and its index is searched in place, so
+    only the pages of the index entries probed and of the blocks read are loaded.
+    """
+
+    def __init__(self, path: str):
+        """
+        Opens and maps a segment file.
+
+        :param path: Path of the segment file.
+        """
+        self.path = path
+        self.size = os.path.getsize(path)
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, month, pairs, rows, index_offset = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a review segment")
+        self.month = datetime(month // 100, month % 100, 1, tzinfo=pytz.UTC)
+        self.rows = rows
+        self._index = np.frombuffer(self._map, dtype=INDEX_DTYPE, count=pairs, offset=index_offset)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def pairs(self, loc_uuid: UUID, cat_uuid: Optional[UUID] = None) -> np.ndarray:
+        """
+        Returns the index entries of a location-category pair, or of every pair of a location:
+        keys start with the location, so they are contiguous in the index.
+        """
+        low = loc_uuid.bytes + (cat_uuid.bytes if cat_uuid is not None else bytes(16))
+        high = loc_uuid.bytes + (cat_uuid.bytes if cat_uuid is not None else b"\xff" * 16)
+        start = np.searchsorted(self._index["key"], np.bytes_(low), side="left")
+        end = np.searchsorted(self._index["key"], np.bytes_(high), side="right")
+        return self._index[start:end]
+
+    def read(self, entry) -> List[ReviewEntity]:
+        """
+        Decodes the reviews of an index entry, in history order.
+        """
+        # NumPy strips the trailing zero bytes of the key
+        key = bytes(entry["key"]).ljust(32, b"\x00")
+        offset, length = int(entry["offset"]), int(entry["length"])
+        return decode_block(self._map[offset:offset + length], int(entry["rows"]),
+                            UUID(bytes=key[:16]), UUID(bytes=key[16:]))
+
+    def close(self) -> None:
+        """
+        Unmaps the file.
+        """
+        # The index view must be released before the map is closed
+        del self._index
+        self._map.close()
+
+
+class ReviewArchive(ReviewHistoryPort):
+    """
+    Serves the history of the reviews moved out of the database to segment files, straight from
+    the memory-mapped segments. Segments are (re)discovered when the directory changes, so those
+    written by the archive command are served without a restart.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Initializes the archive.
+
+        :param directory: Directory holding the segment files.
+        """
+        self.directory = directory
+        self._segments: Dict[str, ReviewSegment] = {}
+        self._scanned_at: Optional[int] = None
+
+    def refresh(self) -> None:
+        """
+        Opens the segments added to the directory since the last scan, and closes the removed ones.
+        """
+        if not os.path.isdir(self.directory):
+            return
+        modified_at = os.stat(self.directory).st_mtime_ns
+        if modified_at == self._scanned_at:
+            return
+        self._scanned_at = modified_at
+
+        names = {name for name in os.listdir(self.directory) if SEGMENT_NAME.match(name)}
+        for name in set(self._segments) - names:
+            self._segments.pop(name).close()
+        for name in names - set(self._segments):
+            self._segments[name] = ReviewSegment(os.path.join(self.directory, name))
+
+    async def get_reviews(self, loc_uuid: UUID, cat_uuid: Optional[UUID] = None, limit: int = 100,
+                          after: Optional[ReviewCursor] = None) -> List[ReviewEntity]:
+        """
+        Retrieves a page of archived reviews of a location, or of a location-category pair.
+
+        Segments are read newest month first, and reading stops once a month completes the page.
+        Blocks entirely newer than the cursor are skipped without being decompressed. A review
+        archived twice (when an archive run stopped before removing its month from the database)
+        is returned once.
+        """
+        self.refresh()
+        months: Dict[datetime, List[ReviewSegment]] = {}
+        for segment in self._segments.values():
+            months.setdefault(segment.month, []).append(segment)
+        after_micros = epoch_micros(after.rev_created) if after is not None else None
+
+        reviews: Dict[UUID, ReviewEntity] = {}
+        for month in sorted(months, reverse=True):
+            if after is not None and month > after.rev_created:
+                continue
+            for segment in months[month]:
+                for entry in segment.pairs(loc_uuid, cat_uuid):
+                    if after_micros is not None and int(entry["oldest"]) > after_micros:
+                        continue
+                    for review in segment.read(entry):
+                        if after is None or after.is_before(review):
+                            reviews.setdefault(review.rev_uuid, review)
+            if len(reviews) >= limit:
+                break
+
+        return sorted(reviews.values(), key=ReviewCursor.sort_key)[:limit]
+
+    def stats(self) -> dict:
+        """
+        Returns the number of segments, pairs and reviews archived, and the size of the segment files.
+        """
+        self.refresh()
+        segments = list(self._segments.values())
+        return {
+            "segments": len(segments),
+            "pairs": sum(len(segment) for segment in segments),
+            "reviews": sum(segment.rows for segment in segments),
+            "bytes": sum(segment.size for segment in segments),
+        }
+
+
+# Process-wide archive, created on first use
+_archive: Optional[ReviewArchive] = None
+
+
+def get_review_archive() -> Optional[ReviewArchive]:
+    """
+    Returns the process-wide review archive, or None when `REVIEW_ARCHIVE_DIR` is not set.
+    """
+    global _archive
+    if _archive is None and REVIEW_ARCHIVE_DIR:
+        _archive = ReviewArchive(REVIEW_ARCHIVE_DIR)
+    return _archive
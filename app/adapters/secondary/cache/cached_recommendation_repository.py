@@ -0,0 +1,41 @@
+from typing import List, Optional
+from uuid import UUID
+from app.core.domain.entities.recomendation_entity import RecommendationEntity
+from app.core.domain.entities.recommendation_cursor_entity import RecommendationCursor
+from app.core.domain.ports.recommendation_cache_ports import RecommendationCachePort
+from app.core.domain.ports.recommendation_ports import RecommendationRepositoryPort
+
+
+class CachedRecommendationRepository(RecommendationRepositoryPort):
+    """
+    Recommendation repository that serves results from a cache and only delegates to the
+    wrapped repository on a cache miss.
+    """
+
+    def __init__(self, repository: RecommendationRepositoryPort, cache: RecommendationCachePort):
+        """
+        Initializes the repository.
+
+        :param repository: The repository that computes the recommendations.
+        :param cache: The cache storing the computed recommendations.
+        """
+        self.repository = repository
+        self.cache = cache
+
+    async def get_recommendations(self, limit: int = 100, after: Optional[RecommendationCursor] = None,
+                                  category: Optional[UUID] = None, location: Optional[UUID] = None,
+                                  bandera: Optional[int] = None, lat: Optional[float] = None,
+                                  long: Optional[float] = None,
+                                  radius_km: Optional[float] = None) -> List[RecommendationEntity]:
+        """
+        Retrieves the recommendations from the cache, computing and caching them on a miss.
+        Every page and filter combination is cached under its own key.
+        """
+        return await self.cache.get_or_compute(
+            lambda: self.repository.get_recommendations(
+                limit=limit, after=after, category=category, location=location, bandera=bandera,
+                lat=lat, long=long, radius_km=radius_km
+            ),
+            limit=limit, after=after, category=category, location=location, bandera=bandera,
+            lat=lat, long=long, radius_km=radius_km
+        )
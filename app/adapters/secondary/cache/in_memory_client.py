@@ -0,0 +1,56 @@
+import time
+from typing import Dict, Optional, Tuple
+
+
+class InMemoryCacheClient:
+    """
+    In-process stand-in for the subset of the `redis.asyncio.Redis` API used by the cache adapters.
+    Values are kept in a dictionary with an optional expiration, which makes it suitable for tests
+    and for single-process deployments without Redis.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty cache.
+        """
+        self._data: Dict[str, Tuple[str, Optional[float]]] = {}
+
+    def _alive(self, key: str) -> bool:
+        """
+        Returns True if the key exists and has not expired, removing it otherwise.
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            return False
+        if entry[1] is not None and entry[1] <= time.monotonic():
+            del self._data[key]
+            return False
+        return True
+
+    async def get(self, key: str) -> Optional[str]:
+        """
+        Returns the value stored under the key, or None if it is missing or expired.
+        """
+        return self._data[key][0] if self._alive(key) else None
+
+    async def set(self, key: str, value: str, ex: Optional[int] = None) -> bool:
+        """
+        Stores the value under the key, expiring after `ex` seconds when provided.
+        """
+        expires_at = time.monotonic() + ex if ex else None
+        self._data[key] = (str(value), expires_at)
+        return True
+
+    async def incr(self, key: str) -> int:
+        """
+        Increments the integer stored under the key, starting from 0, and returns the new value.
+        """
+        value = int(self._data[key][0]) + 1 if self._alive(key) else 1
+        self._data[key] = (str(value), None)
+        return value
+
+    async def delete(self, *keys: str) -> int:
+        """
+        Removes the given keys and returns how many existed.
+        """
+        return sum(1 for key in keys if self._data.pop(key, None) is not None)
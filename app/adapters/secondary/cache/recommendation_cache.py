@@ -0,0 +1,118 @@
+import json
+import logging
+from typing import Awaitable, Callable, List, Optional
+from redis.exceptions import RedisError
+from app.core.domain.entities.recomendation_entity import RecommendationEntity
+from app.core.domain.ports.recommendation_cache_ports import RecommendationCachePort
+from app.main_app.config import REDIS_URL, RECOMMENDATION_CACHE_TTL
+
+logger = logging.getLogger(__name__)
+
+# Prefix of every key written by the recommendation cache
+KEY_PREFIX = "recommendations"
+
+
+class RecommendationCache(RecommendationCachePort):
+    """
+    Cache of computed recommendations stored in Redis (or any client with the same API).
+
+    Entries are keyed by a version number kept under `<prefix>:version`. Invalidating the cache
+    increments the version, so entries written before the change are never read again and
+    simply expire with their TTL.
+    """
+
+    def __init__(self, client, ttl: int = RECOMMENDATION_CACHE_TTL, prefix: str = KEY_PREFIX):
+        """
+        Initializes the cache.
+
+        :param client: An async Redis client, or an InMemoryCacheClient.
+        :param ttl: Time to live of the cached recommendations, in seconds.
+        :param prefix: Prefix of the keys written by the cache.
+        """
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def version_key(self) -> str:
+        return f"{self.prefix}:version"
+
+    async def _version(self) -> str:
+        """
+        Returns the current cache version.
+        """
+        return await self.client.get(self.version_key) or "0"
+
+    def _key(self, version: str, **params) -> str:
+        """
+        Builds the entry key from a cache version and the computation parameters.
+        """
+        encoded = ":".join(f"{name}={params[name]}" for name in sorted(params))
+        return f"{self.prefix}:v{version}:{encoded}"
+
+    async def get_or_compute(self, compute: Callable[[], Awaitable[List[RecommendationEntity]]],
+                             **params) -> List[RecommendationEntity]:
+        """
+        Retrieve the cached recommendations computed with the given parameters, computing and
+        storing them for `ttl` seconds on a miss.
+
+        The version is read before computing, so a result computed while an invalidation happens
+        is stored under the old version and never served. Cache errors are logged and the
+        recommendations are computed as on a miss.
+        """
+        try:
+            key = self._key(await self._version(), **params)
+            cached = await self.client.get(key)
+        except RedisError as e:
+            logger.warning("Recommendation cache read failed: %s", e)
+            self.misses += 1
+            return await compute()
+
+        if cached is not None:
+            self.hits += 1
+            return [RecommendationEntity.from_dict(item) for item in json.loads(cached)]
+
+        self.misses += 1
+        recommendations = await compute()
+        payload = json.dumps([recommendation.dict() for recommendation in recommendations])
+        try:
+            await self.client.set(key, payload, ex=self.ttl)
+        except RedisError as e:
+            logger.warning("Recommendation cache write failed: %s", e)
+        return recommendations
+
+    async def invalidate(self) -> None:
+        """
+        Invalidate every cached recommendation by bumping the version key.
+        """
+        try:
+            await self.client.incr(self.version_key)
+        except RedisError as e:
+            logger.warning("Recommendation cache invalidation failed: %s", e)
+
+    def stats(self) -> dict:
+        """
+        Returns the hit and miss counters of this process and the resulting hit ratio.
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+
+_cache: Optional[RecommendationCache] = None
+
+
+def get_recommendation_cache() -> Optional[RecommendationCache]:
+    """
+    Returns the process-wide recommendation cache, or None when `REDIS_URL` is not configured.
+    """
+    global _cache
+    if _cache is None and REDIS_URL:
+        from redis.asyncio import from_url
+        _cache = RecommendationCache(from_url(REDIS_URL, decode_responses=True))
+    return _cache
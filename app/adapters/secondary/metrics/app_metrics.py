@@ -0,0 +1,117 @@
+from tortoise import connections
+from app.adapters.secondary.cache.recommendation_cache import get_recommendation_cache
+from app.adapters.secondary.metrics.registry import CollectedCounter, Gauge, Histogram, registry
+from app.adapters.secondary.orm import query_counter
+from app.adapters.secondary.orm.pool_settings import get_pool_settings
+from app.adapters.secondary.orm.replica_router import get_replica_router
+from app.adapters.secondary.queue.write_behind_review_repository import get_review_write_queue
+
+# Recorded by the metrics middleware
+HTTP_REQUEST_DURATION = registry.register(Histogram(
+    "http_request_duration_seconds", "Latency of HTTP requests.", ("method", "route", "status")
+))
+HTTP_REQUESTS_IN_FLIGHT = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests being served."
+))
+
+# Recorded by RecommendationRepository
+RECOMMENDATION_COMPUTE_DURATION = registry.register(Histogram(
+    "recommendation_compute_seconds", "Time spent computing recommendations outside the cache."
+))
+
+
+def _db_pool():
+    """
+    Returns the size, idle connections and maximum size of the default connection pool, or an
+    empty list when the database has no pool (SQLite) or is not initialized.
+    """
+    try:
+        pool = getattr(connections.get("default"), "_pool", None)
+    except Exception:
+        return []
+    if pool is None:
+        return []
+    return [(pool.get_size(), pool.get_idle_size(), pool.get_max_size())]
+
+
+def _db_pool_connections():
+    for size, idle, max_size in _db_pool():
+        yield {"state": "in_use"}, size - idle
+        yield {"state": "idle"}, idle
+        yield {"state": "max"}, max_size
+
+
+def _db_pool_utilization():
+    for size, idle, max_size in _db_pool():
+        yield {}, (size - idle) / max_size if max_size else 0.0
+
+
+def _db_pool_settings():
+    settings = get_pool_settings() or {}
+    for name, value in settings.items():
+        # Unset arguments (e.g. no command timeout) are not reported
+        if value is not None:
+            yield {"setting": name}, value
+
+
+def _replica_stats():
+    router = get_replica_router()
+    return [router.stats()] if router is not None else []
+
+
+def _cache_stats():
+    cache = get_recommendation_cache()
+    return [cache.stats()] if cache is not None else []
+
+
+def _review_queue_stats():
+    queue = get_review_write_queue()
+    return [queue.stats()] if queue is not None else []
+
+
+def register_collectors() -> None:
+    """
+    Registers the metrics read from other components when /metrics is rendered.
+    """
+    registry.register(Gauge(
+        "db_pool_connections", "Connections of the database pool, by state.",
+        collect=_db_pool_connections
+    ))
+    registry.register(Gauge(
+        "db_pool_utilization", "Fraction of the maximum pool size in use.",
+        collect=_db_pool_utilization
+    ))
+    registry.register(Gauge(
+        "db_pool_settings", "Configured size and statement settings of the database pool.",
+        collect=_db_pool_settings
+    ))
+    registry.register(CollectedCounter(
+        "db_queries_total", "Statements sent to the database.",
+        collect=lambda: [({}, query_counter.totals.count)]
+    ))
+    registry.register(CollectedCounter(
+        "db_query_seconds_total", "Time spent waiting for database statements.",
+        collect=lambda: [({}, query_counter.totals.seconds)]
+    ))
+    registry.register(CollectedCounter(
+        "db_routed_reads_total", "Read-only queries routed to the replica or back to the primary.",
+        collect=lambda: [({"connection": connection}, stats[f"{connection}_reads"]) for stats in _replica_stats()
+                         for connection in ("replica", "primary")]
+    ))
+    registry.register(Gauge(
+        "db_replica_lag_seconds", "Replication lag of the read replica when last measured.",
+        collect=lambda: [({}, stats["lag_seconds"]) for stats in _replica_stats() if stats["lag_seconds"] is not None]
+    ))
+    registry.register(CollectedCounter(
+        "recommendation_cache_requests_total", "Recommendation requests, by cache result.",
+        collect=lambda: [({"result": result}, stats[f"{result}s"]) for stats in _cache_stats()
+                         for result in ("hit", "miss")]
+    ))
+    registry.register(Gauge(
+        "recommendation_cache_hit_ratio", "Fraction of recommendation requests served from the cache.",
+        collect=lambda: [({}, stats["hit_ratio"]) for stats in _cache_stats()]
+    ))
+    registry.register(Gauge(
+        "review_queue_depth", "Reviews waiting in the write-behind queue.",
+        collect=lambda: [({}, stats["depth"]) for stats in _review_queue_stats()]
+    ))
@@ -1,6 +1,10 @@
 from .category_model import ModelCategory
 from .location_model import ModelLocation
 from .review_model import ModelReview
+from .pair_review_state_model import ModelPairReviewState
+from .location_cluster_model import ModelLocationCluster
+from .review_rollup_model import ModelReviewRollup
 
 # Esto asegura que Tortoise pueda detectar los modelos correctamente.
-__all__ = ["ModelCategory", "ModelLocation", "ModelReview"]
+__all__ = ["ModelCategory", "ModelLocation", "ModelReview", "ModelPairReviewState", "ModelLocationCluster",
+           "ModelReviewRollup"]
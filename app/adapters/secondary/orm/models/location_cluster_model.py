@@ -0,0 +1,53 @@
+from tortoise import Model, fields
+import uuid
+
+
+class ModelLocationCluster(Model):
+    """
+    Represents a cluster of locations on the map at a given zoom level.
+
+    A tile at zoom `z` is divided into a grid of cells, each cell being a tile of zoom
+    `z + CLUSTER_GRID_BITS`; every cell holding locations has one cluster row per zoom level.
+    Rows are maintained incrementally on every location insertion, so a map tile is served by
+    reading its cells instead of scanning the locations.
+
+    Attributes:
+    - `lcl_uuid`: A unique identifier for the cluster row (UUID).
+    - `lcl_zoom`: The zoom level of the tiles the cluster belongs to (integer).
+    - `lcl_x`: The column of the cluster cell, at zoom `lcl_zoom + CLUSTER_GRID_BITS` (integer).
+    - `lcl_y`: The row of the cluster cell, at zoom `lcl_zoom + CLUSTER_GRID_BITS` (integer).
+    - `lcl_count`: The number of locations in the cell (integer).
+    - `lcl_lat_sum`: The sum of the latitudes of those locations, for the centroid (float).
+    - `lcl_long_sum`: The sum of the longitudes of those locations, for the centroid (float).
+
+    Meta:
+    - The table name is set to `location_cluster` in the database.
+    - The (`lcl_zoom`, `lcl_x`, `lcl_y`) triple is unique, it is the upsert key and serves tile lookups.
+    """
+
+    # Unique identifier for the cluster row
+    lcl_uuid = fields.UUIDField(pk=True, default=uuid.uuid4, description="Unique identifier for the cluster.")
+
+    # Zoom level of the tiles the cluster belongs to
+    lcl_zoom = fields.SmallIntField(null=False, description="Zoom level of the cluster.")
+
+    # Column and row of the cluster cell
+    lcl_x = fields.IntField(null=False, description="Column of the cluster cell.")
+    lcl_y = fields.IntField(null=False, description="Row of the cluster cell.")
+
+    # Number of locations in the cell
+    lcl_count = fields.IntField(default=0, null=False, description="Number of locations in the cluster.")
+
+    # Sums of the coordinates of the locations in the cell
+    lcl_lat_sum = fields.FloatField(default=0, null=False, description="Sum of the latitudes of the cluster.")
+    lcl_long_sum = fields.FloatField(default=0, null=False, description="Sum of the longitudes of the cluster.")
+
+    class Meta:
+        # Table name and additional metadata
+        table = 'location_cluster'
+        comment = "Precomputed location counts and centroids per map zoom level."
+
+        # Upsert key and tile lookups: one row per zoom level and cell
+        unique_together = (("lcl_zoom", "lcl_x", "lcl_y"),)
+
+        schema = "public"
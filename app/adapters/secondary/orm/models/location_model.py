@@ -11,6 +11,7 @@ class ModelLocation(Model):
     - `loc_description`: A description or name of the location (string).
     - `loc_lat`: The latitude of the location (decimal).
     - `loc_long`: The longitude of the location (decimal).
+    - `loc_geohash`: The geohash of the location coordinates (string).
     - `loc_status`: Indicates whether the location is active or inactive (boolean).
     - `loc_created`: The date and time when the location was created (datetime).
     - `loc_updated`: The date and time when the location was last updated (datetime).
@@ -19,6 +20,7 @@ class ModelLocation(Model):
     - The table name is set to `location` in the database.
     - The `loc_description` field is unique to ensure no duplicate locations.
     - The `loc_created` field is indexed to optimize queries filtering by creation date.
+    - The `loc_geohash`, `loc_lat` and `loc_long` fields are indexed together for proximity lookups.
     """
 
     # Unique identifier for the location
@@ -34,6 +36,9 @@ class ModelLocation(Model):
     # Longitude of the location
     loc_long = fields.DecimalField(max_digits=9, null=True, decimal_places=6, description="Longitude of the location.")
 
+    # Geohash of the coordinates, maintained by the repository for proximity lookups
+    loc_geohash = fields.CharField(max_length=12, null=True, description="Geohash of the location coordinates.")
+
     # Active or inactive status of the location
     loc_status = fields.BooleanField(null=False, description="Status of the location: Active or Inactive.")
 
@@ -51,7 +56,8 @@ class ModelLocation(Model):
         # Indexes for optimization
         indexes = [
             ["loc_description"],  # Ensure the description is unique
-            ["loc_created"]  # Index on creation date for quick lookups
+            ["loc_created"],  # Index on creation date for quick lookups
+            ["loc_geohash", "loc_lat", "loc_long"]  # Covering index for proximity lookups by geohash prefix
         ]
 
         # Schema where the table belongs
@@ -0,0 +1,66 @@
+from tortoise import Model, fields
+import uuid
+
+
+class ModelPairReviewState(Model):
+    """
+    Represents the review state of a location-category pair.
+
+    It is maintained incrementally on every review insertion, so recommendations can be computed
+    without aggregating the whole review history.
+
+    Attributes:
+    - `prs_uuid`: A unique identifier for the state row (UUID).
+    - `prs_fk_loc_uuid`: A foreign key to the Location model (UUID).
+    - `prs_fk_cat_uuid`: A foreign key to the Category model (UUID).
+    - `prs_last_review`: The date and time of the most recent review of the pair (datetime).
+    - `prs_review_count`: The number of reviews registered for the pair (integer).
+
+    Meta:
+    - The table name is set to `pair_review_state` in the database.
+    - The (`prs_fk_loc_uuid`, `prs_fk_cat_uuid`) pair is unique, it is the upsert key.
+    - The `prs_last_review`, `prs_fk_loc_uuid` and `prs_fk_cat_uuid` fields are indexed together,
+      matching the keyset order of expired recommendations.
+    - The `prs_fk_cat_uuid` and `prs_last_review` fields are indexed together for category filters.
+    """
+
+    # Unique identifier for the state row
+    prs_uuid = fields.UUIDField(pk=True, default=uuid.uuid4, description="Unique identifier for the pair state.")
+
+    # Foreign key relationship to the Location model
+    prs_fk_loc_uuid = fields.ForeignKeyField(
+        'models.ModelLocation',
+        related_name='review_states',
+        on_delete=fields.CASCADE,
+        description="Relationship from pair state to location model."
+    )
+
+    # Foreign key relationship to the Category model
+    prs_fk_cat_uuid = fields.ForeignKeyField(
+        'models.ModelCategory',
+        related_name='review_states',
+        on_delete=fields.CASCADE,
+        description="Relationship from pair state to category model."
+    )
+
+    # The date and time of the most recent review of the pair
+    prs_last_review = fields.DatetimeField(null=False, description="Creation date of the last review of the pair.")
+
+    # Number of reviews registered for the pair
+    prs_review_count = fields.IntField(default=0, null=False, description="Number of reviews of the pair.")
+
+    class Meta:
+        # Table name and additional metadata
+        table = 'pair_review_state'
+        comment = "Last review date and review count per location-category pair."
+
+        # Upsert key: one row per location-category pair
+        unique_together = (("prs_fk_loc_uuid", "prs_fk_cat_uuid"),)
+
+        # Indexes for optimization
+        indexes = [
+            ["prs_last_review", "prs_fk_loc_uuid", "prs_fk_cat_uuid"],  # Keyset pagination of expired pairs
+            ["prs_fk_cat_uuid", "prs_last_review"]  # Expired pairs of a category
+        ]
+
+        schema = "public"
@@ -0,0 +1,65 @@
+from tortoise import Model, fields
+import uuid
+
+
+class ModelReviewRollup(Model):
+    """
+    Represents the summary of the reviews of a location-category pair in a month, once removed.
+
+    When a month of reviews leaves the `review` table (its partition is dropped or detached), the
+    reviews are first summarized here, one row per pair, so the review count and dates of the pair
+    remain known.
+
+    Attributes:
+    - `rro_uuid`: A unique identifier for the rollup row (UUID).
+    - `rro_fk_loc_uuid`: A foreign key to the Location model (UUID).
+    - `rro_fk_cat_uuid`: A foreign key to the Category model (UUID).
+    - `rro_month`: The first instant of the month summarized, in UTC (datetime).
+    - `rro_review_count`: The number of reviews of the pair in that month (integer).
+    - `rro_first_review`: The date and time of the first review of the pair in that month (datetime).
+    - `rro_last_review`: The date and time of the last review of the pair in that month (datetime).
+
+    Meta:
+    - The table name is set to `review_rollup` in the database.
+    - The (`rro_fk_loc_uuid`, `rro_fk_cat_uuid`, `rro_month`) triple is unique, it is the upsert key
+      and serves the lookups of a pair.
+    """
+
+    # Unique identifier for the rollup row
+    rro_uuid = fields.UUIDField(pk=True, default=uuid.uuid4, description="Unique identifier for the rollup.")
+
+    # Foreign key relationship to the Location model
+    rro_fk_loc_uuid = fields.ForeignKeyField(
+        'models.ModelLocation',
+        related_name='review_rollups',
+        on_delete=fields.CASCADE,
+        description="Relationship from rollup to location model."
+    )
+
+    # Foreign key relationship to the Category model
+    rro_fk_cat_uuid = fields.ForeignKeyField(
+        'models.ModelCategory',
+        related_name='review_rollups',
+        on_delete=fields.CASCADE,
+        description="Relationship from rollup to category model."
+    )
+
+    # Month summarized
+    rro_month = fields.DatetimeField(null=False, description="First instant of the month summarized.")
+
+    # Number of reviews of the pair in the month
+    rro_review_count = fields.IntField(default=0, null=False, description="Number of reviews of the pair in the month.")
+
+    # Dates of the first and last reviews of the pair in the month
+    rro_first_review = fields.DatetimeField(null=False, description="Creation date of the first review of the month.")
+    rro_last_review = fields.DatetimeField(null=False, description="Creation date of the last review of the month.")
+
+    class Meta:
+        # Table name and additional metadata
+        table = 'review_rollup'
+        comment = "Per-pair monthly summary of the reviews removed by the retention policy."
+
+        # Upsert key: one row per location-category pair and month
+        unique_together = (("rro_fk_loc_uuid", "rro_fk_cat_uuid", "rro_month"),)
+
+        schema = "public"
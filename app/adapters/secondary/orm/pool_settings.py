@@ -0,0 +1,22 @@
+from typing import Optional
+from tortoise import connections
+
+# asyncpg pool arguments reported next to the pool size
+POOL_ARGUMENTS = ("statement_cache_size", "command_timeout", "max_inactive_connection_lifetime")
+
+
+def get_pool_settings(connection_name: str = "default") -> Optional[dict]:
+    """
+    Returns the settings of a connection pool as applied by its client, or None when the
+    backend has no pool (SQLite) or the ORM is not initialized.
+    """
+    try:
+        client = connections.get(connection_name)
+    except Exception:
+        return None
+    if not hasattr(client, "pool_maxsize"):
+        return None
+    settings = {"min_size": client.pool_minsize, "max_size": client.pool_maxsize}
+    for name in POOL_ARGUMENTS:
+        settings[name] = client.extra.get(name)
+    return settings
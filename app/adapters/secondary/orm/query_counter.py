@@ -0,0 +1,101 @@
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+from tortoise.backends.base.client import BaseDBAsyncClient
+
+# Methods through which Tortoise clients send every statement to the database
+EXECUTE_METHODS = ("execute_query", "execute_query_dict", "execute_insert", "execute_many", "execute_script")
+
+# Marker set on the wrapped methods, so a method is never wrapped twice
+WRAPPED = "_query_counter_wrapped"
+
+
+class QueryStats:
+    """
+    Number of statements sent to the database and the time spent waiting for them.
+    `streamed` is set when statements are read while the response body is sent, after the headers.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.streamed = False
+
+    @property
+    def milliseconds(self) -> float:
+        return self.seconds * 1000
+
+
+# Statements of the whole process, and of the current request (or any block in track_queries)
+totals = QueryStats()
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+# Set while a statement is being counted, so nested client calls (super()) are counted once
+_executing: ContextVar[bool] = ContextVar("query_executing", default=False)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    Counts the statements executed inside the block, including those of the tasks it starts.
+    """
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def mark_streamed() -> None:
+    """
+    Marks the current `track_queries` block, if any, as reading from the database while its
+    response is streamed, so its counts are incomplete when the headers are sent.
+    """
+    stats = _current.get()
+    if stats is not None:
+        stats.streamed = True
+
+
+def install_query_counter() -> None:
+    """
+    Wraps the execute methods of every Tortoise client class loaded so far, so each statement
+    is counted in `totals` and in the stats of the current `track_queries` block.
+
+    Tortoise has no execution hook, and its backends are imported when it is initialized, so
+    call this once Tortoise is initialized. Calling it again only wraps new classes.
+    """
+    pending = [BaseDBAsyncClient]
+    while pending:
+        client_class = pending.pop()
+        pending.extend(client_class.__subclasses__())
+        for name in EXECUTE_METHODS:
+            method = client_class.__dict__.get(name)
+            if method is not None and not getattr(method, WRAPPED, False):
+                setattr(client_class, name, _counted(method))
+
+
+def _counted(method):
+    """
+    Wraps a client execute method to count its statement and time it.
+    """
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        if _executing.get():
+            return await method(*args, **kwargs)
+        token = _executing.set(True)
+        started = time.perf_counter()
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            _executing.reset(token)
+            for stats in (totals, _current.get()):
+                if stats is not None:
+                    stats.count += 1
+                    stats.seconds += elapsed
+
+    setattr(wrapper, WRAPPED, True)
+    return wrapper
@@ -0,0 +1,156 @@
+import asyncio
+from typing import Any, AsyncIterator, List, Set, Type
+from tortoise import Model
+from tortoise.backends.base.client import BaseDBAsyncClient
+from app.adapters.secondary.orm.query_counter import mark_streamed
+from app.core.domain.exceptions.exceptions import ExportLimitError
+from app.main_app.config import EXPORT_IDLE_TIMEOUT, EXPORT_MAX_CONCURRENCY
+
+# Positional parameter markers for each Tortoise dialect (asyncpg, sqlite3, aiomysql)
+PLACEHOLDERS = {
+    "postgres": "${}",
+    "sqlite": "?",
+    "mysql": "%s",
+}
+
+# Cursors open at once in the process, see `stream_rows`
+_stream_slots = asyncio.Semaphore(EXPORT_MAX_CONCURRENCY)
+
+
+def table(model: Type[Model]) -> str:
+    """
+    Returns the quoted table name of a model, qualified with its schema when the model declares one.
+    This mirrors the table reference Tortoise itself uses when it queries the model.
+    """
+    meta = model._meta
+    if meta.schema:
+        return f'"{meta.schema}"."{meta.db_table}"'
+    return f'"{meta.db_table}"'
+
+
+def placeholder(connection: BaseDBAsyncClient, position: int) -> str:
+    """
+    Returns the parameter marker for the given 1-based position in the connection's dialect.
+    """
+    marker = PLACEHOLDERS.get(connection.capabilities.dialect, "?")
+    return marker.format(position)
+
+
+def to_db(model: Type[Model], field_name: str, value: Any, connection: BaseDBAsyncClient) -> Any:
+    """
+    Converts a Python value to the representation the connection expects for the given model field.
+    SQLite stores datetimes, decimals and booleans as text/integers, so the executor overrides are applied.
+    """
+    field = model._meta.fields_map[field_name]
+    override = connection.executor_class.TO_DB_OVERRIDE.get(field.__class__)
+    if override:
+        return override(field, value, model)
+    return field.to_db_value(value, model)
+
+
+def to_python(model: Type[Model], field_name: str, value: Any) -> Any:
+    """
+    Converts a raw value returned by the driver to the Python type of the given model field.
+    """
+    if value is None:
+        return None
+    return model._meta.fields_map[field_name].to_python_value(value)
+
+
+class Parameters:
+    """
+    Collects the values of a raw query while it is built, returning the marker of each one.
+    Every occurrence gets its own marker, which keeps the query valid for positional-only dialects.
+    """
+
+    def __init__(self, connection: BaseDBAsyncClient):
+        self.connection = connection
+        self.values = []
+
+    def add(self, value: Any) -> str:
+        """
+        Registers a value and returns its parameter marker.
+        """
+        self.values.append(value)
+        return placeholder(self.connection, len(self.values))
+
+
+async def insert_absent(connection: BaseDBAsyncClient, model: Type[Model], instances: List[Model],
+                        conflict_field: str) -> Set[Any]:
+    """
+    Inserts the instances in a single statement, skipping those whose `conflict_field` value is
+    already taken: INSERT ... ON CONFLICT DO NOTHING RETURNING, supported by PostgreSQL and
+    SQLite 3.35+.
+
+    Racing inserts of the same value never fail; exactly one of them is created.
+
+    :return: The primary keys of the instances actually inserted.
+    """
+    if not instances:
+        return set()
+    meta = model._meta
+    fields = list(meta.fields_db_projection)
+    columns = [meta.fields_db_projection[name] for name in fields]
+    params = Parameters(connection)
+    rows = [
+        f"({', '.join(params.add(to_db(model, name, getattr(instance, name), connection)) for name in fields)})"
+        for instance in instances
+    ]
+    query = f"""
+        INSERT INTO {table(model)} ({", ".join(columns)})
+        VALUES {", ".join(rows)}
+        ON CONFLICT ({meta.fields_db_projection[conflict_field]}) DO NOTHING
+        RETURNING {meta.db_pk_column}
+    """
+    inserted = await connection.execute_query_dict(query, params.values)
+    return {to_python(model, meta.pk_attr, row[meta.db_pk_column]) for row in inserted}
+
+
+async def stream_rows(connection: BaseDBAsyncClient, query: str, values: list,
+                      chunk_size: int) -> AsyncIterator[List[Any]]:
+    """
+    Runs a query through a database cursor and yields its rows in chunks of `chunk_size`, so the
+    result set is never held in memory at once, whatever its size. Rows support access by column
+    name, like the rows of `execute_query_dict`.
+
+    Cursors hold a connection for as long as they are read, so at most `EXPORT_MAX_CONCURRENCY`
+    are open at once in the process; further ones raise ExportLimitError before any query.
+
+    - On Postgres, the cursor lives in its own read-only transaction on a pool connection. The
+      server ends the transaction, and with it the cursor, when the next chunk is not requested
+      within `EXPORT_IDLE_TIMEOUT` seconds, e.g. because the client stopped reading.
+    - On SQLite, the single connection is only locked while a chunk is fetched, so the other
+      queries run between chunks.
+
+    The chunks are read while the response is streamed, after its headers, so the current request
+    is marked as streamed for the query counter.
+    """
+    if _stream_slots.locked():
+        raise ExportLimitError("Too many exports in progress.")
+    async with _stream_slots:
+        mark_streamed()
+        if connection.capabilities.dialect == "postgres":
+            async with connection.acquire_connection() as driver, driver.transaction(readonly=True):
+                if EXPORT_IDLE_TIMEOUT > 0:
+                    await driver.execute("SELECT set_config('idle_in_transaction_session_timeout', $1, true)",
+                                         str(int(EXPORT_IDLE_TIMEOUT * 1000)))
+                # asyncpg server-side cursor
+                cursor = await driver.cursor(query, *values)
+                while True:
+                    rows = await cursor.fetch(chunk_size)
+                    if not rows:
+                        return
+                    yield rows
+        else:
+            # sqlite3 cursor, stepping through the result set as rows are fetched
+            async with connection.acquire_connection() as driver:
+                cursor = await driver.execute(query, values)
+            try:
+                while True:
+                    async with connection.acquire_connection():
+                        rows = await cursor.fetchmany(chunk_size)
+                    if not rows:
+                        return
+                    yield rows
+            finally:
+                await cursor.close()
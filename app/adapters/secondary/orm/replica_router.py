@@ -0,0 +1,131 @@
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+from tortoise import connections
+from tortoise.backends.base.client import BaseDBAsyncClient
+from app.main_app.config import DATABASE_REPLICA_URL, REPLICA_LAG_CHECK_SECONDS, REPLICA_MAX_STALENESS_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Names of the Tortoise connections
+PRIMARY = "default"
+REPLICA = "replica"
+
+# Seconds the replica is behind the primary: 0 when it has replayed everything it received,
+# NULL when the server is not a standby
+POSTGRES_LAG_QUERY = """
+    SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END AS lag
+"""
+
+# Measures the replication lag of a connection, in seconds
+Lag = Callable[[BaseDBAsyncClient], Awaitable[Optional[float]]]
+
+
+async def postgres_lag(client: BaseDBAsyncClient) -> float:
+    """
+    Returns the replication lag of a Postgres standby. Other databases (e.g. a SQLite copy) do not
+    report replication, so their lag is 0.
+    """
+    if client.capabilities.dialect != "postgres":
+        return 0.0
+    _, rows = await client.execute_query(POSTGRES_LAG_QUERY)
+    lag = rows[0]["lag"] if rows else None
+    return float(lag) if lag is not None else 0.0
+
+
+class ReplicaRouter:
+    """
+    Picks the connection of read-only queries: the replica while its replication lag is at most
+    `max_staleness` seconds, and the primary otherwise, or when the lag cannot be measured.
+
+    Only queries that tolerate slightly stale data should be routed here (recommendations,
+    lookups, listings). Writes, and reads that must see the writes just made (duplicate and
+    reference checks), stay on the primary.
+    """
+
+    def __init__(self, max_staleness: float = REPLICA_MAX_STALENESS_SECONDS,
+                 check_interval: float = REPLICA_LAG_CHECK_SECONDS, lag: Lag = postgres_lag,
+                 primary: str = PRIMARY, replica: str = REPLICA):
+        """
+        Initializes the router.
+
+        :param max_staleness: Maximum replication lag, in seconds, at which reads go to the replica.
+        :param check_interval: Seconds between two measurements of the lag.
+        :param lag: Function measuring the lag of the replica connection.
+        :param primary: Name of the primary connection.
+        :param replica: Name of the replica connection.
+        """
+        self.max_staleness = max_staleness
+        self.check_interval = check_interval
+        self.lag = lag
+        self.primary = primary
+        self.replica = replica
+        self.last_lag: Optional[float] = None
+        self._checked_at: Optional[float] = None
+
+        # Counters reported by stats()
+        self.replica_reads = 0
+        self.primary_reads = 0
+
+    async def read_connection(self) -> BaseDBAsyncClient:
+        """
+        Returns the connection on which to run a read-only query.
+        """
+        lag = await self._replica_lag()
+        if lag is not None and lag <= self.max_staleness:
+            self.replica_reads += 1
+            return connections.get(self.replica)
+        self.primary_reads += 1
+        return connections.get(self.primary)
+
+    async def _replica_lag(self) -> Optional[float]:
+        """
+        Returns the last lag measured, measuring it again every `check_interval` seconds.
+        None means the replica could not be reached.
+        """
+        now = time.monotonic()
+        if self._checked_at is None or now - self._checked_at >= self.check_interval:
+            # Set first, so concurrent reads keep the previous value instead of measuring again
+            self._checked_at = now
+            try:
+                self.last_lag = await self.lag(connections.get(self.replica))
+            except Exception as e:
+                logger.warning("Could not measure the lag of the replica, reading from the primary: %s", e)
+                self.last_lag = None
+        return self.last_lag
+
+    def stats(self) -> dict:
+        """
+        Returns the last lag measured and the reads routed to each connection by this process.
+        """
+        return {
+            "lag_seconds": self.last_lag,
+            "max_staleness_seconds": self.max_staleness,
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+        }
+
+
+_router: Optional[ReplicaRouter] = None
+
+
+def get_replica_router() -> Optional[ReplicaRouter]:
+    """
+    Returns the process-wide replica router, or None when `DATABASE_REPLICA_URL` is not set.
+    """
+    global _router
+    if _router is None and DATABASE_REPLICA_URL:
+        _router = ReplicaRouter()
+    return _router
+
+
+async def read_connection() -> BaseDBAsyncClient:
+    """
+    Returns the connection of a read-only query that tolerates replication lag: the replica when
+    one is configured and fresh enough, the primary otherwise.
+    """
+    router = get_replica_router()
+    if router is None:
+        return connections.get(PRIMARY)
+    return await router.read_connection()
@@ -1,41 +1,176 @@
-from typing import Optional
+from typing import AsyncIterator, List, Optional, Set
+from tortoise.expressions import Q
+from app.core.domain.entities.catalog_cursor_entity import CatalogCursor
 from app.core.domain.entities.category_entity import CategoryEntity
 from app.core.domain.ports.category_ports import CategoryRepositoryPort
 from app.adapters.secondary.orm.models.category_model import ModelCategory
+from app.adapters.secondary.orm.raw_sql import Parameters, insert_absent, stream_rows, table, to_db, to_python
+from app.adapters.secondary.orm.replica_router import read_connection
+from app.adapters.secondary.snapshot.reference_filter import get_reference_filter
+from app.core.domain.ports.reference_filter_ports import ReferenceFilterPort
 from tortoise.exceptions import DoesNotExist
 
+# Number of categories inserted per statement by bulk saves
+BULK_CHUNK_SIZE = 500
+
+# Number of categories fetched from the database cursor at a time by exports
+EXPORT_CHUNK_SIZE = 1000
+
+# Columns of the categories listed and exported
+LIST_FIELDS = ("cat_uuid", "cat_description", "cat_status", "cat_created", "cat_updated")
+
 class CategoryRepository(CategoryRepositoryPort):
     """
     Repository for managing categories in the database.
     """
 
+    def __init__(self, reference_filter: Optional[ReferenceFilterPort] = None):
+        """
+        Initializes the repository.
+
+        :param reference_filter: Filter of the existing category UUIDs, updated on every save.
+                                 Defaults to the process-wide filter.
+        """
+        self.reference_filter = reference_filter if reference_filter is not None else get_reference_filter()
+
     async def save(self, category: CategoryEntity) -> None:
         """
         Save a new category to the database.
         """
-        await ModelCategory.create(
-            cat_uuid=category.cat_uuid,
-            cat_description=category.cat_description,
-            cat_status=category.cat_status,
-            cat_created=category.cat_created,
-            cat_updated=category.cat_updated
-        )
+        await self._to_model(category).save(force_create=True)
+        self._register([category])
+
+    async def create_if_absent(self, category: CategoryEntity) -> bool:
+        """
+        Save a new category unless its description is taken, in a single statement.
+
+        :return: True if the category was created, False if the description already exists.
+        """
+        return bool(await self._insert_absent([category]))
+
+    async def save_many(self, categories: List[CategoryEntity]) -> List[CategoryEntity]:
+        """
+        Save new categories in chunks of `BULK_CHUNK_SIZE`, one statement per chunk.
+        Categories whose description was taken meanwhile by another request are skipped.
+
+        :return: The categories actually saved.
+        """
+        saved = []
+        for start in range(0, len(categories), BULK_CHUNK_SIZE):
+            saved += await self._insert_absent(categories[start:start + BULK_CHUNK_SIZE])
+        return saved
 
     async def get_by_description(self, description: str) -> Optional[CategoryEntity]:
         """
-        Retrieve a category by its description.
+        Retrieve a category by its description, from the read replica when there is one.
         Returns None if not found.
         """
         try:
-            model = await ModelCategory.filter(cat_description=description).first()
+            model = await ModelCategory.filter(cat_description=description).using_db(await read_connection()).first()
             if not model:
                 return None
-            return CategoryEntity(
-                cat_uuid=model.cat_uuid,
-                cat_description=model.cat_description,
-                cat_status=model.cat_status,
-                cat_created=model.cat_created,
-                cat_updated=model.cat_updated
-            )
+            return self._to_entity(model)
         except DoesNotExist:
             return None
+
+    async def get_page(self, status: Optional[bool] = None, limit: int = 100,
+                       after: Optional[CatalogCursor] = None) -> List[CategoryEntity]:
+        """
+        Retrieve a page of categories ordered by (cat_created, cat_uuid), from the read replica when
+        there is one. Pages start at the cursor on the `cat_created` index, never at an OFFSET.
+        """
+        query = ModelCategory.all()
+        if status is not None:
+            query = query.filter(cat_status=status)
+        if after is not None:
+            # The first condition bounds the index range, the second skips the ties already returned
+            query = query.filter(Q(cat_created__gte=after.created),
+                                 Q(cat_created__gt=after.created) | Q(cat_uuid__gt=after.uuid))
+        models = await query.order_by("cat_created", "cat_uuid").limit(limit).using_db(await read_connection())
+        return [self._to_entity(model) for model in models]
+
+    async def export(self, status: Optional[bool] = None,
+                     chunk_size: int = EXPORT_CHUNK_SIZE) -> AsyncIterator[List[CategoryEntity]]:
+        """
+        Iterate over every category, in the order of `get_page`, through a database cursor read
+        `chunk_size` rows at a time, so exports of any size run in constant memory. The cursor
+        is read from the read replica when there is one.
+
+        :raises ExportLimitError: If `EXPORT_MAX_CONCURRENCY` exports are already in progress.
+        """
+        connection = await read_connection()
+        params = Parameters(connection)
+        conditions = []
+        if status is not None:
+            conditions.append(f"cat_status = {params.add(to_db(ModelCategory, 'cat_status', status, connection))}")
+        query = f"""
+            SELECT {", ".join(LIST_FIELDS)}
+            FROM {table(ModelCategory)}
+            {"WHERE " + " AND ".join(conditions) if conditions else ""}
+            ORDER BY cat_created, cat_uuid
+        """
+        chunks = stream_rows(connection, query, params.values, chunk_size)
+        try:
+            async for rows in chunks:
+                yield [
+                    CategoryEntity(**{name: to_python(ModelCategory, name, row[name]) for name in LIST_FIELDS})
+                    for row in rows
+                ]
+        finally:
+            # Releases the cursor as soon as the export is closed, not when it is garbage collected
+            await chunks.aclose()
+
+    async def get_existing_descriptions(self, descriptions: List[str]) -> Set[str]:
+        """
+        Retrieve which of the descriptions already belong to a category, in a single query.
+        """
+        if not descriptions:
+            return set()
+        return set(await ModelCategory.filter(cat_description__in=descriptions).values_list(
+            "cat_description", flat=True
+        ))
+
+    async def _insert_absent(self, categories: List[CategoryEntity]) -> List[CategoryEntity]:
+        """
+        Inserts the categories whose description is not taken, in one statement.
+
+        :return: The categories actually inserted.
+        """
+        created = await insert_absent(ModelCategory._meta.db, ModelCategory,
+                                      [self._to_model(category) for category in categories], "cat_description")
+        inserted = [category for category in categories if category.cat_uuid in created]
+        self._register(inserted)
+        return inserted
+
+    def _register(self, categories: List[CategoryEntity]) -> None:
+        """
+        Adds newly saved categories to the reference filter.
+        """
+        if self.reference_filter is not None and categories:
+            self.reference_filter.add_categories([category.cat_uuid for category in categories])
+
+    @staticmethod
+    def _to_model(category: CategoryEntity) -> ModelCategory:
+        """
+        Maps a CategoryEntity to a new ModelCategory.
+        """
+        return ModelCategory(
+            cat_uuid=category.cat_uuid,
+            cat_description=category.cat_description,
+            cat_status=category.cat_status,
+            cat_created=category.cat_created,
+            cat_updated=category.cat_updated
+        )
+
+    @staticmethod
+    def _to_entity(model: ModelCategory) -> CategoryEntity:
+        """
+        Maps a ModelCategory to a CategoryEntity.
+        """
+        return CategoryEntity(
+            cat_uuid=model.cat_uuid,
+            cat_description=model.cat_description,
+            cat_status=model.cat_status,
+            cat_created=model.cat_created,
+            cat_updated=model.cat_updated
+        )
@@ -0,0 +1,102 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+import pytz
+from app.adapters.secondary.orm.models import ModelCategory, ModelLocation, ModelLocationCluster, ModelPairReviewState
+from app.adapters.secondary.orm.raw_sql import Parameters, table, to_db, to_python
+from app.adapters.secondary.orm.replica_router import read_connection
+from app.adapters.secondary.orm.repositories.location_repository import CLUSTER_GRID_BITS, GEOHASH_UPPER_BOUND
+from app.adapters.secondary.orm.repositories.recommendation_repository import REVIEW_EXPIRATION_DAYS
+from app.core.domain import geo
+from app.core.domain.entities.location_cluster_entity import LocationClusterEntity
+from app.core.domain.ports.location_cluster_ports import LocationClusterRepositoryPort
+
+# Margin added to the tile bounds when choosing the geohash cells to read, so no location is lost to rounding
+BOUNDS_MARGIN = 0.000001
+
+
+class LocationClusterRepository(LocationClusterRepositoryPort):
+    """
+    Repository for reading the precomputed map clusters of locations.
+    """
+
+    async def get_tile(self, zoom: int, x: int, y: int, include_stale: bool = False) -> List[LocationClusterEntity]:
+        """
+        Retrieve the clusters of locations inside a map tile, read from the cluster cells of the
+        tile at its zoom level (a range over the unique (zoom, x, y) index).
+
+        Stale counts depend on the current date, so they are not precomputed: they are derived
+        from the recently reviewed pairs of the tile, which are few compared to all its pairs.
+        """
+        cells = 1 << CLUSTER_GRID_BITS
+        x_min, y_min = x * cells, y * cells
+        models = await ModelLocationCluster.filter(
+            lcl_zoom=zoom, lcl_x__gte=x_min, lcl_x__lt=x_min + cells, lcl_y__gte=y_min, lcl_y__lt=y_min + cells
+        ).order_by("lcl_y", "lcl_x").using_db(await read_connection())
+
+        clusters = []
+        stale_counts = await self._count_stale_pairs(zoom, x, y, models) if include_stale and models else {}
+        for model in models:
+            clusters.append(LocationClusterEntity(
+                lat=model.lcl_lat_sum / model.lcl_count,
+                long=model.lcl_long_sum / model.lcl_count,
+                count=model.lcl_count,
+                stale_count=stale_counts.get((model.lcl_x, model.lcl_y)) if include_stale else None
+            ))
+        return clusters
+
+    async def _count_stale_pairs(self, zoom: int, x: int, y: int,
+                                 models: List[ModelLocationCluster]) -> Dict[Tuple[int, int], int]:
+        """
+        Counts the location-category pairs needing a review in each cluster cell of the tile.
+
+        Every pair of a cluster needs a review except those reviewed within the expiration
+        period, so the count is `locations x categories - fresh pairs`.
+        """
+        category_count = await ModelCategory.all().using_db(await read_connection()).count()
+        stale_counts = {(model.lcl_x, model.lcl_y): model.lcl_count * category_count for model in models}
+        for cell, fresh in (await self._count_fresh_pairs(zoom, x, y)).items():
+            if cell in stale_counts:
+                stale_counts[cell] -= fresh
+        return stale_counts
+
+    async def _count_fresh_pairs(self, zoom: int, x: int, y: int) -> Dict[Tuple[int, int], int]:
+        """
+        Counts the pairs reviewed within the expiration period per cluster cell of the tile.
+
+        The locations of the tile are read as ranges of the geohash index, over the cells covering
+        the tile, and joined with their pairs through the (location, category) unique index, so the
+        work is proportional to the locations around the tile rather than to every fresh pair.
+        The coordinates themselves are not compared in SQL: SQLite stores decimals as text.
+        """
+        connection = await read_connection()
+        params = Parameters(connection)
+
+        # Get the expiration cutoff in UTC
+        cutoff = datetime.now(pytz.UTC) - timedelta(days=REVIEW_EXPIRATION_DAYS)
+        lat_min, lat_max, long_min, long_max = geo.tile_bounds(zoom, x, y)
+        cells = geo.box_cells(lat_min - BOUNDS_MARGIN, lat_max + BOUNDS_MARGIN,
+                              long_min - BOUNDS_MARGIN, long_max + BOUNDS_MARGIN)
+        ranges = " OR ".join(
+            f"(loc.loc_geohash >= {params.add(cell)} AND loc.loc_geohash < {params.add(cell + GEOHASH_UPPER_BOUND)})"
+            for cell in cells
+        )
+
+        query = f"""
+            SELECT loc.loc_lat, loc.loc_long, COUNT(*) AS fresh
+            FROM {table(ModelLocation)} loc
+            JOIN {table(ModelPairReviewState)} prs ON prs.prs_fk_loc_uuid_id = loc.loc_uuid
+            WHERE ({ranges})
+              AND prs.prs_last_review >= {params.add(to_db(ModelPairReviewState, 'prs_last_review', cutoff, connection))}
+            GROUP BY loc.loc_uuid, loc.loc_lat, loc.loc_long
+        """
+        rows = await connection.execute_query_dict(query, params.values)
+
+        # Assign each location to its cell exactly as it was clustered; locations of the covering
+        # cells that belong to a neighbouring tile are ignored
+        fresh_counts = defaultdict(int)
+        for row in rows:
+            lat = float(to_python(ModelLocation, "loc_lat", row["loc_lat"]))
+            long = float(to_python(ModelLocation, "loc_long", row["loc_long"]))
+            fresh_counts[geo.tile_xy(lat, long, zoom + CLUSTER_GRID_BITS)] += row["fresh"]
+        return fresh_counts
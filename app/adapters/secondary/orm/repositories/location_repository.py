@@ -1,45 +1,376 @@
-from typing import Optional
+import math
+import uuid
+from typing import AsyncIterator, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+from tortoise.expressions import Q
+from tortoise.transactions import in_transaction
+from app.core.domain.entities.catalog_cursor_entity import CatalogCursor
+from app.core.domain import geo
 from app.core.domain.entities.location_entity import LocationEntity
 from app.core.domain.ports.location_ports import LocationRepositoryPort
 from app.adapters.secondary.orm.models.location_model import ModelLocation
+from app.adapters.secondary.orm.models.location_cluster_model import ModelLocationCluster
+from app.adapters.secondary.orm.raw_sql import Parameters, insert_absent, stream_rows, table, to_db, to_python
+from app.adapters.secondary.orm.replica_router import read_connection
+from app.adapters.secondary.snapshot.location_snapshot import LocationSnapshot, get_location_snapshot
+from app.adapters.secondary.snapshot.reference_filter import get_reference_filter
+from app.core.domain.ports.reference_filter_ports import ReferenceFilterPort
 from tortoise.exceptions import DoesNotExist
 
+# Geohash precision at which k-nearest lookups start (cells of ~150 m), before widening the search
+NEAREST_START_PRECISION = 7
+
+# Character greater than any geohash character, used to turn a prefix into an index range
+GEOHASH_UPPER_BOUND = "~"
+
+# Highest map zoom level with precomputed clusters
+MAX_CLUSTER_ZOOM = 16
+
+# Each tile is split into a 2^bits x 2^bits grid of cluster cells
+CLUSTER_GRID_BITS = 3
+
+# Number of cluster rows upserted per statement (7 parameters each)
+CLUSTER_UPSERT_BATCH_SIZE = 1000
+
+# Number of locations inserted per transaction by bulk saves
+BULK_CHUNK_SIZE = 500
+
+# Number of locations fetched from the database cursor at a time by exports
+EXPORT_CHUNK_SIZE = 1000
+
+# Columns of the locations listed and exported
+LIST_FIELDS = ("loc_uuid", "loc_description", "loc_lat", "loc_long", "loc_status", "loc_created", "loc_updated")
+
 class LocationRepository(LocationRepositoryPort):
     """
     Repository for managing location data in the database.
     """
 
+    def __init__(self, snapshot: Optional[LocationSnapshot] = None,
+                 reference_filter: Optional[ReferenceFilterPort] = None):
+        """
+        Initializes the repository.
+
+        :param snapshot: In-memory snapshot of the location coordinates, patched on every save and
+                         used for proximity lookups once loaded. Defaults to the process-wide snapshot.
+        :param reference_filter: Filter of the existing location UUIDs, updated on every save.
+                                 Defaults to the process-wide filter.
+        """
+        self.snapshot = snapshot if snapshot is not None else get_location_snapshot()
+        self.reference_filter = reference_filter if reference_filter is not None else get_reference_filter()
+
     async def save(self, location: LocationEntity) -> None:
         """
-        Save a new location to the database.
+        Save a new location to the database, together with the geohash of its coordinates,
+        and add it to the location snapshot and the reference filter.
+
+        The map clusters of the location are upserted in the same transaction, so
+        `location_cluster` is always consistent with the `location` table.
+        """
+        async with in_transaction() as connection:
+            await self._to_model(location).save(using_db=connection, force_create=True)
+
+            # Register the location in its cluster of every zoom level
+            await upsert_location_clusters(connection, self._stored_coordinates([location]))
+
+        self._register([location])
+
+    async def create_if_absent(self, location: LocationEntity) -> bool:
+        """
+        Save a new location unless its description is taken, with a single insert statement
+        followed by the upsert of its map clusters, and add it to the location snapshot and the
+        reference filter.
+
+        :return: True if the location was created, False if the description already exists.
+        """
+        created = await self._insert_absent([location])
+        self._register(created)
+        return bool(created)
+
+    async def save_many(self, locations: List[LocationEntity]) -> List[LocationEntity]:
+        """
+        Save new locations in chunks of `BULK_CHUNK_SIZE`, one transaction per chunk, with their
+        map clusters aggregated into a single upsert per chunk.
+        Locations whose description was taken meanwhile by another request are skipped.
+
+        :return: The locations actually saved.
+        """
+        saved = []
+        for start in range(0, len(locations), BULK_CHUNK_SIZE):
+            saved += await self._insert_absent(locations[start:start + BULK_CHUNK_SIZE])
+
+        self._register(saved)
+        return saved
+
+    def _register(self, locations: List[LocationEntity]) -> None:
+        """
+        Adds newly saved locations to the location snapshot and the reference filter.
+        """
+        if self.snapshot is not None:
+            for location in locations:
+                self.snapshot.add(location.loc_uuid, location.loc_lat, location.loc_long)
+        if self.reference_filter is not None and locations:
+            self.reference_filter.add_locations([location.loc_uuid for location in locations])
+
+    async def get_existing_descriptions(self, descriptions: List[str]) -> Set[str]:
+        """
+        Retrieve which of the descriptions already belong to a location, in a single query.
+        """
+        if not descriptions:
+            return set()
+        return set(await ModelLocation.filter(loc_description__in=descriptions).values_list(
+            "loc_description", flat=True
+        ))
+
+    async def _insert_absent(self, locations: List[LocationEntity]) -> List[LocationEntity]:
         """
-        await ModelLocation.create(
+        Inserts the locations whose description is not taken, in one statement, and the map
+        clusters of those inserted, in one transaction.
+
+        :return: The locations actually inserted.
+        """
+        if not locations:
+            return []
+        async with in_transaction() as connection:
+            created = await insert_absent(connection, ModelLocation,
+                                          [self._to_model(location) for location in locations], "loc_description")
+            inserted = [location for location in locations if location.loc_uuid in created]
+            await upsert_location_clusters(connection, self._stored_coordinates(inserted))
+        return inserted
+
+    @staticmethod
+    def _to_model(location: LocationEntity) -> ModelLocation:
+        """
+        Maps a LocationEntity to a new ModelLocation, with the geohash of its coordinates.
+        """
+        return ModelLocation(
             loc_uuid=location.loc_uuid,
             loc_description=location.loc_description,
             loc_status=location.loc_status,
             loc_created=location.loc_created,
             loc_updated=location.loc_updated,
             loc_lat=location.loc_lat,
-            loc_long=location.loc_long
+            loc_long=location.loc_long,
+            loc_geohash=location_geohash(location.loc_lat, location.loc_long)
         )
 
+    @staticmethod
+    def _stored_coordinates(locations: Iterable[LocationEntity]) -> List[Tuple[float, float]]:
+        """
+        Returns the coordinates of the locations as stored in the database, skipping locations
+        without coordinates.
+        """
+        return [
+            (float(to_python(ModelLocation, "loc_lat", location.loc_lat)),
+             float(to_python(ModelLocation, "loc_long", location.loc_long)))
+            for location in locations if location.loc_lat is not None and location.loc_long is not None
+        ]
+
     async def get_by_description(self, description: str) -> Optional[LocationEntity]:
         """
-        Retrieve a location by its description.
+        Retrieve a location by its description, from the read replica when there is one.
         Returns None if not found.
         """
         try:
-            model = await ModelLocation.filter(loc_description=description).first()
+            model = await ModelLocation.filter(loc_description=description).using_db(await read_connection()).first()
             if not model:
                 return None
-            return LocationEntity(
-                loc_uuid=model.loc_uuid,
-                loc_description=model.loc_description,
-                loc_status=model.loc_status,
-                loc_created=model.loc_created,
-                loc_updated=model.loc_updated,
-                loc_lat=model.loc_lat,
-                loc_long=model.loc_long
-            )
+            return self._to_entity(model)
         except DoesNotExist:
             return None
+
+    async def get_page(self, status: Optional[bool] = None, limit: int = 100,
+                       after: Optional[CatalogCursor] = None) -> List[LocationEntity]:
+        """
+        Retrieve a page of locations ordered by (loc_created, loc_uuid), from the read replica when
+        there is one. Pages start at the cursor on the `loc_created` index, never at an OFFSET.
+        """
+        query = ModelLocation.all()
+        if status is not None:
+            query = query.filter(loc_status=status)
+        if after is not None:
+            # The first condition bounds the index range, the second skips the ties already returned
+            query = query.filter(Q(loc_created__gte=after.created),
+                                 Q(loc_created__gt=after.created) | Q(loc_uuid__gt=after.uuid))
+        models = await query.order_by("loc_created", "loc_uuid").limit(limit).using_db(await read_connection())
+        return [self._to_entity(model) for model in models]
+
+    async def export(self, status: Optional[bool] = None,
+                     chunk_size: int = EXPORT_CHUNK_SIZE) -> AsyncIterator[List[LocationEntity]]:
+        """
+        Iterate over every location, in the order of `get_page`, through a database cursor read
+        `chunk_size` rows at a time, so exports of any size run in constant memory. The cursor
+        is read from the read replica when there is one.
+
+        :raises ExportLimitError: If `EXPORT_MAX_CONCURRENCY` exports are already in progress.
+        """
+        connection = await read_connection()
+        params = Parameters(connection)
+        conditions = []
+        if status is not None:
+            conditions.append(f"loc_status = {params.add(to_db(ModelLocation, 'loc_status', status, connection))}")
+        query = f"""
+            SELECT {", ".join(LIST_FIELDS)}
+            FROM {table(ModelLocation)}
+            {"WHERE " + " AND ".join(conditions) if conditions else ""}
+            ORDER BY loc_created, loc_uuid
+        """
+        chunks = stream_rows(connection, query, params.values, chunk_size)
+        try:
+            async for rows in chunks:
+                yield [
+                    LocationEntity(**{name: to_python(ModelLocation, name, row[name]) for name in LIST_FIELDS})
+                    for row in rows
+                ]
+        finally:
+            # Releases the cursor as soon as the export is closed, not when it is garbage collected
+            await chunks.aclose()
+
+    async def find_within_radius(self, lat: float, long: float, radius_km: float,
+                                 limit: Optional[int] = None) -> List[Tuple[LocationEntity, float]]:
+        """
+        Retrieve the locations within a radius of a point, nearest first.
+        Only the geohash cells covering the radius are scanned; candidates are then filtered
+        exactly with the haversine distance. When the location snapshot is loaded, the distances
+        are computed from it instead and only the matching locations are read.
+        """
+        if self._snapshot_ready():
+            return await self._get_ranked(self.snapshot.within_radius(lat, long, radius_km, limit))
+        precision = geo.covering_precision(lat, radius_km)
+        candidates = await self._get_in_cells(geo.covering_cells(lat, long, precision))
+        ranked = [(model, distance) for model, distance in self._rank(lat, long, candidates) if distance <= radius_km]
+        return [(self._to_entity(model), distance) for model, distance in ranked[:limit]]
+
+    async def find_nearest(self, lat: float, long: float, k: int,
+                           radius_km: Optional[float] = None) -> List[Tuple[LocationEntity, float]]:
+        """
+        Retrieve the k locations nearest to a point, optionally within a maximum radius.
+
+        The search starts with small geohash cells around the point and widens them one precision
+        level at a time. A candidate is only accepted once it lies within the radius fully covered
+        by the scanned cells, so no nearer location can have been missed. When the location
+        snapshot is loaded, the k nearest are selected from it directly.
+        """
+        if self._snapshot_ready():
+            return await self._get_ranked(self.snapshot.nearest(lat, long, k, radius_km))
+        max_distance = radius_km if radius_km is not None else math.inf
+        for precision in range(NEAREST_START_PRECISION, -1, -1):
+            covered_km = geo.covered_radius_km(lat, precision)
+            candidates = await self._get_in_cells(geo.covering_cells(lat, long, precision))
+            certain = [
+                (model, distance) for model, distance in self._rank(lat, long, candidates)
+                if distance <= min(covered_km, max_distance)
+            ]
+            if len(certain) >= k or covered_km >= max_distance:
+                return [(self._to_entity(model), distance) for model, distance in certain[:k]]
+        return []
+
+    def _snapshot_ready(self) -> bool:
+        if self.snapshot is None or not self.snapshot.loaded:
+            return False
+        # Picks up the locations written by other processes once the snapshot is too old
+        self.snapshot.refresh_if_expired()
+        return True
+
+    async def _get_ranked(self, ranked: List[Tuple[UUID, float]]) -> List[Tuple[LocationEntity, float]]:
+        """
+        Reads the locations of (loc_uuid, distance) pairs, keeping their order. A location the
+        read replica has not received yet is left out.
+        """
+        if not ranked:
+            return []
+        uuids = [loc_uuid for loc_uuid, _ in ranked]
+        models = {
+            model.loc_uuid: model
+            for model in await ModelLocation.filter(loc_uuid__in=uuids).using_db(await read_connection())
+        }
+        return [(self._to_entity(models[loc_uuid]), distance) for loc_uuid, distance in ranked if loc_uuid in models]
+
+    @staticmethod
+    async def _get_in_cells(prefixes: Iterable[str]) -> List[ModelLocation]:
+        """
+        Retrieve the locations whose geohash starts with any of the prefixes.
+        Each prefix is queried as an index range, which works on every database.
+        """
+        conditions = [
+            Q(loc_geohash__gte=prefix, loc_geohash__lt=prefix + GEOHASH_UPPER_BOUND) for prefix in prefixes
+        ]
+        return await ModelLocation.filter(Q(*conditions, join_type="OR")).using_db(await read_connection())
+
+    @staticmethod
+    def _rank(lat: float, long: float, models: Iterable[ModelLocation]) -> List[Tuple[ModelLocation, float]]:
+        """
+        Pairs each location with its distance to the point, nearest first.
+        """
+        ranked = [
+            (model, geo.haversine_km(lat, long, float(model.loc_lat), float(model.loc_long)))
+            for model in models
+        ]
+        return sorted(ranked, key=lambda item: item[1])
+
+    @staticmethod
+    def _to_entity(model: ModelLocation) -> LocationEntity:
+        """
+        Maps a ModelLocation to a LocationEntity.
+        """
+        return LocationEntity(
+            loc_uuid=model.loc_uuid,
+            loc_description=model.loc_description,
+            loc_status=model.loc_status,
+            loc_created=model.loc_created,
+            loc_updated=model.loc_updated,
+            loc_lat=model.loc_lat,
+            loc_long=model.loc_long
+        )
+
+
+def location_geohash(lat, long) -> Optional[str]:
+    """
+    Returns the geohash stored for the given coordinates, or None when they are missing.
+    """
+    if lat is None or long is None:
+        return None
+    return geo.encode(float(lat), float(long))
+
+
+def cluster_cells(lat: float, long: float) -> List[Tuple[int, int, int]]:
+    """
+    Returns the (zoom, x, y) cluster cell of a coordinate for every precomputed zoom level.
+    The cell of zoom `z` is the tile of zoom `z + CLUSTER_GRID_BITS` containing the coordinate.
+    """
+    return [(zoom, *geo.tile_xy(lat, long, zoom + CLUSTER_GRID_BITS)) for zoom in range(MAX_CLUSTER_ZOOM + 1)]
+
+
+async def upsert_location_clusters(connection, coordinates: List[Tuple[float, float]]) -> None:
+    """
+    Adds locations to their cluster row of every zoom level, inserting the rows that do not exist
+    yet. The locations are first aggregated per cell, so each row is written once, in batches of
+    `CLUSTER_UPSERT_BATCH_SIZE` rows per statement. Rows are always written in (zoom, x, y) order,
+    so concurrent insertions lock them in the same order.
+    """
+    clusters = {}
+    for lat, long in coordinates:
+        for cell in cluster_cells(lat, long):
+            count, lat_sum, long_sum = clusters.get(cell, (0, 0.0, 0.0))
+            clusters[cell] = (count + 1, lat_sum + lat, long_sum + long)
+
+    cells = sorted(clusters.items())
+    cluster_table = table(ModelLocationCluster)
+    for start in range(0, len(cells), CLUSTER_UPSERT_BATCH_SIZE):
+        params = Parameters(connection)
+        rows = [
+            f"({params.add(to_db(ModelLocationCluster, 'lcl_uuid', uuid.uuid4(), connection))}, "
+            f"{params.add(zoom)}, {params.add(x)}, {params.add(y)}, "
+            f"{params.add(count)}, {params.add(lat_sum)}, {params.add(long_sum)})"
+            for (zoom, x, y), (count, lat_sum, long_sum) in cells[start:start + CLUSTER_UPSERT_BATCH_SIZE]
+        ]
+        query = f"""
+            INSERT INTO {cluster_table}
+                (lcl_uuid, lcl_zoom, lcl_x, lcl_y, lcl_count, lcl_lat_sum, lcl_long_sum)
+            VALUES {", ".join(rows)}
+            ON CONFLICT (lcl_zoom, lcl_x, lcl_y) DO UPDATE SET
+                lcl_count = {cluster_table}.lcl_count + excluded.lcl_count,
+                lcl_lat_sum = {cluster_table}.lcl_lat_sum + excluded.lcl_lat_sum,
+                lcl_long_sum = {cluster_table}.lcl_long_sum + excluded.lcl_long_sum
+        """
+        await connection.execute_query(query, params.values)
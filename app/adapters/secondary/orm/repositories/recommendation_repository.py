@@ -1,77 +1,238 @@
-from app.adapters.secondary.orm.models import ModelLocation, ModelCategory, ModelReview
+from app.adapters.secondary.orm.models import ModelLocation, ModelCategory, ModelPairReviewState
+from app.adapters.secondary.orm.raw_sql import Parameters, table, to_db, to_python
+from app.adapters.secondary.orm.replica_router import read_connection
+from app.adapters.secondary.orm.repositories.location_repository import LocationRepository
+from app.adapters.secondary.metrics.app_metrics import RECOMMENDATION_COMPUTE_DURATION
 from app.core.domain.ports.recommendation_ports import RecommendationRepositoryPort
 from app.core.domain.entities.recomendation_entity import RecommendationEntity
-from typing import List
-from tortoise.exceptions import DoesNotExist
+from app.core.domain.entities.recommendation_cursor_entity import RecommendationCursor
+from typing import List, Optional
+from uuid import UUID
 from datetime import datetime, timedelta
 import pytz
 
+# Number of days after which a review is considered expired
+REVIEW_EXPIRATION_DAYS = 30
+
+# Default number of recommendations returned
+DEFAULT_LIMIT = 100
+
+# Default search radius of proximity-aware recommendations, in kilometres
+DEFAULT_PROXIMITY_RADIUS_KM = 50
+
+# Number of nearby locations whose pairs are read per query
+PROXIMITY_CHUNK_SIZE = 100
+
+
 class RecommendationRepository(RecommendationRepositoryPort):
     """
     Repository for handling recommendations.
     Retrieves and creates recommendations based on location and category combinations.
     """
 
-    async def get_recommendations(self) -> List[RecommendationEntity]:
+    @RECOMMENDATION_COMPUTE_DURATION.time()
+    async def get_recommendations(self, limit: int = DEFAULT_LIMIT, after: Optional[RecommendationCursor] = None,
+                                  category: Optional[UUID] = None, location: Optional[UUID] = None,
+                                  bandera: Optional[int] = None, lat: Optional[float] = None,
+                                  long: Optional[float] = None,
+                                  radius_km: Optional[float] = None) -> List[RecommendationEntity]:
         """
-        Retrieves up to 10 recommendations based on location-category combinations.
-        Prioritizes combinations that haven't been reviewed in the last 30 days.
+        Retrieves a page of up to `limit` recommendations based on location-category combinations.
+        Prioritizes combinations that have never been reviewed (bandera 1), followed by those whose
+        last review is older than 30 days (bandera 2). Recently reviewed combinations are excluded.
+
+        Recommendations are read from the `pair_review_state` table, which holds the last review
+        date of every reviewed pair, so the cost depends on the number of pairs and not on the
+        review history. Each bandera bucket is read with its own keyset query, starting right
+        after the `after` cursor, so deep pages cost the same as the first one. The queries run on
+        the read replica when there is one.
+
+        When a point is given, only locations within `radius_km` of it are considered, and each
+        bandera bucket is ranked by distance to the point instead (see `_get_nearby`).
+
+        :param limit: Maximum number of recommendations to return.
+        :param after: Cursor of the last recommendation of the previous page.
+        :param category: Only return recommendations for this category.
+        :param location: Only return recommendations for this location.
+        :param bandera: Only return recommendations with this flag (1 or 2).
+        :param lat: Latitude of the point to rank recommendations by distance from.
+        :param long: Longitude of the point to rank recommendations by distance from.
+        :param radius_km: Search radius around the point, in kilometres (default 50).
         """
+        if lat is not None and long is not None:
+            return await self._get_nearby(limit, after, category, location, bandera, lat, long,
+                                          radius_km if radius_km is not None else DEFAULT_PROXIMITY_RADIUS_KM)
+
+        recommendations = []
+        locations = [location] if location is not None else None
+
+        # Never reviewed pairs come first, ordered by (loc_uuid, cat_uuid)
+        if bandera in (None, 1) and (after is None or after.bandera == 1):
+            recommendations += await self._get_never_reviewed(limit, after, category, locations)
 
-        # Retrieve all locations and categories from the database
-        all_locations = await ModelLocation.all()
-        all_categories = await ModelCategory.all()
+        # Expired pairs fill the rest of the page, the most recently reviewed first
+        remaining = limit - len(recommendations)
+        if remaining > 0 and bandera in (None, 2):
+            expired_after = after if after is not None and after.bandera == 2 else None
+            recommendations += await self._get_expired(remaining, expired_after, category, locations)
+
+        return recommendations
+
+    async def _get_nearby(self, limit: int, after: Optional[RecommendationCursor], category: Optional[UUID],
+                          location: Optional[UUID], bandera: Optional[int], lat: float, long: float,
+                          radius_km: float) -> List[RecommendationEntity]:
+        """
+        Retrieves recommendations for the locations within `radius_km` of a point, ordered by
+        (bandera, distance, loc_uuid, cat_uuid).
+
+        The locations around the point are found first through the geohash index, and the
+        staleness of their pairs is then read in chunks of nearby locations, nearest chunk first,
+        until the page is full. Locations outside the radius are never joined with the review state.
+        """
+        nearby = await LocationRepository().find_within_radius(lat, long, radius_km)
+        ranked = sorted(
+            (round(distance, 6), entity.loc_uuid) for entity, distance in nearby
+            if location is None or entity.loc_uuid == location
+        )
 
         recommendations = []
+        for bucket, fetch in ((1, self._get_never_reviewed), (2, self._get_expired)):
+            if bandera not in (None, bucket) or (after is not None and after.bandera > bucket):
+                continue
+            bucket_after = self._proximity_key(after) if after is not None and after.bandera == bucket else None
+
+            # Locations before the cursor have been returned by previous pages
+            candidates = [item for item in ranked if bucket_after is None or item >= bucket_after[:2]]
+            for start in range(0, len(candidates), PROXIMITY_CHUNK_SIZE):
+                remaining = limit - len(recommendations)
+                if remaining <= 0:
+                    return recommendations
+
+                distances = {loc_uuid: distance for distance, loc_uuid in candidates[start:start + PROXIMITY_CHUNK_SIZE]}
+                rows = await fetch(None, None, category, list(distances))
+                for recommendation in rows:
+                    recommendation.distance_km = distances[recommendation.loc_uuid]
+                rows = sorted(
+                    (row for row in rows if bucket_after is None or self._proximity_key(row) > bucket_after),
+                    key=self._proximity_key
+                )
+                recommendations += rows[:remaining]
+
+        return recommendations
+
+    @staticmethod
+    def _proximity_key(recommendation) -> tuple:
+        """
+        Sort key of a recommendation or cursor inside a bandera bucket of a proximity request.
+        """
+        return recommendation.distance_km, recommendation.loc_uuid, recommendation.cat_uuid
+
+    async def _get_never_reviewed(self, limit: Optional[int], after: Optional[RecommendationCursor],
+                                  category: Optional[UUID],
+                                  locations: Optional[List[UUID]]) -> List[RecommendationEntity]:
+        """
+        Retrieves pairs without any review, in (loc_uuid, cat_uuid) order.
+        Without a limit, every matching pair is returned.
+        """
+        connection = await read_connection()
+        params = Parameters(connection)
+
+        conditions = [f"""NOT EXISTS (
+            SELECT 1 FROM {table(ModelPairReviewState)} prs
+            WHERE prs.prs_fk_loc_uuid_id = loc.loc_uuid AND prs.prs_fk_cat_uuid_id = cat.cat_uuid
+        )"""]
+        if locations is not None:
+            conditions.append(f"loc.loc_uuid IN ({self._in_list(params, locations, connection)})")
+        if category is not None:
+            conditions.append(f"cat.cat_uuid = {params.add(to_db(ModelCategory, 'cat_uuid', category, connection))}")
+        if after is not None:
+            loc_uuid = to_db(ModelLocation, "loc_uuid", after.loc_uuid, connection)
+            cat_uuid = to_db(ModelCategory, "cat_uuid", after.cat_uuid, connection)
+            conditions.append(
+                f"(loc.loc_uuid > {params.add(loc_uuid)} "
+                f"OR (loc.loc_uuid = {params.add(loc_uuid)} AND cat.cat_uuid > {params.add(cat_uuid)}))"
+            )
 
-        # Get current time in UTC
+        query = f"""
+            SELECT loc.loc_uuid, loc.loc_description, cat.cat_uuid, cat.cat_description, NULL AS review_date
+            FROM {table(ModelLocation)} loc
+            CROSS JOIN {table(ModelCategory)} cat
+            WHERE {" AND ".join(conditions)}
+            ORDER BY loc.loc_uuid, cat.cat_uuid
+            {self._limit_clause(params, limit)}
+        """
+        rows = await connection.execute_query_dict(query, params.values)
+        return [self._to_entity(row, bandera=1) for row in rows]
+
+    async def _get_expired(self, limit: Optional[int], after: Optional[RecommendationCursor],
+                           category: Optional[UUID], locations: Optional[List[UUID]]) -> List[RecommendationEntity]:
+        """
+        Retrieves pairs whose last review is expired, by last review date (newest first), then
+        (loc_uuid, cat_uuid). The query is a range scan over the `prs_last_review` index.
+        Without a limit, every matching pair is returned.
+        """
+        connection = await read_connection()
+        params = Parameters(connection)
+
+        # Get the expiration cutoff in UTC
         datetime_now_aware = datetime.now(pytz.UTC)
+        cutoff = datetime_now_aware - timedelta(days=REVIEW_EXPIRATION_DAYS)
+
+        conditions = [f"prs.prs_last_review < {params.add(to_db(ModelPairReviewState, 'prs_last_review', cutoff, connection))}"]
+        if locations is not None:
+            conditions.append(f"prs.prs_fk_loc_uuid_id IN ({self._in_list(params, locations, connection)})")
+        if category is not None:
+            conditions.append(
+                f"prs.prs_fk_cat_uuid_id = {params.add(to_db(ModelCategory, 'cat_uuid', category, connection))}"
+            )
+        if after is not None:
+            review_date = to_db(ModelPairReviewState, "prs_last_review", after.review_date, connection)
+            loc_uuid = to_db(ModelLocation, "loc_uuid", after.loc_uuid, connection)
+            cat_uuid = to_db(ModelCategory, "cat_uuid", after.cat_uuid, connection)
+            conditions.append(
+                f"(prs.prs_last_review < {params.add(review_date)} "
+                f"OR (prs.prs_last_review = {params.add(review_date)} "
+                f"AND (prs.prs_fk_loc_uuid_id > {params.add(loc_uuid)} "
+                f"OR (prs.prs_fk_loc_uuid_id = {params.add(loc_uuid)} AND prs.prs_fk_cat_uuid_id > {params.add(cat_uuid)}))))"
+            )
 
-        # Iterate over all combinations of location and category
-        for location in all_locations:
-            for category in all_categories:
-                try:
-                    # Try to get the latest review for this location-category combination
-                    last_review = await ModelReview.filter(
-                        rev_fk_loc_uuid=location.loc_uuid,
-                        rev_fk_cat_uuid=category.cat_uuid,
-                        rev_created__lt=datetime_now_aware - timedelta(days=30)
-                    ).order_by('-rev_created').first()  # Get the most recent review
-
-                    # Check if the review exists
-                    if last_review is None:
-                        bandera = 1  # No review found
-                        review_date = None
-                    elif last_review.rev_created < datetime_now_aware - timedelta(days=30):
-                        bandera = 2  # Review is older than 30 days
-                        review_date = last_review.rev_created
-                    else:
-                        bandera = 0  # Review is recent
-                        review_date = last_review.rev_created
-
-                    # Create recommendation with the flag and review date
-                    recommendations.append(RecommendationEntity(
-                        loc_uuid=location.loc_uuid,
-                        loc_description=location.loc_description,
-                        cat_uuid=category.cat_uuid,
-                        cat_description=category.cat_description,
-                        bandera=bandera,
-                        review_date=review_date
-                    ))
-
-                except DoesNotExist:
-                    # If no review exists for this combination, assign flag 1
-                    recommendations.append(RecommendationEntity(
-                        loc_uuid=location.loc_uuid,
-                        loc_description=location.loc_description,
-                        cat_uuid=category.cat_uuid,
-                        cat_description=category.cat_description,
-                        bandera=1,
-                        review_date=None
-                    ))
-
-        # Ordenar las recomendaciones por 'bandera' en orden ascendente (1 primero)
-        recommendations = sorted(recommendations, key=lambda r: r.bandera)
-
-        # Return only the top 10 recommendations
-        return recommendations[:100]  # We return only the first 10 recommendations
+        query = f"""
+            SELECT loc.loc_uuid, loc.loc_description, cat.cat_uuid, cat.cat_description,
+                   prs.prs_last_review AS review_date
+            FROM {table(ModelPairReviewState)} prs
+            JOIN {table(ModelLocation)} loc ON loc.loc_uuid = prs.prs_fk_loc_uuid_id
+            JOIN {table(ModelCategory)} cat ON cat.cat_uuid = prs.prs_fk_cat_uuid_id
+            WHERE {" AND ".join(conditions)}
+            ORDER BY prs.prs_last_review DESC, prs.prs_fk_loc_uuid_id, prs.prs_fk_cat_uuid_id
+            {self._limit_clause(params, limit)}
+        """
+        rows = await connection.execute_query_dict(query, params.values)
+        return [self._to_entity(row, bandera=2) for row in rows]
+
+    @staticmethod
+    def _in_list(params: Parameters, locations: List[UUID], connection) -> str:
+        """
+        Returns the placeholders of an IN list of location UUIDs.
+        """
+        return ", ".join(params.add(to_db(ModelLocation, "loc_uuid", loc_uuid, connection)) for loc_uuid in locations)
+
+    @staticmethod
+    def _limit_clause(params: Parameters, limit: Optional[int]) -> str:
+        """
+        Returns the LIMIT clause of a query, or nothing when there is no limit.
+        """
+        return f"LIMIT {params.add(limit)}" if limit is not None else ""
+
+    @staticmethod
+    def _to_entity(row: dict, bandera: int) -> RecommendationEntity:
+        """
+        Maps a row to an entity, converting driver values (e.g. SQLite text) to Python types.
+        """
+        return RecommendationEntity(
+            loc_uuid=to_python(ModelLocation, "loc_uuid", row["loc_uuid"]),
+            loc_description=row["loc_description"],
+            cat_uuid=to_python(ModelCategory, "cat_uuid", row["cat_uuid"]),
+            cat_description=row["cat_description"],
+            bandera=bandera,
+            review_date=to_python(ModelPairReviewState, "prs_last_review", row["review_date"])
+        )
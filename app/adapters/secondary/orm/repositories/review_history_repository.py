@@ -0,0 +1,91 @@
+from typing import List, Optional
+from uuid import UUID
+from app.adapters.secondary.orm.models import ModelPairReviewState, ModelReview
+from app.adapters.secondary.orm.raw_sql import Parameters, table, to_db, to_python
+from app.adapters.secondary.orm.replica_router import read_connection
+from app.core.domain.entities.review_cursor_entity import ReviewCursor
+from app.core.domain.entities.review_entity import ReviewEntity
+from app.core.domain.ports.review_history_ports import ReviewHistoryPort
+
+# Columns of the reviews returned, and their keyset order
+HISTORY_COLUMNS = "rev_uuid, rev_recommendation, rev_obs, rev_created, rev_fk_loc_uuid_id, rev_fk_cat_uuid_id"
+HISTORY_ORDER = "rev_created DESC, rev_uuid"
+
+
+class ReviewHistoryRepository(ReviewHistoryPort):
+    """
+    Repository reading the review history of the locations from the database, with keyset
+    pagination on (rev_created DESC, rev_uuid): every page is a range scan of the
+    (location, category, creation date) index starting at the cursor, never an OFFSET, so deep
+    pages cost the same as the first one.
+    """
+
+    async def get_reviews(self, loc_uuid: UUID, cat_uuid: Optional[UUID] = None, limit: int = 100,
+                          after: Optional[ReviewCursor] = None) -> List[ReviewEntity]:
+        """
+        Retrieves a page of reviews of a location, or of a location-category pair, newest first.
+
+        The index is ordered by category within a location, so the reviews of a whole location
+        are read with one branch per reviewed category (taken from `pair_review_state`), each one
+        reading at most `limit` rows from the index, and the branches are merged by the database.
+        """
+        connection = await read_connection()
+        if cat_uuid is not None:
+            categories = [cat_uuid]
+        else:
+            categories = await ModelPairReviewState.filter(prs_fk_loc_uuid_id=loc_uuid).using_db(
+                connection
+            ).values_list("prs_fk_cat_uuid_id", flat=True)
+            if not categories:
+                return []
+
+        params = Parameters(connection)
+        branches = [
+            f"SELECT * FROM ({self._pair_query(params, loc_uuid, category, limit, after, connection)}) AS pair_{index}"
+            for index, category in enumerate(categories)
+        ]
+        query = f"""
+            {" UNION ALL ".join(branches)}
+            ORDER BY {HISTORY_ORDER}
+            LIMIT {params.add(limit)}
+        """
+        rows = await connection.execute_query_dict(query, params.values)
+        return [self._to_entity(row) for row in rows]
+
+    @staticmethod
+    def _pair_query(params: Parameters, loc_uuid: UUID, cat_uuid: UUID, limit: int,
+                    after: Optional[ReviewCursor], connection) -> str:
+        """
+        Returns the query of the first `limit` reviews of a pair after the cursor.
+        """
+        conditions = [
+            f"rev_fk_loc_uuid_id = {params.add(to_db(ModelReview, 'rev_fk_loc_uuid_id', loc_uuid, connection))}",
+            f"rev_fk_cat_uuid_id = {params.add(to_db(ModelReview, 'rev_fk_cat_uuid_id', cat_uuid, connection))}",
+        ]
+        if after is not None:
+            rev_created = to_db(ModelReview, "rev_created", after.rev_created, connection)
+            rev_uuid = to_db(ModelReview, "rev_uuid", after.rev_uuid, connection)
+            # The first condition bounds the index range, the second skips the ties already returned
+            conditions.append(f"rev_created <= {params.add(rev_created)}")
+            conditions.append(f"(rev_created < {params.add(rev_created)} OR rev_uuid > {params.add(rev_uuid)})")
+        return f"""
+            SELECT {HISTORY_COLUMNS}
+            FROM {table(ModelReview)}
+            WHERE {" AND ".join(conditions)}
+            ORDER BY {HISTORY_ORDER}
+            LIMIT {params.add(limit)}
+        """
+
+    @staticmethod
+    def _to_entity(row) -> ReviewEntity:
+        """
+        Maps a review row to a ReviewEntity.
+        """
+        return ReviewEntity(
+            rev_uuid=to_python(ModelReview, "rev_uuid", row["rev_uuid"]),
+            rev_recommendation=row["rev_recommendation"],
+            rev_obs=row["rev_obs"],
+            rev_created=to_python(ModelReview, "rev_created", row["rev_created"]),
+            rev_fk_loc_uuid=to_python(ModelReview, "rev_fk_loc_uuid_id", row["rev_fk_loc_uuid_id"]),
+            rev_fk_cat_uuid=to_python(ModelReview, "rev_fk_cat_uuid_id", row["rev_fk_cat_uuid_id"])
+        )
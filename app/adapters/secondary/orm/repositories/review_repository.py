@@ -1,6 +1,20 @@
-from app.adapters.secondary.orm.models import ModelReview
+import uuid
+from typing import Dict, List, Set, Tuple
+from uuid import UUID
+from tortoise.exceptions import IntegrityError
+from tortoise.transactions import in_transaction
+from app.adapters.secondary.orm.models import ModelCategory, ModelLocation, ModelReview, ModelPairReviewState
+from app.adapters.secondary.orm.raw_sql import Parameters, table, to_db
+from app.core.domain.entities.review_entity import ReviewEntity
+from app.core.domain.exceptions.exceptions import CategoryNotFoundError, LocationNotFoundError
 from app.core.domain.ports.review_ports import ReviewRepositoryPort
 
+# Number of reviews inserted per transaction by bulk saves
+BULK_CHUNK_SIZE = 500
+
+# Number of pair state rows upserted per statement (5 parameters each)
+STATE_UPSERT_BATCH_SIZE = 1000
+
 class ReviewRepository(ReviewRepositoryPort):
     """
     Repository for managing reviews in the system.
@@ -12,16 +26,116 @@ class ReviewRepository(ReviewRepositoryPort):
         Save a new review to the database.
         The method assumes that the UUIDs for location and category are already correctly set.
         This method maps the entities to the corresponding database fields and stores the review.
+
+        The review state of the location-category pair is upserted in the same transaction,
+        so `pair_review_state` is always consistent with the `review` table.
+
+        :raises LocationNotFoundError: If the location does not exist.
+        :raises CategoryNotFoundError: If the category does not exist.
         """
+        try:
+            async with in_transaction() as connection:
+                # Save the review to the ModelReview table in the database
+                await self._to_model(review).save(using_db=connection, force_create=True)
+
+                # Register the review in the state of its location-category pair
+                await upsert_pair_review_state(connection, review.rev_fk_loc_uuid, review.rev_fk_cat_uuid,
+                                               review.rev_created)
+        except IntegrityError:
+            # A foreign key failed: find out which reference is missing, only on this error path
+            locations, categories = await self.get_existing_references([review.rev_fk_loc_uuid],
+                                                                       [review.rev_fk_cat_uuid])
+            if review.rev_fk_loc_uuid not in locations:
+                raise LocationNotFoundError(f"Location {review.rev_fk_loc_uuid} not found.")
+            if review.rev_fk_cat_uuid not in categories:
+                raise CategoryNotFoundError(f"Category {review.rev_fk_cat_uuid} not found.")
+            raise
 
-        # Save the review to the ModelReview table in the database
-        await ModelReview.create(
+    async def save_many(self, reviews: List[ReviewEntity]) -> None:
+        """
+        Save new reviews in chunks of `BULK_CHUNK_SIZE`, one transaction per chunk.
+        The reviews of a chunk are aggregated per location-category pair, so each pair state
+        is upserted once per chunk.
+        """
+        for start in range(0, len(reviews), BULK_CHUNK_SIZE):
+            chunk = reviews[start:start + BULK_CHUNK_SIZE]
+            states: Dict[Tuple[UUID, UUID], Tuple[object, int]] = {}
+            for review in chunk:
+                key = (review.rev_fk_loc_uuid, review.rev_fk_cat_uuid)
+                last_review, review_count = states.get(key, (review.rev_created, 0))
+                states[key] = (max(last_review, review.rev_created), review_count + 1)
+
+            async with in_transaction() as connection:
+                await ModelReview.bulk_create([self._to_model(review) for review in chunk], using_db=connection)
+                await upsert_pair_review_states(connection, [
+                    (loc_uuid, cat_uuid, last_review, review_count)
+                    for (loc_uuid, cat_uuid), (last_review, review_count) in states.items()
+                ])
+
+    async def get_existing_references(self, loc_uuids: List[UUID],
+                                      cat_uuids: List[UUID]) -> Tuple[Set[UUID], Set[UUID]]:
+        """
+        Retrieve which of the location and category UUIDs exist, with one query per table.
+        """
+        locations = set(await ModelLocation.filter(loc_uuid__in=set(loc_uuids)).values_list(
+            "loc_uuid", flat=True
+        )) if loc_uuids else set()
+        categories = set(await ModelCategory.filter(cat_uuid__in=set(cat_uuids)).values_list(
+            "cat_uuid", flat=True
+        )) if cat_uuids else set()
+        return locations, categories
+
+    @staticmethod
+    def _to_model(review: ReviewEntity) -> ModelReview:
+        """
+        Maps a ReviewEntity to a new ModelReview.
+        """
+        return ModelReview(
             rev_uuid=review.rev_uuid,  # Unique identifier for the review
             rev_recommendation=review.rev_recommendation,  # The recommendation content of the review
             rev_obs=review.rev_obs,  # Optional observations for the review
             rev_created=review.rev_created,  # Timestamp when the review was created
             rev_fk_loc_uuid_id=review.rev_fk_loc_uuid,  # Foreign key to the Location entity (UUID)
-            rev_fk_cat_uuid_id=review.rev_fk_cat_uuid,  # Foreign key to the Category entity (UUID)
+            rev_fk_cat_uuid_id=review.rev_fk_cat_uuid  # Foreign key to the Category entity (UUID)
         )
 
 
+async def upsert_pair_review_state(connection, loc_uuid, cat_uuid, review_created, review_count: int = 1) -> None:
+    """
+    Inserts the state row of a location-category pair, or updates it when it already exists:
+    the last review date keeps the most recent value and the review count is incremented.
+    """
+    await upsert_pair_review_states(connection, [(loc_uuid, cat_uuid, review_created, review_count)])
+
+
+async def upsert_pair_review_states(connection, states: List[Tuple[UUID, UUID, object, int]]) -> None:
+    """
+    Upserts the state rows of several location-category pairs, given as
+    (loc_uuid, cat_uuid, last_review, review_count) with at most one entry per pair.
+    Rows are written in batches of `STATE_UPSERT_BATCH_SIZE`, in (loc_uuid, cat_uuid) order, so
+    concurrent insertions lock them in the same order.
+    """
+    state_table = table(ModelPairReviewState)
+    states = sorted(states, key=lambda state: (str(state[0]), str(state[1])))
+    for start in range(0, len(states), STATE_UPSERT_BATCH_SIZE):
+        params = Parameters(connection)
+        rows = [
+            f"({params.add(to_db(ModelPairReviewState, 'prs_uuid', uuid.uuid4(), connection))}, "
+            f"{params.add(to_db(ModelPairReviewState, 'prs_fk_loc_uuid_id', loc_uuid, connection))}, "
+            f"{params.add(to_db(ModelPairReviewState, 'prs_fk_cat_uuid_id', cat_uuid, connection))}, "
+            f"{params.add(to_db(ModelPairReviewState, 'prs_last_review', last_review, connection))}, "
+            f"{params.add(review_count)})"
+            for loc_uuid, cat_uuid, last_review, review_count in states[start:start + STATE_UPSERT_BATCH_SIZE]
+        ]
+        query = f"""
+            INSERT INTO {state_table}
+                (prs_uuid, prs_fk_loc_uuid_id, prs_fk_cat_uuid_id, prs_last_review, prs_review_count)
+            VALUES {", ".join(rows)}
+            ON CONFLICT (prs_fk_loc_uuid_id, prs_fk_cat_uuid_id) DO UPDATE SET
+                prs_last_review = CASE
+                    WHEN excluded.prs_last_review > {state_table}.prs_last_review THEN excluded.prs_last_review
+                    ELSE {state_table}.prs_last_review
+                END,
+                prs_review_count = {state_table}.prs_review_count + excluded.prs_review_count
+        """
+        await connection.execute_query(query, params.values)
@@ -0,0 +1,356 @@
+import logging
+import re
+import uuid
+from datetime import datetime
+from typing import List, Optional
+import pytz
+from tortoise import connections
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.transactions import in_transaction
+from app.adapters.secondary.orm.models import ModelReview, ModelReviewRollup
+from app.adapters.secondary.orm.raw_sql import Parameters, table, to_db, to_python
+from app.main_app.config import REVIEW_PARTITION_MONTHS_AHEAD, REVIEW_RETENTION_MODE, REVIEW_RETENTION_MONTHS
+
+logger = logging.getLogger(__name__)
+
+# Monthly partitions are named review_pYYYY_MM; rows outside of them go to the default partition
+PARTITION_PREFIX = "review_p"
+PARTITION_NAME = re.compile(rf"^{PARTITION_PREFIX}(\d{{4}})_(\d{{2}})$")
+DEFAULT_PARTITION = "review_default"
+
+# Retention modes: detach keeps the partitions as standalone tables, drop deletes them
+RETENTION_MODES = ("detach", "drop")
+
+# Key of the advisory lock serializing partition maintenance between processes
+MAINTENANCE_LOCK_KEY = 7_402_215
+
+# Number of rollup rows upserted per statement (7 parameters each)
+ROLLUP_UPSERT_BATCH_SIZE = 1000
+
+
+def month_start(moment: datetime) -> datetime:
+    """
+    Returns the first instant, in UTC, of the month of a date.
+    """
+    moment = moment.astimezone(pytz.UTC) if moment.tzinfo else pytz.UTC.localize(moment)
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    """
+    Returns the first instant of the month `months` after (or before, when negative) a month start.
+    """
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    """
+    Returns the name of the partition of a month.
+    """
+    return f"{PARTITION_PREFIX}{month.year:04d}_{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[datetime]:
+    """
+    Returns the month of a partition, or None when the name is not a monthly partition.
+    """
+    match = PARTITION_NAME.match(name)
+    if match is None:
+        return None
+    return datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=pytz.UTC)
+
+
+def partition_table(name: str) -> str:
+    """
+    Returns the quoted name of a partition, in the schema of the `review` table.
+    """
+    schema = ModelReview._meta.schema
+    return f'"{schema}"."{name}"' if schema else f'"{name}"'
+
+
+async def _lock(connection: BaseDBAsyncClient) -> None:
+    """
+    Takes the maintenance lock until the end of the transaction.
+    """
+    await connection.execute_query(f"SELECT pg_advisory_xact_lock({MAINTENANCE_LOCK_KEY})")
+
+
+async def _is_partitioned(connection: BaseDBAsyncClient) -> bool:
+    """
+    Tells whether the `review` table is partitioned, that is, whether the database is Postgres and
+    the partitioning migration has been applied.
+    """
+    if connection.capabilities.dialect != "postgres":
+        return False
+    _, rows = await connection.execute_query(
+        "SELECT relkind FROM pg_class WHERE oid = to_regclass($1)", [table(ModelReview)]
+    )
+    return bool(rows) and rows[0]["relkind"] == "p"
+
+
+async def _partitions(connection: BaseDBAsyncClient) -> List[str]:
+    """
+    Returns the names of the partitions attached to the `review` table.
+    """
+    _, rows = await connection.execute_query(
+        "SELECT child.relname AS name FROM pg_inherits "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE pg_inherits.inhparent = to_regclass($1)",
+        [table(ModelReview)]
+    )
+    return [row["name"] for row in rows]
+
+
+async def _month_rows_exist(connection: BaseDBAsyncClient, source: str, month: datetime) -> bool:
+    """
+    Tells whether a table holds reviews of a month.
+    """
+    params = Parameters(connection)
+    conditions = _month_conditions(params, month, connection)
+    _, rows = await connection.execute_query(f"SELECT 1 FROM {source} WHERE {conditions} LIMIT 1", params.values)
+    return bool(rows)
+
+
+def _month_conditions(params: Parameters, month: datetime, connection: BaseDBAsyncClient) -> str:
+    """
+    Returns the conditions selecting the reviews of a month.
+    """
+    start = to_db(ModelReview, "rev_created", month, connection)
+    end = to_db(ModelReview, "rev_created", add_months(month, 1), connection)
+    return f"rev_created >= {params.add(start)} AND rev_created < {params.add(end)}"
+
+
+async def _create_partition(connection: BaseDBAsyncClient, month: datetime) -> None:
+    """
+    Creates the partition of a month. Reviews of that month already in the default partition are
+    moved to it, since Postgres refuses to create a partition whose rows sit in the default one.
+    """
+    review = table(ModelReview)
+    default = partition_table(DEFAULT_PARTITION)
+    create = (
+        f"CREATE TABLE {partition_table(partition_name(month))} PARTITION OF {review} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    )
+    if not await _month_rows_exist(connection, default, month):
+        await connection.execute_script(create)
+        return
+
+    params = Parameters(connection)
+    conditions = _month_conditions(params, month, connection)
+    await connection.execute_script(f"ALTER TABLE {review} DETACH PARTITION {default}")
+    await connection.execute_script(create)
+    await connection.execute_query(f"INSERT INTO {review} SELECT * FROM {default} WHERE {conditions}", params.values)
+    await connection.execute_query(f"DELETE FROM {default} WHERE {conditions}", params.values)
+    await connection.execute_script(f"ALTER TABLE {review} ATTACH PARTITION {default} DEFAULT")
+
+
+async def create_review_partitions(months_ahead: int = REVIEW_PARTITION_MONTHS_AHEAD,
+                                   now: Optional[datetime] = None, connection_name: str = "default") -> List[str]:
+    """
+    Creates the missing partitions of the current month and the next `months_ahead` ones.
+    Does nothing when the `review` table is not partitioned (e.g. on SQLite).
+
+    :return: The names of the partitions created.
+    """
+    if not await _is_partitioned(connections.get(connection_name)):
+        return []
+
+    current = month_start(now or datetime.now(pytz.UTC))
+    created = []
+    async with in_transaction(connection_name) as connection:
+        await _lock(connection)
+        existing = set(await _partitions(connection))
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            if partition_name(month) not in existing:
+                await _create_partition(connection, month)
+                created.append(partition_name(month))
+    return created
+
+
+async def upsert_review_rollups(connection: BaseDBAsyncClient, month: datetime, pairs: List[dict]) -> None:
+    """
+    Adds the reviews of a month to the rollup rows of their location-category pairs, given as rows
+    with loc_uuid, cat_uuid, review_count, first_review and last_review. Counts are added to the
+    existing rows, and the first and last review dates widened.
+    """
+    rollup_table = table(ModelReviewRollup)
+    for start in range(0, len(pairs), ROLLUP_UPSERT_BATCH_SIZE):
+        params = Parameters(connection)
+        rows = [
+            f"({params.add(to_db(ModelReviewRollup, 'rro_uuid', uuid.uuid4(), connection))}, "
+            f"{params.add(to_db(ModelReviewRollup, 'rro_fk_loc_uuid_id', pair['loc_uuid'], connection))}, "
+            f"{params.add(to_db(ModelReviewRollup, 'rro_fk_cat_uuid_id', pair['cat_uuid'], connection))}, "
+            f"{params.add(to_db(ModelReviewRollup, 'rro_month', month, connection))}, "
+            f"{params.add(pair['review_count'])}, "
+            f"{params.add(to_db(ModelReviewRollup, 'rro_first_review', pair['first_review'], connection))}, "
+            f"{params.add(to_db(ModelReviewRollup, 'rro_last_review', pair['last_review'], connection))})"
+            for pair in pairs[start:start + ROLLUP_UPSERT_BATCH_SIZE]
+        ]
+        query = f"""
+            INSERT INTO {rollup_table}
+                (rro_uuid, rro_fk_loc_uuid_id, rro_fk_cat_uuid_id, rro_month, rro_review_count,
+                 rro_first_review, rro_last_review)
+            VALUES {", ".join(rows)}
+            ON CONFLICT (rro_fk_loc_uuid_id, rro_fk_cat_uuid_id, rro_month) DO UPDATE SET
+                rro_review_count = {rollup_table}.rro_review_count + excluded.rro_review_count,
+                rro_first_review = CASE
+                    WHEN excluded.rro_first_review < {rollup_table}.rro_first_review THEN excluded.rro_first_review
+                    ELSE {rollup_table}.rro_first_review
+                END,
+                rro_last_review = CASE
+                    WHEN excluded.rro_last_review > {rollup_table}.rro_last_review THEN excluded.rro_last_review
+                    ELSE {rollup_table}.rro_last_review
+                END
+        """
+        await connection.execute_query(query, params.values)
+
+
+async def _roll_up_month(connection: BaseDBAsyncClient, source: str, month: datetime) -> int:
+    """
+    Summarizes the reviews of a month held by a table (the review table or one of its partitions)
+    into `review_rollup`.
+
+    :return: The number of reviews summarized.
+    """
+    params = Parameters(connection)
+    query = f"""
+        SELECT rev_fk_loc_uuid_id AS loc_uuid, rev_fk_cat_uuid_id AS cat_uuid, COUNT(*) AS review_count,
+               MIN(rev_created) AS first_review, MAX(rev_created) AS last_review
+        FROM {source}
+        WHERE {_month_conditions(params, month, connection)}
+        GROUP BY rev_fk_loc_uuid_id, rev_fk_cat_uuid_id
+    """
+    pairs = [
+        {
+            "loc_uuid": to_python(ModelReview, "rev_fk_loc_uuid_id", row["loc_uuid"]),
+            "cat_uuid": to_python(ModelReview, "rev_fk_cat_uuid_id", row["cat_uuid"]),
+            "review_count": row["review_count"],
+            "first_review": to_python(ModelReview, "rev_created", row["first_review"]),
+            "last_review": to_python(ModelReview, "rev_created", row["last_review"]),
+        }
+        for row in await connection.execute_query_dict(query, params.values)
+    ]
+    await upsert_review_rollups(connection, month, pairs)
+    return sum(pair["review_count"] for pair in pairs)
+
+
+async def oldest_review_month(connection: BaseDBAsyncClient, before: datetime) -> Optional[datetime]:
+    """
+    Returns the month of the oldest review created before a date, or None when there is none.
+    """
+    params = Parameters(connection)
+    _, rows = await connection.execute_query(
+        f"SELECT MIN(rev_created) AS oldest FROM {table(ModelReview)} "
+        f"WHERE rev_created < {params.add(to_db(ModelReview, 'rev_created', before, connection))}",
+        params.values
+    )
+    oldest = to_python(ModelReview, "rev_created", rows[0]["oldest"]) if rows else None
+    return month_start(oldest) if oldest is not None else None
+
+
+async def detached_partitions(connection: BaseDBAsyncClient) -> List[str]:
+    """
+    Returns the names of the monthly partitions detached by the retention policy, which are left as
+    standalone tables. Their reviews are already summarized in `review_rollup`.
+    """
+    if connection.capabilities.dialect != "postgres":
+        return []
+    _, rows = await connection.execute_query(
+        "SELECT tablename AS name FROM pg_tables WHERE schemaname = $1 AND tablename LIKE $2",
+        [ModelReview._meta.schema or "public", f"{PARTITION_PREFIX}%"]
+    )
+    attached = set(await _partitions(connection)) if await _is_partitioned(connection) else set()
+    return sorted(row["name"] for row in rows if partition_month(row["name"]) and row["name"] not in attached)
+
+
+async def remove_review_month(connection: BaseDBAsyncClient, month: datetime) -> None:
+    """
+    Summarizes the reviews of a month in `review_rollup` and removes them from the `review` table:
+    the partition of the month is dropped, and the remaining rows of the month (in the default
+    partition, or in a table without partitions) are deleted. Run it inside a transaction.
+    """
+    partitioned = await _is_partitioned(connection)
+    if partitioned:
+        await _lock(connection)
+        name = partition_name(month)
+        if name in await _partitions(connection):
+            await _roll_up_month(connection, partition_table(name), month)
+            await connection.execute_script(f"DROP TABLE {partition_table(name)}")
+
+    source = partition_table(DEFAULT_PARTITION) if partitioned else table(ModelReview)
+    await _roll_up_month(connection, source, month)
+    params = Parameters(connection)
+    await connection.execute_query(
+        f"DELETE FROM {source} WHERE {_month_conditions(params, month, connection)}", params.values
+    )
+
+
+async def _delete_months(connection_name: str, cutoff: datetime) -> List[str]:
+    """
+    Summarizes and deletes, month by month, the reviews created before the cutoff that are still in
+    the `review` table. Each month is removed in its own transaction.
+
+    :return: The months removed, named like their partitions.
+    """
+    removed = []
+    while True:
+        async with in_transaction(connection_name) as connection:
+            month = await oldest_review_month(connection, cutoff)
+            if month is None:
+                return removed
+            await remove_review_month(connection, month)
+        removed.append(partition_name(month))
+
+
+async def apply_review_retention(retention_months: int = REVIEW_RETENTION_MONTHS, mode: str = REVIEW_RETENTION_MODE,
+                                 now: Optional[datetime] = None, connection_name: str = "default") -> List[str]:
+    """
+    Removes the reviews of the months older than the last `retention_months`, once summarized per
+    location-category pair in `review_rollup`. The review state of the pairs, used by
+    recommendations, is kept as it is.
+
+    On a partitioned table, each expired partition is summarized, then detached or dropped
+    according to `mode`, in its own transaction. Without partitions (e.g. on SQLite), and for the
+    expired rows of the default partition, the rows can only be deleted: this is done in "drop"
+    mode, and they are left in place in "detach" mode.
+
+    :param retention_months: Number of whole months of reviews kept, besides the current one. 0 keeps every review.
+    :param mode: "detach" or "drop".
+    :param now: Current date, defaults to now.
+    :param connection_name: Name of the connection of the review table.
+    :return: The months removed, named like their partitions.
+    """
+    if mode not in RETENTION_MODES:
+        raise ValueError(f"Unknown retention mode {mode!r}, expected one of {', '.join(RETENTION_MODES)}")
+    if retention_months <= 0:
+        return []
+
+    cutoff = add_months(month_start(now or datetime.now(pytz.UTC)), -retention_months)
+    if not await _is_partitioned(connections.get(connection_name)):
+        if mode == "drop":
+            return await _delete_months(connection_name, cutoff)
+        logger.warning("The review table is not partitioned, so no review can be detached; nothing removed")
+        return []
+
+    removed = []
+    for name in sorted(await _partitions(connections.get(connection_name))):
+        month = partition_month(name)
+        if month is None or add_months(month, 1) > cutoff:
+            continue
+        async with in_transaction(connection_name) as connection:
+            await _lock(connection)
+            # Skip the partitions another process removed meanwhile
+            if name not in await _partitions(connection):
+                continue
+            await _roll_up_month(connection, partition_table(name), month)
+            if mode == "drop":
+                await connection.execute_script(f"DROP TABLE {partition_table(name)}")
+            else:
+                await connection.execute_script(f"ALTER TABLE {table(ModelReview)} DETACH PARTITION {partition_table(name)}")
+        removed.append(name)
+
+    if mode == "drop":
+        removed += await _delete_months(connection_name, cutoff)
+    return removed
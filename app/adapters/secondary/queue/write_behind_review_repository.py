@@ -0,0 +1,258 @@
+import asyncio
+import contextvars
+import logging
+import time
+from typing import List, Optional, Set, Tuple
+from uuid import UUID
+from app.adapters.secondary.cache.recommendation_cache import get_recommendation_cache
+from app.adapters.secondary.orm.repositories.review_repository import BULK_CHUNK_SIZE, ReviewRepository
+from app.core.domain.entities.review_entity import ReviewEntity
+from app.core.domain.exceptions.exceptions import ReviewQueueFullError
+from app.core.domain.ports.review_ports import ReviewRepositoryPort
+from app.core.domain.ports.recommendation_cache_ports import RecommendationCachePort
+from app.main_app.config import (
+    REVIEW_WRITE_BEHIND_ENABLED, REVIEW_QUEUE_MAX_SIZE, REVIEW_QUEUE_BATCH_SIZE, REVIEW_QUEUE_FLUSH_MS,
+    REVIEW_QUEUE_RETRY_MAX_MS
+)
+
+logger = logging.getLogger(__name__)
+
+# Attempts to insert a failing batch once the queue is closed, before its reviews are given up
+CLOSE_FLUSH_ATTEMPTS = 3
+
+
+class WriteBehindReviewRepository(ReviewRepositoryPort):
+    """
+    Review repository that queues saved reviews and inserts them in batches from a background task.
+
+    `save` returns as soon as the review is queued, so its latency does not depend on the database.
+    A batch is flushed when it reaches `batch_size` reviews or `flush_interval_ms` milliseconds
+    after its first review was queued. The queue is bounded: when it is full, `save` raises
+    ReviewQueueFullError instead of waiting.
+
+    Reviews referencing a location or category that does not exist are dropped and logged when
+    their batch is flushed. Any other error (e.g. the database is down) is retried with an
+    exponential backoff capped at `retry_max_ms`, without losing the queued reviews: meanwhile the
+    queue fills up and `save` starts rejecting reviews. Bulk saves and reads go straight to the
+    wrapped repository.
+    """
+
+    def __init__(self, repository: ReviewRepositoryPort, cache: Optional[RecommendationCachePort] = None,
+                 max_size: int = REVIEW_QUEUE_MAX_SIZE, batch_size: int = REVIEW_QUEUE_BATCH_SIZE,
+                 flush_interval_ms: int = REVIEW_QUEUE_FLUSH_MS, retry_base_ms: int = 100,
+                 retry_max_ms: int = REVIEW_QUEUE_RETRY_MAX_MS):
+        """
+        Initializes the queue.
+
+        :param repository: The repository that inserts the batches.
+        :param cache: Optional recommendation cache, invalidated after every flush.
+        :param max_size: Maximum number of queued reviews.
+        :param batch_size: Maximum number of reviews per batch.
+        :param flush_interval_ms: Maximum time a queued review waits for its batch to fill.
+        :param retry_base_ms: Delay before retrying a failed batch, doubled on every failure.
+        :param retry_max_ms: Maximum delay between the attempts to insert a failed batch.
+        """
+        self.repository = repository
+        self.cache = cache
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.retry_base = retry_base_ms / 1000
+        self.retry_max = retry_max_ms / 1000
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self._worker: Optional[asyncio.Task] = None
+        self._batch: List[ReviewEntity] = []
+        self._flushing: Optional[asyncio.Task] = None
+        self._closed = False
+
+        # Counters reported by stats()
+        self.queued = 0
+        self.rejected = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.retries = 0
+        self.failed = 0
+        self.flushes = 0
+        self.flush_seconds_total = 0.0
+        self.flush_seconds_max = 0.0
+
+    async def save(self, review: ReviewEntity) -> None:
+        """
+        Queue a review to be inserted with the next batch.
+
+        :raises ReviewQueueFullError: If the queue is full or closed.
+        """
+        if self._closed:
+            raise ReviewQueueFullError("The review queue is closed.")
+        self.start()
+        try:
+            self.queue.put_nowait(review)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise ReviewQueueFullError("The review queue is full.")
+        self.queued += 1
+
+    async def save_many(self, reviews: List[ReviewEntity]) -> None:
+        """
+        Save several reviews right away with the wrapped repository.
+        """
+        await self.repository.save_many(reviews)
+
+    async def get_existing_references(self, loc_uuids: List[UUID],
+                                      cat_uuids: List[UUID]) -> Tuple[Set[UUID], Set[UUID]]:
+        """
+        Retrieve which of the locations and categories exist, with the wrapped repository.
+        """
+        return await self.repository.get_existing_references(loc_uuids, cat_uuids)
+
+    def start(self) -> None:
+        """
+        Starts the background task flushing the queue, if it is not running.
+        """
+        if self._worker is None or self._worker.done():
+            # Started in an empty context, so its queries are not counted in the request that started it
+            self._worker = contextvars.Context().run(asyncio.get_running_loop().create_task, self._run())
+
+    async def close(self) -> None:
+        """
+        Stops accepting reviews and flushes the queued ones before returning.
+        """
+        self._closed = True
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        # Wait for the batch being inserted, then insert the one being filled and the rest of the queue
+        if self._flushing is not None:
+            await self._flushing
+        batch, self._batch = self._batch, []
+        while batch or not self.queue.empty():
+            batch.extend(self._take(self.batch_size - len(batch)))
+            await self._flush(batch)
+            batch = []
+
+    async def _run(self) -> None:
+        """
+        Flushes batches forever: waits for a first review, then for the batch to fill or the
+        flush interval to elapse.
+        """
+        while True:
+            # The batch being filled is kept on the instance, so close() can insert it
+            self._batch.append(await self.queue.get())
+            deadline = time.monotonic() + self.flush_interval
+            while len(self._batch) < self.batch_size:
+                self._batch.extend(self._take(self.batch_size - len(self._batch)))
+                remaining = deadline - time.monotonic()
+                if len(self._batch) >= self.batch_size or remaining <= 0:
+                    break
+                try:
+                    self._batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            batch, self._batch = self._batch, []
+            # Shielded, so cancelling the worker does not interrupt the insertion; close() awaits it
+            self._flushing = asyncio.ensure_future(self._flush(batch))
+            await asyncio.shield(self._flushing)
+            self._flushing = None
+
+    def _take(self, count: int) -> List[ReviewEntity]:
+        """
+        Takes up to `count` reviews already in the queue, without waiting.
+        """
+        reviews = []
+        while len(reviews) < count and not self.queue.empty():
+            reviews.append(self.queue.get_nowait())
+        return reviews
+
+    async def _flush(self, batch: List[ReviewEntity]) -> None:
+        """
+        Inserts a batch, dropping the reviews whose location or category does not exist.
+
+        The batch is inserted in chunks of one transaction each, and a failed chunk is retried
+        with the ones after it, so a retry never inserts a review twice. The worker keeps retrying
+        until the insertion succeeds; once the queue is closed, the reviews are given up (logged
+        and counted as failed) after `CLOSE_FLUSH_ATTEMPTS` attempts, so the shutdown ends.
+        """
+        started = time.perf_counter()
+        flushed = self.flushed
+        attempts = 0
+        try:
+            while batch:
+                try:
+                    # Checked again on every attempt: a location may be deleted between two of them
+                    batch = await self._drop_missing_references(batch)
+                    while batch:
+                        chunk = batch[:BULK_CHUNK_SIZE]
+                        await self.repository.save_many(chunk)
+                        self.flushed += len(chunk)
+                        batch = batch[len(chunk):]
+                except Exception:
+                    attempts += 1
+                    if self._closed and attempts >= CLOSE_FLUSH_ATTEMPTS:
+                        logger.exception("Gave up inserting %d queued reviews on shutdown", len(batch))
+                        self.failed += len(batch)
+                        return
+                    delay = min(self.retry_base * 2 ** (attempts - 1), self.retry_max)
+                    logger.exception("Failed to insert %d queued reviews, retrying in %.1f s", len(batch), delay)
+                    self.retries += 1
+                    await asyncio.sleep(delay)
+        finally:
+            # The reviewed pairs are no longer candidates for recommendation
+            if self.cache and self.flushed > flushed:
+                try:
+                    await self.cache.invalidate()
+                except Exception:
+                    logger.exception("Failed to invalidate the recommendation cache")
+            elapsed = time.perf_counter() - started
+            self.flushes += 1
+            self.flush_seconds_total += elapsed
+            self.flush_seconds_max = max(self.flush_seconds_max, elapsed)
+
+    async def _drop_missing_references(self, batch: List[ReviewEntity]) -> List[ReviewEntity]:
+        """
+        Returns the reviews of the batch whose location and category exist, dropping the others.
+        """
+        locations, categories = await self.repository.get_existing_references(
+            [review.rev_fk_loc_uuid for review in batch], [review.rev_fk_cat_uuid for review in batch]
+        )
+        valid = [review for review in batch
+                 if review.rev_fk_loc_uuid in locations and review.rev_fk_cat_uuid in categories]
+        if len(valid) < len(batch):
+            logger.warning("Dropped %d queued reviews referencing missing locations or categories",
+                           len(batch) - len(valid))
+            self.dropped += len(batch) - len(valid)
+        return valid
+
+    def stats(self) -> dict:
+        """
+        Returns the queue depth and the counters and flush latency of this process.
+        """
+        return {
+            "depth": self.queue.qsize(),
+            "capacity": self.queue.maxsize,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "retries": self.retries,
+            "failed": self.failed,
+            "flushes": self.flushes,
+            "flush_ms_avg": round(self.flush_seconds_total / self.flushes * 1000, 3) if self.flushes else 0.0,
+            "flush_ms_max": round(self.flush_seconds_max * 1000, 3),
+        }
+
+
+_queue: Optional[WriteBehindReviewRepository] = None
+
+
+def get_review_write_queue() -> Optional[WriteBehindReviewRepository]:
+    """
+    Returns the process-wide write-behind review repository, or None when
+    `REVIEW_WRITE_BEHIND_ENABLED` is off.
+    """
+    global _queue
+    if _queue is None and REVIEW_WRITE_BEHIND_ENABLED:
+        _queue = WriteBehindReviewRepository(ReviewRepository(), get_recommendation_cache())
+    return _queue
@@ -0,0 +1,86 @@
+import math
+import secrets
+from typing import Iterable, List
+from uuid import UUID
+import numpy as np
+
+# Multipliers of the splitmix64 finalizer
+MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+MIX_2 = np.uint64(0x94D049BB133111EB)
+
+LOW_64_BITS = (1 << 64) - 1
+
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    """
+    splitmix64 finalizer: spreads every bit of the 64-bit values over the whole result.
+    """
+    values = (values ^ (values >> np.uint64(30))) * MIX_1
+    values = (values ^ (values >> np.uint64(27))) * MIX_2
+    return values ^ (values >> np.uint64(31))
+
+
+class UUIDBloomFilter:
+    """
+    Bloom filter of UUIDs backed by a NumPy bit array.
+
+    `might_contain` never returns False for an added UUID, and returns True for a UUID never
+    added with probability `error_rate` while no more than `capacity` UUIDs were added. The
+    memory used is fixed by the capacity and the error rate: ~1.2 bytes per UUID at 1%.
+
+    UUIDs are hashed with a random per-process seed, so colliding UUIDs cannot be crafted from
+    outside. Several kinds of UUIDs can share a filter by passing a different `kind` for each.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        """
+        Initializes an empty filter.
+
+        :param capacity: Number of UUIDs the filter is sized for.
+        :param error_rate: False positive probability at full capacity.
+        """
+        bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.size = max(64, (bits + 63) // 64 * 64)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = np.zeros(self.size // 8, dtype=np.uint8)
+        self._seed = np.array([secrets.randbits(64), secrets.randbits(64)], dtype=np.uint64)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bits.nbytes
+
+    def add(self, uuids: Iterable[UUID], kind: int = 0) -> None:
+        """
+        Adds UUIDs to the filter.
+        """
+        indexes = self._indexes(list(uuids), kind)
+        if indexes.size:
+            self.count += len(indexes)
+            flat = indexes.ravel()
+            # `at` applies every index, including repeated bytes, unlike `|=` with fancy indexing
+            np.bitwise_or.at(self._bits, flat >> np.uint64(3), np.left_shift(1, flat & np.uint64(7)).astype(np.uint8))
+
+    def might_contain(self, uuids: Iterable[UUID], kind: int = 0) -> List[bool]:
+        """
+        Tells for each UUID whether it may have been added; False means it definitely was not.
+        """
+        indexes = self._indexes(list(uuids), kind)
+        if not indexes.size:
+            return []
+        bits = (self._bits[indexes >> np.uint64(3)] >> (indexes & np.uint64(7)).astype(np.uint8)) & 1
+        return bits.all(axis=1).tolist()
+
+    def _indexes(self, uuids: List[UUID], kind: int) -> np.ndarray:
+        """
+        Returns the `hashes` bit positions of every UUID, with double hashing: h1 + i * h2.
+        """
+        if not uuids:
+            return np.empty((0, self.hashes), dtype=np.uint64)
+        values = [uuid.int for uuid in uuids]
+        high = np.array([value >> 64 for value in values], dtype=np.uint64)
+        low = np.array([value & LOW_64_BITS for value in values], dtype=np.uint64)
+        h1 = _mix(high ^ self._seed[0] ^ _mix(low + np.uint64(kind)))
+        h2 = _mix(low ^ self._seed[1] ^ h1) | np.uint64(1)
+        steps = np.arange(self.hashes, dtype=np.uint64)
+        return (h1[:, None] + steps[None, :] * h2[:, None]) % np.uint64(self.size)
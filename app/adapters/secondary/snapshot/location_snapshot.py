@@ -0,0 +1,182 @@
+import asyncio
+import contextvars
+import logging
+import time
+from typing import Iterable, List, Optional, Tuple
+from uuid import UUID
+import numpy as np
+from app.adapters.secondary.orm.models import ModelLocation
+from app.core.domain import geo
+from app.main_app.config import LOCATION_SNAPSHOT_ENABLED, LOCATION_SNAPSHOT_MAX_AGE
+
+logger = logging.getLogger(__name__)
+
+# Initial number of locations the arrays can hold before growing
+INITIAL_CAPACITY = 1024
+
+
+class LocationSnapshot:
+    """
+    Read-side copy of the location coordinates, kept in contiguous NumPy arrays (radians), so
+    the distance from a point to every location is computed in a single vectorized pass.
+
+    The snapshot is loaded at startup and patched by `LocationRepository.save`, which only
+    covers the writes of its own process. The locations written or deleted by other processes
+    are picked up by reloading it in the background once it is older than `max_age` seconds, so
+    they are seen at most `max_age` seconds (plus the time of the reload) late.
+    """
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY, max_age: float = LOCATION_SNAPSHOT_MAX_AGE):
+        """
+        Initializes an empty snapshot.
+
+        :param capacity: Initial number of locations the arrays can hold.
+        :param max_age: Age, in seconds, after which the snapshot is reloaded. 0 never reloads it.
+        """
+        self.max_age = max_age
+        self.loaded = False
+        self.loaded_at: Optional[float] = None
+        self._refresh: Optional[asyncio.Task] = None
+        self._loading = False
+        self._added_while_loading: List[Tuple[UUID, float, float]] = []
+        self._reset(capacity)
+
+    def __len__(self) -> int:
+        return self._size
+
+    async def load(self) -> None:
+        """
+        Loads the coordinates of every location from the database, replacing the snapshot.
+        """
+        started = time.monotonic()
+        self._loading = True
+        try:
+            rows = await ModelLocation.filter(loc_lat__isnull=False, loc_long__isnull=False).values_list(
+                "loc_uuid", "loc_lat", "loc_long"
+            )
+            self.replace(rows)
+            # Locations saved while the query was running may be missing from its result
+            known = set(self._uuids)
+            for loc_uuid, lat, long in self._added_while_loading:
+                if loc_uuid not in known:
+                    self._append(loc_uuid, lat, long)
+        finally:
+            self._loading = False
+            self._added_while_loading = []
+        self.loaded = True
+        self.loaded_at = started
+
+    def refresh_if_expired(self) -> None:
+        """
+        Starts reloading the snapshot in the background if it is older than `max_age` seconds and
+        no reload is running. Lookups keep using the current snapshot meanwhile.
+        """
+        if not self.loaded or self.max_age <= 0 or time.monotonic() - self.loaded_at <= self.max_age:
+            return
+        if self._refresh is None or self._refresh.done():
+            # Started in an empty context, so its query is not counted in the request that started it
+            self._refresh = contextvars.Context().run(asyncio.get_running_loop().create_task, self._reload())
+
+    async def _reload(self) -> None:
+        """
+        Reloads the snapshot, logging errors: the current one keeps being used until a reload succeeds.
+        """
+        try:
+            await self.load()
+        except Exception:
+            logger.exception("Failed to reload the location snapshot")
+
+    def replace(self, rows: Iterable[Tuple[UUID, float, float]]) -> None:
+        """
+        Replaces the content of the snapshot with the given (loc_uuid, lat, long) rows.
+        """
+        rows = list(rows)
+        self._reset(max(INITIAL_CAPACITY, len(rows)))
+        for loc_uuid, lat, long in rows:
+            self._append(loc_uuid, lat, long)
+
+    def add(self, loc_uuid: UUID, lat, long) -> None:
+        """
+        Adds a newly saved location. Locations without coordinates are ignored.
+        """
+        if lat is None or long is None:
+            return
+        if self._loading:
+            self._added_while_loading.append((loc_uuid, lat, long))
+        self._append(loc_uuid, lat, long)
+
+    def distances_km(self, lat: float, long: float) -> np.ndarray:
+        """
+        Returns the haversine distance from the point to every location, in snapshot order.
+        """
+        phi = np.radians(lat)
+        lat_rad = self._lat[:self._size]
+        long_rad = self._long[:self._size]
+        a = (np.sin((lat_rad - phi) / 2) ** 2
+             + np.cos(phi) * self._cos_lat[:self._size] * np.sin((long_rad - np.radians(long)) / 2) ** 2)
+        return 2 * geo.EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+    def within_radius(self, lat: float, long: float, radius_km: float,
+                      limit: Optional[int] = None) -> List[Tuple[UUID, float]]:
+        """
+        Returns the (loc_uuid, distance) of the locations within a radius of the point, nearest first.
+        """
+        distances = self.distances_km(lat, long)
+        indexes = np.flatnonzero(distances <= radius_km)
+        return self._ranked(distances, indexes, limit)
+
+    def nearest(self, lat: float, long: float, k: int,
+                radius_km: Optional[float] = None) -> List[Tuple[UUID, float]]:
+        """
+        Returns the (loc_uuid, distance) of the k locations nearest to the point, optionally
+        within a maximum radius.
+        """
+        distances = self.distances_km(lat, long)
+        indexes = np.arange(self._size) if radius_km is None else np.flatnonzero(distances <= radius_km)
+        if len(indexes) > k:
+            # Only the k nearest candidates are sorted
+            indexes = indexes[np.argpartition(distances[indexes], k - 1)[:k]]
+        return self._ranked(distances, indexes, k)
+
+    def _ranked(self, distances: np.ndarray, indexes: np.ndarray, limit: Optional[int]) -> List[Tuple[UUID, float]]:
+        """
+        Sorts the selected locations by distance and pairs them with their UUID.
+        """
+        indexes = indexes[np.argsort(distances[indexes], kind="stable")][:limit]
+        return [(self._uuids[index], float(distances[index])) for index in indexes]
+
+    def _reset(self, capacity: int) -> None:
+        self._uuids: List[UUID] = []
+        self._lat = np.empty(capacity, dtype=np.float64)
+        self._long = np.empty(capacity, dtype=np.float64)
+        self._cos_lat = np.empty(capacity, dtype=np.float64)
+        self._size = 0
+
+    def _append(self, loc_uuid: UUID, lat, long) -> None:
+        if self._size == len(self._lat):
+            # Double the arrays, so appending stays amortized O(1)
+            capacity = 2 * len(self._lat)
+            for name in ("_lat", "_long", "_cos_lat"):
+                grown = np.empty(capacity, dtype=np.float64)
+                grown[:self._size] = getattr(self, name)[:self._size]
+                setattr(self, name, grown)
+        lat_rad = np.radians(float(lat))
+        self._uuids.append(loc_uuid)
+        self._lat[self._size] = lat_rad
+        self._long[self._size] = np.radians(float(long))
+        self._cos_lat[self._size] = np.cos(lat_rad)
+        self._size += 1
+
+
+# Process-wide snapshot, created on first use
+_snapshot: Optional[LocationSnapshot] = None
+
+
+def get_location_snapshot() -> Optional[LocationSnapshot]:
+    """
+    Returns the process-wide location snapshot, or None when `LOCATION_SNAPSHOT_ENABLED` is off.
+    """
+    global _snapshot
+    if _snapshot is None and LOCATION_SNAPSHOT_ENABLED:
+        _snapshot = LocationSnapshot()
+    return _snapshot
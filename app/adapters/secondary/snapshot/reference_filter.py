@@ -0,0 +1,213 @@
+import asyncio
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, List, Optional, Set, Tuple
+from uuid import UUID
+from app.adapters.secondary.orm.models import ModelCategory, ModelLocation
+from app.adapters.secondary.orm.repositories.review_repository import ReviewRepository
+from app.adapters.secondary.snapshot.bloom_filter import UUIDBloomFilter
+from app.core.domain.ports.reference_filter_ports import ReferenceFilterPort
+from app.main_app.config import (
+    REFERENCE_FILTER_ENABLED, REFERENCE_FILTER_CAPACITY, REFERENCE_FILTER_ERROR_RATE, REFERENCE_FILTER_LRU_SIZE,
+    REFERENCE_FILTER_REFRESH_SECONDS
+)
+
+# Kinds of UUIDs sharing the Bloom filter
+LOCATION = 0
+CATEGORY = 1
+
+# Number of UUIDs read per query while loading
+LOAD_BATCH_SIZE = 100000
+
+# Tables read by the loads: model, UUID field, creation date field and kind
+SOURCES = ((ModelLocation, "loc_uuid", "loc_created", LOCATION), (ModelCategory, "cat_uuid", "cat_created", CATEGORY))
+
+# Creation dates come from the clock of the process that wrote the row, and rows become visible
+# when their transaction commits: each refresh reads back this far before the previous load
+REFRESH_OVERLAP = timedelta(seconds=60)
+
+# Confirms which of the (location, category) UUIDs exist, e.g. ReviewRepository.get_existing_references
+Confirm = Callable[[List[UUID], List[UUID]], Awaitable[Tuple[Set[UUID], Set[UUID]]]]
+
+
+class ReferenceFilter(ReferenceFilterPort):
+    """
+    In-process filter of the location and category UUIDs that exist.
+
+    A Bloom filter answers "definitely unknown" without any query, and those rejections are
+    trusted. UUIDs it may contain are looked up in a small LRU of UUIDs confirmed to exist, and
+    only the remaining ones are confirmed with the database, in a single query.
+
+    The filter is loaded once at startup and updated by the location and category repositories
+    of its own process. The locations and categories written by other processes are added by an
+    incremental load of the rows created since the previous load, run before a check once the
+    filter is older than `refresh_seconds`, so they are rejected at most `refresh_seconds` after
+    being created.
+    """
+
+    def __init__(self, confirm: Confirm, capacity: int = REFERENCE_FILTER_CAPACITY,
+                 error_rate: float = REFERENCE_FILTER_ERROR_RATE, lru_size: int = REFERENCE_FILTER_LRU_SIZE,
+                 refresh_seconds: float = REFERENCE_FILTER_REFRESH_SECONDS):
+        """
+        Initializes an empty filter.
+
+        :param confirm: Function confirming with the database which UUIDs exist.
+        :param capacity: Number of UUIDs the Bloom filter is sized for.
+        :param error_rate: False positive probability of the Bloom filter at full capacity.
+        :param lru_size: Number of UUIDs confirmed to exist remembered.
+        :param refresh_seconds: Age, in seconds, after which the rows created by other processes are
+                                loaded. 0 never loads them, which is only right with a single process.
+        """
+        self.confirm = confirm
+        self.bloom = UUIDBloomFilter(capacity, error_rate)
+        self.lru_size = lru_size
+        self.refresh_seconds = refresh_seconds
+        self.loaded = False
+        self.loaded_at: Optional[float] = None
+        self._confirmed: "OrderedDict[Tuple[int, UUID], None]" = OrderedDict()
+        # Creation date from which the next refresh reads the rows
+        self._created_since: Optional[datetime] = None
+        self._refresh: Optional[asyncio.Future] = None
+
+        # Counters reported by stats()
+        self.rejected = 0
+        self.lru_hits = 0
+        self.confirmations = 0
+        self.refreshes = 0
+
+    async def load(self) -> None:
+        """
+        Adds every location and category UUID in the database to the Bloom filter, in batches.
+        """
+        started_at, started = time.monotonic(), datetime.utcnow()
+        for model, field, _, kind in SOURCES:
+            last = None
+            while True:
+                query = model.all() if last is None else model.filter(**{f"{field}__gt": last})
+                uuids = await query.order_by(field).limit(LOAD_BATCH_SIZE).values_list(field, flat=True)
+                self.bloom.add(uuids, kind)
+                if len(uuids) < LOAD_BATCH_SIZE:
+                    break
+                last = uuids[-1]
+        self._created_since = started - REFRESH_OVERLAP
+        self.loaded = True
+        self.loaded_at = started_at
+
+    async def refresh(self) -> None:
+        """
+        Adds the UUIDs of the locations and categories created since the previous load, read from
+        the index on their creation date.
+        """
+        started_at, started = time.monotonic(), datetime.utcnow()
+        for model, field, created_field, kind in SOURCES:
+            uuids = await model.filter(**{f"{created_field}__gte": self._created_since}).values_list(field, flat=True)
+            # Rows read back by the overlap are already in the filter
+            self.bloom.add([value for value, found in zip(uuids, self.bloom.might_contain(uuids, kind)) if not found],
+                           kind)
+        self._created_since = started - REFRESH_OVERLAP
+        self.loaded_at = started_at
+        self.refreshes += 1
+
+    async def refresh_if_expired(self) -> None:
+        """
+        Refreshes the filter if it is older than `refresh_seconds`. Concurrent checks wait for the
+        same refresh.
+        """
+        if not self.loaded or self.refresh_seconds <= 0 or time.monotonic() - self.loaded_at <= self.refresh_seconds:
+            return
+        if self._refresh is None or self._refresh.done():
+            self._refresh = asyncio.ensure_future(self.refresh())
+        await asyncio.shield(self._refresh)
+
+    def add_locations(self, loc_uuids: List[UUID]) -> None:
+        """
+        Adds newly saved locations.
+        """
+        self.bloom.add(loc_uuids, LOCATION)
+
+    def add_categories(self, cat_uuids: List[UUID]) -> None:
+        """
+        Adds newly saved categories.
+        """
+        self.bloom.add(cat_uuids, CATEGORY)
+
+    async def missing_references(self, loc_uuids: List[UUID],
+                                 cat_uuids: List[UUID]) -> Tuple[Set[UUID], Set[UUID]]:
+        """
+        Retrieve which of the location and category UUIDs do not exist. UUIDs rejected by the
+        Bloom filter or found in the LRU cost no query; the others are confirmed in one query.
+        """
+        await self.refresh_if_expired()
+        loc_unknown, missing_locations = self._check(set(loc_uuids), LOCATION)
+        cat_unknown, missing_categories = self._check(set(cat_uuids), CATEGORY)
+        if loc_unknown or cat_unknown:
+            self.confirmations += 1
+            locations, categories = await self.confirm(list(loc_unknown), list(cat_unknown))
+            for kind, unknown, existing, missing in ((LOCATION, loc_unknown, locations, missing_locations),
+                                                     (CATEGORY, cat_unknown, categories, missing_categories)):
+                for value in unknown:
+                    if value in existing:
+                        self._remember(kind, value)
+                    else:
+                        missing.add(value)
+        return missing_locations, missing_categories
+
+    def _check(self, uuids: Set[UUID], kind: int) -> Tuple[Set[UUID], Set[UUID]]:
+        """
+        Splits the UUIDs into those to confirm with the database and those that do not exist.
+        """
+        uuids = list(uuids)
+        if self.loaded:
+            maybe = self.bloom.might_contain(uuids, kind)
+            missing = {value for value, found in zip(uuids, maybe) if not found}
+            self.rejected += len(missing)
+        else:
+            # Until the filter is loaded every UUID may exist
+            missing = set()
+        unknown = set()
+        for value in uuids:
+            if value in missing:
+                continue
+            if (kind, value) in self._confirmed:
+                self._confirmed.move_to_end((kind, value))
+                self.lru_hits += 1
+            else:
+                unknown.add(value)
+        return unknown, missing
+
+    def _remember(self, kind: int, value: UUID) -> None:
+        """
+        Remembers a UUID confirmed to exist, evicting the least recently used one when full.
+        """
+        self._confirmed[(kind, value)] = None
+        if len(self._confirmed) > self.lru_size:
+            self._confirmed.popitem(last=False)
+
+    def stats(self) -> dict:
+        """
+        Returns the size of the filter and the counters of this process.
+        """
+        return {
+            "loaded": self.loaded,
+            "entries": self.bloom.count,
+            "bytes": self.bloom.nbytes,
+            "rejected": self.rejected,
+            "lru_hits": self.lru_hits,
+            "confirmations": self.confirmations,
+            "refresh_seconds": self.refresh_seconds,
+            "refreshes": self.refreshes,
+        }
+
+
+_filter: Optional[ReferenceFilter] = None
+
+
+def get_reference_filter() -> Optional[ReferenceFilter]:
+    """
+    Returns the process-wide reference filter, or None when `REFERENCE_FILTER_ENABLED` is off.
+    """
+    global _filter
+    if _filter is None and REFERENCE_FILTER_ENABLED:
+        _filter = ReferenceFilter(ReviewRepository().get_existing_references)
+    return _filter
@@ -0,0 +1,77 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent executions of the same computation.
+
+    While a computation identified by a key is in flight, further calls with the same key await
+    the same task instead of starting their own. Optionally, calls arriving while a refresh is in
+    flight are answered immediately with the previous result, as long as it is not older than
+    `stale_seconds`.
+
+    Previous results are only kept when `stale_seconds` is positive, and only while they can
+    still be served: the expired ones are evicted whenever a computation completes.
+    """
+
+    def __init__(self, stale_seconds: float = 0.0):
+        """
+        Initializes the coalescer.
+
+        :param stale_seconds: Maximum age, in seconds, of a previous result served while a refresh
+                              is in flight. 0 disables serving stale results.
+        """
+        self.stale_seconds = stale_seconds
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        # Ordered by completion time, oldest first, so the expired results are at the front
+        self._last_results: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+
+    async def do(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Returns the result of `compute()`, sharing a single execution among concurrent callers.
+
+        :param key: Identifies the computation; calls with equal keys are coalesced.
+        :param compute: Coroutine function performing the computation.
+        :return: The result of the computation (or a recent previous result, see `stale_seconds`).
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._run(key, compute))
+            self._in_flight[key] = task
+        elif self.stale_seconds > 0 and key in self._last_results:
+            # A refresh is in flight: serve the previous result if it is recent enough
+            result, completed_at = self._last_results[key]
+            if time.monotonic() - completed_at <= self.stale_seconds:
+                return result
+            del self._last_results[key]
+
+        # Shield the shared task so a cancelled caller does not cancel it for the others
+        return await asyncio.shield(task)
+
+    async def _run(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Runs the computation, records its result and releases the key.
+        """
+        try:
+            result = await compute()
+            if self.stale_seconds > 0:
+                now = time.monotonic()
+                self._last_results.pop(key, None)
+                self._last_results[key] = (result, now)
+                self._evict_expired(now)
+            return result
+        finally:
+            self._in_flight.pop(key, None)
+
+    def _evict_expired(self, now: float) -> None:
+        """
+        Removes the previous results older than `stale_seconds`, which can no longer be served.
+        """
+        while self._last_results:
+            key, (_, completed_at) = next(iter(self._last_results.items()))
+            if now - completed_at <= self.stale_seconds:
+                break
+            del self._last_results[key]
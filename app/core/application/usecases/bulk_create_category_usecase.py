@@ -0,0 +1,59 @@
+from typing import List, Optional, Union
+from app.core.domain.entities.category_entity import CategoryEntity
+from app.core.domain.ports.category_ports import CategoryRepositoryPort
+from app.core.domain.ports.recommendation_cache_ports import RecommendationCachePort
+from app.core.domain.exceptions.exceptions import DuplicateCategoryError
+
+
+class BulkCreateCategoriesUseCase:
+    """
+    Use case for creating many categories at once.
+    """
+
+    def __init__(self, repository: CategoryRepositoryPort, cache: Optional[RecommendationCachePort] = None):
+        """
+        Initializes the use case with the provided category repository.
+
+        Args:
+            repository: Category repository for fetching and saving data.
+            cache: Optional recommendation cache, invalidated when categories are created.
+        """
+        self.repository = repository
+        self.cache = cache
+
+    async def execute(self, descriptions: List[str]) -> List[Union[CategoryEntity, DuplicateCategoryError]]:
+        """
+        Creates a category for every description that does not exist yet.
+        Existing descriptions are checked with a single lookup for the whole batch.
+
+        Args:
+            descriptions: Category descriptions to be created.
+
+        Returns:
+            One result per description, in order: the created CategoryEntity, or a
+            DuplicateCategoryError when the description already exists or is repeated in the batch.
+        """
+        taken = await self.repository.get_existing_descriptions(list(set(descriptions)))
+
+        results = []
+        for description in descriptions:
+            if description in taken:
+                results.append(DuplicateCategoryError("A category with this description already exists."))
+                continue
+            taken.add(description)
+            results.append(CategoryEntity.create(description))
+
+        # Categories created by another request meanwhile are reported as duplicates
+        pending = [result for result in results if isinstance(result, CategoryEntity)]
+        saved = {category.cat_uuid for category in await self.repository.save_many(pending)}
+        results = [
+            result if isinstance(result, DuplicateCategoryError) or result.cat_uuid in saved
+            else DuplicateCategoryError("A category with this description already exists.")
+            for result in results
+        ]
+
+        # New categories mean new location-category pairs to recommend
+        if saved and self.cache:
+            await self.cache.invalidate()
+
+        return results
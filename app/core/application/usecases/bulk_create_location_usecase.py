@@ -0,0 +1,53 @@
+from decimal import Decimal
+from typing import List, Optional, Tuple, Union
+from app.core.domain.entities.location_entity import LocationEntity
+from app.core.domain.ports.location_ports import LocationRepositoryPort
+from app.core.domain.ports.recommendation_cache_ports import RecommendationCachePort
+from app.core.domain.exceptions.exceptions import DuplicateLocationError
+
+
+class BulkCreateLocationsUseCase:
+    """
+    Use case for creating many locations at once.
+    """
+
+    def __init__(self, repository: LocationRepositoryPort, cache: Optional[RecommendationCachePort] = None):
+        """
+        Initializes the use case with the provided location repository and an optional
+        recommendation cache, invalidated when locations are created.
+        """
+        self.repository = repository
+        self.cache = cache
+
+    async def execute(self, locations: List[Tuple[str, Decimal, Decimal]]) -> List[Union[LocationEntity, DuplicateLocationError]]:
+        """
+        Creates a location for every (description, lat, long) whose description does not exist yet.
+        Existing descriptions are checked with a single lookup for the whole batch.
+
+        Returns one result per location, in order: the created LocationEntity, or a
+        DuplicateLocationError when the description already exists or is repeated in the batch.
+        """
+        taken = await self.repository.get_existing_descriptions(list({description for description, _, _ in locations}))
+
+        results = []
+        for description, lat, long in locations:
+            if description in taken:
+                results.append(DuplicateLocationError("A location with this description already exists."))
+                continue
+            taken.add(description)
+            results.append(LocationEntity.create(description, lat, long))
+
+        # Locations created by another request meanwhile are reported as duplicates
+        pending = [result for result in results if isinstance(result, LocationEntity)]
+        saved = {location.loc_uuid for location in await self.repository.save_many(pending)}
+        results = [
+            result if isinstance(result, DuplicateLocationError) or result.loc_uuid in saved
+            else DuplicateLocationError("A location with this description already exists.")
+            for result in results
+        ]
+
+        # New locations mean new location-category pairs to recommend
+        if saved and self.cache:
+            await self.cache.invalidate()
+
+        return results
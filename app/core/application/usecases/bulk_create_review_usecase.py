@@ -0,0 +1,53 @@
+from typing import List, Optional, Tuple, Union
+from uuid import UUID
+from app.core.domain.entities.review_entity import ReviewEntity
+from app.core.domain.ports.review_ports import ReviewRepositoryPort
+from app.core.domain.ports.recommendation_cache_ports import RecommendationCachePort
+from app.core.domain.exceptions.exceptions import CategoryNotFoundError, LocationNotFoundError
+
+
+class BulkCreateReviewsUseCase:
+    """
+    Use case for creating many reviews at once.
+    """
+
+    def __init__(self, repository: ReviewRepositoryPort, cache: Optional[RecommendationCachePort] = None):
+        """
+        Initializes the use case with the provided review repository and an optional
+        recommendation cache, invalidated when reviews are created.
+        """
+        self.repository = repository
+        self.cache = cache
+
+    async def execute(self, reviews: List[Tuple[str, UUID, UUID, Optional[str]]]
+                      ) -> List[Union[ReviewEntity, LocationNotFoundError, CategoryNotFoundError]]:
+        """
+        Creates a review for every (recommendation, cat_uuid, loc_uuid, obs) whose location and
+        category exist. The references of the whole batch are checked with one lookup per table.
+
+        Returns one result per review, in order: the created ReviewEntity, or the error of a
+        missing location or category.
+        """
+        locations, categories = await self.repository.get_existing_references(
+            [loc_uuid for _, _, loc_uuid, _ in reviews], [cat_uuid for _, cat_uuid, _, _ in reviews]
+        )
+
+        results = []
+        for recommendation, cat_uuid, loc_uuid, obs in reviews:
+            if loc_uuid not in locations:
+                results.append(LocationNotFoundError(f"Location {loc_uuid} not found."))
+            elif cat_uuid not in categories:
+                results.append(CategoryNotFoundError(f"Category {cat_uuid} not found."))
+            else:
+                results.append(ReviewEntity.create(recommendation=recommendation, loc_uuid=loc_uuid,
+                                                   cat_uuid=cat_uuid, obs=obs))
+
+        # Save the valid reviews of the batch
+        created = [result for result in results if isinstance(result, ReviewEntity)]
+        await self.repository.save_many(created)
+
+        # The reviewed pairs are no longer candidates for recommendation
+        if created and self.cache:
+            await self.cache.invalidate()
+
+        return results
@@ -1,5 +1,7 @@
+from typing import Optional
 from app.core.domain.entities.category_entity import CategoryEntity
 from app.core.domain.ports.category_ports import CategoryRepositoryPort
+from app.core.domain.ports.recommendation_cache_ports import RecommendationCachePort
 from app.core.domain.exceptions.exceptions import DuplicateCategoryError
 
 class CreateCategoryUseCase:
@@ -7,14 +9,16 @@ class CreateCategoryUseCase:
     Use case for creating a new category.
     """
 
-    def __init__(self, repository: CategoryRepositoryPort):
+    def __init__(self, repository: CategoryRepositoryPort, cache: Optional[RecommendationCachePort] = None):
         """
         Initializes the use case with the provided category repository.
 
         Args:
             repository: Category repository for fetching and saving data.
+            cache: Optional recommendation cache, invalidated when a category is created.
         """
         self.repository = repository
+        self.cache = cache
 
     async def execute(self, description: str) -> CategoryEntity:
         """
@@ -29,13 +33,13 @@ class CreateCategoryUseCase:
         Raises:
             DuplicateCategoryError: If a category with the same description exists.
         """
-        # Check if the category already exists
-        existing_category = await self.repository.get_by_description(description)
-        if existing_category:
+        # Create the new category and save it unless the description is taken, in one statement
+        category = CategoryEntity.create(description)
+        if not await self.repository.create_if_absent(category):
             raise DuplicateCategoryError("A category with this description already exists.")
 
-        # Create and save the new category
-        category = CategoryEntity.create(description)
-        await self.repository.save(category)
+        # New category means new location-category pairs to recommend
+        if self.cache:
+            await self.cache.invalidate()
 
         return category
@@ -1,7 +1,9 @@
 from app.core.domain.entities.location_entity import LocationEntity
 from app.core.domain.ports.location_ports import LocationRepositoryPort
+from app.core.domain.ports.recommendation_cache_ports import RecommendationCachePort
 from app.core.domain.exceptions.exceptions import DuplicateLocationError
 from decimal import Decimal
+from typing import Optional
 
 
 class CreateLocationUseCase:
@@ -9,24 +11,26 @@ class CreateLocationUseCase:
     Use case for creating a new location.
     """
 
-    def __init__(self, repository: LocationRepositoryPort):
+    def __init__(self, repository: LocationRepositoryPort, cache: Optional[RecommendationCachePort] = None):
         """
-        Initializes the use case with the provided location repository.
+        Initializes the use case with the provided location repository and an optional
+        recommendation cache, invalidated when a location is created.
         """
         self.repository = repository
+        self.cache = cache
 
     async def execute(self, description: str, lat: Decimal, long: Decimal) -> LocationEntity:
         """
         Creates a new location if no location exists with the given description.
         """
-        # Check if location exists
-        existing_location = await self.repository.get_by_description(description)
-        if existing_location:
+        # Create the new location unless the description is taken: one insert, plus its map clusters when created
+        location = LocationEntity.create(description, lat, long)
+        if not await self.repository.create_if_absent(location):
             raise DuplicateLocationError("A location with this description already exists.")
 
-        # Create and save the new location
-        location = LocationEntity.create(description, lat, long)
-        await self.repository.save(location)
+        # New location means new location-category pairs to recommend
+        if self.cache:
+            await self.cache.invalidate()
 
         return location
 
@@ -2,6 +2,9 @@ from typing import Optional
 from uuid import UUID
 from app.core.domain.entities.review_entity import ReviewEntity
 from app.core.domain.ports.review_ports import ReviewRepositoryPort
+from app.core.domain.ports.recommendation_cache_ports import RecommendationCachePort
+from app.core.domain.ports.reference_filter_ports import ReferenceFilterPort
+from app.core.domain.exceptions.exceptions import CategoryNotFoundError, LocationNotFoundError
 
 
 class CreateReviewUseCase:
@@ -9,17 +12,32 @@ class CreateReviewUseCase:
     Use case for creating a review.
     """
 
-    def __init__(self, repository: ReviewRepositoryPort):
+    def __init__(self, repository: ReviewRepositoryPort, cache: Optional[RecommendationCachePort] = None,
+                 references: Optional[ReferenceFilterPort] = None):
         """
-        Initializes the use case with the provided review repository.
+        Initializes the use case with the provided review repository, an optional
+        recommendation cache, invalidated when a review is created, and an optional filter
+        rejecting reviews of unknown locations or categories before they are saved.
         """
         self.repository = repository
+        self.cache = cache
+        self.references = references
 
     async def execute(self, recommendation: str, cat_uuid: UUID, loc_uuid: UUID,
                       obs: Optional[str] = "") -> ReviewEntity:
         """
         Creates a new review and saves it to the database.
+
+        :raises LocationNotFoundError: If the location does not exist.
+        :raises CategoryNotFoundError: If the category does not exist.
         """
+        if self.references:
+            missing_locations, missing_categories = await self.references.missing_references([loc_uuid], [cat_uuid])
+            if missing_locations:
+                raise LocationNotFoundError(f"Location {loc_uuid} not found.")
+            if missing_categories:
+                raise CategoryNotFoundError(f"Category {cat_uuid} not found.")
+
         # Create the review entity using provided information
         reviewed = ReviewEntity.create(
             recommendation=recommendation,
@@ -30,5 +48,10 @@ class CreateReviewUseCase:
 
         # Save the review entity to the database
         await self.repository.save(reviewed)
+
+        # The reviewed pair is no longer a candidate for recommendation
+        if self.cache:
+            await self.cache.invalidate()
+
         return reviewed
 
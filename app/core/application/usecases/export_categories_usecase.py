@@ -0,0 +1,22 @@
+from typing import AsyncIterator, List, Optional
+from app.core.domain.entities.category_entity import CategoryEntity
+from app.core.domain.ports.category_ports import CategoryRepositoryPort
+
+
+class ExportCategoriesUseCase:
+    """
+    Use case for exporting every category.
+    """
+
+    def __init__(self, repository: CategoryRepositoryPort):
+        """
+        Initializes the use case with the provided category repository.
+        """
+        self.repository = repository
+
+    def execute(self, status: Optional[bool] = None) -> AsyncIterator[List[CategoryEntity]]:
+        """
+        Iterates over every category, oldest first, optionally only those with the given status,
+        in chunks, without loading them all at once.
+        """
+        return self.repository.export(status)
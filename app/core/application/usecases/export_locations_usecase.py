@@ -0,0 +1,22 @@
+from typing import AsyncIterator, List, Optional
+from app.core.domain.entities.location_entity import LocationEntity
+from app.core.domain.ports.location_ports import LocationRepositoryPort
+
+
+class ExportLocationsUseCase:
+    """
+    Use case for exporting every location.
+    """
+
+    def __init__(self, repository: LocationRepositoryPort):
+        """
+        Initializes the use case with the provided location repository.
+        """
+        self.repository = repository
+
+    def execute(self, status: Optional[bool] = None) -> AsyncIterator[List[LocationEntity]]:
+        """
+        Iterates over every location, oldest first, optionally only those with the given status,
+        in chunks, without loading them all at once.
+        """
+        return self.repository.export(status)
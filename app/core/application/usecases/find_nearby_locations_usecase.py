@@ -0,0 +1,27 @@
+from typing import List, Optional, Tuple
+from app.core.domain.entities.location_entity import LocationEntity
+from app.core.domain.ports.location_ports import LocationRepositoryPort
+
+
+class FindNearbyLocationsUseCase:
+    """
+    Use case for finding the locations near a point.
+    """
+
+    def __init__(self, repository: LocationRepositoryPort):
+        """
+        Initializes the use case with the provided location repository.
+        """
+        self.repository = repository
+
+    async def execute(self, lat: float, long: float, radius_km: Optional[float] = None, k: Optional[int] = None,
+                      limit: int = 100) -> List[Tuple[LocationEntity, float]]:
+        """
+        Finds the locations near a point, nearest first.
+
+        When `k` is provided, returns the k nearest locations (within `radius_km` if provided).
+        Otherwise returns up to `limit` locations within `radius_km`.
+        """
+        if k is not None:
+            return await self.repository.find_nearest(lat, long, k, radius_km)
+        return await self.repository.find_within_radius(lat, long, radius_km, limit)
@@ -0,0 +1,21 @@
+from typing import List
+from app.core.domain.entities.location_cluster_entity import LocationClusterEntity
+from app.core.domain.ports.location_cluster_ports import LocationClusterRepositoryPort
+
+
+class GetLocationTileUseCase:
+    """
+    Use case for retrieving the clustered locations of a map tile.
+    """
+
+    def __init__(self, repository: LocationClusterRepositoryPort):
+        """
+        Initializes the use case with the provided location cluster repository.
+        """
+        self.repository = repository
+
+    async def execute(self, zoom: int, x: int, y: int, include_stale: bool = False) -> List[LocationClusterEntity]:
+        """
+        Retrieves the clusters of the tile, optionally with the number of pairs needing a review.
+        """
+        return await self.repository.get_tile(zoom, x, y, include_stale)
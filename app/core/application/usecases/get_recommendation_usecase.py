@@ -1,22 +1,42 @@
 from app.core.domain.ports.recommendation_ports import RecommendationRepositoryPort
 from app.core.domain.entities.recomendation_entity import RecommendationEntity
-from typing import List
+from app.core.domain.entities.recommendation_cursor_entity import RecommendationCursor
+from app.core.application.single_flight import SingleFlight
+from typing import List, Optional
+from uuid import UUID
 
 class GetRecommendationsUseCase:
     """
     Use case for retrieving recommendations.
     """
 
-    def __init__(self, repository: RecommendationRepositoryPort):
+    def __init__(self, repository: RecommendationRepositoryPort, single_flight: Optional[SingleFlight] = None):
         """
-        Initializes the use case with the provided recommendation repository.
+        Initializes the use case with the provided recommendation repository and an optional
+        SingleFlight shared between requests, used to coalesce concurrent computations.
         """
         self.repository = repository
+        self.single_flight = single_flight
 
-    async def execute(self) -> List[RecommendationEntity]:
+    async def execute(self, limit: int = 100, after: Optional[RecommendationCursor] = None,
+                      category: Optional[UUID] = None, location: Optional[UUID] = None,
+                      bandera: Optional[int] = None, lat: Optional[float] = None, long: Optional[float] = None,
+                      radius_km: Optional[float] = None) -> List[RecommendationEntity]:
         """
-        Executes the use case to retrieve recommendations from the repository.
+        Executes the use case to retrieve a page of recommendations from the repository.
+        When a point (`lat`, `long`) is given, only locations within `radius_km` of it are
+        recommended, nearest first within each bandera.
+        Concurrent identical requests share a single repository call when a SingleFlight is provided.
         """
-        return await self.repository.get_recommendations()
+        def compute():
+            return self.repository.get_recommendations(
+                limit=limit, after=after, category=category, location=location, bandera=bandera,
+                lat=lat, long=long, radius_km=radius_km
+            )
 
+        if self.single_flight is None:
+            return await compute()
 
+        key = ("recommendations", limit, str(after) if after else None, category, location, bandera,
+               lat, long, radius_km)
+        return await self.single_flight.do(key, compute)
@@ -0,0 +1,38 @@
+from typing import List, Optional
+from uuid import UUID
+from app.core.domain.entities.review_cursor_entity import ReviewCursor
+from app.core.domain.entities.review_entity import ReviewEntity
+from app.core.domain.ports.review_history_ports import ReviewHistoryPort
+
+
+class GetReviewHistoryUseCase:
+    """
+    Use case for retrieving the review history of a location or location-category pair.
+    """
+
+    def __init__(self, repository: ReviewHistoryPort, archive: Optional[ReviewHistoryPort] = None):
+        """
+        Initializes the use case with the provided review history sources.
+
+        :param repository: Source of the reviews, e.g. the database.
+        :param archive: Optional second source, e.g. the cold archive of old reviews.
+        """
+        self.repository = repository
+        self.archive = archive
+
+    async def execute(self, location: UUID, category: Optional[UUID] = None, limit: int = 100,
+                      after: Optional[ReviewCursor] = None) -> List[ReviewEntity]:
+        """
+        Retrieves a page of reviews, newest first, starting right after the cursor.
+
+        With an archive, each source returns its own page and both are merged, so the pages keep
+        the history order across the database and the archive. A review present in both (while it
+        is being archived) is returned once.
+        """
+        reviews = await self.repository.get_reviews(location, category, limit, after)
+        if self.archive is None:
+            return reviews
+
+        merged = {review.rev_uuid: review for review in await self.archive.get_reviews(location, category, limit, after)}
+        merged.update((review.rev_uuid, review) for review in reviews)
+        return sorted(merged.values(), key=ReviewCursor.sort_key)[:limit]
@@ -0,0 +1,67 @@
+from typing import AsyncIterable, Optional, Tuple
+from uuid import UUID
+from app.core.application.usecases.bulk_create_review_usecase import BulkCreateReviewsUseCase
+from app.core.domain.entities.import_summary_entity import ImportSummaryEntity
+from app.core.domain.ports.review_ports import ReviewRepositoryPort
+from app.core.domain.ports.recommendation_cache_ports import RecommendationCachePort
+
+# Number of rows inserted per batch
+IMPORT_BATCH_SIZE = 1000
+
+# A review to import: (recommendation, cat_uuid, loc_uuid, obs)
+ImportedReview = Tuple[str, UUID, UUID, Optional[str]]
+
+
+class ImportReviewsUseCase:
+    """
+    Use case for importing a stream of reviews of any length.
+    """
+
+    def __init__(self, repository: ReviewRepositoryPort, cache: Optional[RecommendationCachePort] = None,
+                 batch_size: int = IMPORT_BATCH_SIZE):
+        """
+        Initializes the use case with the provided review repository, an optional recommendation
+        cache invalidated once the import ends, and the number of rows inserted per batch.
+        """
+        self.repository = repository
+        self.cache = cache
+        self.batch_size = batch_size
+
+    async def execute(self, rows: AsyncIterable[Tuple[int, ImportedReview]],
+                      summary: Optional[ImportSummaryEntity] = None) -> ImportSummaryEntity:
+        """
+        Imports the (line, review) rows in batches of `batch_size`.
+
+        Each batch is inserted before the next row is read, so the stream is only consumed as
+        fast as the database accepts it and at most one batch is held in memory.
+
+        :param rows: The rows to import, with their line number in the imported file.
+        :param summary: The summary to fill, which may already hold rows rejected by the caller.
+        :return: The summary of accepted and rejected rows.
+        """
+        summary = summary if summary is not None else ImportSummaryEntity()
+        batch = []
+        async for line, review in rows:
+            batch.append((line, review))
+            if len(batch) >= self.batch_size:
+                await self._insert(batch, summary)
+                batch = []
+        if batch:
+            await self._insert(batch, summary)
+
+        # The imported pairs are no longer candidates for recommendation
+        if summary.accepted and self.cache:
+            await self.cache.invalidate()
+
+        return summary
+
+    async def _insert(self, batch, summary: ImportSummaryEntity) -> None:
+        """
+        Inserts a batch, rejecting the rows whose location or category does not exist.
+        """
+        results = await BulkCreateReviewsUseCase(self.repository).execute([review for _, review in batch])
+        for (line, _), result in zip(batch, results):
+            if isinstance(result, Exception):
+                summary.reject(line, {"_schema": [str(result)]})
+            else:
+                summary.accept()
@@ -0,0 +1,24 @@
+from typing import List, Optional
+from app.core.domain.entities.catalog_cursor_entity import CatalogCursor
+from app.core.domain.entities.category_entity import CategoryEntity
+from app.core.domain.ports.category_ports import CategoryRepositoryPort
+
+
+class ListCategoriesUseCase:
+    """
+    Use case for listing the categories one page at a time.
+    """
+
+    def __init__(self, repository: CategoryRepositoryPort):
+        """
+        Initializes the use case with the provided category repository.
+        """
+        self.repository = repository
+
+    async def execute(self, status: Optional[bool] = None, limit: int = 100,
+                      after: Optional[CatalogCursor] = None) -> List[CategoryEntity]:
+        """
+        Retrieves the page of categories starting right after the cursor, oldest first, optionally
+        only those with the given status.
+        """
+        return await self.repository.get_page(status, limit, after)
@@ -0,0 +1,24 @@
+from typing import List, Optional
+from app.core.domain.entities.catalog_cursor_entity import CatalogCursor
+from app.core.domain.entities.location_entity import LocationEntity
+from app.core.domain.ports.location_ports import LocationRepositoryPort
+
+
+class ListLocationsUseCase:
+    """
+    Use case for listing the locations one page at a time.
+    """
+
+    def __init__(self, repository: LocationRepositoryPort):
+        """
+        Initializes the use case with the provided location repository.
+        """
+        self.repository = repository
+
+    async def execute(self, status: Optional[bool] = None, limit: int = 100,
+                      after: Optional[CatalogCursor] = None) -> List[LocationEntity]:
+        """
+        Retrieves the page of locations starting right after the cursor, oldest first, optionally
+        only those with the given status.
+        """
+        return await self.repository.get_page(status, limit, after)
@@ -0,0 +1,20 @@
+from uuid import UUID
+from datetime import datetime
+
+
+class CatalogCursor:
+    """
+    Represents a position in the listing of the locations or the categories, ordered by
+    (creation date, UUID). A cursor holds those values for the last item of a page, so the next
+    page starts right after it.
+    """
+
+    def __init__(self, created: datetime, uuid: UUID):
+        """
+        Initializes a CatalogCursor instance.
+
+        :param created: The creation date of the last item of the page.
+        :param uuid: Unique identifier for that item.
+        """
+        self.created = created
+        self.uuid = uuid
@@ -0,0 +1,48 @@
+# Maximum number of rejected rows reported with their errors
+MAX_REPORTED_ERRORS = 100
+
+
+class ImportSummaryEntity:
+    """
+    Represents the outcome of an import: how many rows were accepted and rejected, and the
+    errors of up to `max_errors` rejected rows. Its size does not depend on the number of rows imported.
+    """
+
+    def __init__(self, max_errors: int = MAX_REPORTED_ERRORS):
+        """
+        Initializes an empty ImportSummaryEntity instance.
+
+        :param max_errors: Maximum number of rejected rows whose errors are kept.
+        """
+        self.accepted = 0
+        self.rejected = 0
+        self.errors = []
+        self.max_errors = max_errors
+
+    def accept(self, count: int = 1) -> None:
+        """
+        Counts accepted rows.
+        """
+        self.accepted += count
+
+    def reject(self, line: int, errors: dict) -> None:
+        """
+        Counts a rejected row, keeping its errors while there is room for them.
+
+        :param line: Line number of the row in the imported file.
+        :param errors: The errors of the row, by field.
+        """
+        self.rejected += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line, "errors": errors})
+
+    def dict(self) -> dict:
+        """
+        Serializes the ImportSummaryEntity object to a dictionary.
+        """
+        return {
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "errors": sorted(self.errors, key=lambda error: error["line"]),
+            "errors_truncated": self.rejected > len(self.errors)
+        }
@@ -0,0 +1,23 @@
+from typing import Optional
+
+
+class LocationClusterEntity:
+    """
+    Represents a cluster of locations inside a map tile: the centroid of the locations and how
+    many there are.
+    """
+
+    def __init__(self, lat: float, long: float, count: int, stale_count: Optional[int] = None):
+        """
+        Initializes a LocationClusterEntity instance.
+
+        :param lat: Latitude of the centroid of the cluster.
+        :param long: Longitude of the centroid of the cluster.
+        :param count: Number of locations in the cluster.
+        :param stale_count: Number of location-category pairs of the cluster that need a review
+                            (never reviewed or expired), when requested.
+        """
+        self.lat = lat
+        self.long = long
+        self.count = count
+        self.stale_count = stale_count
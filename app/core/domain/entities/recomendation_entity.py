@@ -11,7 +11,7 @@ class RecommendationEntity:
     """
 
     def __init__(self, loc_uuid: UUID, loc_description: str, cat_uuid: UUID, cat_description: str, bandera: int,
-                 review_date: Optional[datetime]):
+                 review_date: Optional[datetime], distance_km: Optional[float] = None):
         """
         Initializes a RecommendationEntity instance.
 
@@ -22,6 +22,7 @@ class RecommendationEntity:
         :param bandera: Flag indicating the recommendation status:
                         1 = not reviewed, 2 = reviewed but old, 0 = recently reviewed.
         :param review_date: The date when the review was created, or None if not available.
+        :param distance_km: Distance from the requested point to the location, for proximity-aware requests.
         """
         self.loc_uuid = loc_uuid
         self.loc_description = loc_description
@@ -29,6 +30,7 @@ class RecommendationEntity:
         self.cat_description = cat_description
         self.bandera = bandera
         self.review_date = review_date
+        self.distance_km = distance_km
 
     def dict(self):
         """
@@ -36,7 +38,7 @@ class RecommendationEntity:
 
         :return: A dictionary representation of the RecommendationEntity instance.
         """
-        return {
+        data = {
             "loc_uuid": str(self.loc_uuid),  # Convert UUID to string for JSON compatibility
             "loc_description": self.loc_description,
             "cat_uuid": str(self.cat_uuid),  # Convert UUID to string for JSON compatibility
@@ -45,6 +47,28 @@ class RecommendationEntity:
             "review_date": self.review_date.isoformat() if self.review_date else None
             # Convert datetime to string (ISO format) or None
         }
+        if self.distance_km is not None:
+            # Only present in proximity-aware recommendations
+            data["distance_km"] = self.distance_km
+        return data
+
+    @staticmethod
+    def from_dict(data: dict) -> "RecommendationEntity":
+        """
+        Deserializes a dictionary produced by `dict()` back into a RecommendationEntity.
+
+        :param data: A dictionary representation of a RecommendationEntity instance.
+        :return: A new RecommendationEntity instance.
+        """
+        return RecommendationEntity(
+            loc_uuid=UUID(data["loc_uuid"]),
+            loc_description=data["loc_description"],
+            cat_uuid=UUID(data["cat_uuid"]),
+            cat_description=data["cat_description"],
+            bandera=data["bandera"],
+            review_date=datetime.fromisoformat(data["review_date"]) if data["review_date"] else None,
+            distance_km=data.get("distance_km")
+        )
 
     @staticmethod
     def create(loc_uuid: UUID, loc_description: str, cat_uuid: UUID, cat_description: str, bandera: int,
@@ -0,0 +1,52 @@
+from uuid import UUID
+from datetime import datetime
+from typing import Optional
+
+
+class RecommendationCursor:
+    """
+    Represents a position in the ordered list of recommendations.
+
+    Recommendations are ordered by (bandera ASC, review_date DESC, loc_uuid ASC, cat_uuid ASC), or
+    by (bandera ASC, distance_km ASC, loc_uuid ASC, cat_uuid ASC) for proximity-aware requests;
+    a cursor holds those values for the last recommendation of a page, so the next page starts
+    right after it.
+    """
+
+    def __init__(self, bandera: int, review_date: Optional[datetime], loc_uuid: UUID, cat_uuid: UUID,
+                 distance_km: Optional[float] = None):
+        """
+        Initializes a RecommendationCursor instance.
+
+        :param bandera: Flag of the last recommendation (1 = not reviewed, 2 = reviewed but old).
+        :param review_date: The date of the last review of the pair, or None if never reviewed.
+        :param loc_uuid: Unique identifier for the location.
+        :param cat_uuid: Unique identifier for the category.
+        :param distance_km: Distance to the location, for proximity-aware requests.
+        """
+        self.bandera = bandera
+        self.review_date = review_date
+        self.loc_uuid = loc_uuid
+        self.cat_uuid = cat_uuid
+        self.distance_km = distance_km
+
+    def __str__(self):
+        review_date = self.review_date.isoformat() if self.review_date else ""
+        distance_km = "" if self.distance_km is None else self.distance_km
+        return f"{self.bandera}|{review_date}|{self.loc_uuid}|{self.cat_uuid}|{distance_km}"
+
+    @staticmethod
+    def from_recommendation(recommendation) -> "RecommendationCursor":
+        """
+        Creates the cursor pointing right after the given recommendation.
+
+        :param recommendation: The last RecommendationEntity of a page.
+        :return: A new RecommendationCursor instance.
+        """
+        return RecommendationCursor(
+            bandera=recommendation.bandera,
+            review_date=recommendation.review_date,
+            loc_uuid=recommendation.loc_uuid,
+            cat_uuid=recommendation.cat_uuid,
+            distance_km=recommendation.distance_km
+        )
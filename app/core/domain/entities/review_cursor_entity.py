@@ -0,0 +1,57 @@
+from uuid import UUID
+from datetime import datetime, timedelta, timezone
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def epoch_micros(moment: datetime) -> int:
+    """
+    Returns a date as whole microseconds since the epoch. Naive dates are taken as UTC.
+    """
+    moment = moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+    return (moment - EPOCH) // timedelta(microseconds=1)
+
+
+class ReviewCursor:
+    """
+    Represents a position in the history of reviews, ordered by (rev_created DESC, rev_uuid ASC).
+    A cursor holds those values for the last review of a page, so the next page starts right after it.
+    """
+
+    def __init__(self, rev_created: datetime, rev_uuid: UUID):
+        """
+        Initializes a ReviewCursor instance.
+
+        :param rev_created: The creation date of the last review of the page.
+        :param rev_uuid: Unique identifier for that review.
+        """
+        self.rev_created = rev_created
+        self.rev_uuid = rev_uuid
+
+    def is_before(self, review) -> bool:
+        """
+        Tells whether a review comes after the cursor in the history order, i.e. belongs to a later page.
+
+        :param review: A ReviewEntity.
+        """
+        return ReviewCursor.sort_key(review) > ReviewCursor.sort_key(self)
+
+    @staticmethod
+    def sort_key(review) -> tuple:
+        """
+        Sort key of a review in the history order. Dates are compared as whole microseconds, like
+        the database compares them: a float timestamp cannot tell every microsecond apart.
+
+        :param review: A ReviewEntity, or a ReviewCursor.
+        """
+        return -epoch_micros(review.rev_created), review.rev_uuid
+
+    @staticmethod
+    def from_review(review) -> "ReviewCursor":
+        """
+        Creates the cursor pointing right after the given review.
+
+        :param review: The last ReviewEntity of a page.
+        :return: A new ReviewCursor instance.
+        """
+        return ReviewCursor(rev_created=review.rev_created, rev_uuid=review.rev_uuid)
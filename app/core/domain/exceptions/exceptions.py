@@ -2,4 +2,16 @@ class DuplicateCategoryError(Exception):
     pass
 
 class DuplicateLocationError(Exception):
-    pass
\ No newline at end of file
+    pass
+
+class LocationNotFoundError(Exception):
+    pass
+
+class CategoryNotFoundError(Exception):
+    pass
+
+class ReviewQueueFullError(Exception):
+    pass
+
+class ExportLimitError(Exception):
+    pass
@@ -0,0 +1,196 @@
+"""
+Geographic helpers: geohash encoding, neighbouring cells, great-circle distances and web map tiles.
+
+A geohash interleaves longitude and latitude bits and encodes them in base32, so locations in the
+same cell share a prefix. Any point within `covered_radius_km(lat, precision)` of a location lies
+in the location's cell or one of its 8 neighbours at that precision, which allows proximity
+lookups to scan only those 9 prefixes.
+"""
+import math
+from typing import List, Tuple
+
+# Geohash base32 alphabet
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# Maximum geohash length stored for a location (sub-metre resolution)
+MAX_PRECISION = 12
+
+# Mean Earth radius and length of one degree of latitude, in kilometres
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+# Latitude limit of the Web Mercator projection used by map tiles
+MAX_MERCATOR_LAT = 85.05112878
+
+
+def encode(lat: float, long: float, precision: int = MAX_PRECISION) -> str:
+    """
+    Encodes a coordinate as a geohash of the given length.
+    """
+    lat_range, long_range = [-90.0, 90.0], [-180.0, 180.0]
+    geohash, bits, bit_count, even = [], 0, 0, True
+    while len(geohash) < precision:
+        # Even bits refine the longitude, odd bits the latitude
+        interval, value = (long_range, long) if even else (lat_range, lat)
+        middle = (interval[0] + interval[1]) / 2
+        bits <<= 1
+        if value >= middle:
+            bits |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            geohash.append(BASE32[bits])
+            bits, bit_count = 0, 0
+    return "".join(geohash)
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """
+    Returns the (latitude, longitude) size in degrees of a geohash cell of the given length.
+    """
+    total_bits = 5 * precision
+    long_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** long_bits
+
+
+def decode(geohash: str) -> Tuple[float, float]:
+    """
+    Returns the (lat, long) centre of a geohash cell.
+    """
+    lat_range, long_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        bits = BASE32.index(char)
+        for shift in range(4, -1, -1):
+            interval = long_range if even else lat_range
+            middle = (interval[0] + interval[1]) / 2
+            if bits >> shift & 1:
+                interval[0] = middle
+            else:
+                interval[1] = middle
+            even = not even
+    return (lat_range[0] + lat_range[1]) / 2, (long_range[0] + long_range[1]) / 2
+
+
+def neighbors(geohash: str) -> List[str]:
+    """
+    Returns the up to 8 cells surrounding a geohash cell, wrapping around the antimeridian.
+    Cells beyond the poles do not exist and are omitted.
+    """
+    lat, long = decode(geohash)
+    lat_size, long_size = cell_size(len(geohash))
+    cells = []
+    for lat_step in (-1, 0, 1):
+        neighbor_lat = lat + lat_step * lat_size
+        if not -90 < neighbor_lat < 90:
+            continue
+        for long_step in (-1, 0, 1):
+            if lat_step == 0 and long_step == 0:
+                continue
+            neighbor_long = (long + long_step * long_size + 180) % 360 - 180
+            cell = encode(neighbor_lat, neighbor_long, len(geohash))
+            if cell not in cells and cell != geohash:
+                cells.append(cell)
+    return cells
+
+
+def covered_radius_km(lat: float, precision: int) -> float:
+    """
+    Returns the radius around any point at latitude `lat` that is fully covered by the point's
+    cell and its neighbours at the given precision. Precision 0 covers the whole planet.
+    """
+    if precision == 0:
+        return math.inf
+    lat_size, long_size = cell_size(precision)
+    # Meridians converge towards the poles: use the latitude farthest from the equator in range
+    farthest_lat = min(90.0, abs(lat) + lat_size)
+    return min(lat_size * KM_PER_DEGREE, long_size * KM_PER_DEGREE * math.cos(math.radians(farthest_lat)))
+
+
+def covering_precision(lat: float, radius_km: float) -> int:
+    """
+    Returns the longest geohash precision whose 3x3 block of cells covers `radius_km` around
+    a point at latitude `lat`, or 0 when no precision does (the whole table must be scanned).
+    """
+    for precision in range(MAX_PRECISION, 0, -1):
+        if covered_radius_km(lat, precision) >= radius_km:
+            return precision
+    return 0
+
+
+def covering_cells(lat: float, long: float, precision: int) -> List[str]:
+    """
+    Returns the geohash prefixes to scan around a point: its cell and the neighbouring cells.
+    Precision 0 returns a single empty prefix, which matches every location.
+    """
+    if precision == 0:
+        return [""]
+    cell = encode(lat, long, precision)
+    return [cell] + neighbors(cell)
+
+
+def box_cells(lat_min: float, lat_max: float, long_min: float, long_max: float,
+              max_cells: int = 16) -> List[str]:
+    """
+    Returns the geohash prefixes to scan for a bounding box: the cells of the longest precision
+    covering it with at most `max_cells` cells. When no precision does, returns a single empty
+    prefix, which matches every location.
+    """
+    for precision in range(MAX_PRECISION, 0, -1):
+        lat_size, long_size = cell_size(precision)
+        rows = int(180 / lat_size)
+        columns = int(360 / long_size)
+        row_min = max(0, int((lat_min + 90) / lat_size))
+        row_max = min(rows - 1, int((lat_max + 90) / lat_size))
+        column_min = max(0, int((long_min + 180) / long_size))
+        column_max = min(columns - 1, int((long_max + 180) / long_size))
+        if (row_max - row_min + 1) * (column_max - column_min + 1) <= max_cells:
+            # Each cell is encoded from its centre
+            return [
+                encode(-90 + (row + 0.5) * lat_size, -180 + (column + 0.5) * long_size, precision)
+                for row in range(row_min, row_max + 1)
+                for column in range(column_min, column_max + 1)
+            ]
+    return [""]
+
+
+def haversine_km(lat1: float, long1: float, lat2: float, long2: float) -> float:
+    """
+    Returns the great-circle distance between two coordinates, in kilometres.
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    delta_phi = phi2 - phi1
+    delta_lambda = math.radians(long2 - long1)
+    a = math.sin(delta_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def tile_xy(lat: float, long: float, zoom: int) -> Tuple[int, int]:
+    """
+    Returns the (x, y) Web Mercator tile containing a coordinate at the given zoom level.
+    Latitudes beyond the projection limit fall in the first or last row of tiles.
+    """
+    tiles = 1 << zoom
+    lat = max(-MAX_MERCATOR_LAT, min(MAX_MERCATOR_LAT, lat))
+    x = int((long + 180.0) / 360.0 * tiles)
+    y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * tiles)
+    return min(max(x, 0), tiles - 1), min(max(y, 0), tiles - 1)
+
+
+def tile_bounds(zoom: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """
+    Returns the (lat_min, lat_max, long_min, long_max) of a Web Mercator tile. The first and last
+    rows extend to the poles, matching `tile_xy`.
+    """
+    tiles = 1 << zoom
+
+    def row_lat(row: int) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / tiles))))
+
+    lat_max = 90.0 if y == 0 else row_lat(y)
+    lat_min = -90.0 if y == tiles - 1 else row_lat(y + 1)
+    return lat_min, lat_max, x / tiles * 360.0 - 180.0, (x + 1) / tiles * 360.0 - 180.0
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import AsyncIterator, List, Optional, Set
 
+from app.core.domain.entities.catalog_cursor_entity import CatalogCursor
 from app.core.domain.entities.category_entity import CategoryEntity
 
 
@@ -19,6 +20,16 @@ class CategoryRepositoryPort(ABC):
         """
         pass
 
+    @abstractmethod
+    async def create_if_absent(self, category: CategoryEntity) -> bool:
+        """
+        Atomically save a new category entity unless its description is already taken.
+
+        :param category: The category entity to be saved.
+        :return: True if the category was created, False if the description already exists.
+        """
+        pass
+
     @abstractmethod
     async def get_by_description(self, description: str) -> Optional[CategoryEntity]:
         """
@@ -29,3 +40,45 @@ class CategoryRepositoryPort(ABC):
         """
         pass
 
+    @abstractmethod
+    async def save_many(self, categories: List[CategoryEntity]) -> List[CategoryEntity]:
+        """
+        Save several new category entities.
+
+        :param categories: The category entities to be saved.
+        :return: The categories actually saved; those whose description was taken meanwhile are skipped.
+        """
+        pass
+
+    @abstractmethod
+    async def get_existing_descriptions(self, descriptions: List[str]) -> Set[str]:
+        """
+        Retrieve which of the descriptions already belong to a category.
+
+        :param descriptions: The descriptions to be checked.
+        :return: The subset of descriptions that already exist.
+        """
+        pass
+
+    @abstractmethod
+    async def get_page(self, status: Optional[bool] = None, limit: int = 100,
+                       after: Optional[CatalogCursor] = None) -> List[CategoryEntity]:
+        """
+        Retrieve a page of categories, ordered by creation date, then UUID.
+
+        :param status: Only return the categories with this `cat_status`.
+        :param limit: Maximum number of categories to return.
+        :param after: Cursor of the last category of the previous page.
+        :return: A list of CategoryEntity objects.
+        """
+        pass
+
+    @abstractmethod
+    def export(self, status: Optional[bool] = None) -> AsyncIterator[List[CategoryEntity]]:
+        """
+        Iterate over every category, in the order of `get_page`, in chunks.
+
+        :param status: Only return the categories with this `cat_status`.
+        :return: An async iterator of lists of CategoryEntity objects.
+        """
+        pass
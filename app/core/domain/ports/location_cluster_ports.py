@@ -0,0 +1,23 @@
+from abc import ABC, abstractmethod
+from typing import List
+from app.core.domain.entities.location_cluster_entity import LocationClusterEntity
+
+
+class LocationClusterRepositoryPort(ABC):
+    """
+    Abstract base class for the Location cluster repository port, defining the methods
+    that should be implemented for reading the precomputed map clusters.
+    """
+
+    @abstractmethod
+    async def get_tile(self, zoom: int, x: int, y: int, include_stale: bool = False) -> List[LocationClusterEntity]:
+        """
+        Retrieve the clusters of locations inside a map tile.
+
+        :param zoom: Zoom level of the tile.
+        :param x: Column of the tile.
+        :param y: Row of the tile.
+        :param include_stale: Whether to count the pairs needing a review in each cluster.
+        :return: A list of LocationClusterEntity objects.
+        """
+        pass
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import AsyncIterator, List, Optional, Set, Tuple
+from app.core.domain.entities.catalog_cursor_entity import CatalogCursor
 from app.core.domain.entities.location_entity import LocationEntity
 
 
@@ -18,6 +19,16 @@ class LocationRepositoryPort(ABC):
         """
         pass
 
+    @abstractmethod
+    async def create_if_absent(self, location: LocationEntity) -> bool:
+        """
+        Atomically save a new location entity unless its description is already taken.
+
+        :param location: The location entity to be saved.
+        :return: True if the location was created, False if the description already exists.
+        """
+        pass
+
     @abstractmethod
     async def get_by_description(self, description: str) -> Optional[LocationEntity]:
         """
@@ -27,3 +38,74 @@ class LocationRepositoryPort(ABC):
         :return: An optional LocationEntity if found, otherwise None.
         """
         pass
+
+    @abstractmethod
+    async def find_within_radius(self, lat: float, long: float, radius_km: float,
+                                 limit: Optional[int] = None) -> List[Tuple[LocationEntity, float]]:
+        """
+        Retrieve the locations within a radius of a point, nearest first.
+
+        :param lat: Latitude of the point.
+        :param long: Longitude of the point.
+        :param radius_km: Search radius, in kilometres.
+        :param limit: Maximum number of locations to return, or None for all of them.
+        :return: A list of (LocationEntity, distance in kilometres) tuples.
+        """
+        pass
+
+    @abstractmethod
+    async def find_nearest(self, lat: float, long: float, k: int,
+                           radius_km: Optional[float] = None) -> List[Tuple[LocationEntity, float]]:
+        """
+        Retrieve the k locations nearest to a point, optionally within a maximum radius.
+
+        :param lat: Latitude of the point.
+        :param long: Longitude of the point.
+        :param k: Number of locations to return.
+        :param radius_km: Optional maximum distance, in kilometres.
+        :return: A list of (LocationEntity, distance in kilometres) tuples, nearest first.
+        """
+        pass
+
+    @abstractmethod
+    async def save_many(self, locations: List[LocationEntity]) -> List[LocationEntity]:
+        """
+        Save several new location entities.
+
+        :param locations: The location entities to be saved.
+        :return: The locations actually saved; those whose description was taken meanwhile are skipped.
+        """
+        pass
+
+    @abstractmethod
+    async def get_existing_descriptions(self, descriptions: List[str]) -> Set[str]:
+        """
+        Retrieve which of the descriptions already belong to a location.
+
+        :param descriptions: The descriptions to be checked.
+        :return: The subset of descriptions that already exist.
+        """
+        pass
+
+    @abstractmethod
+    async def get_page(self, status: Optional[bool] = None, limit: int = 100,
+                       after: Optional[CatalogCursor] = None) -> List[LocationEntity]:
+        """
+        Retrieve a page of locations, ordered by creation date, then UUID.
+
+        :param status: Only return the locations with this `loc_status`.
+        :param limit: Maximum number of locations to return.
+        :param after: Cursor of the last location of the previous page.
+        :return: A list of LocationEntity objects.
+        """
+        pass
+
+    @abstractmethod
+    def export(self, status: Optional[bool] = None) -> AsyncIterator[List[LocationEntity]]:
+        """
+        Iterate over every location, in the order of `get_page`, in chunks.
+
+        :param status: Only return the locations with this `loc_status`.
+        :return: An async iterator of lists of LocationEntity objects.
+        """
+        pass
@@ -0,0 +1,31 @@
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, List
+from app.core.domain.entities.recomendation_entity import RecommendationEntity
+
+
+class RecommendationCachePort(ABC):
+    """
+    Abstract base class for the Recommendation cache port.
+    Defines the methods to read through and invalidate computed recommendations.
+    """
+
+    @abstractmethod
+    async def get_or_compute(self, compute: Callable[[], Awaitable[List[RecommendationEntity]]],
+                             **params) -> List[RecommendationEntity]:
+        """
+        Retrieve the cached recommendations computed with the given parameters, computing and
+        storing them on a cache miss.
+
+        :param compute: Coroutine function that computes the recommendations on a miss.
+        :param params: The parameters the recommendations are computed with (e.g. limit).
+        :return: A list of RecommendationEntity objects.
+        """
+        pass
+
+    @abstractmethod
+    async def invalidate(self) -> None:
+        """
+        Invalidate every cached recommendation.
+        Must be called whenever a location, category or review is created.
+        """
+        pass
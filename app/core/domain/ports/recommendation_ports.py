@@ -1,5 +1,7 @@
-from typing import List
+from typing import List, Optional
+from uuid import UUID
 from app.core.domain.entities.recomendation_entity import RecommendationEntity
+from app.core.domain.entities.recommendation_cursor_entity import RecommendationCursor
 
 
 class RecommendationRepositoryPort():
@@ -8,10 +10,22 @@ class RecommendationRepositoryPort():
     Defines the method to fetch recommendations.
     """
 
-    async def get_recommendations(self) -> List[RecommendationEntity]:
+    async def get_recommendations(self, limit: int = 100, after: Optional[RecommendationCursor] = None,
+                                  category: Optional[UUID] = None, location: Optional[UUID] = None,
+                                  bandera: Optional[int] = None, lat: Optional[float] = None,
+                                  long: Optional[float] = None,
+                                  radius_km: Optional[float] = None) -> List[RecommendationEntity]:
         """
-        Fetch recommendations from the data source.
+        Fetch a page of recommendations from the data source.
 
+        :param limit: Maximum number of recommendations to return.
+        :param after: Cursor of the last recommendation of the previous page, or None for the first page.
+        :param category: Optional category UUID to filter by.
+        :param location: Optional location UUID to filter by.
+        :param bandera: Optional flag to filter by (1 = not reviewed, 2 = reviewed but old).
+        :param lat: Optional latitude of a point; recommendations are then ranked by distance from it.
+        :param long: Optional longitude of the point.
+        :param radius_km: Optional search radius around the point, in kilometres.
         :return: A list of RecommendationEntity objects.
         :raises NotImplementedError: This method must be implemented in a subclass.
         """
@@ -0,0 +1,39 @@
+from abc import ABC, abstractmethod
+from typing import List, Set, Tuple
+from uuid import UUID
+
+
+class ReferenceFilterPort(ABC):
+    """
+    Abstract base class for the filter of the locations and categories referenced by reviews.
+    """
+
+    @abstractmethod
+    def add_locations(self, loc_uuids: List[UUID]) -> None:
+        """
+        Register newly created locations.
+
+        :param loc_uuids: The UUIDs of the created locations.
+        """
+        pass
+
+    @abstractmethod
+    def add_categories(self, cat_uuids: List[UUID]) -> None:
+        """
+        Register newly created categories.
+
+        :param cat_uuids: The UUIDs of the created categories.
+        """
+        pass
+
+    @abstractmethod
+    async def missing_references(self, loc_uuids: List[UUID],
+                                 cat_uuids: List[UUID]) -> Tuple[Set[UUID], Set[UUID]]:
+        """
+        Retrieve which of the locations and categories do not exist.
+
+        :param loc_uuids: The location UUIDs to be checked.
+        :param cat_uuids: The category UUIDs to be checked.
+        :return: The missing location UUIDs and the missing category UUIDs.
+        """
+        pass
@@ -0,0 +1,26 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from uuid import UUID
+from app.core.domain.entities.review_cursor_entity import ReviewCursor
+from app.core.domain.entities.review_entity import ReviewEntity
+
+
+class ReviewHistoryPort(ABC):
+    """
+    Abstract base class for the review history port, defining the methods that should be
+    implemented for reading the reviews of a location, from the database or the archive.
+    """
+
+    @abstractmethod
+    async def get_reviews(self, loc_uuid: UUID, cat_uuid: Optional[UUID] = None, limit: int = 100,
+                          after: Optional[ReviewCursor] = None) -> List[ReviewEntity]:
+        """
+        Retrieve a page of reviews of a location, newest first.
+
+        :param loc_uuid: The UUID of the location.
+        :param cat_uuid: Only return reviews of this category.
+        :param limit: Maximum number of reviews to return.
+        :param after: Cursor of the last review of the previous page.
+        :return: A list of ReviewEntity objects, ordered by (rev_created DESC, rev_uuid ASC).
+        """
+        pass
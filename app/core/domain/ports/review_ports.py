@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from typing import List, Set, Tuple
+from uuid import UUID
 from app.core.domain.entities.review_entity import ReviewEntity
 
 class ReviewRepositoryPort(ABC):
@@ -13,6 +15,29 @@ class ReviewRepositoryPort(ABC):
         Save the provided review entity to the data source.
 
         :param review: The ReviewEntity object to be saved.
+        :raises LocationNotFoundError: If the location does not exist.
+        :raises CategoryNotFoundError: If the category does not exist.
         :raises NotImplementedError: This method must be implemented in a subclass.
         """
         pass
+
+    @abstractmethod
+    async def save_many(self, reviews: List[ReviewEntity]) -> None:
+        """
+        Save several review entities to the data source.
+
+        :param reviews: The ReviewEntity objects to be saved.
+        """
+        pass
+
+    @abstractmethod
+    async def get_existing_references(self, loc_uuids: List[UUID],
+                                      cat_uuids: List[UUID]) -> Tuple[Set[UUID], Set[UUID]]:
+        """
+        Retrieve which of the locations and categories referenced by reviews exist.
+
+        :param loc_uuids: The location UUIDs to be checked.
+        :param cat_uuids: The category UUIDs to be checked.
+        :return: The existing location UUIDs and the existing category UUIDs.
+        """
+        pass
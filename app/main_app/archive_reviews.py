@@ -0,0 +1,142 @@
+"""
+Periodic command that moves the old reviews out of the database into the cold archive: the
+months older than the last REVIEW_ARCHIVE_MONTHS are written to compressed segment files in
+REVIEW_ARCHIVE_DIR, summarized per pair in `review_rollup`, and removed from the `review` table
+(on Postgres, by dropping their partitions). Partitions detached by the retention policy are
+archived and dropped too.
+
+Run it monthly, e.g. from cron, on the host (or volume) holding REVIEW_ARCHIVE_DIR:
+    python -m app.main_app.archive_reviews
+"""
+import asyncio
+import os
+from datetime import datetime
+from typing import List, Optional
+import pytz
+from tortoise import Tortoise, connections
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.transactions import in_transaction
+from app.adapters.secondary.archive.review_archive import SegmentWriter, segment_path
+from app.adapters.secondary.orm.models import ModelReview
+from app.adapters.secondary.orm.raw_sql import Parameters, table, to_db, to_python
+from app.adapters.secondary.orm.review_partitions import (add_months, detached_partitions, month_start,
+                                                          oldest_review_month, partition_month, partition_table,
+                                                          remove_review_month)
+from app.core.domain.entities.review_entity import ReviewEntity
+from app.main_app.config import REVIEW_ARCHIVE_DIR, REVIEW_ARCHIVE_MONTHS, TORTOISE_ORM
+
+# Number of reviews read per query while a month is exported
+EXPORT_CHUNK_SIZE = 5000
+
+# Columns of the reviews exported, in keyset order
+EXPORT_KEY = ("rev_fk_loc_uuid_id", "rev_fk_cat_uuid_id", "rev_created", "rev_uuid")
+
+
+async def _export_month(connection: BaseDBAsyncClient, source: str, month: datetime, directory: str,
+                        chunk_size: int) -> str:
+    """
+    Writes the reviews of a month held by a table to a new segment, reading them in keyset order
+    (location, category, creation date, UUID), so each pair is read contiguously.
+
+    :return: The path of the segment.
+    """
+    writer = SegmentWriter(segment_path(directory, month), month)
+    try:
+        pair, pair_reviews, last = None, [], None
+        while True:
+            params = Parameters(connection)
+            start = to_db(ModelReview, "rev_created", month, connection)
+            end = to_db(ModelReview, "rev_created", add_months(month, 1), connection)
+            conditions = [f"rev_created >= {params.add(start)}", f"rev_created < {params.add(end)}"]
+            if last is not None:
+                conditions.append(
+                    f"({', '.join(EXPORT_KEY)}) > "
+                    f"({', '.join(params.add(to_db(ModelReview, name, last[name], connection)) for name in EXPORT_KEY)})"
+                )
+            rows = await connection.execute_query_dict(f"""
+                SELECT rev_uuid, rev_recommendation, rev_obs, rev_created, rev_fk_loc_uuid_id, rev_fk_cat_uuid_id
+                FROM {source}
+                WHERE {" AND ".join(conditions)}
+                ORDER BY {", ".join(EXPORT_KEY)}
+                LIMIT {params.add(chunk_size)}
+            """, params.values)
+
+            for row in rows:
+                review = ReviewEntity(
+                    rev_uuid=to_python(ModelReview, "rev_uuid", row["rev_uuid"]),
+                    rev_recommendation=row["rev_recommendation"],
+                    rev_obs=row["rev_obs"],
+                    rev_created=to_python(ModelReview, "rev_created", row["rev_created"]),
+                    rev_fk_loc_uuid=to_python(ModelReview, "rev_fk_loc_uuid_id", row["rev_fk_loc_uuid_id"]),
+                    rev_fk_cat_uuid=to_python(ModelReview, "rev_fk_cat_uuid_id", row["rev_fk_cat_uuid_id"])
+                )
+                if (review.rev_fk_loc_uuid, review.rev_fk_cat_uuid) != pair and pair_reviews:
+                    writer.add_pair(*pair, pair_reviews)
+                    pair_reviews = []
+                pair = (review.rev_fk_loc_uuid, review.rev_fk_cat_uuid)
+                pair_reviews.append(review)
+            if len(rows) < chunk_size:
+                break
+            last = {
+                "rev_fk_loc_uuid_id": pair[0], "rev_fk_cat_uuid_id": pair[1],
+                "rev_created": pair_reviews[-1].rev_created, "rev_uuid": pair_reviews[-1].rev_uuid,
+            }
+
+        if pair_reviews:
+            writer.add_pair(*pair, pair_reviews)
+        return writer.finish()
+    except BaseException:
+        writer.abort()
+        raise
+
+
+async def archive_reviews(directory: str = REVIEW_ARCHIVE_DIR, months: int = REVIEW_ARCHIVE_MONTHS,
+                          now: Optional[datetime] = None, chunk_size: int = EXPORT_CHUNK_SIZE,
+                          connection_name: str = "default") -> List[str]:
+    """
+    Moves the reviews of the months older than the last `months` to segment files, one month at a
+    time. Each month is removed from the database in the transaction that read it, once its segment
+    is on disk, so a failure never loses reviews: at worst a month is archived twice, and the
+    archive returns its reviews once.
+
+    :param directory: Directory of the segment files.
+    :param months: Number of whole months of reviews kept in the database, besides the current one.
+    :param now: Current date, defaults to now.
+    :param chunk_size: Number of reviews read per query.
+    :param connection_name: Name of the connection of the review table.
+    :return: The paths of the segments written.
+    """
+    os.makedirs(directory, exist_ok=True)
+    cutoff = add_months(month_start(now or datetime.now(pytz.UTC)), -months)
+    paths = []
+
+    # Partitions detached by the retention policy: already summarized, only dropped once archived
+    for name in await detached_partitions(connections.get(connection_name)):
+        async with in_transaction(connection_name) as connection:
+            paths.append(await _export_month(connection, partition_table(name), partition_month(name),
+                                             directory, chunk_size))
+            await connection.execute_script(f"DROP TABLE {partition_table(name)}")
+
+    while True:
+        async with in_transaction(connection_name) as connection:
+            month = await oldest_review_month(connection, cutoff)
+            if month is None:
+                return paths
+            paths.append(await _export_month(connection, table(ModelReview), month, directory, chunk_size))
+            await remove_review_month(connection, month)
+
+
+async def main():
+    if not REVIEW_ARCHIVE_DIR:
+        print("REVIEW_ARCHIVE_DIR is not set, nothing to archive.")
+        return
+    await Tortoise.init(config=TORTOISE_ORM)
+    try:
+        paths = await archive_reviews()
+        print(f"Review segments written: {', '.join(paths) or 'none'}.")
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,63 @@
+"""
+One-off command that rebuilds the `location_cluster` table from the existing locations.
+
+The migration that creates the table builds it from the existing locations. Run this command
+to rebuild it when locations were written without their clusters, e.g. by an older instance of
+the app during a rolling upgrade:
+    python -m app.main_app.backfill_location_clusters
+"""
+import asyncio
+from tortoise import Tortoise
+from tortoise.transactions import in_transaction
+from app.adapters.secondary.orm.models import ModelLocation, ModelLocationCluster
+from app.adapters.secondary.orm.repositories.location_repository import cluster_cells
+from app.main_app.config import TORTOISE_ORM
+
+# Number of cluster rows inserted per statement
+BATCH_SIZE = 1000
+
+
+async def backfill_location_clusters(batch_size: int = BATCH_SIZE) -> int:
+    """
+    Replaces the content of `location_cluster` with the count and coordinate sums of the
+    locations of every cluster cell, at every zoom level.
+
+    :param batch_size: Number of cluster rows inserted per statement.
+    :return: The number of cluster rows written.
+    """
+    # Aggregate the locations per cell in memory: only coordinates are read
+    clusters = {}
+    coordinates = await ModelLocation.filter(loc_lat__isnull=False, loc_long__isnull=False).values_list(
+        "loc_lat", "loc_long"
+    )
+    for lat, long in coordinates:
+        lat, long = float(lat), float(long)
+        for cell in cluster_cells(lat, long):
+            count, lat_sum, long_sum = clusters.get(cell, (0, 0.0, 0.0))
+            clusters[cell] = (count + 1, lat_sum + lat, long_sum + long)
+
+    rows = [
+        ModelLocationCluster(lcl_zoom=zoom, lcl_x=x, lcl_y=y, lcl_count=count, lcl_lat_sum=lat_sum,
+                             lcl_long_sum=long_sum)
+        for (zoom, x, y), (count, lat_sum, long_sum) in clusters.items()
+    ]
+
+    # Swap the table content atomically
+    async with in_transaction() as connection:
+        await ModelLocationCluster.all().using_db(connection).delete()
+        await ModelLocationCluster.bulk_create(rows, batch_size=batch_size, using_db=connection)
+
+    return len(rows)
+
+
+async def main():
+    await Tortoise.init(config=TORTOISE_ORM)
+    try:
+        written = await backfill_location_clusters()
+        print(f"location_cluster rebuilt with {written} clusters.")
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
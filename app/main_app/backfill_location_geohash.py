@@ -0,0 +1,52 @@
+"""
+One-off command that fills the geohash of locations created before proximity lookups existed.
+
+Locations without a geohash are not returned by /locations/nearby. The migration that adds the
+`loc_geohash` column fills it for the existing locations; run this command to fill the locations
+written without one since, e.g. by an older instance of the app during a rolling upgrade:
+    python -m app.main_app.backfill_location_geohash
+"""
+import asyncio
+from tortoise import Tortoise
+from tortoise.transactions import in_transaction
+from app.adapters.secondary.orm.models import ModelLocation
+from app.adapters.secondary.orm.repositories.location_repository import location_geohash
+from app.main_app.config import TORTOISE_ORM
+
+# Number of locations updated per transaction
+BATCH_SIZE = 1000
+
+
+async def backfill_location_geohash(batch_size: int = BATCH_SIZE) -> int:
+    """
+    Computes the geohash of every location that has coordinates but no geohash.
+
+    :param batch_size: Number of locations updated per transaction.
+    :return: The number of locations updated.
+    """
+    updated = 0
+    while True:
+        locations = await ModelLocation.filter(
+            loc_geohash__isnull=True, loc_lat__isnull=False, loc_long__isnull=False
+        ).limit(batch_size)
+        if not locations:
+            return updated
+
+        for location in locations:
+            location.loc_geohash = location_geohash(location.loc_lat, location.loc_long)
+        async with in_transaction() as connection:
+            await ModelLocation.bulk_update(locations, fields=["loc_geohash"], using_db=connection)
+        updated += len(locations)
+
+
+async def main():
+    await Tortoise.init(config=TORTOISE_ORM)
+    try:
+        updated = await backfill_location_geohash()
+        print(f"Geohash computed for {updated} locations.")
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
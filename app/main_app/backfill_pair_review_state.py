@@ -0,0 +1,84 @@
+"""
+One-off command that rebuilds the `pair_review_state` table from the existing reviews, and the
+rollups of the reviews removed by the retention policy.
+
+Run it once after the table is created, before relying on it for recommendations:
+    python -m app.main_app.backfill_pair_review_state
+"""
+import asyncio
+from tortoise import Tortoise
+from tortoise.functions import Count, Max, Sum
+from tortoise.transactions import in_transaction
+from app.adapters.secondary.orm.models import ModelReview, ModelPairReviewState, ModelReviewRollup
+from app.adapters.secondary.orm.raw_sql import to_python
+from app.main_app.config import TORTOISE_ORM
+
+# Number of state rows inserted per statement
+BATCH_SIZE = 1000
+
+
+async def backfill_pair_review_state(batch_size: int = BATCH_SIZE) -> int:
+    """
+    Replaces the content of `pair_review_state` with the last review date and review count
+    of every reviewed location-category pair, counting the reviews removed by the retention
+    policy through their rollups.
+
+    :param batch_size: Number of state rows inserted per statement.
+    :return: The number of pairs written.
+    """
+    # Aggregate the review history per pair in the database
+    pairs = await ModelReview.annotate(
+        last_review=Max("rev_created"),
+        review_count=Count("rev_uuid")
+    ).group_by("rev_fk_loc_uuid_id", "rev_fk_cat_uuid_id").values(
+        "rev_fk_loc_uuid_id", "rev_fk_cat_uuid_id", "last_review", "review_count"
+    )
+    totals = {
+        (pair["rev_fk_loc_uuid_id"], pair["rev_fk_cat_uuid_id"]): (
+            to_python(ModelReview, "rev_created", pair["last_review"]), pair["review_count"]
+        )
+        for pair in pairs
+    }
+
+    # Add the reviews removed by the retention policy, summarized per pair and month
+    rollups = await ModelReviewRollup.annotate(
+        last_review=Max("rro_last_review"),
+        review_count=Sum("rro_review_count")
+    ).group_by("rro_fk_loc_uuid_id", "rro_fk_cat_uuid_id").values(
+        "rro_fk_loc_uuid_id", "rro_fk_cat_uuid_id", "last_review", "review_count"
+    )
+    for rollup in rollups:
+        key = (rollup["rro_fk_loc_uuid_id"], rollup["rro_fk_cat_uuid_id"])
+        rollup_last_review = to_python(ModelReviewRollup, "rro_last_review", rollup["last_review"])
+        last_review, review_count = totals.get(key, (rollup_last_review, 0))
+        totals[key] = (max(last_review, rollup_last_review), review_count + int(rollup["review_count"]))
+
+    states = [
+        ModelPairReviewState(
+            prs_fk_loc_uuid_id=loc_uuid,
+            prs_fk_cat_uuid_id=cat_uuid,
+            prs_last_review=last_review,
+            prs_review_count=review_count
+        )
+        for (loc_uuid, cat_uuid), (last_review, review_count) in totals.items()
+    ]
+
+    # Swap the table content atomically
+    async with in_transaction() as connection:
+        await ModelPairReviewState.all().using_db(connection).delete()
+        await ModelPairReviewState.bulk_create(states, batch_size=batch_size, using_db=connection)
+
+    return len(states)
+
+
+async def main():
+    await Tortoise.init(config=TORTOISE_ORM)
+    try:
+        written = await backfill_pair_review_state()
+        print(f"pair_review_state rebuilt with {written} pairs.")
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,9 +1,150 @@
 import os
+from tortoise.backends.base.config_generator import expand_db_url
 
 DATABASE_URL = os.getenv("DATABASE_URL", "postgres://postgres:postgres@db:5432/mapmyworld")
 
+# Optional read replica. Read-only queries that tolerate slightly stale data (recommendations,
+# lookups and listings) go to it while its replication lag is at most REPLICA_MAX_STALENESS_SECONDS,
+# measured every REPLICA_LAG_CHECK_SECONDS; otherwise they go back to the primary.
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+REPLICA_MAX_STALENESS_SECONDS = float(os.getenv("REPLICA_MAX_STALENESS_SECONDS", "5"))
+REPLICA_LAG_CHECK_SECONDS = float(os.getenv("REPLICA_LAG_CHECK_SECONDS", "1"))
+
+# Connection pool of each process on Postgres (asyncpg). Every worker opens up to DB_POOL_MAX_SIZE
+# connections, so keep workers x DB_POOL_MAX_SIZE below the max_connections of the server.
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "5"))
+
+# Prepared statements cached per connection. 0 disables the cache, which PgBouncer in transaction
+# pooling mode requires.
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+
+# Seconds before a statement is cancelled, and seconds after which an idle connection is closed
+# (0 disables either)
+DB_COMMAND_TIMEOUT = float(os.getenv("DB_COMMAND_TIMEOUT", "0"))
+DB_MAX_INACTIVE_CONNECTION_LIFETIME = float(os.getenv("DB_MAX_INACTIVE_CONNECTION_LIFETIME", "300"))
+
+# Exports (`?export=ndjson`) read a database cursor, holding a connection, for as long as the
+# download lasts. At most EXPORT_MAX_CONCURRENCY run at once in each process, so they never take the
+# whole pool; further ones are answered with 503. On Postgres, an export whose client stops reading
+# for EXPORT_IDLE_TIMEOUT seconds is ended by the server (0 disables the timeout).
+EXPORT_MAX_CONCURRENCY = int(os.getenv("EXPORT_MAX_CONCURRENCY", "2"))
+EXPORT_IDLE_TIMEOUT = float(os.getenv("EXPORT_IDLE_TIMEOUT", "30"))
+
+# Redis connection used to cache recommendations. The cache is disabled when it is not set.
+REDIS_URL = os.getenv("REDIS_URL")
+
+# Time to live of cached recommendations, in seconds
+RECOMMENDATION_CACHE_TTL = int(os.getenv("RECOMMENDATION_CACHE_TTL", "60"))
+
+# Maximum age, in seconds, of the previous recommendations served while a new computation is in flight.
+# 0 makes concurrent requests always wait for the in-flight computation.
+RECOMMENDATION_STALE_SECONDS = float(os.getenv("RECOMMENDATION_STALE_SECONDS", "0"))
+
+# Keep an in-memory NumPy snapshot of the location coordinates for proximity lookups.
+# Each process patches it with its own writes only; the writes of other workers are picked up by
+# reloading it once it is older than LOCATION_SNAPSHOT_MAX_AGE seconds (0 never reloads it, which
+# is only right with a single worker).
+LOCATION_SNAPSHOT_ENABLED = os.getenv("LOCATION_SNAPSHOT_ENABLED", "false").lower() == "true"
+LOCATION_SNAPSHOT_MAX_AGE = float(os.getenv("LOCATION_SNAPSHOT_MAX_AGE", "60"))
+
+# Reject reviews of unknown locations or categories before any query, with an in-memory Bloom
+# filter of the existing UUIDs. Each process adds its own writes to the filter; the writes of other
+# workers are added by loading the rows created since the previous load once the filter is older
+# than REFERENCE_FILTER_REFRESH_SECONDS (0 never loads them, which is only right with a single worker).
+REFERENCE_FILTER_ENABLED = os.getenv("REFERENCE_FILTER_ENABLED", "false").lower() == "true"
+REFERENCE_FILTER_REFRESH_SECONDS = float(os.getenv("REFERENCE_FILTER_REFRESH_SECONDS", "2"))
+
+# Number of UUIDs the filter is sized for and its false positive rate at that size
+# (10M UUIDs at 1% take 12 MB), and number of UUIDs confirmed by the database remembered
+REFERENCE_FILTER_CAPACITY = int(os.getenv("REFERENCE_FILTER_CAPACITY", "10000000"))
+REFERENCE_FILTER_ERROR_RATE = float(os.getenv("REFERENCE_FILTER_ERROR_RATE", "0.01"))
+REFERENCE_FILTER_LRU_SIZE = int(os.getenv("REFERENCE_FILTER_LRU_SIZE", "10000"))
+
+# Write-behind mode for review creation: reviews are queued and inserted in batches by a
+# background task, so creating a review does not wait for the database.
+REVIEW_WRITE_BEHIND_ENABLED = os.getenv("REVIEW_WRITE_BEHIND_ENABLED", "false").lower() == "true"
+
+# Maximum number of queued reviews; further reviews are rejected with 503 until the queue drains
+REVIEW_QUEUE_MAX_SIZE = int(os.getenv("REVIEW_QUEUE_MAX_SIZE", "10000"))
+
+# A batch is flushed when it reaches REVIEW_QUEUE_BATCH_SIZE reviews or REVIEW_QUEUE_FLUSH_MS
+# milliseconds after its first review was queued
+REVIEW_QUEUE_BATCH_SIZE = int(os.getenv("REVIEW_QUEUE_BATCH_SIZE", "500"))
+REVIEW_QUEUE_FLUSH_MS = int(os.getenv("REVIEW_QUEUE_FLUSH_MS", "50"))
+
+# A batch that fails to be inserted is retried, waiting twice as long after every failure up to
+# REVIEW_QUEUE_RETRY_MAX_MS milliseconds between attempts
+REVIEW_QUEUE_RETRY_MAX_MS = int(os.getenv("REVIEW_QUEUE_RETRY_MAX_MS", "5000"))
+
+# Monthly partitions of the `review` table on Postgres: the current month and the next
+# REVIEW_PARTITION_MONTHS_AHEAD ones are created at startup and by the maintenance command.
+REVIEW_PARTITION_MONTHS_AHEAD = int(os.getenv("REVIEW_PARTITION_MONTHS_AHEAD", "3"))
+
+# Retention of reviews, applied by the maintenance command: the months older than the last
+# REVIEW_RETENTION_MONTHS are summarized per location-category pair in `review_rollup`, then their
+# partitions are detached (kept as standalone tables, out of the queries) or dropped, depending on
+# REVIEW_RETENTION_MODE ("detach" or "drop"). 0 keeps every review.
+REVIEW_RETENTION_MONTHS = int(os.getenv("REVIEW_RETENTION_MONTHS", "0"))
+REVIEW_RETENTION_MODE = os.getenv("REVIEW_RETENTION_MODE", "detach")
+
+# Cold archive of reviews: the archive command moves the months older than the last
+# REVIEW_ARCHIVE_MONTHS out of the database into compressed segment files in REVIEW_ARCHIVE_DIR,
+# from which GET /reviews/archive serves them. The archive is disabled when the directory is not set.
+REVIEW_ARCHIVE_DIR = os.getenv("REVIEW_ARCHIVE_DIR")
+REVIEW_ARCHIVE_MONTHS = int(os.getenv("REVIEW_ARCHIVE_MONTHS", "12"))
+
+# Requests issuing more database statements, or spending more milliseconds on them, are logged
+DB_QUERY_LOG_THRESHOLD = int(os.getenv("DB_QUERY_LOG_THRESHOLD", "20"))
+DB_TIME_LOG_THRESHOLD_MS = float(os.getenv("DB_TIME_LOG_THRESHOLD_MS", "200"))
+
+# Per-request profiling. When enabled, requests sending PROFILING_HEADER (with PROFILING_TOKEN
+# as value, when set) and a PROFILING_SAMPLE_RATE fraction of the others are profiled, and
+# written to PROFILING_DIR as a cProfile dump and collapsed stacks sampled every
+# PROFILING_SAMPLE_INTERVAL_MS. When disabled, the profiling middleware is not installed.
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+PROFILING_HEADER = os.getenv("PROFILING_HEADER", "X-Profile")
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN")
+PROFILING_DIR = os.getenv("PROFILING_DIR", "profiles")
+PROFILING_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILING_SAMPLE_INTERVAL_MS", "1"))
+
+
+def database_connection(url: str) -> dict:
+    """
+    Returns the Tortoise ORM connection of a database URL. On Postgres, the pool settings above are
+    applied, unless the URL sets them in its query string (minsize, maxsize, statement_cache_size,
+    command_timeout or max_inactive_connection_lifetime).
+    """
+    connection = expand_db_url(url)
+    if connection["engine"] == "tortoise.backends.asyncpg":
+        credentials = connection["credentials"]
+        settings = {
+            "minsize": (int, DB_POOL_MIN_SIZE),
+            "maxsize": (int, DB_POOL_MAX_SIZE),
+            "statement_cache_size": (int, DB_STATEMENT_CACHE_SIZE),
+            "command_timeout": (float, DB_COMMAND_TIMEOUT),
+            "max_inactive_connection_lifetime": (float, DB_MAX_INACTIVE_CONNECTION_LIFETIME),
+        }
+        for name, (cast, default) in settings.items():
+            credentials[name] = cast(credentials.get(name, default))
+        # asyncpg disables the timeout with None
+        credentials["command_timeout"] = credentials["command_timeout"] or None
+    return connection
+
+
+def database_connections() -> dict:
+    """
+    Returns the Tortoise ORM connections: `default` (the primary) and, when configured, `replica`.
+    """
+    database_connections = {"default": database_connection(DATABASE_URL)}
+    if DATABASE_REPLICA_URL:
+        database_connections["replica"] = database_connection(DATABASE_REPLICA_URL)
+    return database_connections
+
+
 TORTOISE_ORM = {
-    "connections": {"default": DATABASE_URL},
+    "connections": database_connections(),
     "apps": {
         "models": {
             "models": ["app.adapters.secondary.orm.models", "aerich.models"],
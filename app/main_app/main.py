@@ -1,12 +1,26 @@
 from fastapi import FastAPI
 from tortoise.contrib.fastapi import register_tortoise
-from app.main_app.config import DATABASE_URL
+from app.main_app.config import PROFILING_ENABLED, database_connections
 from app.adapters.primary.api.category_api import router as category_router
 from app.adapters.primary.api.location_api import router as location_router
 from app.adapters.primary.api.review_api import router as review_router
 from app.adapters.primary.api.recommendation_api import router as recommendation_route
+from app.adapters.primary.middleware.query_counter_middleware import QueryCounterMiddleware
+from app.adapters.primary.middleware.metrics_middleware import MetricsMiddleware
+from app.adapters.primary.middleware.profiling_middleware import ProfilingMiddleware
+from app.adapters.primary.api.metrics_api import router as metrics_router
+from app.adapters.secondary.metrics.app_metrics import register_collectors
+from app.adapters.secondary.snapshot.location_snapshot import get_location_snapshot
+from app.adapters.secondary.snapshot.reference_filter import get_reference_filter
+from app.adapters.secondary.queue.write_behind_review_repository import get_review_write_queue
+from app.adapters.secondary.orm.pool_settings import get_pool_settings
+from app.adapters.secondary.orm.review_partitions import create_review_partitions
+import logging
 import os
 
+# Startup reports go to the server log
+logger = logging.getLogger("uvicorn.error")
+
 # Environment configuration: This allows you to set the environment dynamically (production, development, etc.)
 ENVIRONMENT = os.getenv("ENVIRONMENT", "production")
 
@@ -17,6 +31,20 @@ app = FastAPI(
     version="1.0.0",  # Version of the API
 )
 
+# Report the database queries of every request in the X-DB-Queries and X-DB-Time headers
+app.add_middleware(QueryCounterMiddleware)
+
+# Profile requests on demand (see PROFILING_* in the configuration). Not installed unless enabled,
+# so it costs nothing otherwise.
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+# Record request latency and requests in flight, served with the other metrics at /metrics.
+# Added last, so it is the outermost middleware and measures the whole request.
+app.add_middleware(MetricsMiddleware)
+register_collectors()
+app.include_router(metrics_router, tags=["Metrics"])
+
 # Include category routes
 # This will allow you to manage category-related operations (e.g., create, read, update, delete categories)
 app.include_router(category_router, prefix="/categories", tags=["Categories"])
@@ -33,16 +61,59 @@ app.include_router(review_router, prefix="/reviews", tags=["Reviews"])
 # This will allow you to manage recommendation-related operations (e.g., get recommendations)
 app.include_router(recommendation_route, prefix="/recommendations", tags=["Recommendations"])
 
+# Insert the queued reviews on shutdown. Registered before Tortoise ORM, whose shutdown handler
+# closes the database connections, so it runs first.
+@app.on_event("shutdown")
+async def flush_review_queue():
+    queue = get_review_write_queue()
+    if queue is not None:
+        await queue.close()
+
 # Tortoise ORM configuration for connecting to the database and managing models
 # This connects the FastAPI app to the database using the Tortoise ORM, defines the models to use, and generates schemas if in development environment
 register_tortoise(
     app,
-    db_url=DATABASE_URL,  # Database URL, should be defined in the configuration file (e.g., DATABASE_URL in .env)
-    modules={"models": ["app.adapters.secondary.orm.models"]},  # Define the models module
+    config={
+        # Database URL, should be defined in the configuration file (e.g., DATABASE_URL in .env),
+        # with the pool settings (DB_POOL_* and DB_* in the configuration), and the optional
+        # read replica (DATABASE_REPLICA_URL)
+        "connections": database_connections(),
+        # Define the models module
+        "apps": {"models": {"models": ["app.adapters.secondary.orm.models"], "default_connection": "default"}},
+    },
     generate_schemas=ENVIRONMENT == "development",  # Automatically generate schemas if in development
     add_exception_handlers=True,  # Adds exception handling for common Tortoise ORM errors
 )
 
+# Report the settings of the database pool, so they can be checked per deployment
+@app.on_event("startup")
+async def report_database_pool():
+    settings = get_pool_settings()
+    if settings is not None:
+        logger.info("Database pool: %s", ", ".join(f"{name}={value}" for name, value in settings.items()))
+
+# Create the review partitions of the coming months, so new reviews never land in the default
+# partition. A no-op unless the review table is partitioned (Postgres).
+@app.on_event("startup")
+async def create_upcoming_review_partitions():
+    created = await create_review_partitions()
+    if created:
+        logger.info("Review partitions created: %s", ", ".join(created))
+
+# Load the location snapshot used by proximity lookups, once the ORM is initialized
+@app.on_event("startup")
+async def load_location_snapshot():
+    snapshot = get_location_snapshot()
+    if snapshot is not None:
+        await snapshot.load()
+
+# Load the UUIDs of the existing locations and categories checked before creating reviews
+@app.on_event("startup")
+async def load_reference_filter():
+    reference_filter = get_reference_filter()
+    if reference_filter is not None:
+        await reference_filter.load()
+
 # Basic root route for testing the API and ensuring the service is up and running
 @app.get("/")
 async def read_root():
@@ -0,0 +1,27 @@
+"""
+Periodic command that maintains the monthly partitions of the `review` table: it creates the
+partitions of the coming months and applies the retention policy (see REVIEW_PARTITION_MONTHS_AHEAD
+and REVIEW_RETENTION_* in the configuration).
+
+Run it daily, e.g. from cron:
+    python -m app.main_app.maintain_review_partitions
+"""
+import asyncio
+from tortoise import Tortoise
+from app.adapters.secondary.orm.review_partitions import apply_review_retention, create_review_partitions
+from app.main_app.config import TORTOISE_ORM
+
+
+async def main():
+    await Tortoise.init(config=TORTOISE_ORM)
+    try:
+        created = await create_review_partitions()
+        print(f"Review partitions created: {', '.join(created) or 'none'}.")
+        removed = await apply_review_retention()
+        print(f"Review months rolled up and removed: {', '.join(removed) or 'none'}.")
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,118 @@
+"""
+Benchmark of the bulk create endpoints against the single-row endpoints.
+
+Sends the same rows to POST /categories, /locations and /reviews one request per row, and to
+their /bulk counterparts in batches, through the ASGI app in process (no network), and reports
+the rows written per second. The single-row path pays a request, a duplicate lookup and a
+transaction per row; the bulk path pays them once per batch.
+
+Usage:
+    python -m benchmarks.bulk_benchmark [--db-url sqlite://:memory:] [--rows 1000] [--batch-size 500]
+"""
+import argparse
+import asyncio
+import json
+import httpx
+from app.adapters.secondary.orm.models import (
+    ModelCategory, ModelLocation, ModelLocationCluster, ModelPairReviewState, ModelReview
+)
+from app.main_app.main import app
+from benchmarks.common import close_database, init_database, timer
+
+# Key of the created entity in the results of each bulk endpoint
+RESULT_KEYS = {"/categories": "category", "/locations": "location", "/reviews": "review"}
+
+
+async def clear() -> None:
+    """
+    Deletes every row written by the endpoints.
+    """
+    for model in (ModelPairReviewState, ModelReview, ModelLocationCluster, ModelLocation, ModelCategory):
+        await model.all().delete()
+
+
+def build_rows(rows: int) -> dict:
+    """
+    Returns the request bodies of `rows` categories and locations.
+    """
+    return {
+        "categories": [{"description": f"Category {i}"} for i in range(rows)],
+        "locations": [
+            {"description": f"Location {i}", "lat": round(4 + i % 100 / 100, 6), "long": round(-74 - i // 100 / 100, 6)}
+            for i in range(rows)
+        ],
+    }
+
+
+def build_reviews(rows: int, location_ids: list, category_ids: list) -> list:
+    """
+    Returns the request bodies of `rows` reviews over the created locations and categories.
+    """
+    return [
+        {"recommendation": "Benchmark review", "location": location_ids[i % len(location_ids)],
+         "category": category_ids[i % len(category_ids)]}
+        for i in range(rows)
+    ]
+
+
+async def single_row(client: httpx.AsyncClient, path: str, bodies: list) -> list:
+    responses = [await client.post(f"{path}/", json=body) for body in bodies]
+    return [response.json()["id"] for response in responses]
+
+
+async def bulk(client: httpx.AsyncClient, path: str, bodies: list, batch_size: int) -> list:
+    ids = []
+    for start in range(0, len(bodies), batch_size):
+        response = await client.post(f"{path}/bulk", json=bodies[start:start + batch_size])
+        ids += [item[RESULT_KEYS[path]]["id"] for item in response.json()["results"] if item["status"] == "created"]
+    return ids
+
+
+async def measure(client: httpx.AsyncClient, rows: int, write) -> dict:
+    """
+    Writes categories, locations and reviews with the given strategy and returns the rows per second.
+    """
+    await clear()
+    bodies = build_rows(rows)
+    result = {}
+    for path in ("categories", "locations"):
+        with timer() as elapsed:
+            bodies[f"{path}_ids"] = await write(client, f"/{path}", bodies[path])
+        result[path] = round(rows / (elapsed["ms"] / 1000))
+
+    reviews = build_reviews(rows, bodies["locations_ids"], bodies["categories_ids"])
+    with timer() as elapsed:
+        await write(client, "/reviews", reviews)
+    result["reviews"] = round(rows / (elapsed["ms"] / 1000))
+    return result
+
+
+async def run(db_url: str, rows: int, batch_size: int) -> dict:
+    """
+    Runs the benchmark and returns the rows per second of each path and resource.
+    """
+    await init_database(db_url)
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark") as client:
+            return {
+                "rows": rows,
+                "single_row_rows_per_second": await measure(client, rows, single_row),
+                "bulk_rows_per_second": await measure(
+                    client, rows, lambda client, path, bodies: bulk(client, path, bodies, batch_size)
+                ),
+            }
+    finally:
+        await close_database()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db-url", default="sqlite://:memory:", help="Tortoise database URL")
+    parser.add_argument("--rows", type=int, default=1000, help="Rows written per resource")
+    parser.add_argument("--batch-size", type=int, default=500, help="Items per bulk request")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.db_url, args.rows, args.batch_size)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import time
+from contextlib import contextmanager
+from typing import Iterator
+from tortoise import Tortoise, connections
+from app.adapters.secondary.orm import models
+
+MODELS_MODULE = "app.adapters.secondary.orm.models"
+
+# Client methods through which every ORM and raw query is sent to the database
+QUERY_METHODS = ("execute_query", "execute_query_dict", "execute_insert", "execute_many")
+
+
+async def init_database(db_url: str = "sqlite://:memory:") -> None:
+    """
+    Initializes Tortoise ORM against the given database and creates the schema.
+
+    The models declare the Postgres `public` schema. SQLite has no schemas, so for SQLite
+    databases the schema is cleared before the ORM builds its queries.
+    """
+    if db_url.startswith("sqlite"):
+        for name in models.__all__:
+            getattr(models, name)._meta.schema = None
+    await Tortoise.init(db_url=db_url, modules={"models": [MODELS_MODULE]})
+    await Tortoise.generate_schemas(safe=True)
+
+
+async def close_database() -> None:
+    """
+    Closes all Tortoise ORM connections.
+    """
+    await Tortoise.close_connections()
+
+
+class QueryCounter:
+    """
+    Counts the statements issued through the default connection while it is active.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    @contextmanager
+    def track(self) -> Iterator["QueryCounter"]:
+        """
+        Wraps the query methods of the default connection for the duration of the block.
+        """
+        connection = connections.get("default")
+        originals = {name: getattr(connection, name) for name in QUERY_METHODS}
+
+        def wrap(method):
+            async def counted(*args, **kwargs):
+                self.count += 1
+                return await method(*args, **kwargs)
+            return counted
+
+        for name, method in originals.items():
+            setattr(connection, name, wrap(method))
+        try:
+            yield self
+        finally:
+            for name in originals:
+                delattr(connection, name)
+
+
+@contextmanager
+def timer() -> Iterator[dict]:
+    """
+    Measures the wall-clock time of the block in milliseconds.
+    """
+    result = {"ms": 0.0}
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result["ms"] = (time.perf_counter() - start) * 1000
@@ -0,0 +1,171 @@
+"""
+Seeded generator of synthetic datasets for the benchmarks.
+
+The same seed and sizes always produce the same rows (UUIDs included), with ages relative to the
+generation time, so runs against different builds measure the same data:
+
+- locations spread over the benchmark bounding box, created over the last two years;
+- categories created over the last two years;
+- reviews concentrated on popular locations and categories (Zipf-like weights), with ages
+  drawn from an exponential distribution: most pairs were reviewed recently, a long tail of
+  them expired (older than 30 days), and the pairs never drawn stay unreviewed.
+
+Usage:
+    python -m benchmarks.data_generator [--db-url sqlite://:memory:] [--locations 2000] [--categories 50]
+                                        [--reviews 20000] [--seed 42]
+"""
+import argparse
+import asyncio
+import json
+import random
+import uuid
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import List
+import pytz
+from app.adapters.secondary.orm.models import (
+    ModelCategory, ModelLocation, ModelLocationCluster, ModelPairReviewState, ModelReview
+)
+from app.adapters.secondary.orm.repositories.location_repository import location_geohash
+from app.main_app.backfill_location_clusters import backfill_location_clusters
+from app.main_app.backfill_pair_review_state import backfill_pair_review_state
+from benchmarks.common import close_database, init_database
+from benchmarks.nearby_benchmark import BOUNDING_BOX
+
+DEFAULT_SEED = 42
+
+# Age, in days, of the oldest location and category
+CATALOG_MAX_AGE_DAYS = 730
+
+# Mean and maximum age of the reviews, in days: with a 20-day mean ~22% of them are expired
+REVIEW_MEAN_AGE_DAYS = 20
+REVIEW_MAX_AGE_DAYS = 365
+
+# Exponent of the popularity weights: the location (or category) of rank r gets 1 / r^s of the reviews
+POPULARITY_EXPONENT = 0.8
+
+# Number of rows inserted per statement
+INSERT_BATCH_SIZE = 1000
+
+
+class Dataset:
+    """
+    UUIDs and coordinates of a generated dataset, used by the benchmark scenarios to build requests.
+    """
+
+    def __init__(self, seed: int, location_uuids: List[uuid.UUID], coordinates: List[tuple],
+                 category_uuids: List[uuid.UUID], reviews: int):
+        self.seed = seed
+        self.location_uuids = location_uuids
+        self.coordinates = coordinates
+        self.category_uuids = category_uuids
+        self.reviews = reviews
+
+    def dict(self) -> dict:
+        return {"seed": self.seed, "locations": len(self.location_uuids), "categories": len(self.category_uuids),
+                "reviews": self.reviews}
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _popularity(count: int) -> List[float]:
+    """
+    Returns the cumulative Zipf-like weights of `count` items, for `random.choices`.
+    """
+    return list(accumulate(1 / (rank + 1) ** POPULARITY_EXPONENT for rank in range(count)))
+
+
+async def clear() -> None:
+    """
+    Deletes every row of the tables filled by the generator.
+    """
+    for model in (ModelPairReviewState, ModelReview, ModelLocationCluster, ModelLocation, ModelCategory):
+        await model.all().delete()
+
+
+async def generate(locations: int, categories: int, reviews: int, seed: int = DEFAULT_SEED,
+                   now: datetime = None) -> Dataset:
+    """
+    Replaces the content of the database with a generated dataset, and rebuilds the pair review
+    states and the map clusters derived from it.
+
+    :param locations: Number of locations.
+    :param categories: Number of categories.
+    :param reviews: Number of reviews.
+    :param seed: Seed of the generator.
+    :param now: Time the ages are relative to. Defaults to the current time.
+    :return: The UUIDs and coordinates of the generated rows.
+    """
+    rng = random.Random(seed)
+    now = now or datetime.now(pytz.UTC)
+    await clear()
+
+    lat_min, lat_max, long_min, long_max = BOUNDING_BOX
+    location_models = []
+    for i in range(locations):
+        lat, long = round(rng.uniform(lat_min, lat_max), 6), round(rng.uniform(long_min, long_max), 6)
+        location_models.append(ModelLocation(
+            loc_uuid=_uuid(rng), loc_description=f"Location {i}", loc_status=True, loc_lat=lat, loc_long=long,
+            loc_geohash=location_geohash(lat, long),
+            loc_created=now - timedelta(days=rng.uniform(0, CATALOG_MAX_AGE_DAYS)),
+        ))
+    category_models = [
+        ModelCategory(cat_uuid=_uuid(rng), cat_description=f"Category {i}", cat_status=True,
+                      cat_created=now - timedelta(days=rng.uniform(0, CATALOG_MAX_AGE_DAYS)))
+        for i in range(categories)
+    ]
+    await ModelLocation.bulk_create(location_models, batch_size=INSERT_BATCH_SIZE)
+    await ModelCategory.bulk_create(category_models, batch_size=INSERT_BATCH_SIZE)
+
+    # Popularity does not follow the creation order
+    location_weights, category_weights = _popularity(locations), _popularity(categories)
+    popular_locations = rng.sample(location_models, locations)
+    popular_categories = rng.sample(category_models, categories)
+    for start in range(0, reviews, INSERT_BATCH_SIZE):
+        size = min(INSERT_BATCH_SIZE, reviews - start)
+        pairs = zip(rng.choices(popular_locations, cum_weights=location_weights, k=size),
+                    rng.choices(popular_categories, cum_weights=category_weights, k=size))
+        await ModelReview.bulk_create([
+            ModelReview(rev_uuid=_uuid(rng), rev_recommendation="Benchmark review",
+                        rev_created=now - timedelta(days=min(rng.expovariate(1 / REVIEW_MEAN_AGE_DAYS),
+                                                             REVIEW_MAX_AGE_DAYS)),
+                        rev_fk_loc_uuid_id=location.loc_uuid, rev_fk_cat_uuid_id=category.cat_uuid)
+            for location, category in pairs
+        ])
+
+    await backfill_pair_review_state()
+    await backfill_location_clusters()
+    return Dataset(
+        seed=seed,
+        location_uuids=[location.loc_uuid for location in location_models],
+        coordinates=[(location.loc_lat, location.loc_long) for location in location_models],
+        category_uuids=[category.cat_uuid for category in category_models],
+        reviews=reviews,
+    )
+
+
+async def run(db_url: str, locations: int, categories: int, reviews: int, seed: int) -> dict:
+    await init_database(db_url)
+    try:
+        dataset = await generate(locations, categories, reviews, seed)
+        return {**dataset.dict(), "pairs": await ModelPairReviewState.all().count()}
+    finally:
+        await close_database()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db-url", default="sqlite://:memory:", help="Tortoise database URL")
+    parser.add_argument("--locations", type=int, default=2000, help="Number of locations")
+    parser.add_argument("--categories", type=int, default=50, help="Number of categories")
+    parser.add_argument("--reviews", type=int, default=20000, help="Number of reviews")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Seed of the generator")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.db_url, args.locations, args.categories, args.reviews, args.seed)),
+                     indent=2))
+
+
+if __name__ == "__main__":
+    main()
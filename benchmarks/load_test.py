@@ -0,0 +1,289 @@
+"""
+Load generator sweeping concurrency levels over a weighted request mix.
+
+For each concurrency level, that many virtual users send requests back to back (closed loop) for a
+fixed duration, each request drawn from the mix. Every level reports its throughput, error rate
+and p50/p95/p99 latency, overall and per operation, so the throughput-versus-latency curve shows
+where the service saturates: past that point throughput stops growing and only latency does.
+
+Two targets are supported:
+- the ASGI app in process (default), over a seeded dataset in SQLite, or Postgres with --db-url.
+  The load generator shares the event loop with the app, so this compares code changes (caching,
+  query counts) rather than deployment settings;
+- a running server, with --base-url (e.g. uvicorn with several workers), to compare pool sizes
+  and worker counts. Its database is seeded through the bulk endpoints first.
+
+Operations of the mix: recommendations, recommendations_nearby, reviews, creates (a location or
+a category), nearby and tiles.
+
+Usage:
+    python -m benchmarks.load_test [--base-url http://localhost:8000] [--db-url URL]
+                                   [--mix recommendations=80,reviews=15,creates=5]
+                                   [--concurrency 1,2,4,8,16,32,64] [--duration 10] [--warmup 2]
+                                   [--csv curve.csv]
+"""
+import argparse
+import asyncio
+import csv
+import json
+import random
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+import httpx
+from app.core.domain import geo
+from benchmarks.common import close_database, init_database
+from benchmarks.data_generator import DEFAULT_SEED, Dataset, generate
+from benchmarks.nearby_benchmark import BOUNDING_BOX
+from benchmarks.suite import percentile
+
+DEFAULT_MIX = "recommendations=80,reviews=15,creates=5"
+DEFAULT_CONCURRENCY = "1,2,4,8,16,32,64"
+
+# Size of the dataset seeded before the sweep
+SEED_LOCATIONS = 2000
+SEED_CATEGORIES = 50
+SEED_REVIEWS = 20000
+
+# Items per request when seeding a running server through the bulk endpoints
+SEED_BATCH_SIZE = 500
+
+# Zoom level of the map tiles requested
+TILE_ZOOM = 10
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """
+    Parses a request mix such as `recommendations=80,reviews=15,creates=5` into weights per operation.
+    """
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation {name!r}, expected one of: {', '.join(OPERATIONS)}")
+        weights[name] = float(weight or 1)
+    if not any(weight > 0 for weight in weights.values()):
+        raise ValueError("The mix needs at least one operation with a positive weight")
+    return weights
+
+
+class Workload:
+    """
+    Builds the requests of the mix over the seeded locations and categories.
+    """
+
+    def __init__(self, dataset: Dataset, weights: Dict[str, float]):
+        self.dataset = dataset
+        self.names = list(weights)
+        self.cum_weights = []
+        total = 0.0
+        for name in self.names:
+            total += weights[name]
+            self.cum_weights.append(total)
+
+    def choose(self, rng: random.Random) -> str:
+        return rng.choices(self.names, cum_weights=self.cum_weights)[0]
+
+    def known_point(self, rng: random.Random) -> Tuple[float, float]:
+        lat, long = rng.choice(self.dataset.coordinates)
+        return float(lat), float(long)
+
+    async def recommendations(self, client: httpx.AsyncClient, rng: random.Random) -> httpx.Response:
+        return await client.get("/recommendations/", params={"limit": 50})
+
+    async def recommendations_nearby(self, client: httpx.AsyncClient, rng: random.Random) -> httpx.Response:
+        lat, long = self.known_point(rng)
+        return await client.get("/recommendations/", params={"lat": lat, "long": long, "radius": 20})
+
+    async def reviews(self, client: httpx.AsyncClient, rng: random.Random) -> httpx.Response:
+        return await client.post("/reviews/", json={
+            "recommendation": "Load test review", "location": str(rng.choice(self.dataset.location_uuids)),
+            "category": str(rng.choice(self.dataset.category_uuids)),
+        })
+
+    async def creates(self, client: httpx.AsyncClient, rng: random.Random) -> httpx.Response:
+        name = uuid.UUID(int=rng.getrandbits(128)).hex
+        if rng.random() < 0.5:
+            return await client.post("/categories/", json={"description": f"Load test category {name}"})
+        lat_min, lat_max, long_min, long_max = BOUNDING_BOX
+        return await client.post("/locations/", json={
+            "description": f"Load test location {name}",
+            "lat": round(rng.uniform(lat_min, lat_max), 6), "long": round(rng.uniform(long_min, long_max), 6),
+        })
+
+    async def nearby(self, client: httpx.AsyncClient, rng: random.Random) -> httpx.Response:
+        lat, long = self.known_point(rng)
+        return await client.get("/locations/nearby", params={"lat": lat, "long": long, "k": 10})
+
+    async def tiles(self, client: httpx.AsyncClient, rng: random.Random) -> httpx.Response:
+        x, y = geo.tile_xy(*self.known_point(rng), TILE_ZOOM)
+        return await client.get(f"/locations/tiles/{TILE_ZOOM}/{x}/{y}")
+
+
+# Operations accepted in the mix
+OPERATIONS = ("recommendations", "recommendations_nearby", "reviews", "creates", "nearby", "tiles")
+
+
+def summarize_level(concurrency: int, seconds: float, samples: List[Tuple[str, float, bool]]) -> dict:
+    """
+    Summarizes the (operation, latency in ms, ok) samples of a concurrency level.
+    """
+    def stats(selected):
+        latencies = [ms for _, ms, _ in selected]
+        errors = sum(1 for _, _, ok in selected if not ok)
+        result = {"requests": len(selected), "errors": errors,
+                  "throughput": round((len(selected) - errors) / seconds, 1)}
+        if latencies:
+            result.update({"p50_ms": round(percentile(latencies, 50), 2),
+                           "p95_ms": round(percentile(latencies, 95), 2),
+                           "p99_ms": round(percentile(latencies, 99), 2)})
+        return result
+
+    operations = sorted({name for name, _, _ in samples})
+    return {"concurrency": concurrency, **stats(samples),
+            "operations": {name: stats([sample for sample in samples if sample[0] == name]) for name in operations}}
+
+
+async def run_level(client: httpx.AsyncClient, workload: Workload, concurrency: int, duration: float,
+                    warmup: float, seed: int) -> dict:
+    """
+    Runs `concurrency` virtual users for `warmup` + `duration` seconds; only the requests
+    started after the warm-up are recorded.
+    """
+    samples: List[Tuple[str, float, bool]] = []
+    started = time.perf_counter()
+    measure_from = started + warmup
+    stop_at = measure_from + duration
+
+    async def user(rng: random.Random) -> None:
+        while True:
+            begin = time.perf_counter()
+            if begin >= stop_at:
+                return
+            name = workload.choose(rng)
+            try:
+                response = await getattr(workload, name)(client, rng)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            if begin >= measure_from:
+                samples.append((name, (time.perf_counter() - begin) * 1000, ok))
+
+    # Every user of every level draws its own requests, so created descriptions never repeat
+    await asyncio.gather(*(user(random.Random(f"{seed}-{concurrency}-{i}")) for i in range(concurrency)))
+    return summarize_level(concurrency, duration, samples)
+
+
+async def seed_server(client: httpx.AsyncClient, rng: random.Random) -> Dataset:
+    """
+    Creates the locations, categories and reviews of the sweep through the bulk endpoints of a
+    running server. Descriptions carry a run prefix, so runs do not collide.
+    """
+    prefix = uuid.UUID(int=rng.getrandbits(128)).hex[:8]
+    lat_min, lat_max, long_min, long_max = BOUNDING_BOX
+
+    async def bulk(path: str, key: str, bodies: list) -> list:
+        created = []
+        for start in range(0, len(bodies), SEED_BATCH_SIZE):
+            response = await client.post(f"{path}/bulk", json=bodies[start:start + SEED_BATCH_SIZE])
+            response.raise_for_status()
+            created += [item[key] for item in response.json()["results"] if item["status"] == "created"]
+        return created
+
+    locations = await bulk("/locations", "location", [
+        {"description": f"Load {prefix} location {i}", "lat": round(rng.uniform(lat_min, lat_max), 6),
+         "long": round(rng.uniform(long_min, long_max), 6)}
+        for i in range(SEED_LOCATIONS)
+    ])
+    categories = await bulk("/categories", "category", [
+        {"description": f"Load {prefix} category {i}"} for i in range(SEED_CATEGORIES)
+    ])
+    location_uuids = [uuid.UUID(location["id"]) for location in locations]
+    category_uuids = [uuid.UUID(category["id"]) for category in categories]
+    await bulk("/reviews", "review", [
+        {"recommendation": "Load test review", "location": str(rng.choice(location_uuids)),
+         "category": str(rng.choice(category_uuids))}
+        for _ in range(SEED_REVIEWS)
+    ])
+    return Dataset(seed=DEFAULT_SEED, location_uuids=location_uuids,
+                   coordinates=[(location["lat"], location["long"]) for location in locations],
+                   category_uuids=category_uuids, reviews=SEED_REVIEWS)
+
+
+async def run(base_url: Optional[str], db_url: str, mix: str, levels: List[int], duration: float,
+              warmup: float, seed: int) -> dict:
+    """
+    Seeds the target and runs every concurrency level in turn.
+    """
+    weights = parse_mix(mix)
+    rng = random.Random(seed)
+    if base_url:
+        client = httpx.AsyncClient(base_url=base_url, timeout=30,
+                                   limits=httpx.Limits(max_connections=max(levels)))
+    else:
+        # Imported here, so driving a running server does not load the app
+        from app.adapters.secondary.snapshot.location_snapshot import get_location_snapshot
+        from app.adapters.secondary.snapshot.reference_filter import get_reference_filter
+        from app.main_app.main import app
+
+        await init_database(db_url)
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://load-test", timeout=30)
+    try:
+        if base_url:
+            dataset = await seed_server(client, rng)
+        else:
+            dataset = await generate(SEED_LOCATIONS, SEED_CATEGORIES, SEED_REVIEWS, seed)
+            # Loaded at startup by the app
+            for component in (get_location_snapshot(), get_reference_filter()):
+                if component is not None:
+                    await component.load()
+
+        workload = Workload(dataset, weights)
+        results = [await run_level(client, workload, concurrency, duration, warmup, seed)
+                   for concurrency in levels]
+    finally:
+        await client.aclose()
+        if not base_url:
+            await close_database()
+
+    # Saturation: the lowest concurrency reaching 95% of the peak throughput
+    peak = max(level["throughput"] for level in results)
+    saturation = next(level["concurrency"] for level in results if level["throughput"] >= 0.95 * peak)
+    return {"target": base_url or "asgi", "mix": weights, "duration_seconds": duration, "dataset": dataset.dict(),
+            "peak_throughput": peak, "saturation_concurrency": saturation, "levels": results}
+
+
+def write_csv(path: str, report: dict) -> None:
+    """
+    Writes the throughput-versus-latency curve, one row per concurrency level.
+    """
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["concurrency", "throughput", "p50_ms", "p95_ms", "p99_ms", "errors"])
+        for level in report["levels"]:
+            writer.writerow([level["concurrency"], level["throughput"], level.get("p50_ms"), level.get("p95_ms"),
+                             level.get("p99_ms"), level["errors"]])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", help="URL of a running server; the ASGI app is driven in process when omitted")
+    parser.add_argument("--db-url", default="sqlite://:memory:", help="Tortoise database URL of the in-process app")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Weights of the operations, e.g. " + DEFAULT_MIX)
+    parser.add_argument("--concurrency", default=DEFAULT_CONCURRENCY, help="Comma-separated concurrency levels")
+    parser.add_argument("--duration", type=float, default=10, help="Measured seconds per level")
+    parser.add_argument("--warmup", type=float, default=2, help="Unmeasured seconds before each level")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Seed of the dataset and the requests")
+    parser.add_argument("--csv", help="Also write the curve to this CSV file")
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.concurrency.split(",")]
+    report = asyncio.run(run(args.base_url, args.db_url, args.mix, levels, args.duration, args.warmup, args.seed))
+    if args.csv:
+        write_csv(args.csv, report)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
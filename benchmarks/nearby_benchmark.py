@@ -0,0 +1,105 @@
+"""
+Benchmark for the proximity lookups of LocationRepository.
+
+Seeds growing numbers of locations spread over Colombia and measures radius and k-nearest
+lookups against a full scan that computes the distance to every location. The geohash lookups
+only read the cells around the point, so their cost grows far slower than the table.
+
+Usage:
+    python -m benchmarks.nearby_benchmark [--db-url sqlite://:memory:] [--repeat 20]
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+from app.adapters.secondary.orm.models import ModelLocation
+from app.adapters.secondary.orm.repositories.location_repository import LocationRepository, location_geohash
+from app.core.domain import geo
+from benchmarks.common import close_database, init_database, timer
+
+# Numbers of locations to benchmark
+LOCATION_COUNTS = [1000, 10000, 50000]
+
+# Bounding box of the seeded locations (lat_min, lat_max, long_min, long_max)
+BOUNDING_BOX = (-4.2, 12.5, -79.0, -67.0)
+
+RADIUS_KM = 5
+K = 10
+
+
+async def seed(count: int, rng: random.Random) -> None:
+    """
+    Replaces the locations with `count` random locations inside the bounding box.
+    """
+    await ModelLocation.all().delete()
+    lat_min, lat_max, long_min, long_max = BOUNDING_BOX
+    locations = []
+    for i in range(count):
+        lat, long = round(rng.uniform(lat_min, lat_max), 6), round(rng.uniform(long_min, long_max), 6)
+        locations.append(ModelLocation(loc_description=f"Location {i}", loc_status=True, loc_lat=lat,
+                                       loc_long=long, loc_geohash=location_geohash(lat, long)))
+    await ModelLocation.bulk_create(locations, batch_size=1000)
+
+
+async def full_scan(lat: float, long: float, radius_km: float) -> list:
+    """
+    Reference lookup: loads every location and computes its distance to the point.
+    """
+    locations = await ModelLocation.all()
+    return sorted(
+        distance for distance in (
+            geo.haversine_km(lat, long, float(location.loc_lat), float(location.loc_long)) for location in locations
+        ) if distance <= radius_km
+    )
+
+
+async def measure(lookup, points) -> float:
+    """
+    Returns the median latency in milliseconds of the lookup over the points.
+    """
+    latencies = []
+    for lat, long in points:
+        with timer() as elapsed:
+            await lookup(lat, long)
+        latencies.append(elapsed["ms"])
+    return round(statistics.median(latencies), 3)
+
+
+async def run(db_url: str, repeat: int) -> list:
+    """
+    Runs the benchmark for every location count and returns one result per count.
+    """
+    await init_database(db_url)
+    rng = random.Random(42)
+    repository = LocationRepository()
+    lat_min, lat_max, long_min, long_max = BOUNDING_BOX
+    results = []
+    try:
+        for count in LOCATION_COUNTS:
+            await seed(count, rng)
+            points = [(rng.uniform(lat_min, lat_max), rng.uniform(long_min, long_max)) for _ in range(repeat)]
+            results.append({
+                "locations": count,
+                "radius_median_ms": await measure(
+                    lambda lat, long: repository.find_within_radius(lat, long, RADIUS_KM, 100), points),
+                "nearest_median_ms": await measure(
+                    lambda lat, long: repository.find_nearest(lat, long, K), points),
+                "full_scan_median_ms": await measure(
+                    lambda lat, long: full_scan(lat, long, RADIUS_KM), points[:3]),
+            })
+    finally:
+        await close_database()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db-url", default="sqlite://:memory:", help="Tortoise database URL")
+    parser.add_argument("--repeat", type=int, default=20, help="Lookups per location count")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.db_url, args.repeat)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark for RecommendationRepository.get_recommendations.
+
+Seeds catalogs of growing size and reports, for each one, the number of statements issued and
+the latency of a recommendation request. With the set-based engine the query count must stay at 1
+regardless of the number of locations and categories.
+
+Usage:
+    python -m benchmarks.recommendation_benchmark [--db-url sqlite://:memory:] [--repeat 5]
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+from datetime import datetime, timedelta
+import pytz
+from app.adapters.secondary.orm.models import ModelCategory, ModelLocation, ModelPairReviewState, ModelReview
+from app.adapters.secondary.orm.repositories.recommendation_repository import RecommendationRepository
+from app.main_app.backfill_pair_review_state import backfill_pair_review_state
+from benchmarks.common import QueryCounter, close_database, init_database, timer
+
+# (locations, categories) catalog sizes to benchmark
+CATALOG_SIZES = [(100, 10), (500, 20), (2000, 50)]
+
+# Fraction of pairs that receive reviews while seeding
+REVIEWED_RATIO = 0.3
+
+
+async def seed(locations: int, categories: int, rng: random.Random) -> None:
+    """
+    Replaces the catalog with `locations` x `categories` pairs, a share of them reviewed
+    at ages spread over the last 90 days.
+    """
+    await ModelPairReviewState.all().delete()
+    await ModelReview.all().delete()
+    await ModelLocation.all().delete()
+    await ModelCategory.all().delete()
+
+    location_models = [
+        ModelLocation(loc_description=f"Location {i}", loc_status=True,
+                      loc_lat=rng.uniform(-90, 90), loc_long=rng.uniform(-180, 180))
+        for i in range(locations)
+    ]
+    category_models = [ModelCategory(cat_description=f"Category {i}", cat_status=True) for i in range(categories)]
+    await ModelLocation.bulk_create(location_models, batch_size=1000)
+    await ModelCategory.bulk_create(category_models, batch_size=1000)
+
+    now = datetime.now(pytz.UTC)
+    reviews = [
+        ModelReview(rev_recommendation="Benchmark review", rev_created=now - timedelta(days=rng.uniform(0, 90)),
+                    rev_fk_loc_uuid_id=location.loc_uuid, rev_fk_cat_uuid_id=category.cat_uuid)
+        for location in location_models
+        for category in category_models
+        if rng.random() < REVIEWED_RATIO
+    ]
+    await ModelReview.bulk_create(reviews, batch_size=1000)
+    await backfill_pair_review_state()
+
+
+async def run(db_url: str, repeat: int) -> list:
+    """
+    Runs the benchmark for every catalog size and returns one result per size.
+    """
+    await init_database(db_url)
+    rng = random.Random(42)
+    repository = RecommendationRepository()
+    results = []
+    try:
+        for locations, categories in CATALOG_SIZES:
+            await seed(locations, categories, rng)
+            await repository.get_recommendations()  # Warm up
+
+            latencies = []
+            counter = QueryCounter()
+            for _ in range(repeat):
+                with counter.track(), timer() as elapsed:
+                    recommendations = await repository.get_recommendations()
+                latencies.append(elapsed["ms"])
+
+            results.append({
+                "locations": locations,
+                "categories": categories,
+                "pairs": locations * categories,
+                "queries_per_request": counter.count / repeat,
+                "median_ms": round(statistics.median(latencies), 3),
+                "returned": len(recommendations),
+            })
+    finally:
+        await close_database()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db-url", default="sqlite://:memory:", help="Tortoise database URL")
+    parser.add_argument("--repeat", type=int, default=5, help="Measured requests per catalog size")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.db_url, args.repeat)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Micro-benchmark of the in-memory location snapshot.
+
+Compares the per-entity path (a haversine per LocationEntity, with its Decimal coordinates)
+against the vectorized LocationSnapshot for computing the distance from a point to every
+location and picking the k nearest. Both run in memory; only the computation is timed.
+
+Usage:
+    python -m benchmarks.snapshot_benchmark [--repeat 20]
+"""
+import argparse
+import json
+import random
+import statistics
+import uuid
+from decimal import Decimal
+from app.adapters.secondary.snapshot.location_snapshot import LocationSnapshot
+from app.core.domain import geo
+from app.core.domain.entities.location_entity import LocationEntity
+from benchmarks.common import timer
+from benchmarks.nearby_benchmark import BOUNDING_BOX, K
+
+# Numbers of locations to benchmark
+LOCATION_COUNTS = [1000, 10000, 100000]
+
+
+def build_entities(count: int, rng: random.Random) -> list:
+    """
+    Returns `count` random locations inside the bounding box, with Decimal coordinates as read from the ORM.
+    """
+    lat_min, lat_max, long_min, long_max = BOUNDING_BOX
+    return [
+        LocationEntity(loc_uuid=uuid.uuid4(), loc_description=f"Location {i}", loc_status=True, loc_created=None,
+                       loc_updated=None, loc_lat=Decimal(f"{rng.uniform(lat_min, lat_max):.6f}"),
+                       loc_long=Decimal(f"{rng.uniform(long_min, long_max):.6f}"))
+        for i in range(count)
+    ]
+
+
+def per_entity_nearest(entities: list, lat: float, long: float, k: int) -> list:
+    """
+    Reference path: computes the distance to each entity one by one and sorts them.
+    """
+    ranked = sorted(
+        ((entity.loc_uuid, geo.haversine_km(lat, long, float(entity.loc_lat), float(entity.loc_long)))
+         for entity in entities),
+        key=lambda item: item[1]
+    )
+    return ranked[:k]
+
+
+def measure(lookup, points) -> float:
+    """
+    Returns the median latency in milliseconds of the lookup over the points.
+    """
+    latencies = []
+    for lat, long in points:
+        with timer() as elapsed:
+            lookup(lat, long)
+        latencies.append(elapsed["ms"])
+    return round(statistics.median(latencies), 3)
+
+
+def run(repeat: int) -> list:
+    """
+    Runs the benchmark for every location count and returns one result per count.
+    """
+    rng = random.Random(42)
+    lat_min, lat_max, long_min, long_max = BOUNDING_BOX
+    results = []
+    for count in LOCATION_COUNTS:
+        entities = build_entities(count, rng)
+        snapshot = LocationSnapshot()
+        with timer() as load:
+            snapshot.replace((entity.loc_uuid, entity.loc_lat, entity.loc_long) for entity in entities)
+        points = [(rng.uniform(lat_min, lat_max), rng.uniform(long_min, long_max)) for _ in range(repeat)]
+        results.append({
+            "locations": count,
+            "snapshot_load_ms": round(load["ms"], 3),
+            "per_entity_median_ms": measure(lambda lat, long: per_entity_nearest(entities, lat, long, K), points),
+            "snapshot_median_ms": measure(lambda lat, long: snapshot.nearest(lat, long, K), points),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20, help="Lookups per location count")
+    args = parser.parse_args()
+    print(json.dumps(run(args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
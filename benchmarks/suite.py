@@ -0,0 +1,402 @@
+"""
+Benchmark suite covering every endpoint and every repository method, with regression gating.
+
+Generates a seeded dataset (see benchmarks.data_generator), then runs each scenario a fixed
+number of times, one operation at a time, and reports its throughput and p50/p95/p99 latency as
+JSON. Scenarios run in several rounds and the best value of each metric is reported, which
+filters out most of the noise of a busy machine. Endpoints are called through the ASGI app in process (no
+network), so the figures include routing, validation and serialization but no socket overhead.
+
+The results are compared with the stored baseline of the backend (benchmarks/baselines/sqlite.json
+or postgres.json): the run fails when the throughput, p50 or p95 of a scenario is worse than the
+baseline by more than the threshold (twice the threshold for p95, which varies more between
+runs). p99 is reported but not gated, as a handful of operations decide it. Baselines only
+compare runs on the same machine, so record one with --save-baseline on the machine that runs
+the gate.
+
+The suite runs against an in-memory SQLite database, or against Postgres when DATABASE_URL is set
+(the tables are emptied first).
+
+Usage:
+    python -m benchmarks.suite [--db-url URL] [--ops 200] [--rounds 3] [--only api.reviews] [--threshold 0.25]
+                               [--baseline PATH] [--save-baseline] [--output results.json]
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+from decimal import Decimal
+from typing import Awaitable, Callable, Dict, List, Optional
+import httpx
+from app.adapters.secondary.orm.repositories.category_repository import CategoryRepository
+from app.adapters.secondary.orm.repositories.location_cluster_repository import LocationClusterRepository
+from app.adapters.secondary.orm.repositories.location_repository import LocationRepository
+from app.adapters.secondary.orm.repositories.recommendation_repository import RecommendationRepository
+from app.adapters.secondary.orm.repositories.review_repository import ReviewRepository
+from app.adapters.secondary.snapshot.location_snapshot import get_location_snapshot
+from app.adapters.secondary.snapshot.reference_filter import get_reference_filter
+from app.core.domain import geo
+from app.core.domain.entities.category_entity import CategoryEntity
+from app.core.domain.entities.location_entity import LocationEntity
+from app.core.domain.entities.review_entity import ReviewEntity
+from app.main_app.main import app
+from benchmarks.common import close_database, init_database, timer
+from benchmarks.data_generator import DEFAULT_SEED, Dataset, generate
+from benchmarks.nearby_benchmark import BOUNDING_BOX
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+
+# Size of the generated dataset
+DATASET_LOCATIONS = 2000
+DATASET_CATEGORIES = 50
+DATASET_REVIEWS = 20000
+
+# Rows per operation of the batch scenarios (bulk endpoints, save_many, import)
+BATCH_ROWS = 100
+IMPORT_ROWS = 1000
+
+# Unmeasured operations run before each scenario
+WARMUP_OPS = 3
+
+# Maximum relative regression before the run fails
+DEFAULT_THRESHOLD = 0.25
+
+# Latency differences below this are noise, whatever their relative size
+NOISE_FLOOR_MS = 0.2
+
+# p95 varies more between runs than the median, so it may regress by this many times the threshold
+TAIL_THRESHOLD_FACTOR = 2
+
+# Zoom level of the map tiles requested
+TILE_ZOOM = 10
+
+
+class Scenario:
+    """
+    A named operation measured by the suite. `operation` receives the index of the call, so
+    writes can use unique descriptions.
+    """
+
+    def __init__(self, name: str, operation: Callable[[int], Awaitable], rows: int = 1):
+        """
+        :param name: Name of the scenario, `api.*` for endpoints and `repository.*` for repository methods.
+        :param operation: The measured operation.
+        :param rows: Rows handled per operation; batch scenarios run ten times fewer operations.
+        """
+        self.name = name
+        self.operation = operation
+        self.rows = rows
+
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    Returns the q-th percentile (0-100) of the values, with the nearest-rank method.
+    """
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def summarize(latencies_ms: List[float], rows: int) -> dict:
+    """
+    Returns the throughput and latency percentiles of a scenario.
+    """
+    total_seconds = sum(latencies_ms) / 1000
+    return {
+        "ops": len(latencies_ms),
+        "rows_per_op": rows,
+        "ops_per_second": round(len(latencies_ms) / total_seconds, 1) if total_seconds else None,
+        "p50_ms": round(percentile(latencies_ms, 50), 3),
+        "p95_ms": round(percentile(latencies_ms, 95), 3),
+        "p99_ms": round(percentile(latencies_ms, 99), 3),
+    }
+
+
+def best_of(best: Optional[dict], summary: dict) -> dict:
+    """
+    Merges the summary of a round into the best values so far: highest throughput, lowest latencies.
+    """
+    if best is None:
+        return summary
+    merged = dict(summary)
+    merged["ops_per_second"] = max(best["ops_per_second"] or 0, summary["ops_per_second"] or 0) or None
+    for metric in ("p50_ms", "p95_ms", "p99_ms"):
+        merged[metric] = min(best[metric], summary[metric])
+    return merged
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[dict]:
+    """
+    Returns the regressions of the results against the baseline: scenarios whose throughput or
+    p50 is worse by more than `threshold`, or whose p95 is worse by more than
+    `TAIL_THRESHOLD_FACTOR` times it, and by more than the noise floor. Scenarios missing from
+    either side are ignored.
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        # Throughput is compared as the mean time per operation, so the noise floor applies to it too
+        pairs = {"p50_ms": (current["p50_ms"], previous["p50_ms"], threshold),
+                 "p95_ms": (current["p95_ms"], previous["p95_ms"], threshold * TAIL_THRESHOLD_FACTOR)}
+        if current.get("ops_per_second") and previous.get("ops_per_second"):
+            pairs["ops_per_second"] = (1000 / current["ops_per_second"], 1000 / previous["ops_per_second"],
+                                       threshold)
+        for metric, (now_ms, before_ms, allowed) in pairs.items():
+            if now_ms > before_ms * (1 + allowed) and now_ms - before_ms > NOISE_FLOOR_MS:
+                regressions.append({"scenario": name, "metric": metric, "baseline": previous[metric],
+                                    "current": current[metric]})
+    return regressions
+
+
+def check(response: httpx.Response) -> httpx.Response:
+    """
+    Fails the scenario on an error response, so error paths are never measured as successes.
+    """
+    if response.status_code >= 400:
+        raise RuntimeError(f"{response.request.method} {response.request.url} returned "
+                           f"{response.status_code}: {response.text[:200]}")
+    return response
+
+
+def build_scenarios(client: httpx.AsyncClient, dataset: Dataset, rng: random.Random) -> List[Scenario]:
+    """
+    Returns the scenarios of every endpoint and repository method, over the generated dataset.
+    """
+    lat_min, lat_max, long_min, long_max = BOUNDING_BOX
+    locations, categories = dataset.location_uuids, dataset.category_uuids
+
+    def point():
+        return round(rng.uniform(lat_min, lat_max), 6), round(rng.uniform(long_min, long_max), 6)
+
+    def known_point():
+        lat, long = rng.choice(dataset.coordinates)
+        return float(lat), float(long)
+
+    def review_body():
+        return {"recommendation": "Benchmark review", "location": str(rng.choice(locations)),
+                "category": str(rng.choice(categories))}
+
+    def location_body(name):
+        lat, long = point()
+        return {"description": name, "lat": lat, "long": long}
+
+    cursors = []
+
+    async def second_page_cursor():
+        # Read once, outside the measured operation
+        if not cursors:
+            cursors.append(check(await client.get("/recommendations/", params={"limit": 50})).json()["next_cursor"])
+        return cursors[0]
+
+    def tile():
+        lat, long = known_point()
+        return geo.tile_xy(lat, long, TILE_ZOOM)
+
+    # API scenarios
+    async def recommendations_next_page(i):
+        cursor = await second_page_cursor()
+        check(await client.get("/recommendations/", params={"limit": 50, "cursor": cursor}))
+
+    async def import_reviews(i):
+        body = "".join(json.dumps(review_body()) + "\n" for _ in range(IMPORT_ROWS))
+        check(await client.post("/reviews/import", content=body, headers={"Content-Type": "application/x-ndjson"}))
+
+    async def get_tile(i, stale):
+        x, y = tile()
+        check(await client.get(f"/locations/tiles/{TILE_ZOOM}/{x}/{y}", params={"stale": "true"} if stale else {}))
+
+    api = [
+        Scenario("api.categories.create", lambda i: client.post(
+            "/categories/", json={"description": f"API category {i}"})),
+        Scenario("api.categories.bulk", lambda i: client.post(
+            "/categories/bulk", json=[{"description": f"API bulk category {i}-{j}"} for j in range(BATCH_ROWS)]),
+            rows=BATCH_ROWS),
+        Scenario("api.locations.create", lambda i: client.post("/locations/", json=location_body(f"API location {i}"))),
+        Scenario("api.locations.bulk", lambda i: client.post(
+            "/locations/bulk", json=[location_body(f"API bulk location {i}-{j}") for j in range(BATCH_ROWS)]),
+            rows=BATCH_ROWS),
+        Scenario("api.locations.nearby_radius", lambda i: client.get(
+            "/locations/nearby", params=dict(zip(("lat", "long"), known_point()), radius=5))),
+        Scenario("api.locations.nearby_k", lambda i: client.get(
+            "/locations/nearby", params=dict(zip(("lat", "long"), known_point()), k=10))),
+        Scenario("api.locations.tile", lambda i: get_tile(i, False)),
+        Scenario("api.locations.tile_stale", lambda i: get_tile(i, True)),
+        Scenario("api.reviews.create", lambda i: client.post("/reviews/", json=review_body())),
+        Scenario("api.reviews.bulk", lambda i: client.post(
+            "/reviews/bulk", json=[review_body() for _ in range(BATCH_ROWS)]), rows=BATCH_ROWS),
+        Scenario("api.reviews.import", import_reviews, rows=IMPORT_ROWS),
+        Scenario("api.reviews.queue_stats", lambda i: client.get("/reviews/queue/stats")),
+        Scenario("api.reviews.references_stats", lambda i: client.get("/reviews/references/stats")),
+        Scenario("api.recommendations.first_page", lambda i: client.get("/recommendations/", params={"limit": 50})),
+        Scenario("api.recommendations.next_page", recommendations_next_page),
+        Scenario("api.recommendations.category", lambda i: client.get(
+            "/recommendations/", params={"category": str(rng.choice(categories))})),
+        Scenario("api.recommendations.nearby", lambda i: client.get(
+            "/recommendations/", params=dict(zip(("lat", "long"), known_point()), radius=20))),
+        Scenario("api.recommendations.cache_stats", lambda i: client.get("/recommendations/cache/stats")),
+        Scenario("api.metrics", lambda i: client.get("/metrics")),
+    ]
+    for scenario in api:
+        scenario.operation = _checked(scenario.operation)
+
+    # Repository scenarios
+    category_repository, location_repository = CategoryRepository(), LocationRepository()
+    review_repository, recommendation_repository = ReviewRepository(), RecommendationRepository()
+    cluster_repository = LocationClusterRepository()
+
+    def location_entity(name):
+        lat, long = point()
+        return LocationEntity.create(name, Decimal(str(lat)), Decimal(str(long)))
+
+    def review_entity():
+        return ReviewEntity.create("Benchmark review", rng.choice(locations), rng.choice(categories))
+
+    async def find_tile(i):
+        x, y = tile()
+        await cluster_repository.get_tile(TILE_ZOOM, x, y)
+
+    repository = [
+        Scenario("repository.category.save", lambda i: category_repository.save(
+            CategoryEntity.create(f"Repository category {i}"))),
+        Scenario("repository.category.create_if_absent", lambda i: category_repository.create_if_absent(
+            CategoryEntity.create(f"Category {i % len(categories)}" if i % 2 else f"Absent category {i}"))),
+        Scenario("repository.category.save_many", lambda i: category_repository.save_many(
+            [CategoryEntity.create(f"Repository bulk category {i}-{j}") for j in range(BATCH_ROWS)]),
+            rows=BATCH_ROWS),
+        Scenario("repository.category.get_by_description", lambda i: category_repository.get_by_description(
+            f"Category {rng.randrange(len(categories))}")),
+        Scenario("repository.category.get_existing_descriptions",
+                 lambda i: category_repository.get_existing_descriptions(
+                     [f"Category {rng.randrange(len(categories) * 2)}" for _ in range(BATCH_ROWS)]),
+                 rows=BATCH_ROWS),
+        Scenario("repository.location.save", lambda i: location_repository.save(
+            location_entity(f"Repository location {i}"))),
+        Scenario("repository.location.create_if_absent", lambda i: location_repository.create_if_absent(
+            location_entity(f"Location {i % len(locations)}" if i % 2 else f"Absent location {i}"))),
+        Scenario("repository.location.save_many", lambda i: location_repository.save_many(
+            [location_entity(f"Repository bulk location {i}-{j}") for j in range(BATCH_ROWS)]), rows=BATCH_ROWS),
+        Scenario("repository.location.get_by_description", lambda i: location_repository.get_by_description(
+            f"Location {rng.randrange(len(locations))}")),
+        Scenario("repository.location.get_existing_descriptions",
+                 lambda i: location_repository.get_existing_descriptions(
+                     [f"Location {rng.randrange(len(locations) * 2)}" for _ in range(BATCH_ROWS)]),
+                 rows=BATCH_ROWS),
+        Scenario("repository.location.find_within_radius",
+                 lambda i: location_repository.find_within_radius(*known_point(), 5, 100)),
+        Scenario("repository.location.find_nearest", lambda i: location_repository.find_nearest(*known_point(), 10)),
+        Scenario("repository.location_cluster.get_tile", find_tile),
+        Scenario("repository.review.save", lambda i: review_repository.save(review_entity())),
+        Scenario("repository.review.save_many", lambda i: review_repository.save_many(
+            [review_entity() for _ in range(BATCH_ROWS)]), rows=BATCH_ROWS),
+        Scenario("repository.review.get_existing_references", lambda i: review_repository.get_existing_references(
+            rng.sample(locations, 10), rng.sample(categories, 10))),
+        Scenario("repository.recommendation.get_recommendations",
+                 lambda i: recommendation_repository.get_recommendations()),
+    ]
+    return api + repository
+
+
+def _checked(operation: Callable[[int], Awaitable]) -> Callable[[int], Awaitable]:
+    async def run(i):
+        response = await operation(i)
+        if isinstance(response, httpx.Response):
+            check(response)
+    return run
+
+
+async def measure(scenario: Scenario, ops: int) -> dict:
+    """
+    Runs the scenario `ops` times after the warm-up and returns its summary. Batch scenarios run
+    ten times fewer operations, with a minimum of 5.
+    """
+    if scenario.rows > 1:
+        ops = max(5, ops // 10)
+    for i in range(WARMUP_OPS):
+        await scenario.operation(-1 - i)
+    latencies = []
+    for i in range(ops):
+        with timer() as elapsed:
+            await scenario.operation(i)
+        latencies.append(elapsed["ms"])
+    return summarize(latencies, scenario.rows)
+
+
+def backend(db_url: str) -> str:
+    return "postgres" if db_url.startswith(("postgres", "asyncpg", "psycopg")) else "sqlite"
+
+
+async def run(db_url: str, ops: int, rounds: int, only: Optional[str], seed: int) -> dict:
+    """
+    Runs the selected scenarios `rounds` times and returns the best value of each metric over
+    the rounds.
+
+    Every round starts from a freshly generated dataset and replays the same operations, since
+    the write scenarios grow the tables. A burst of load on the machine then only disturbs some
+    rounds of a scenario.
+    """
+    await init_database(db_url)
+    results = {}
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark") as client:
+            for _ in range(rounds):
+                dataset = await generate(DATASET_LOCATIONS, DATASET_CATEGORIES, DATASET_REVIEWS, seed)
+                # Loaded at startup by the app
+                for component in (get_location_snapshot(), get_reference_filter()):
+                    if component is not None:
+                        await component.load()
+
+                for scenario in build_scenarios(client, dataset, random.Random(seed)):
+                    if only and not scenario.name.startswith(only):
+                        continue
+                    results[scenario.name] = best_of(results.get(scenario.name), await measure(scenario, ops))
+        return {"backend": backend(db_url), "dataset": dataset.dict(), "ops": ops, "rounds": rounds,
+                "scenarios": results}
+    finally:
+        await close_database()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db-url", default=os.getenv("DATABASE_URL", "sqlite://:memory:"),
+                        help="Tortoise database URL (default: DATABASE_URL, or in-memory SQLite)")
+    parser.add_argument("--ops", type=int, default=200, help="Measured operations per scenario")
+    parser.add_argument("--rounds", type=int, default=3,
+                        help="Rounds per scenario; the best value of each metric is kept")
+    parser.add_argument("--only", help="Only run the scenarios whose name starts with this prefix")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Seed of the dataset and the requests")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Maximum relative regression against the baseline (0.25 = 25%%)")
+    parser.add_argument("--baseline", help="Baseline file (default: benchmarks/baselines/<backend>.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--output", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args.db_url, args.ops, args.rounds, args.only, args.seed))
+    baseline_path = args.baseline or os.path.join(BASELINE_DIR, f"{report['backend']}.json")
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(baseline_path), exist_ok=True)
+        with open(baseline_path, "w") as file:
+            json.dump(report, file, indent=2)
+            file.write("\n")
+    elif os.path.exists(baseline_path):
+        with open(baseline_path) as file:
+            baseline = json.load(file)
+        report["baseline"] = os.path.relpath(baseline_path)
+        report["threshold"] = args.threshold
+        report["regressions"] = compare(report["scenarios"], baseline["scenarios"], args.threshold)
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    if report.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
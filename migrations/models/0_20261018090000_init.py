@@ -0,0 +1,67 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "category" (
+            "cat_uuid" UUID NOT NULL  PRIMARY KEY,
+            "cat_description" VARCHAR(150) NOT NULL UNIQUE,
+            "cat_status" BOOL NOT NULL,
+            "cat_created" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+            "cat_updated" TIMESTAMPTZ
+        );
+        CREATE INDEX IF NOT EXISTS "idx_category_cat_des_7aacf8" ON "category" ("cat_description");
+        CREATE INDEX IF NOT EXISTS "idx_category_cat_cre_e05b6f" ON "category" ("cat_created");
+        COMMENT ON COLUMN "category"."cat_uuid" IS 'Unique identifier for the category.';
+        COMMENT ON COLUMN "category"."cat_description" IS 'Description / name of the category.';
+        COMMENT ON COLUMN "category"."cat_status" IS 'Status of the category: Active or Inactive.';
+        COMMENT ON COLUMN "category"."cat_created" IS 'Creation date of the category.';
+        COMMENT ON COLUMN "category"."cat_updated" IS 'Last update date of the category.';
+        COMMENT ON TABLE "category" IS 'Represents a Category in the system.';
+        CREATE TABLE IF NOT EXISTS "location" (
+            "loc_uuid" UUID NOT NULL  PRIMARY KEY,
+            "loc_description" VARCHAR(150) NOT NULL UNIQUE,
+            "loc_lat" DECIMAL(9,6),
+            "loc_long" DECIMAL(9,6),
+            "loc_status" BOOL NOT NULL,
+            "loc_created" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+            "loc_updated" TIMESTAMPTZ
+        );
+        CREATE INDEX IF NOT EXISTS "idx_location_loc_des_625bc1" ON "location" ("loc_description");
+        CREATE INDEX IF NOT EXISTS "idx_location_loc_cre_20e5ed" ON "location" ("loc_created");
+        COMMENT ON COLUMN "location"."loc_uuid" IS 'Unique identifier for the location.';
+        COMMENT ON COLUMN "location"."loc_description" IS 'Description / name of the location.';
+        COMMENT ON COLUMN "location"."loc_lat" IS 'Latitude of the location.';
+        COMMENT ON COLUMN "location"."loc_long" IS 'Longitude of the location.';
+        COMMENT ON COLUMN "location"."loc_status" IS 'Status of the location: Active or Inactive.';
+        COMMENT ON COLUMN "location"."loc_created" IS 'Creation date of the location.';
+        COMMENT ON COLUMN "location"."loc_updated" IS 'Last update date of the location.';
+        COMMENT ON TABLE "location" IS 'Represents a Location in the system.';
+        CREATE TABLE IF NOT EXISTS "review" (
+            "rev_uuid" UUID NOT NULL  PRIMARY KEY,
+            "rev_recommendation" VARCHAR(500) NOT NULL,
+            "rev_obs" VARCHAR(500),
+            "rev_created" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+            "rev_fk_cat_uuid_id" UUID NOT NULL REFERENCES "category" ("cat_uuid") ON DELETE CASCADE,
+            "rev_fk_loc_uuid_id" UUID NOT NULL REFERENCES "location" ("loc_uuid") ON DELETE CASCADE
+        );
+        CREATE INDEX IF NOT EXISTS "idx_review_rev_fk__67006e" ON "review" ("rev_fk_loc_uuid_id", "rev_fk_cat_uuid_id", "rev_created");
+        CREATE INDEX IF NOT EXISTS "idx_review_rev_cre_857392" ON "review" ("rev_created");
+        COMMENT ON COLUMN "review"."rev_uuid" IS 'Unique identifier for the review.';
+        COMMENT ON COLUMN "review"."rev_recommendation" IS 'Recommendation captured for the review.';
+        COMMENT ON COLUMN "review"."rev_obs" IS 'Optional observations captured for the review.';
+        COMMENT ON COLUMN "review"."rev_created" IS 'Creation date of the review.';
+        COMMENT ON COLUMN "review"."rev_fk_cat_uuid_id" IS 'Relationship from review to category model.';
+        COMMENT ON COLUMN "review"."rev_fk_loc_uuid_id" IS 'Relationship from review to location model.';
+        COMMENT ON TABLE "review" IS 'Represents a review in the system.';
+        CREATE TABLE IF NOT EXISTS "aerich" (
+            "id" SERIAL NOT NULL PRIMARY KEY,
+            "version" VARCHAR(255) NOT NULL,
+            "app" VARCHAR(100) NOT NULL,
+            "content" JSONB NOT NULL
+        );"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        """
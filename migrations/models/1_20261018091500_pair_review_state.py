@@ -0,0 +1,33 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "pair_review_state" (
+            "prs_uuid" UUID NOT NULL  PRIMARY KEY,
+            "prs_last_review" TIMESTAMPTZ NOT NULL,
+            "prs_review_count" INT NOT NULL  DEFAULT 0,
+            "prs_fk_cat_uuid_id" UUID NOT NULL REFERENCES "category" ("cat_uuid") ON DELETE CASCADE,
+            "prs_fk_loc_uuid_id" UUID NOT NULL REFERENCES "location" ("loc_uuid") ON DELETE CASCADE,
+            CONSTRAINT "uid_pair_review_prs_fk__06a517" UNIQUE ("prs_fk_loc_uuid_id", "prs_fk_cat_uuid_id")
+        );
+        CREATE INDEX IF NOT EXISTS "idx_pair_review_prs_las_dad5cd" ON "pair_review_state" ("prs_last_review", "prs_fk_loc_uuid_id", "prs_fk_cat_uuid_id");
+        CREATE INDEX IF NOT EXISTS "idx_pair_review_prs_fk__e1981f" ON "pair_review_state" ("prs_fk_cat_uuid_id", "prs_last_review");
+        COMMENT ON COLUMN "pair_review_state"."prs_uuid" IS 'Unique identifier for the pair state.';
+        COMMENT ON COLUMN "pair_review_state"."prs_last_review" IS 'Creation date of the last review of the pair.';
+        COMMENT ON COLUMN "pair_review_state"."prs_review_count" IS 'Number of reviews of the pair.';
+        COMMENT ON COLUMN "pair_review_state"."prs_fk_cat_uuid_id" IS 'Relationship from pair state to category model.';
+        COMMENT ON COLUMN "pair_review_state"."prs_fk_loc_uuid_id" IS 'Relationship from pair state to location model.';
+        COMMENT ON TABLE "pair_review_state" IS 'Represents the review state of a location-category pair.';
+        -- Review state of the existing pairs, so recommendations are right as soon as the app starts
+        INSERT INTO "pair_review_state"
+            ("prs_uuid", "prs_fk_loc_uuid_id", "prs_fk_cat_uuid_id", "prs_last_review", "prs_review_count")
+        SELECT gen_random_uuid(), "rev_fk_loc_uuid_id", "rev_fk_cat_uuid_id", MAX("rev_created"), COUNT(*)
+        FROM "review"
+        GROUP BY "rev_fk_loc_uuid_id", "rev_fk_cat_uuid_id"
+        ON CONFLICT ("prs_fk_loc_uuid_id", "prs_fk_cat_uuid_id") DO NOTHING;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "pair_review_state";"""
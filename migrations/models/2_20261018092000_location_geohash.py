@@ -0,0 +1,57 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        -- Databases created before the migrations (by generate_schemas) already have the baseline
+        -- tables, so the column added to them is only added when missing.
+        ALTER TABLE "location" ADD COLUMN IF NOT EXISTS "loc_geohash" VARCHAR(12);
+        COMMENT ON COLUMN "location"."loc_geohash" IS 'Geohash of the location coordinates.';
+        CREATE INDEX IF NOT EXISTS "idx_location_loc_geo_62833e" ON "location" ("loc_geohash", "loc_lat", "loc_long");
+        -- Geohash of the existing locations, computed like app.core.domain.geo.encode (precision 12),
+        -- so they are found by proximity lookups as soon as the app starts
+        CREATE FUNCTION pg_temp.geohash_encode(point_lat DOUBLE PRECISION, point_long DOUBLE PRECISION)
+        RETURNS VARCHAR(12) AS $$
+        DECLARE
+            alphabet CONSTANT TEXT := '0123456789bcdefghjkmnpqrstuvwxyz';
+            lat_min DOUBLE PRECISION := -90;
+            lat_max DOUBLE PRECISION := 90;
+            long_min DOUBLE PRECISION := -180;
+            long_max DOUBLE PRECISION := 180;
+            middle DOUBLE PRECISION;
+            geohash TEXT := '';
+            bits INT := 0;
+            bit_count INT := 0;
+            even BOOLEAN := TRUE;
+        BEGIN
+            WHILE length(geohash) < 12 LOOP
+                -- Even bits refine the longitude, odd bits the latitude
+                bits := bits << 1;
+                IF even THEN
+                    middle := (long_min + long_max) / 2;
+                    IF point_long >= middle THEN bits := bits | 1; long_min := middle; ELSE long_max := middle; END IF;
+                ELSE
+                    middle := (lat_min + lat_max) / 2;
+                    IF point_lat >= middle THEN bits := bits | 1; lat_min := middle; ELSE lat_max := middle; END IF;
+                END IF;
+                even := NOT even;
+                bit_count := bit_count + 1;
+                IF bit_count = 5 THEN
+                    geohash := geohash || substr(alphabet, bits + 1, 1);
+                    bits := 0;
+                    bit_count := 0;
+                END IF;
+            END LOOP;
+            RETURN geohash;
+        END
+        $$ LANGUAGE plpgsql IMMUTABLE;
+        UPDATE "location"
+        SET "loc_geohash" = pg_temp.geohash_encode("loc_lat"::DOUBLE PRECISION, "loc_long"::DOUBLE PRECISION)
+        WHERE "loc_geohash" IS NULL AND "loc_lat" IS NOT NULL AND "loc_long" IS NOT NULL;
+        DROP FUNCTION pg_temp.geohash_encode(DOUBLE PRECISION, DOUBLE PRECISION);"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_location_loc_geo_62833e";
+        ALTER TABLE "location" DROP COLUMN IF EXISTS "loc_geohash";"""
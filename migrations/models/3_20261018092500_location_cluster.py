@@ -0,0 +1,49 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "location_cluster" (
+            "lcl_uuid" UUID NOT NULL  PRIMARY KEY,
+            "lcl_zoom" SMALLINT NOT NULL,
+            "lcl_x" INT NOT NULL,
+            "lcl_y" INT NOT NULL,
+            "lcl_count" INT NOT NULL  DEFAULT 0,
+            "lcl_lat_sum" DOUBLE PRECISION NOT NULL  DEFAULT 0,
+            "lcl_long_sum" DOUBLE PRECISION NOT NULL  DEFAULT 0,
+            CONSTRAINT "uid_location_cl_lcl_zoo_4ee9a7" UNIQUE ("lcl_zoom", "lcl_x", "lcl_y")
+        );
+        COMMENT ON COLUMN "location_cluster"."lcl_uuid" IS 'Unique identifier for the cluster.';
+        COMMENT ON COLUMN "location_cluster"."lcl_zoom" IS 'Zoom level of the cluster.';
+        COMMENT ON COLUMN "location_cluster"."lcl_x" IS 'Column of the cluster cell.';
+        COMMENT ON COLUMN "location_cluster"."lcl_y" IS 'Row of the cluster cell.';
+        COMMENT ON COLUMN "location_cluster"."lcl_count" IS 'Number of locations in the cluster.';
+        COMMENT ON COLUMN "location_cluster"."lcl_lat_sum" IS 'Sum of the latitudes of the cluster.';
+        COMMENT ON COLUMN "location_cluster"."lcl_long_sum" IS 'Sum of the longitudes of the cluster.';
+        COMMENT ON TABLE "location_cluster" IS 'Represents a cluster of locations on the map at a given zoom level.';
+        -- Clusters of the existing locations, computed like the app does (the cell of zoom z is the
+        -- Web Mercator tile of zoom z + 3 containing the location, for zooms 0 to 16), so the map
+        -- tiles are right as soon as the app starts. The table is rebuilt if it already existed.
+        DELETE FROM "location_cluster";
+        INSERT INTO "location_cluster"
+            ("lcl_uuid", "lcl_zoom", "lcl_x", "lcl_y", "lcl_count", "lcl_lat_sum", "lcl_long_sum")
+        SELECT gen_random_uuid(), "zoom", "x", "y", COUNT(*), SUM("lat"), SUM("long")
+        FROM (
+            SELECT "zoom", "lat", "long",
+                   LEAST(GREATEST(trunc(("long" + 180.0) / 360.0 * "tiles")::INT, 0), "tiles" - 1) AS "x",
+                   LEAST(GREATEST(trunc((1.0 - asinh(tan(radians(
+                       LEAST(GREATEST("lat", -85.05112878), 85.05112878)
+                   ))) / pi()) / 2.0 * "tiles")::INT, 0), "tiles" - 1) AS "y"
+            FROM (
+                SELECT "loc_lat"::DOUBLE PRECISION AS "lat", "loc_long"::DOUBLE PRECISION AS "long",
+                       "zoom", 1 << ("zoom" + 3) AS "tiles"
+                FROM "location" CROSS JOIN generate_series(0, 16) AS "zooms" ("zoom")
+                WHERE "loc_lat" IS NOT NULL AND "loc_long" IS NOT NULL
+            ) AS "points"
+        ) AS "cells"
+        GROUP BY "zoom", "x", "y";"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "location_cluster";"""
@@ -0,0 +1,100 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "review_rollup" (
+            "rro_uuid" UUID NOT NULL  PRIMARY KEY,
+            "rro_month" TIMESTAMPTZ NOT NULL,
+            "rro_review_count" INT NOT NULL  DEFAULT 0,
+            "rro_first_review" TIMESTAMPTZ NOT NULL,
+            "rro_last_review" TIMESTAMPTZ NOT NULL,
+            "rro_fk_cat_uuid_id" UUID NOT NULL REFERENCES "category" ("cat_uuid") ON DELETE CASCADE,
+            "rro_fk_loc_uuid_id" UUID NOT NULL REFERENCES "location" ("loc_uuid") ON DELETE CASCADE,
+            CONSTRAINT "uid_review_roll_rro_fk__5f4d54" UNIQUE ("rro_fk_loc_uuid_id", "rro_fk_cat_uuid_id", "rro_month")
+        );
+        COMMENT ON COLUMN "review_rollup"."rro_uuid" IS 'Unique identifier for the rollup.';
+        COMMENT ON COLUMN "review_rollup"."rro_month" IS 'First instant of the month summarized.';
+        COMMENT ON COLUMN "review_rollup"."rro_review_count" IS 'Number of reviews of the pair in the month.';
+        COMMENT ON COLUMN "review_rollup"."rro_first_review" IS 'Creation date of the first review of the month.';
+        COMMENT ON COLUMN "review_rollup"."rro_last_review" IS 'Creation date of the last review of the month.';
+        COMMENT ON COLUMN "review_rollup"."rro_fk_cat_uuid_id" IS 'Relationship from rollup to category model.';
+        COMMENT ON COLUMN "review_rollup"."rro_fk_loc_uuid_id" IS 'Relationship from rollup to location model.';
+        COMMENT ON TABLE "review_rollup" IS 'Represents the summary of the reviews of a location-category pair in a month, once removed.';
+        -- Monthly range partitions of the review table. The primary key of a partitioned table must
+        -- include the partition key, so it becomes (rev_uuid, rev_created).
+        ALTER TABLE "review" RENAME TO "review_unpartitioned";
+        CREATE TABLE "review" (
+            "rev_uuid" UUID NOT NULL,
+            "rev_recommendation" VARCHAR(500) NOT NULL,
+            "rev_obs" VARCHAR(500),
+            "rev_created" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+            "rev_fk_cat_uuid_id" UUID NOT NULL REFERENCES "category" ("cat_uuid") ON DELETE CASCADE,
+            "rev_fk_loc_uuid_id" UUID NOT NULL REFERENCES "location" ("loc_uuid") ON DELETE CASCADE
+        ) PARTITION BY RANGE ("rev_created");
+        CREATE TABLE "review_default" PARTITION OF "review" DEFAULT;
+        -- One partition per month from the oldest review to three months ahead, in UTC
+        DO $$
+        DECLARE
+            month TIMESTAMP;
+        BEGIN
+            FOR month IN
+                SELECT generate_series(first_month, last_month, INTERVAL '1 month')
+                FROM (
+                    SELECT date_trunc('month', COALESCE(MIN("rev_created"), now()) AT TIME ZONE 'UTC') AS first_month,
+                           date_trunc('month', now() AT TIME ZONE 'UTC') + INTERVAL '3 months' AS last_month
+                    FROM "review_unpartitioned"
+                ) bounds
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF "review" FOR VALUES FROM (%L) TO (%L)',
+                    'review_p' || to_char(month, 'YYYY_MM'),
+                    to_char(month, 'YYYY-MM-DD') || ' 00:00:00+00',
+                    to_char(month + INTERVAL '1 month', 'YYYY-MM-DD') || ' 00:00:00+00'
+                );
+            END LOOP;
+        END $$;
+        INSERT INTO "review" ("rev_uuid", "rev_recommendation", "rev_obs", "rev_created", "rev_fk_cat_uuid_id", "rev_fk_loc_uuid_id")
+            SELECT "rev_uuid", "rev_recommendation", "rev_obs", "rev_created", "rev_fk_cat_uuid_id", "rev_fk_loc_uuid_id"
+            FROM "review_unpartitioned";
+        DROP TABLE "review_unpartitioned";
+        ALTER TABLE "review" ADD PRIMARY KEY ("rev_uuid", "rev_created");
+        CREATE INDEX "idx_review_rev_fk__67006e" ON "review" ("rev_fk_loc_uuid_id", "rev_fk_cat_uuid_id", "rev_created");
+        CREATE INDEX "idx_review_rev_cre_857392" ON "review" ("rev_created");
+        COMMENT ON COLUMN "review"."rev_uuid" IS 'Unique identifier for the review.';
+        COMMENT ON COLUMN "review"."rev_recommendation" IS 'Recommendation captured for the review.';
+        COMMENT ON COLUMN "review"."rev_obs" IS 'Optional observations captured for the review.';
+        COMMENT ON COLUMN "review"."rev_created" IS 'Creation date of the review.';
+        COMMENT ON COLUMN "review"."rev_fk_cat_uuid_id" IS 'Relationship from review to category model.';
+        COMMENT ON COLUMN "review"."rev_fk_loc_uuid_id" IS 'Relationship from review to location model.';
+        COMMENT ON TABLE "review" IS 'Represents a review in the system.';"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        -- Back to a single table, with the reviews of the attached partitions. Detached partitions
+        -- are left as standalone tables.
+        ALTER TABLE "review" RENAME TO "review_partitioned";
+        ALTER TABLE "review_partitioned" RENAME CONSTRAINT "review_pkey" TO "review_partitioned_pkey";
+        CREATE TABLE "review" (
+            "rev_uuid" UUID NOT NULL  PRIMARY KEY,
+            "rev_recommendation" VARCHAR(500) NOT NULL,
+            "rev_obs" VARCHAR(500),
+            "rev_created" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+            "rev_fk_cat_uuid_id" UUID NOT NULL REFERENCES "category" ("cat_uuid") ON DELETE CASCADE,
+            "rev_fk_loc_uuid_id" UUID NOT NULL REFERENCES "location" ("loc_uuid") ON DELETE CASCADE
+        );
+        INSERT INTO "review" ("rev_uuid", "rev_recommendation", "rev_obs", "rev_created", "rev_fk_cat_uuid_id", "rev_fk_loc_uuid_id")
+            SELECT "rev_uuid", "rev_recommendation", "rev_obs", "rev_created", "rev_fk_cat_uuid_id", "rev_fk_loc_uuid_id"
+            FROM "review_partitioned";
+        DROP TABLE "review_partitioned";
+        CREATE INDEX "idx_review_rev_fk__67006e" ON "review" ("rev_fk_loc_uuid_id", "rev_fk_cat_uuid_id", "rev_created");
+        CREATE INDEX "idx_review_rev_cre_857392" ON "review" ("rev_created");
+        COMMENT ON COLUMN "review"."rev_uuid" IS 'Unique identifier for the review.';
+        COMMENT ON COLUMN "review"."rev_recommendation" IS 'Recommendation captured for the review.';
+        COMMENT ON COLUMN "review"."rev_obs" IS 'Optional observations captured for the review.';
+        COMMENT ON COLUMN "review"."rev_created" IS 'Creation date of the review.';
+        COMMENT ON COLUMN "review"."rev_fk_cat_uuid_id" IS 'Relationship from review to category model.';
+        COMMENT ON COLUMN "review"."rev_fk_loc_uuid_id" IS 'Relationship from review to location model.';
+        COMMENT ON TABLE "review" IS 'Represents a review in the system.';
+        DROP TABLE IF EXISTS "review_rollup";"""
@@ -25,3 +25,14 @@ async def test_create_category_api_duplicate(test_client):
 
     assert response_duplicate.status_code == 400
     assert response_duplicate.json()["detail"] == "A category with this description already exists."
+
+
+@pytest.mark.asyncio
+async def test_create_category_api_query_budget(test_client, assert_max_queries):
+    # Crear una categoría cuesta una sola sentencia (INSERT ... ON CONFLICT DO NOTHING)
+    with assert_max_queries(1):
+        response = test_client.post("/categories/", json={"description": "Music"})
+
+    assert response.status_code == 200
+    assert response.headers["X-DB-Queries"] == "1"
+    assert float(response.headers["X-DB-Time"]) >= 0
@@ -0,0 +1,55 @@
+from decimal import Decimal
+import pytest
+from app.adapters.secondary.orm.models import ModelLocation, ModelLocationCluster
+
+
+@pytest.mark.asyncio
+async def test_create_location_api_is_idempotent(test_client):
+    location_data = {"description": "Plaza", "lat": 4.6, "long": -74.08}
+
+    response = test_client.post("/locations/", json=location_data)
+    assert response.status_code == 200
+
+    # Repetir la creación no cambia nada: ni otra ubicación ni otro conteo en los clusters
+    for _ in range(2):
+        response_duplicate = test_client.post("/locations/", json={**location_data, "lat": 6.2})
+        assert response_duplicate.status_code == 400
+        assert response_duplicate.json()["detail"] == "A location with this description already exists."
+
+    assert await ModelLocation.all().count() == 1
+    assert (await ModelLocation.get()).loc_lat == Decimal("4.6")
+    assert await ModelLocationCluster.filter(lcl_zoom=0).values_list("lcl_count", flat=True) == [1]
+
+
+@pytest.mark.asyncio
+async def test_create_location_api_query_budget(test_client, assert_max_queries):
+    # Crear una ubicación cuesta dos sentencias: INSERT ... ON CONFLICT DO NOTHING y el upsert de sus clusters
+    with assert_max_queries(2):
+        response = test_client.post("/locations/", json={"description": "Plaza", "lat": 4.6, "long": -74.08})
+    assert response.status_code == 200
+    assert response.headers["X-DB-Queries"] == "2"
+
+    # Un duplicado se resuelve con el INSERT, sin tocar los clusters
+    with assert_max_queries(1):
+        response = test_client.post("/locations/", json={"description": "Plaza", "lat": 4.6, "long": -74.08})
+    assert response.status_code == 400
+    assert response.headers["X-DB-Queries"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_location_export_has_no_query_headers(test_client):
+    for index in range(3):
+        test_client.post("/locations/", json={"description": f"Plaza {index}", "lat": 4.6, "long": -74.08})
+
+    # La página informa sus sentencias; la exportación lee el cursor después de enviar las cabeceras
+    response = test_client.get("/locations/")
+    assert response.status_code == 200
+    assert int(response.headers["X-DB-Queries"]) > 0
+
+    response = test_client.get("/locations/?export=ndjson")
+    assert response.status_code == 200
+    assert len(response.text.splitlines()) == 3
+    assert "X-DB-Queries" not in response.headers and "X-DB-Time" not in response.headers
+
+    # La marca es de la petición: la siguiente vuelve a llevar las cabeceras
+    assert "X-DB-Queries" in test_client.get("/locations/").headers
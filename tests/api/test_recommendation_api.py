@@ -0,0 +1,34 @@
+import base64
+import json
+import pytest
+from app.adapters.secondary.orm.models import ModelCategory, ModelLocation
+
+
+@pytest.mark.asyncio
+async def test_recommendations_api_pages_with_the_cursor(test_client):
+    for index in range(3):
+        await ModelLocation.create(loc_description=f"Location {index}", loc_status=True)
+    for index in range(2):
+        await ModelCategory.create(cat_description=f"Category {index}", cat_status=True)
+
+    # 6 pares nunca revisados en páginas de 4: la segunda página es la última
+    first = test_client.get("/recommendations/", params={"limit": 4}).json()
+    second = test_client.get("/recommendations/", params={"limit": 4, "cursor": first["next_cursor"]}).json()
+    assert len(first["recommendations"]) == 4 and len(second["recommendations"]) == 2
+    assert second["next_cursor"] is None
+    pairs = [(item["loc_uuid"], item["cat_uuid"]) for item in first["recommendations"] + second["recommendations"]]
+    assert len(set(pairs)) == 6 and pairs == sorted(pairs)
+
+
+@pytest.mark.asyncio
+async def test_recommendations_api_rejects_malformed_cursors(test_client):
+    def encode(payload):
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    # Base64 inválido, JSON inválido, campos de menos y un cursor de proximidad sin punto
+    for cursor in ("not a cursor", base64.urlsafe_b64encode(b"{").decode(), encode([1, None]),
+                   encode([1, None, "not-a-uuid", "not-a-uuid", None]),
+                   encode([1, None, "c6a5bd2e-6f7c-4c4e-9a55-0a1c1d9f0f10", "c6a5bd2e-6f7c-4c4e-9a55-0a1c1d9f0f11", 1.5])):
+        response = test_client.get("/recommendations/", params={"cursor": cursor})
+        assert response.status_code == 400, cursor
+        assert "cursor" in response.json()["errors"]
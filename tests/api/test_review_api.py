@@ -0,0 +1,26 @@
+import uuid
+import pytest
+from app.adapters.secondary.orm.models import ModelCategory, ModelLocation, ModelReview
+
+
+@pytest.mark.asyncio
+async def test_create_review_api_names_the_missing_reference(test_client):
+    location = await ModelLocation.create(loc_description="Plaza", loc_status=True)
+    category = await ModelCategory.create(cat_description="Food", cat_status=True)
+    unknown = uuid.uuid4()
+
+    # Con la configuración por defecto (sin filtro de referencias) la clave foránea decide: 404, no un error opaco
+    response = test_client.post("/reviews/", json={"recommendation": "Great", "location": str(unknown),
+                                                   "category": str(category.cat_uuid)})
+    assert response.status_code == 404
+    assert response.json()["detail"] == f"Location {unknown} not found."
+
+    response = test_client.post("/reviews/", json={"recommendation": "Great", "location": str(location.loc_uuid),
+                                                   "category": str(unknown)})
+    assert response.status_code == 404
+    assert response.json()["detail"] == f"Category {unknown} not found."
+
+    response = test_client.post("/reviews/", json={"recommendation": "Great", "location": str(location.loc_uuid),
+                                                   "category": str(category.cat_uuid)})
+    assert response.status_code == 200
+    assert await ModelReview.all().count() == 1
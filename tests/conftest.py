@@ -1,34 +1,100 @@
 import pytest
-from tortoise.contrib.test import initializer, finalizer
+import pytest_asyncio
+from contextlib import contextmanager
+from tortoise import Tortoise, connections
+from tortoise.utils import get_schema_sql
 import os
+import uuid
 
-@pytest.fixture(scope="module", autouse=True)
-def setup_database():
+
+@pytest_asyncio.fixture
+async def database(request, tmp_path, monkeypatch):
     """
     Inicializa Tortoise ORM para los tests.
-    Configura una base de datos SQLite en memoria para pruebas.
+    Configura una base de datos SQLite en memoria como conexión `default`, la que usa la aplicación,
+    y crea las tablas de todos los modelos. Cada test siembra sus propias filas.
+
+    Con el parámetro "replica" (`@pytest.mark.parametrize("database", ["replica"], indirect=True)`)
+    usa dos ficheros SQLite con el mismo esquema: `default` y `replica`.
+
+    Con el parámetro "postgres" crea una base de datos nueva en el servidor de `TEST_DATABASE_URL`
+    (p. ej. `postgres://postgres@localhost:5432/test_{}`, donde `{}` se sustituye por un nombre único)
+    y la borra al terminar. Sin esa variable el test se omite.
     """
     environment = os.getenv("ENVIRONMENT", "testing")
 
     if environment != "testing":
         raise RuntimeError("Tests deben ejecutarse en el entorno 'testing'.")
 
-    initializer(
-        modules={"models": ["app.adapters.secondary.orm.models"]},  # Ruta a los modelos
-        db_url="sqlite://:memory:",  # Base de datos en memoria
-        app_label="models",  # Alias para los modelos
-    )
+    if getattr(request, "param", None) == "postgres":
+        if not os.getenv("TEST_DATABASE_URL"):
+            pytest.skip("TEST_DATABASE_URL no está definida.")
+        await Tortoise.init(config={
+            "connections": {"default": os.environ["TEST_DATABASE_URL"].format(uuid.uuid4().hex[:8])},
+            "apps": {"models": {"models": ["app.adapters.secondary.orm.models"], "default_connection": "default"}},
+        }, _create_db=True)
+        await Tortoise.generate_schemas()
+        yield
+        await Tortoise._drop_databases()
+        return
+
+    from app.adapters.secondary.orm import models
+
+    # SQLite no tiene esquemas: los modelos declaran "public"
+    for name in models.__all__:
+        monkeypatch.setattr(getattr(models, name)._meta, "schema", None)
+
+    with_replica = getattr(request, "param", None) == "replica"
+    if with_replica:
+        db_connections = {"default": f"sqlite://{tmp_path / 'primary.sqlite3'}",
+                          "replica": f"sqlite://{tmp_path / 'replica.sqlite3'}"}
+    else:
+        db_connections = {"default": "sqlite://:memory:"}  # Base de datos en memoria
+    await Tortoise.init(config={
+        "connections": db_connections,
+        "apps": {"models": {"models": ["app.adapters.secondary.orm.models"], "default_connection": "default"}},
+    })
+    await Tortoise.generate_schemas()
+    if with_replica:
+        await connections.get("replica").execute_script(get_schema_sql(connections.get("default"), safe=True))
     yield
-    finalizer()
+    await Tortoise.close_connections()
+    if with_replica:
+        # Tortoise acumula la configuración de conexiones entre init: se quita la réplica
+        connections.db_config.pop("replica")
 
 
 @pytest.fixture
-def test_client():
+def test_client(database):
     """
-    Devuelve un cliente de pruebas para la aplicación FastAPI.
+    Devuelve un cliente de pruebas para la aplicación FastAPI, sobre la base de datos de pruebas.
     """
     from fastapi.testclient import TestClient
     from app.main_app.main import app
 
     return TestClient(app)
 
+
+
+@pytest.fixture
+def assert_max_queries():
+    """
+    Devuelve un context manager que falla si el bloque ejecuta más de `n` consultas a la base de datos.
+
+    Uso:
+        with assert_max_queries(2):
+            test_client.get("/recommendations/")
+    """
+    from app.adapters.secondary.orm.query_counter import install_query_counter, totals
+
+    install_query_counter()
+
+    @contextmanager
+    def check(n: int):
+        # El cliente de pruebas ejecuta la aplicación en otro hilo: se usa el total del proceso
+        before = totals.count
+        yield
+        executed = totals.count - before
+        assert executed <= n, f"Se esperaban como máximo {n} consultas y se ejecutaron {executed}."
+
+    return check
@@ -0,0 +1,36 @@
+from benchmarks.suite import compare, percentile, summarize
+
+
+def test_summarize_reports_nearest_rank_percentiles():
+    latencies = [float(ms) for ms in range(1, 101)]
+
+    summary = summarize(latencies, rows=1)
+
+    assert percentile(latencies, 50) == 50
+    assert summary["p95_ms"] == 95
+    assert summary["p99_ms"] == 99
+    # 100 operaciones en 5.05 segundos
+    assert summary["ops_per_second"] == 19.8
+
+
+def test_compare_flags_regressions_over_threshold_and_noise_floor():
+    baseline = {
+        "slow": {"ops_per_second": 100.0, "p50_ms": 10.0, "p95_ms": 20.0},
+        "fast": {"ops_per_second": 5000.0, "p50_ms": 0.2, "p95_ms": 0.3},
+        "tail": {"ops_per_second": 100.0, "p50_ms": 10.0, "p95_ms": 20.0},
+        "removed": {"ops_per_second": 1.0, "p50_ms": 1.0, "p95_ms": 1.0},
+    }
+    results = {
+        # p95 +60%: sobre el doble del umbral
+        "slow": {"ops_per_second": 70.0, "p50_ms": 12.0, "p95_ms": 32.0},
+        # p95 +45%: bajo el doble del umbral
+        "tail": {"ops_per_second": 100.0, "p50_ms": 10.0, "p95_ms": 29.0},
+        # +50% pero por debajo del umbral absoluto de ruido
+        "fast": {"ops_per_second": 3333.3, "p50_ms": 0.3, "p95_ms": 0.45},
+        "new": {"ops_per_second": 1.0, "p50_ms": 1.0, "p95_ms": 1.0},
+    }
+
+    regressions = compare(results, baseline, threshold=0.25)
+
+    assert {(item["scenario"], item["metric"]) for item in regressions} == {("slow", "p95_ms"),
+                                                                             ("slow", "ops_per_second")}
@@ -0,0 +1,45 @@
+import pytest
+import uuid
+from unittest.mock import AsyncMock
+from app.core.application.usecases.bulk_create_category_usecase import BulkCreateCategoriesUseCase
+from app.core.application.usecases.bulk_create_review_usecase import BulkCreateReviewsUseCase
+from app.core.domain.entities.category_entity import CategoryEntity
+from app.core.domain.entities.review_entity import ReviewEntity
+from app.core.domain.exceptions.exceptions import DuplicateCategoryError, LocationNotFoundError
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_categories_reports_duplicates():
+    # Mock del repositorio: "Books" ya existe y "Music" la crea otra petición mientras tanto
+    mock_repository = AsyncMock()
+    mock_repository.get_existing_descriptions.return_value = {"Books"}
+    mock_repository.save_many.side_effect = lambda categories: [
+        category for category in categories if category.cat_description != "Music"
+    ]
+
+    results = await BulkCreateCategoriesUseCase(mock_repository).execute(["Books", "Art", "Art", "Music"])
+
+    # Una sola consulta de duplicados para todo el lote
+    mock_repository.get_existing_descriptions.assert_awaited_once()
+    assert isinstance(results[0], DuplicateCategoryError)
+    assert isinstance(results[1], CategoryEntity) and results[1].cat_description == "Art"
+    assert isinstance(results[2], DuplicateCategoryError)
+    assert isinstance(results[3], DuplicateCategoryError)
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_reviews_skips_missing_locations():
+    loc_uuid, cat_uuid = uuid.uuid4(), uuid.uuid4()
+    mock_repository = AsyncMock()
+    mock_repository.get_existing_references.return_value = ({loc_uuid}, {cat_uuid})
+    mock_cache = AsyncMock()
+
+    results = await BulkCreateReviewsUseCase(mock_repository, mock_cache).execute([
+        ("Great", cat_uuid, loc_uuid, None),
+        ("Missing", cat_uuid, uuid.uuid4(), None),
+    ])
+
+    assert isinstance(results[0], ReviewEntity)
+    assert isinstance(results[1], LocationNotFoundError)
+    mock_repository.save_many.assert_awaited_once_with([results[0]])
+    mock_cache.invalidate.assert_awaited_once()
@@ -0,0 +1,120 @@
+import asyncio
+from datetime import datetime, timedelta
+from decimal import Decimal
+import pytest
+import pytz
+from tortoise import connections
+from app.adapters.secondary.orm.models import ModelCategory, ModelLocation, ModelLocationCluster, ModelPairReviewState, ModelReview
+from app.adapters.secondary.orm.raw_sql import insert_absent
+from app.adapters.secondary.orm.repositories import category_repository, location_repository, review_repository
+from app.adapters.secondary.orm.repositories.category_repository import CategoryRepository
+from app.adapters.secondary.orm.repositories.location_repository import LocationRepository
+from app.adapters.secondary.orm.repositories.review_repository import ReviewRepository
+from app.core.domain.entities.category_entity import CategoryEntity
+from app.core.domain.entities.location_entity import LocationEntity
+from app.core.domain.entities.review_entity import ReviewEntity
+
+# Cada test corre en SQLite y, si TEST_DATABASE_URL está definida, en Postgres
+DATABASES = pytest.mark.parametrize("database", ["sqlite", "postgres"], indirect=True)
+
+
+@DATABASES
+@pytest.mark.asyncio
+async def test_insert_absent_skips_taken_and_repeated_values(database):
+    await ModelCategory.create(cat_description="Books", cat_status=True)
+    models = [CategoryRepository._to_model(CategoryEntity.create(description))
+              for description in ("Books", "Art", "Art", "Music")]
+
+    # ON CONFLICT DO NOTHING: ni el valor existente ni la repetición dentro del lote fallan
+    created = await insert_absent(connections.get("default"), ModelCategory, models, "cat_description")
+
+    assert created == {models[1].cat_uuid, models[3].cat_uuid}
+    assert sorted(await ModelCategory.all().values_list("cat_description", flat=True)) == ["Art", "Books", "Music"]
+    assert await insert_absent(connections.get("default"), ModelCategory, [], "cat_description") == set()
+
+
+@DATABASES
+@pytest.mark.asyncio
+async def test_concurrent_create_if_absent_creates_once(database):
+    locations = [LocationEntity.create("Plaza", Decimal("4.6"), Decimal(f"-74.{index}")) for index in range(5)]
+
+    # Creaciones simultáneas de la misma descripción: exactamente una gana y ninguna falla
+    created = await asyncio.gather(*(LocationRepository().create_if_absent(location) for location in locations))
+
+    assert sorted(created) == [False] * 4 + [True]
+    assert await ModelLocation.all().values_list("loc_uuid", flat=True) == [locations[created.index(True)].loc_uuid]
+    assert await ModelLocationCluster.filter(lcl_zoom=0).values_list("lcl_count", flat=True) == [1]
+    assert not await LocationRepository().create_if_absent(locations[0])
+
+
+@DATABASES
+@pytest.mark.asyncio
+async def test_location_save_many_across_chunks(database):
+    size = location_repository.BULK_CHUNK_SIZE
+    await LocationRepository().save(LocationEntity.create("Location 3", Decimal("4.6"), Decimal("-74.1")))
+    descriptions = [f"Location {index}" for index in range(size + 2)]
+    # Repetidas en el mismo bloque, repetida en el bloque siguiente y una ya existente
+    descriptions[1] = descriptions[0]
+    descriptions[size + 1] = descriptions[2]
+    locations = [
+        LocationEntity.create(description, Decimal(f"{4 + index / 1000:.6f}"), Decimal("-74.1"))
+        for index, description in enumerate(descriptions)
+    ]
+
+    saved = await LocationRepository().save_many(locations)
+
+    skipped = {1, 3, size + 1}
+    assert saved == [location for index, location in enumerate(locations) if index not in skipped]
+    assert await ModelLocation.all().count() == len(saved) + 1
+    assert set(await ModelLocation.all().values_list("loc_uuid", flat=True)) >= {location.loc_uuid for location in saved}
+    # Los clusters solo cuentan las ubicaciones insertadas
+    assert await ModelLocationCluster.filter(lcl_zoom=0).first().values_list("lcl_count", flat=True) == len(saved) + 1
+
+
+@DATABASES
+@pytest.mark.asyncio
+async def test_category_save_many_across_chunks(database):
+    size = category_repository.BULK_CHUNK_SIZE
+    await CategoryRepository().save(CategoryEntity.create("Category 0"))
+    categories = [CategoryEntity.create(f"Category {index % (size + 1)}") for index in range(size + 3)]
+
+    saved = await CategoryRepository().save_many(categories)
+
+    # "Category 0" ya existía; "Category 1" y "Category 2" se repiten tras el límite del bloque
+    assert saved == categories[1:size + 1]
+    assert await ModelCategory.all().count() == size + 1
+
+
+@DATABASES
+@pytest.mark.asyncio
+async def test_review_save_many_merges_pair_states_across_chunks(database):
+    size = review_repository.BULK_CHUNK_SIZE
+    location = await ModelLocation.create(loc_description="Plaza", loc_status=True)
+    categories = [await ModelCategory.create(cat_description=f"Category {index}", cat_status=True) for index in range(2)]
+    now = datetime.now(pytz.UTC).replace(microsecond=0)
+
+    # El mismo par en los dos bloques; su última revisión está en el primero
+    reviews = []
+    for index in range(size + 10):
+        review = ReviewEntity.create("Review", location.loc_uuid, categories[index % 2].cat_uuid)
+        review.rev_created = now - timedelta(days=index if index != 4 else -1)
+        reviews.append(review)
+    await ReviewRepository().save_many(reviews)
+
+    assert await ModelReview.all().count() == size + 10
+    states = {
+        state.prs_fk_cat_uuid_id: state
+        for state in await ModelPairReviewState.filter(prs_fk_loc_uuid_id=location.loc_uuid)
+    }
+    assert len(states) == 2
+    for category in categories:
+        pair = [review for review in reviews if review.rev_fk_cat_uuid == category.cat_uuid]
+        assert states[category.cat_uuid].prs_review_count == len(pair)
+        assert states[category.cat_uuid].prs_last_review == max(review.rev_created for review in pair)
+
+    # Un segundo lote suma a los estados existentes
+    extra = ReviewEntity.create("Review", location.loc_uuid, categories[1].cat_uuid)
+    extra.rev_created = now + timedelta(days=2)
+    await ReviewRepository().save_many([extra])
+    state = await ModelPairReviewState.get(prs_fk_loc_uuid_id=location.loc_uuid, prs_fk_cat_uuid_id=categories[1].cat_uuid)
+    assert state.prs_review_count == (size + 10) // 2 + 1 and state.prs_last_review == extra.rev_created
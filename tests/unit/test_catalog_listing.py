@@ -0,0 +1,99 @@
+import asyncio
+import json
+import pytest
+import pytest_asyncio
+from datetime import datetime
+from decimal import Decimal
+import pytz
+from app.adapters.primary.serializers.catalog_schema import (
+    CatalogQuerySchema, dump_ndjson, encode_catalog_cursor, start_export
+)
+from app.adapters.secondary.orm import raw_sql
+from app.adapters.primary.serializers.location_schema import LocationResponseSchema
+from app.adapters.secondary.orm.models import ModelCategory, ModelLocation
+from app.adapters.secondary.orm.repositories.category_repository import CategoryRepository
+from app.adapters.secondary.orm.repositories.location_repository import LocationRepository
+from app.core.application.usecases.export_locations_usecase import ExportLocationsUseCase
+from app.core.application.usecases.list_categories_usecase import ListCategoriesUseCase
+from app.core.application.usecases.list_locations_usecase import ListLocationsUseCase
+from app.core.domain.exceptions.exceptions import ExportLimitError
+
+
+@pytest_asyncio.fixture
+async def catalog(database):
+    locations = []
+    # Varias ubicaciones comparten fecha de creación: el UUID desempata
+    for index, day in enumerate([1, 1, 1, 2, 3, 3, 4]):
+        location = await ModelLocation.create(loc_description=f"Location {index}", loc_status=index % 3 != 0,
+                                              loc_lat=Decimal("4.6"), loc_long=Decimal("-74.08"))
+        location.loc_created = datetime(2026, 10, day, tzinfo=pytz.UTC)
+        await location.save(update_fields=["loc_created"])
+        locations.append(location)
+    for index in range(3):
+        await ModelCategory.create(cat_description=f"Category {index}", cat_status=True)
+    return sorted(locations, key=lambda location: (location.loc_created, location.loc_uuid))
+
+
+@pytest.mark.asyncio
+async def test_listing_pages_follow_the_keyset_order(catalog):
+    use_case = ListLocationsUseCase(LocationRepository())
+
+    # Páginas de 2 sin repetir ni saltar ubicaciones, con el cursor codificado como en la API
+    uuids, after = [], None
+    while True:
+        page = await use_case.execute(limit=2, after=after)
+        uuids += [location.loc_uuid for location in page]
+        if len(page) < 2:
+            break
+        cursor = encode_catalog_cursor(page[-1].loc_created, page[-1].loc_uuid)
+        after = CatalogQuerySchema().load({"cursor": cursor})["after"]
+    assert uuids == [location.loc_uuid for location in catalog]
+
+    # Filtro por estado
+    inactive = await use_case.execute(status=False, limit=10)
+    assert [location.loc_uuid for location in inactive] == \
+           [location.loc_uuid for location in catalog if not location.loc_status]
+
+    categories = await ListCategoriesUseCase(CategoryRepository()).execute(limit=2)
+    assert [category.cat_description for category in categories] == ["Category 0", "Category 1"]
+
+
+@pytest.mark.asyncio
+async def test_export_streams_every_row_in_chunks(catalog):
+    repository = LocationRepository()
+
+    # Lotes de 3 filas leídos del cursor
+    chunks = [chunk async for chunk in repository.export(chunk_size=3)]
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    assert [location.loc_uuid for chunk in chunks for location in chunk] == [location.loc_uuid for location in catalog]
+    assert chunks[0][0].loc_lat == Decimal("4.6") and chunks[0][0].loc_created == catalog[0].loc_created
+
+    # Una línea NDJSON por ubicación activa
+    lines = "".join([text async for text in dump_ndjson(ExportLocationsUseCase(repository).execute(True),
+                                                         LocationResponseSchema())]).splitlines()
+    active = [location for location in catalog if location.loc_status]
+    assert [json.loads(line)["id"] for line in lines] == [str(location.loc_uuid) for location in active]
+    assert json.loads(lines[0])["lat"] == "4.6"
+
+
+@pytest.mark.asyncio
+async def test_exports_are_capped_and_do_not_block_other_queries(catalog, monkeypatch):
+    monkeypatch.setattr(raw_sql, "_stream_slots", asyncio.Semaphore(1))
+    repository = LocationRepository()
+
+    # Una exportación en curso, detenida a mitad del cursor
+    running = await start_export(repository.export(chunk_size=3))
+    assert len(await running.__anext__()) == 3
+
+    # Las demás consultas no esperan a que termine
+    page = await asyncio.wait_for(ListLocationsUseCase(repository).execute(limit=2), 5)
+    assert len(page) == 2
+
+    # Una segunda exportación se rechaza antes de enviar la respuesta
+    with pytest.raises(ExportLimitError):
+        await start_export(repository.export(chunk_size=3))
+
+    # Al cerrarse la primera, su conexión queda libre
+    await running.aclose()
+    chunks = [chunk async for chunk in await start_export(repository.export(chunk_size=3))]
+    assert sum(len(chunk) for chunk in chunks) == len(catalog)
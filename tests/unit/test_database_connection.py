@@ -0,0 +1,24 @@
+from app.main_app import config
+from app.main_app.config import database_connection
+
+
+def test_database_connection_applies_pool_settings_to_postgres(monkeypatch):
+    monkeypatch.setattr(config, "DB_POOL_MAX_SIZE", 12)
+    monkeypatch.setattr(config, "DB_STATEMENT_CACHE_SIZE", 0)
+
+    credentials = database_connection("postgres://user:secret@db:5432/mapmyworld?minsize=3")["credentials"]
+
+    # Los valores de la URL tienen prioridad sobre la configuración
+    assert credentials["minsize"] == 3
+    assert credentials["maxsize"] == 12
+    assert credentials["statement_cache_size"] == 0
+    assert credentials["max_inactive_connection_lifetime"] == 300.0
+    # 0 desactiva el timeout, que asyncpg espera como None
+    assert credentials["command_timeout"] is None
+
+
+def test_database_connection_leaves_sqlite_untouched():
+    connection = database_connection("sqlite://:memory:")
+
+    assert connection["engine"] == "tortoise.backends.sqlite"
+    assert "maxsize" not in connection["credentials"]
@@ -0,0 +1,88 @@
+import math
+import random
+import pytest
+from app.core.domain import geo
+
+
+def test_encode_matches_known_geohashes():
+    # Valores de referencia del algoritmo geohash publicado
+    assert geo.encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    assert geo.encode(42.6, -5.6, 5) == "ezs42"
+    assert geo.encode(-90, -180, 4) == "0000" and geo.encode(89.9999, 179.9999, 4) == "zzzz"
+
+
+def test_decode_returns_the_centre_of_the_cell():
+    rng = random.Random(3)
+    for _ in range(200):
+        lat, long, precision = rng.uniform(-90, 90), rng.uniform(-180, 180), rng.randint(1, geo.MAX_PRECISION)
+        cell = geo.encode(lat, long, precision)
+        lat_size, long_size = geo.cell_size(precision)
+        centre_lat, centre_long = geo.decode(cell)
+        # El punto cae dentro de la celda y el centro vuelve a codificarse en la misma celda
+        assert abs(centre_lat - lat) <= lat_size / 2 and abs(centre_long - long) <= long_size / 2
+        assert geo.encode(centre_lat, centre_long, precision) == cell
+        assert cell.startswith(geo.encode(lat, long, precision - 1))
+
+
+def test_neighbors_are_the_eight_adjacent_cells():
+    assert sorted(geo.neighbors("ezs42")) == sorted(
+        ["ezs48", "ezs49", "ezs43", "ezs41", "ezs40", "ezefp", "ezefr", "ezefx"]
+    )
+    rng = random.Random(5)
+    for _ in range(100):
+        precision = rng.randint(2, 9)
+        cell = geo.encode(rng.uniform(-80, 80), rng.uniform(-170, 170), precision)
+        lat, long = geo.decode(cell)
+        lat_size, long_size = geo.cell_size(precision)
+        cells = geo.neighbors(cell)
+        assert len(cells) == 8 and cell not in cells
+        # Cada vecino está a un paso de celda en latitud y/o longitud
+        for neighbor in cells:
+            neighbor_lat, neighbor_long = geo.decode(neighbor)
+            assert {round(abs(neighbor_lat - lat) / lat_size, 9), round(abs(neighbor_long - long) / long_size, 9)} <= {0, 1}
+
+
+def test_neighbors_wrap_around_the_antimeridian():
+    east, west = geo.encode(10, 179.99, 5), geo.encode(10, -179.99, 5)
+    # Las celdas a ambos lados del meridiano 180 son vecinas
+    assert west in geo.neighbors(east) and east in geo.neighbors(west)
+    assert len(geo.neighbors(east)) == 8
+
+
+def test_neighbors_stop_at_the_poles():
+    for lat in (89.99, -89.99):
+        cell = geo.encode(lat, 0, 4)
+        cells = geo.neighbors(cell)
+        # No hay celdas más allá del polo: solo las 2 del mismo rango y las 3 del lado opuesto al polo
+        assert len(cells) == 5
+        assert all(abs(geo.decode(neighbor)[0]) < 90 for neighbor in cells)
+
+
+def test_covering_cells_contain_every_point_within_the_covered_radius():
+    rng = random.Random(9)
+    for _ in range(300):
+        lat, long = rng.uniform(-85, 85), rng.uniform(-180, 180)
+        precision = rng.randint(1, 8)
+        radius_km = geo.covered_radius_km(lat, precision)
+        cells = geo.covering_cells(lat, long, precision)
+        # Un punto a una distancia y dirección aleatorias dentro del radio cubierto
+        distance, bearing = rng.uniform(0, radius_km), rng.uniform(0, 2 * math.pi)
+        point_lat = lat + distance * math.cos(bearing) / geo.KM_PER_DEGREE
+        point_long = long + distance * math.sin(bearing) / (geo.KM_PER_DEGREE * math.cos(math.radians(point_lat)))
+        point_long = (point_long + 180) % 360 - 180
+        if geo.haversine_km(lat, long, point_lat, point_long) <= radius_km:
+            assert geo.encode(point_lat, point_long, precision) in cells
+
+
+@pytest.mark.parametrize("lat, radius_km", [(0, 1), (4.6, 50), (60, 200), (89, 10), (-45, 5000)])
+def test_covering_precision_covers_the_radius(lat, radius_km):
+    precision = geo.covering_precision(lat, radius_km)
+    assert geo.covered_radius_km(lat, precision) >= radius_km
+    # La precisión siguiente ya no lo cubre
+    assert precision == geo.MAX_PRECISION or geo.covered_radius_km(lat, precision + 1) < radius_km
+
+
+def test_haversine_known_distances():
+    assert geo.haversine_km(0, 0, 0, 0) == 0
+    assert geo.haversine_km(0, 179.5, 0, -179.5) == pytest.approx(geo.KM_PER_DEGREE)
+    assert geo.haversine_km(90, 0, -90, 0) == pytest.approx(math.pi * geo.EARTH_RADIUS_KM)
@@ -0,0 +1,94 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from app.core.application.single_flight import SingleFlight
+from app.core.application.usecases.get_recommendation_usecase import GetRecommendationsUseCase
+
+
+def build_slow_repository(results):
+    # Repositorio que tarda en calcular, para que las peticiones se solapen
+    results = iter(results)
+
+    async def get_recommendations(**kwargs):
+        await asyncio.sleep(0.05)
+        return next(results)
+
+    mock_repository = AsyncMock()
+    mock_repository.get_recommendations.side_effect = get_recommendations
+    return mock_repository
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_computation():
+    mock_repository = build_slow_repository([["first"]])
+    single_flight = SingleFlight()
+
+    # N peticiones simultáneas, cada una con su propio caso de uso como en la API
+    results = await asyncio.gather(*[
+        GetRecommendationsUseCase(mock_repository, single_flight).execute() for _ in range(50)
+    ])
+
+    mock_repository.get_recommendations.assert_awaited_once()
+    assert all(result == ["first"] for result in results)
+
+
+@pytest.mark.asyncio
+async def test_stale_result_served_while_refreshing():
+    mock_repository = build_slow_repository([["first"], ["second"]])
+    single_flight = SingleFlight(stale_seconds=10)
+    use_case = GetRecommendationsUseCase(mock_repository, single_flight)
+    await use_case.execute()
+
+    # Mientras se refresca, las demás peticiones reciben el resultado anterior sin esperar
+    refresh = asyncio.ensure_future(use_case.execute())
+    await asyncio.sleep(0)
+    stale = await use_case.execute()
+
+    assert stale == ["first"]
+    assert await refresh == ["second"]
+    assert mock_repository.get_recommendations.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_are_propagated_and_not_cached():
+    mock_repository = AsyncMock()
+    mock_repository.get_recommendations.side_effect = [RuntimeError("db down"), ["ok"]]
+    use_case = GetRecommendationsUseCase(mock_repository, SingleFlight(stale_seconds=10))
+
+    with pytest.raises(RuntimeError):
+        await use_case.execute()
+    assert await use_case.execute() == ["ok"]
+
+
+@pytest.mark.asyncio
+async def test_requests_for_different_points_are_not_coalesced():
+    mock_repository = build_slow_repository([["bogota"], ["medellin"]])
+    single_flight = SingleFlight()
+
+    # Cada punto tiene sus propias recomendaciones cercanas
+    results = await asyncio.gather(
+        GetRecommendationsUseCase(mock_repository, single_flight).execute(lat=4.65, long=-74.08, radius_km=10),
+        GetRecommendationsUseCase(mock_repository, single_flight).execute(lat=6.24, long=-75.58, radius_km=10),
+    )
+
+    assert mock_repository.get_recommendations.await_count == 2
+    assert sorted(results) == [["bogota"], ["medellin"]]
+    assert mock_repository.get_recommendations.await_args_list[0].kwargs["lat"] == 4.65
+
+
+@pytest.mark.asyncio
+async def test_previous_results_are_only_kept_while_they_can_be_served():
+    # Sin resultados obsoletos no se guarda nada
+    single_flight = SingleFlight()
+    for point in range(5):
+        await single_flight.do(point, AsyncMock(return_value=[point]))
+    assert len(single_flight._last_results) == 0
+
+    # Con resultados obsoletos, los que caducan se descartan al completar otro cálculo
+    single_flight = SingleFlight(stale_seconds=0.05)
+    for point in range(5):
+        await single_flight.do(point, AsyncMock(return_value=[point]))
+    assert list(single_flight._last_results) == [0, 1, 2, 3, 4]
+    await asyncio.sleep(0.06)
+    await single_flight.do(0, AsyncMock(return_value=["refreshed"]))
+    assert list(single_flight._last_results) == [0]
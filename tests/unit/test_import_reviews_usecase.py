@@ -0,0 +1,43 @@
+import pytest
+import uuid
+from unittest.mock import AsyncMock
+from app.adapters.primary.serializers.import_schema import load_stream
+from app.adapters.primary.serializers.review_schema import BaseReviewSchema
+from app.core.application.usecases.import_reviews_usecase import ImportReviewsUseCase
+from app.core.domain.entities.import_summary_entity import ImportSummaryEntity
+
+
+async def chunks(body: bytes, size: int):
+    # Simula el cuerpo de la petición llegando en trozos pequeños
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+
+@pytest.mark.asyncio
+async def test_import_reviews_inserts_in_batches_and_reports_rejected_rows():
+    loc_uuid, cat_uuid = uuid.uuid4(), uuid.uuid4()
+    body = (
+        "recommendation,category,location\n"
+        f"Great,{cat_uuid},{loc_uuid}\n"
+        f"Nice,not-a-uuid,{loc_uuid}\n"
+        f"\"Multi\nline\",{cat_uuid},{loc_uuid}\n"
+        f"Missing,{cat_uuid},{uuid.uuid4()}\n"
+        f"Again,{cat_uuid},{loc_uuid}\n"
+    ).encode()
+    mock_repository = AsyncMock()
+    mock_repository.get_existing_references.return_value = ({loc_uuid}, {cat_uuid})
+    mock_cache = AsyncMock()
+
+    summary = ImportSummaryEntity()
+    rows = load_stream(BaseReviewSchema(), chunks(body, 7), "csv", summary)
+    await ImportReviewsUseCase(mock_repository, mock_cache, batch_size=2).execute(
+        ((line, (data["recommendation"], data["category"], data["location"], None)) async for line, data in rows),
+        summary
+    )
+
+    assert summary.accepted == 3
+    assert [error["line"] for error in summary.dict()["errors"]] == [3, 6]
+    # Dos lotes: [Great, Multi-line] y [Missing, Again]
+    assert mock_repository.save_many.await_count == 2
+    assert mock_repository.save_many.await_args_list[0].args[0][1].rev_recommendation == "Multi\nline"
+    mock_cache.invalidate.assert_awaited_once()
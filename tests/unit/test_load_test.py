@@ -0,0 +1,27 @@
+import pytest
+from benchmarks.load_test import parse_mix, summarize_level
+
+
+def test_parse_mix_reads_weights_and_rejects_unknown_operations():
+    assert parse_mix("recommendations=80, reviews=15,creates=5") == {
+        "recommendations": 80.0, "reviews": 15.0, "creates": 5.0
+    }
+
+    with pytest.raises(ValueError):
+        parse_mix("recommendations=80,deletes=20")
+    with pytest.raises(ValueError):
+        parse_mix("recommendations=0")
+
+
+def test_summarize_level_excludes_errors_from_throughput():
+    samples = [("recommendations", 10.0, True)] * 18 + [("creates", 30.0, True), ("creates", 50.0, False)]
+
+    level = summarize_level(concurrency=4, seconds=2, samples=samples)
+
+    # 19 respuestas correctas en 2 segundos
+    assert level["throughput"] == 9.5
+    assert level["errors"] == 1
+    assert level["p50_ms"] == 10.0
+    assert level["p99_ms"] == 50.0
+    assert level["operations"]["creates"] == {"requests": 2, "errors": 1, "throughput": 0.5,
+                                              "p50_ms": 30.0, "p95_ms": 50.0, "p99_ms": 50.0}
@@ -0,0 +1,74 @@
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+from decimal import Decimal
+import pytest
+import pytz
+from app.adapters.secondary.orm.repositories.category_repository import CategoryRepository
+from app.adapters.secondary.orm.repositories.location_cluster_repository import LocationClusterRepository
+from app.adapters.secondary.orm.repositories.location_repository import CLUSTER_GRID_BITS, LocationRepository
+from app.adapters.secondary.orm.repositories.review_repository import ReviewRepository
+from app.core.domain import geo
+from app.core.domain.entities.category_entity import CategoryEntity
+from app.core.domain.entities.location_entity import LocationEntity
+from app.core.domain.entities.review_entity import ReviewEntity
+
+ZOOM = 10
+
+
+def test_box_cells_cover_the_box():
+    lat_min, lat_max, long_min, long_max = geo.tile_bounds(ZOOM, 293, 493)
+    cells = geo.box_cells(lat_min, lat_max, long_min, long_max)
+    assert 0 < len(cells) <= 16 and len({len(cell) for cell in cells}) == 1
+
+    # Todo punto de la caja cae en una de las celdas
+    rng = random.Random(3)
+    for _ in range(500):
+        lat, long = rng.uniform(lat_min, lat_max), rng.uniform(long_min, long_max)
+        assert geo.encode(lat, long, len(cells[0])) in cells
+
+    # Una caja demasiado grande se recorre entera
+    assert geo.box_cells(-90, 90, -180, 180) == [""]
+
+
+@pytest.mark.asyncio
+async def test_tile_stale_counts_match_the_pairs_of_each_cell(database):
+    x, y = geo.tile_xy(4.65, -74.08, ZOOM)
+    lat_min, lat_max, long_min, long_max = geo.tile_bounds(ZOOM, x, y)
+    rng = random.Random(5)
+
+    # Ubicaciones dentro de la tesela y alrededor de ella
+    locations = [
+        LocationEntity.create(f"Location {index}",
+                              Decimal(f"{rng.uniform(2 * lat_min - lat_max, 2 * lat_max - lat_min):.6f}"),
+                              Decimal(f"{rng.uniform(2 * long_min - long_max, 2 * long_max - long_min):.6f}"))
+        for index in range(200)
+    ]
+    await LocationRepository().save_many(locations)
+    categories = [CategoryEntity.create(f"Category {index}") for index in range(3)]
+    await CategoryRepository().save_many(categories)
+
+    # Revisiones recientes y antiguas de pares al azar
+    now = datetime.now(pytz.UTC)
+    reviews, fresh = [], Counter()
+    for location in locations:
+        for category in rng.sample(categories, 2):
+            review = ReviewEntity.create("Review", location.loc_uuid, category.cat_uuid)
+            review.rev_created = now - timedelta(days=rng.choice([1, 60]))
+            reviews.append(review)
+            if review.rev_created > now - timedelta(days=30):
+                fresh[location.loc_uuid] += 1
+    await ReviewRepository().save_many(reviews)
+
+    # Referencia: cada ubicación de la tesela en su celda, con sus pares sin revisión reciente
+    expected = {}
+    for location in locations:
+        cell = geo.tile_xy(float(location.loc_lat), float(location.loc_long), ZOOM + CLUSTER_GRID_BITS)
+        if cell[0] >> CLUSTER_GRID_BITS == x and cell[1] >> CLUSTER_GRID_BITS == y:
+            count, stale = expected.get(cell, (0, 0))
+            expected[cell] = (count + 1, stale + len(categories) - fresh[location.loc_uuid])
+
+    clusters = await LocationClusterRepository().get_tile(ZOOM, x, y, include_stale=True)
+    assert [(cluster.count, cluster.stale_count) for cluster in clusters] == \
+           [expected[cell] for cell in sorted(expected, key=lambda cell: (cell[1], cell[0]))]
+    assert sum(cluster.count for cluster in clusters) < len(locations)
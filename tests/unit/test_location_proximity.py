@@ -0,0 +1,74 @@
+import random
+from decimal import Decimal
+import pytest
+import pytest_asyncio
+from app.adapters.secondary.orm.repositories.location_repository import LocationRepository
+from app.adapters.secondary.snapshot.location_snapshot import LocationSnapshot
+from app.core.domain import geo
+from app.core.domain.entities.location_entity import LocationEntity
+
+# Puntos de consulta: ciudad, antimeridiano por ambos lados, cerca del polo y en mitad del océano
+POINTS = [(4.6, -74.1), (-16.5, 179.95), (-16.5, -179.95), (88.5, 20.0), (-30.0, -140.0)]
+
+
+@pytest_asyncio.fixture
+async def locations(database):
+    rng = random.Random(21)
+    coordinates = []
+    for lat, long in POINTS:
+        # Ubicaciones agrupadas alrededor de cada punto, a distancias de metros a cientos de kilómetros
+        for _ in range(60):
+            spread = rng.choice([0.001, 0.05, 0.5, 3])
+            point_lat = max(-89.999, min(89.999, lat + rng.uniform(-spread, spread)))
+            point_long = (long + rng.uniform(-spread, spread) + 180) % 360 - 180
+            coordinates.append((point_lat, point_long))
+    entities = [
+        LocationEntity.create(f"Location {index}", Decimal(f"{lat:.6f}"), Decimal(f"{long:.6f}"))
+        for index, (lat, long) in enumerate(coordinates)
+    ]
+    return await LocationRepository().save_many(entities)
+
+
+def brute_force(locations, lat, long):
+    """
+    Referencia: distancia haversine a cada ubicación, de la más cercana a la más lejana.
+    """
+    return sorted(
+        ((location.loc_uuid, geo.haversine_km(lat, long, float(location.loc_lat), float(location.loc_long)))
+         for location in locations),
+        key=lambda item: item[1]
+    )
+
+
+async def repositories():
+    snapshot = LocationSnapshot()
+    await snapshot.load()
+    # Consulta por celdas geohash y consulta desde la instantánea en memoria
+    return [LocationRepository(), LocationRepository(snapshot=snapshot)]
+
+
+def uuids(results):
+    return [item[0].loc_uuid if isinstance(item[0], LocationEntity) else item[0] for item in results]
+
+
+@pytest.mark.asyncio
+async def test_find_within_radius_matches_brute_force(locations):
+    for repository in await repositories():
+        for lat, long in POINTS:
+            expected = brute_force(locations, lat, long)
+            for radius_km in (0.5, 10, 120, 400, 3000):
+                found = await repository.find_within_radius(lat, long, radius_km)
+                assert uuids(found) == uuids([item for item in expected if item[1] <= radius_km]), (lat, long, radius_km)
+                assert all(abs(distance - reference) < 1e-6 for (_, distance), (_, reference) in zip(found, expected))
+
+
+@pytest.mark.asyncio
+async def test_find_nearest_matches_brute_force(locations):
+    for repository in await repositories():
+        for lat, long in POINTS:
+            expected = brute_force(locations, lat, long)
+            for k in (1, 5, 60, 100):
+                assert uuids(await repository.find_nearest(lat, long, k)) == uuids(expected[:k]), (lat, long, k)
+            # Con radio máximo solo se devuelven las que caen dentro
+            within = [item for item in expected if item[1] <= 50]
+            assert uuids(await repository.find_nearest(lat, long, 1000, radius_km=50)) == uuids(within)
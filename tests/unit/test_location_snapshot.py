@@ -0,0 +1,68 @@
+import asyncio
+import random
+import uuid
+from decimal import Decimal
+import pytest
+from app.adapters.secondary.orm.models import ModelLocation
+from app.adapters.secondary.snapshot.location_snapshot import LocationSnapshot
+from app.core.domain import geo
+
+
+def build_rows(count):
+    rng = random.Random(7)
+    return [
+        (uuid.uuid4(), Decimal(f"{rng.uniform(-4, 12):.6f}"), Decimal(f"{rng.uniform(-79, -67):.6f}"))
+        for _ in range(count)
+    ]
+
+
+def test_nearest_matches_per_entity_distances():
+    rows = build_rows(500)
+    snapshot = LocationSnapshot(capacity=8)
+    snapshot.replace(rows)
+
+    # Referencia: distancia calculada ubicación por ubicación
+    expected = sorted(
+        ((loc_uuid, geo.haversine_km(4.6, -74.1, float(lat), float(long))) for loc_uuid, lat, long in rows),
+        key=lambda item: item[1]
+    )
+
+    nearest = snapshot.nearest(4.6, -74.1, 10)
+    assert [loc_uuid for loc_uuid, _ in nearest] == [loc_uuid for loc_uuid, _ in expected[:10]]
+    assert all(abs(a[1] - b[1]) < 1e-6 for a, b in zip(nearest, expected))
+
+    within = snapshot.within_radius(4.6, -74.1, 100)
+    assert [loc_uuid for loc_uuid, _ in within] == [loc_uuid for loc_uuid, distance in expected if distance <= 100]
+
+
+def test_added_locations_are_found():
+    snapshot = LocationSnapshot(capacity=2)
+    snapshot.replace(build_rows(3))
+    loc_uuid = uuid.uuid4()
+
+    # Las ubicaciones sin coordenadas se ignoran
+    snapshot.add(uuid.uuid4(), None, None)
+    snapshot.add(loc_uuid, Decimal("4.6"), Decimal("-74.1"))
+
+    assert len(snapshot) == 4
+    assert snapshot.nearest(4.6, -74.1, 1) == [(loc_uuid, 0.0)]
+
+
+@pytest.mark.asyncio
+async def test_expired_snapshot_picks_up_other_processes_writes(database):
+    await ModelLocation.create(loc_description="Plaza", loc_status=True, loc_lat=Decimal("4.6"),
+                               loc_long=Decimal("-74.1"))
+    snapshot = LocationSnapshot(max_age=0.05)
+    await snapshot.load()
+
+    # Otro proceso crea una ubicación: no se ve mientras la instantánea es reciente
+    other = await ModelLocation.create(loc_description="Parque", loc_status=True, loc_lat=Decimal("6.2"),
+                                       loc_long=Decimal("-75.6"))
+    snapshot.refresh_if_expired()
+    assert len(snapshot) == 1 and snapshot._refresh is None
+
+    # Pasado max_age se recarga en segundo plano
+    await asyncio.sleep(0.06)
+    snapshot.refresh_if_expired()
+    await snapshot._refresh
+    assert snapshot.nearest(6.2, -75.6, 1) == [(other.loc_uuid, 0.0)]
@@ -0,0 +1,25 @@
+from app.adapters.secondary.metrics.registry import Counter, Gauge, Histogram, Registry
+
+
+def test_registry_renders_prometheus_text_format():
+    registry = Registry()
+    latency = registry.register(Histogram("request_seconds", "Latency.", ("route",), buckets=(0.1, 1.0)))
+    requests = registry.register(Counter("requests_total", "Requests.", ("status",)))
+    registry.register(Gauge("pool_connections", "Pool.", collect=lambda: [({"state": "idle"}, 3)]))
+
+    latency.observe(0.05, "/a")
+    latency.observe(0.5, "/a")
+    latency.observe(5, "/a")
+    requests.inc('say "hi"')
+
+    lines = registry.render().splitlines()
+
+    # Buckets acumulados, con +Inf igual al total de observaciones
+    assert 'request_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'request_seconds_bucket{route="/a",le="1.0"} 2' in lines
+    assert 'request_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'request_seconds_count{route="/a"} 3' in lines
+    assert 'request_seconds_sum{route="/a"} 5.55' in lines
+    assert '# TYPE requests_total counter' in lines
+    assert 'requests_total{status="say \\"hi\\""} 1' in lines
+    assert 'pool_connections{state="idle"} 3' in lines
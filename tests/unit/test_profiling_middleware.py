@@ -0,0 +1,38 @@
+import os
+import pstats
+import pytest
+from app.adapters.primary.middleware.profiling_middleware import ProfilingMiddleware
+
+
+async def slow_app(scope, receive, send):
+    # Aplicación ASGI mínima con algo de trabajo que perfilar
+    sum(i * i for i in range(200000))
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def call(middleware, headers):
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/recommendations/", "headers": headers}
+    await middleware(scope, None, send)
+    return dict(messages[0]["headers"])
+
+
+@pytest.mark.asyncio
+async def test_profiles_only_requests_with_the_header_and_token(tmp_path):
+    middleware = ProfilingMiddleware(slow_app, directory=str(tmp_path), sample_rate=0, header="X-Profile",
+                                     token="secret", interval_ms=0.1)
+
+    # Sin cabecera o con un token incorrecto no se perfila
+    assert b"x-profile-id" not in await call(middleware, [])
+    assert b"x-profile-id" not in await call(middleware, [(b"x-profile", b"wrong")])
+    assert os.listdir(tmp_path) == []
+
+    headers = await call(middleware, [(b"x-profile", b"secret")])
+    name = headers[b"x-profile-id"].decode()
+    assert sorted(os.listdir(tmp_path)) == [f"{name}.collapsed", f"{name}.prof"]
+    assert pstats.Stats(str(tmp_path / f"{name}.prof")).total_calls > 0
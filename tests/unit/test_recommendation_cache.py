@@ -0,0 +1,53 @@
+import pytest
+import uuid
+from unittest.mock import AsyncMock
+from datetime import datetime, timezone
+from app.adapters.secondary.cache.cached_recommendation_repository import CachedRecommendationRepository
+from app.adapters.secondary.cache.in_memory_client import InMemoryCacheClient
+from app.adapters.secondary.cache.recommendation_cache import RecommendationCache
+from app.core.application.usecases.create_category_usecase import CreateCategoryUseCase
+from app.core.domain.entities.recomendation_entity import RecommendationEntity
+
+
+def build_recommendations():
+    return [
+        RecommendationEntity(uuid.uuid4(), "Park", uuid.uuid4(), "Books", 1, None),
+        RecommendationEntity(uuid.uuid4(), "Museum", uuid.uuid4(), "Art", 2, datetime(2024, 1, 1, tzinfo=timezone.utc)),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_cached_recommendations_hit_after_miss():
+    # Repositorio que calcula las recomendaciones
+    mock_repository = AsyncMock()
+    mock_repository.get_recommendations.return_value = build_recommendations()
+    cache = RecommendationCache(InMemoryCacheClient(), ttl=60)
+    repository = CachedRecommendationRepository(mock_repository, cache)
+
+    first = await repository.get_recommendations(limit=10)
+    second = await repository.get_recommendations(limit=10)
+
+    # Solo la primera petición llega al repositorio
+    mock_repository.get_recommendations.assert_awaited_once()
+    assert mock_repository.get_recommendations.await_args.kwargs["limit"] == 10
+    assert [rec.dict() for rec in second] == [rec.dict() for rec in first]
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+
+
+@pytest.mark.asyncio
+async def test_create_invalidates_cached_recommendations():
+    mock_repository = AsyncMock()
+    mock_repository.get_recommendations.return_value = build_recommendations()
+    cache = RecommendationCache(InMemoryCacheClient(), ttl=60)
+    repository = CachedRecommendationRepository(mock_repository, cache)
+    await repository.get_recommendations()
+
+    # Crear una categoría invalida la caché
+    mock_category_repository = AsyncMock()
+    mock_category_repository.create_if_absent.return_value = True
+    await CreateCategoryUseCase(mock_category_repository, cache).execute("Books")
+
+    await repository.get_recommendations()
+
+    assert mock_repository.get_recommendations.await_count == 2
+    assert cache.misses == 2
@@ -0,0 +1,180 @@
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+import pytest
+import pytest_asyncio
+import pytz
+from app.adapters.primary.serializers.recommendation_schema import RecommendationQuerySchema, encode_cursor
+from app.adapters.secondary.orm.models import ModelCategory, ModelLocation
+from app.adapters.secondary.orm.repositories.recommendation_repository import (
+    PROXIMITY_CHUNK_SIZE, REVIEW_EXPIRATION_DAYS, RecommendationRepository
+)
+from app.adapters.secondary.orm.repositories.location_repository import LocationRepository
+from app.adapters.secondary.orm.repositories.review_repository import ReviewRepository
+from app.core.domain import geo
+from app.core.domain.entities.location_entity import LocationEntity
+from app.core.domain.entities.review_entity import ReviewEntity
+
+NOW = datetime.now(pytz.UTC).replace(microsecond=0)
+
+
+def expected_recommendations(locations, categories, reviews):
+    """
+    Referencia: el bucle par a par del repositorio original, con la última revisión de cada par.
+    Nunca revisado: bandera 1; última revisión de hace más de 30 días: bandera 2; reciente: excluido.
+    """
+    cutoff = NOW - timedelta(days=REVIEW_EXPIRATION_DAYS)
+    never_reviewed, expired = [], []
+    for location in locations:
+        for category in categories:
+            dates = [review.rev_created for review in reviews
+                     if review.rev_fk_loc_uuid == location.loc_uuid and review.rev_fk_cat_uuid == category.cat_uuid]
+            if not dates:
+                never_reviewed.append((1, None, location.loc_uuid, category.cat_uuid))
+            elif max(dates) < cutoff:
+                expired.append((2, max(dates), location.loc_uuid, category.cat_uuid))
+    # Nunca revisados por (ubicación, categoría); vencidos del más reciente al más antiguo
+    never_reviewed.sort(key=lambda item: (item[2], item[3]))
+    expired.sort(key=lambda item: (-item[1].timestamp(), item[2], item[3]))
+    return never_reviewed + expired
+
+
+def as_tuples(recommendations):
+    return [(item.bandera, item.review_date, item.loc_uuid, item.cat_uuid) for item in recommendations]
+
+
+@pytest_asyncio.fixture
+async def catalog(database):
+    rng = random.Random(11)
+    locations = [
+        await ModelLocation.create(loc_description=f"Location {index}", loc_status=True,
+                                   loc_lat=Decimal(f"{4.6 + index / 100:.6f}"), loc_long=Decimal("-74.08"))
+        for index in range(6)
+    ]
+    categories = [await ModelCategory.create(cat_description=f"Category {index}", cat_status=True) for index in range(4)]
+
+    # Revisiones recientes, vencidas, varias por par y fechas repetidas entre pares
+    reviews = []
+    for location in locations:
+        for category in rng.sample(categories, 3):
+            for days in rng.sample([2, 20, 45, 45, 60, 90], rng.randint(1, 3)):
+                review = ReviewEntity.create("Review", location.loc_uuid, category.cat_uuid)
+                review.rev_created = NOW - timedelta(days=days)
+                reviews.append(review)
+    await ReviewRepository().save_many(reviews)
+    return locations, categories, reviews
+
+
+@pytest.mark.asyncio
+async def test_recommendations_match_the_per_pair_classification(catalog):
+    expected = expected_recommendations(*catalog)
+    # El conjunto cubre las dos banderas, pares excluidos y empates de fecha
+    assert {item[0] for item in expected} == {1, 2}
+    assert len(expected) < len(catalog[0]) * len(catalog[1])
+    assert len({item[1] for item in expected if item[0] == 2}) < sum(1 for item in expected if item[0] == 2)
+
+    recommendations = await RecommendationRepository().get_recommendations(limit=1000)
+    assert as_tuples(recommendations) == expected
+    assert all(item.loc_description.startswith("Location") and item.cat_description.startswith("Category")
+               for item in recommendations)
+
+
+@pytest.mark.asyncio
+async def test_recommendations_are_cut_at_the_limit(catalog):
+    expected = expected_recommendations(*catalog)
+    never_reviewed = sum(1 for item in expected if item[0] == 1)
+
+    # El límite corta dentro de la bandera 1 y dentro de la bandera 2
+    for limit in (1, never_reviewed, never_reviewed + 2):
+        assert as_tuples(await RecommendationRepository().get_recommendations(limit=limit)) == expected[:limit]
+
+
+async def all_pages(limit, **filters):
+    """
+    Recorre las páginas con el cursor codificado como en la API.
+    """
+    repository = RecommendationRepository()
+    pages, after = [], None
+    while True:
+        page = await repository.get_recommendations(limit=limit, after=after, **filters)
+        pages.append(page)
+        if len(page) < limit:
+            return pages
+        point = {key: filters[key] for key in ("lat", "long") if key in filters}
+        after = RecommendationQuerySchema().load({"cursor": encode_cursor(page[-1]), **point})["after"]
+
+
+@pytest.mark.asyncio
+async def test_pages_concatenate_to_the_unpaged_result(catalog):
+    expected = expected_recommendations(*catalog)
+    never_reviewed = sum(1 for item in expected if item[0] == 1)
+
+    # Páginas que terminan justo en el último par de bandera 1 y páginas que cruzan de 1 a 2
+    for limit in (1, 2, 3, 5, never_reviewed, never_reviewed - 1):
+        pages = await all_pages(limit)
+        assert as_tuples([item for page in pages for item in page]) == expected, limit
+        assert all(len(page) == limit for page in pages[:-1])
+
+
+@pytest.mark.asyncio
+async def test_filters_narrow_the_recommendations(catalog):
+    locations, categories, reviews = catalog
+    expected = expected_recommendations(locations, categories, reviews)
+    location = locations[2].loc_uuid
+    # La categoría con más pares vencidos, para que el filtro combinado no quede vacío
+    category = max((item[3] for item in expected if item[0] == 2),
+                   key=lambda uuid: sum(1 for item in expected if item[0] == 2 and item[3] == uuid))
+
+    # Cada filtro, solo y paginado, devuelve exactamente los pares que cumplen la condición
+    for filters, keep in (({"location": location}, lambda item: item[2] == location),
+                          ({"category": category}, lambda item: item[3] == category),
+                          ({"bandera": 1}, lambda item: item[0] == 1),
+                          ({"bandera": 2}, lambda item: item[0] == 2),
+                          ({"bandera": 2, "category": category}, lambda item: item[0] == 2 and item[3] == category)):
+        narrowed = [item for item in expected if keep(item)]
+        assert narrowed and len(narrowed) < len(expected), filters
+        assert as_tuples(await RecommendationRepository().get_recommendations(limit=1000, **filters)) == narrowed
+        pages = await all_pages(2, **filters)
+        assert as_tuples([item for page in pages for item in page]) == narrowed, filters
+
+
+@pytest.mark.asyncio
+async def test_nearby_pages_cover_more_than_one_chunk_of_locations(database):
+    rng = random.Random(17)
+    lat, long, radius_km = 4.6, -74.08, 30
+    # Más ubicaciones dentro del radio que un bloque de la consulta por cercanía, y algunas fuera
+    locations = await LocationRepository().save_many([
+        LocationEntity.create(f"Location {index}", Decimal(f"{lat + rng.uniform(-0.3, 0.3):.6f}"),
+                              Decimal(f"{long + rng.uniform(-0.3, 0.3):.6f}"))
+        for index in range(3 * PROXIMITY_CHUNK_SIZE)
+    ])
+    categories = [await ModelCategory.create(cat_description=f"Category {index}", cat_status=True) for index in range(3)]
+    reviews = []
+    for location in locations:
+        for category in categories:
+            days = rng.choice([None, None, 5, 40, 70])
+            if days is not None:
+                review = ReviewEntity.create("Review", location.loc_uuid, category.cat_uuid)
+                review.rev_created = NOW - timedelta(days=days)
+                reviews.append(review)
+    await ReviewRepository().save_many(reviews)
+
+    # Referencia: clasificación par a par, solo dentro del radio, por (bandera, distancia, ubicación, categoría)
+    distances = {
+        location.loc_uuid: round(geo.haversine_km(lat, long, float(location.loc_lat), float(location.loc_long)), 6)
+        for location in locations
+    }
+    nearby = [location for location in locations if distances[location.loc_uuid] <= radius_km]
+    assert PROXIMITY_CHUNK_SIZE < len(nearby) < len(locations)
+    expected = sorted(expected_recommendations(nearby, categories, reviews),
+                      key=lambda item: (item[0], distances[item[2]], item[2], item[3]))
+    for bandera in (1, 2):
+        assert len({item[2] for item in expected if item[0] == bandera}) > PROXIMITY_CHUNK_SIZE
+
+    point = {"lat": lat, "long": long, "radius_km": radius_km}
+    for limit in (7, PROXIMITY_CHUNK_SIZE, 150, 1000):
+        pages = await all_pages(limit, **point)
+        found = [item for page in pages for item in page]
+        # Completo, sin duplicados y en orden de distancia dentro de cada bandera
+        assert as_tuples(found) == expected, limit
+        assert [item.distance_km for item in found] == [distances[item[2]] for item in expected]
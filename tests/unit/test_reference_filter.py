@@ -0,0 +1,76 @@
+import asyncio
+import pytest
+import uuid
+from unittest.mock import AsyncMock
+from app.adapters.secondary.orm.models import ModelCategory, ModelLocation
+from app.adapters.secondary.orm.repositories.review_repository import ReviewRepository
+from app.adapters.secondary.snapshot.bloom_filter import UUIDBloomFilter
+from app.adapters.secondary.snapshot.reference_filter import LOCATION, ReferenceFilter
+
+
+def test_bloom_filter_has_no_false_negatives_and_bounded_false_positives():
+    bloom = UUIDBloomFilter(capacity=10000, error_rate=0.01)
+    added = [uuid.uuid4() for _ in range(10000)]
+    bloom.add(added)
+
+    assert all(bloom.might_contain(added))
+    # Con la capacidad llena, ~1% de UUIDs nunca añadidos pasan el filtro
+    false_positives = sum(bloom.might_contain([uuid.uuid4() for _ in range(10000)]))
+    assert false_positives < 300
+
+
+@pytest.mark.asyncio
+async def test_reference_filter_only_confirms_possible_uuids_once():
+    loc_uuid, cat_uuid = uuid.uuid4(), uuid.uuid4()
+    confirm = AsyncMock(return_value=({loc_uuid}, {cat_uuid}))
+    reference_filter = ReferenceFilter(confirm, capacity=1000, error_rate=0.01, lru_size=10, refresh_seconds=0)
+    reference_filter.loaded = True
+    reference_filter.add_locations([loc_uuid])
+    reference_filter.add_categories([cat_uuid])
+
+    # UUIDs desconocidos: rechazados sin consultar la base de datos
+    unknown = uuid.uuid4()
+    assert await reference_filter.missing_references([unknown], [unknown]) == ({unknown}, {unknown})
+    confirm.assert_not_awaited()
+
+    # UUIDs existentes: una confirmación, luego servidos desde el LRU
+    assert await reference_filter.missing_references([loc_uuid], [cat_uuid]) == (set(), set())
+    assert await reference_filter.missing_references([loc_uuid], [cat_uuid]) == (set(), set())
+    confirm.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_reference_filter_loads_rows_created_by_another_process(database):
+    category = await ModelCategory.create(cat_description="Food", cat_status=True)
+    reference_filter = ReferenceFilter(ReviewRepository().get_existing_references, capacity=1000,
+                                       error_rate=0.01, lru_size=10, refresh_seconds=0.05)
+    await reference_filter.load()
+
+    # Ubicación inexistente: rechazada sin consultar, siempre
+    unknown = uuid.uuid4()
+    for _ in range(3):
+        assert await reference_filter.missing_references([unknown], []) == ({unknown}, set())
+    assert reference_filter.stats()["confirmations"] == 0 and reference_filter.stats()["rejected"] == 3
+
+    # Otro proceso crea una ubicación sin pasar por el filtro: se rechaza mientras el filtro es reciente
+    location = await ModelLocation.create(loc_description="Plaza", loc_status=True)
+    assert await reference_filter.missing_references([location.loc_uuid], []) == ({location.loc_uuid}, set())
+
+    # Pasado refresh_seconds se cargan las filas creadas desde la última carga, y solo esas
+    await asyncio.sleep(0.06)
+    entries = reference_filter.stats()["entries"]
+    assert await reference_filter.missing_references([location.loc_uuid], [category.cat_uuid]) == (set(), set())
+    assert reference_filter.stats()["refreshes"] == 1 and reference_filter.stats()["entries"] == entries + 1
+    assert await reference_filter.missing_references([unknown], []) == ({unknown}, set())
+
+
+@pytest.mark.asyncio
+async def test_concurrent_checks_share_one_refresh(database):
+    reference_filter = ReferenceFilter(ReviewRepository().get_existing_references, capacity=1000,
+                                       error_rate=0.01, lru_size=10, refresh_seconds=0.01)
+    await reference_filter.load()
+    await asyncio.sleep(0.02)
+
+    # Las comprobaciones que llegan durante la carga la esperan en lugar de lanzar otra
+    await asyncio.gather(*(reference_filter.missing_references([uuid.uuid4()], []) for _ in range(5)))
+    assert reference_filter.stats()["refreshes"] == 1
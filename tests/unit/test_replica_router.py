@@ -0,0 +1,45 @@
+import pytest
+import pytest_asyncio
+from tortoise import connections
+from app.adapters.secondary.orm import replica_router
+from app.adapters.secondary.orm.models import ModelCategory
+from app.adapters.secondary.orm.replica_router import ReplicaRouter
+from app.adapters.secondary.orm.repositories.category_repository import CategoryRepository
+
+
+@pytest_asyncio.fixture
+async def primary_and_replica(database):
+    # Dos ficheros SQLite: la réplica tiene el esquema y las filas replicadas, pero no las últimas escrituras
+    replicated = ModelCategory(cat_description="Replicated", cat_status=True)
+    await replicated.save()
+    await ModelCategory(cat_uuid=replicated.cat_uuid, cat_description="Replicated",
+                        cat_status=True).save(using_db=connections.get("replica"), force_create=True)
+    await ModelCategory(cat_description="Recent", cat_status=True).save()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("database", ["replica"], indirect=True)
+async def test_reads_go_to_the_replica_while_it_is_fresh_enough(primary_and_replica, monkeypatch):
+    lag = 0.0
+
+    async def measure_lag(client):
+        if lag is None:
+            raise ConnectionError("replica down")
+        return lag
+
+    router = ReplicaRouter(max_staleness=5, check_interval=0, lag=measure_lag)
+    monkeypatch.setattr(replica_router, "_router", router)
+    repository = CategoryRepository(reference_filter=None)
+
+    # Réplica al día: lee de la réplica, que aún no tiene la última escritura
+    assert (await repository.get_by_description("Replicated")) is not None
+    assert await repository.get_by_description("Recent") is None
+
+    # Réplica demasiado atrasada, o inaccesible: vuelve al primario
+    lag = 30.0
+    assert (await repository.get_by_description("Recent")) is not None
+    lag = None
+    assert (await repository.get_by_description("Recent")) is not None
+
+    assert router.stats()["replica_reads"] == 2
+    assert router.stats()["primary_reads"] == 2
@@ -0,0 +1,70 @@
+import os
+import shutil
+import pytest
+import pytest_asyncio
+from datetime import datetime, timedelta
+import pytz
+from app.adapters.secondary.archive.review_archive import ReviewArchive
+from app.adapters.secondary.orm.models import ModelCategory, ModelLocation, ModelReview, ModelReviewRollup
+from app.adapters.secondary.orm.repositories.review_repository import ReviewRepository
+from app.core.domain.entities.review_cursor_entity import ReviewCursor
+from app.core.domain.entities.review_entity import ReviewEntity
+from app.main_app.archive_reviews import archive_reviews
+
+NOW = datetime(2026, 10, 18, 12, 0, tzinfo=pytz.UTC)
+
+
+@pytest_asyncio.fixture
+async def reviews(database):
+    location = await ModelLocation.create(loc_description="Plaza", loc_status=True)
+    food = await ModelCategory.create(cat_description="Food", cat_status=True)
+    music = await ModelCategory.create(cat_description="Music", cat_status=True)
+    entities = []
+    # Marzo y abril de 2026 se archivan; septiembre se queda en la base de datos
+    for day, category, obs in [(2, food, None), (2, food, "Noisy"), (20, music, "Ñandú"), (30, food, None)]:
+        for month in (3, 4, 9):
+            entity = ReviewEntity.create(f"Review {month}-{day}", location.loc_uuid, category.cat_uuid, obs)
+            entity.rev_created = datetime(2026, month, min(day, 28), 10, tzinfo=pytz.UTC)
+            entities.append(entity)
+    await ReviewRepository().save_many(entities)
+    return location, food, music, entities
+
+
+@pytest.mark.asyncio
+async def test_archived_reviews_are_served_from_the_segments(reviews, tmp_path):
+    location, food, music, entities = reviews
+
+    # Lotes de 3 filas: los pares quedan repartidos entre varias consultas
+    paths = await archive_reviews(str(tmp_path), months=4, now=NOW, chunk_size=3)
+
+    assert [os.path.basename(path) for path in paths] == ["reviews_2026_03_1.seg", "reviews_2026_04_1.seg"]
+    assert await ModelReview.all().count() == 4
+    assert sum(await ModelReviewRollup.all().values_list("rro_review_count", flat=True)) == 8
+
+    archived = sorted((entity for entity in entities if entity.rev_created.month < 9),
+                      key=lambda entity: (-entity.rev_created.timestamp(), entity.rev_uuid))
+    archive = ReviewArchive(str(tmp_path))
+
+    # Se pagina con el cursor, de la más reciente a la más antigua, sin repetir ni saltar revisiones
+    pages, after = [], None
+    while True:
+        page = await archive.get_reviews(location.loc_uuid, limit=3, after=after)
+        pages += page
+        if len(page) < 3:
+            break
+        after = ReviewCursor.from_review(page[-1])
+    assert [review.rev_uuid for review in pages] == [entity.rev_uuid for entity in archived]
+    assert [(review.rev_recommendation, review.rev_obs, review.rev_fk_cat_uuid) for review in pages] == \
+           [(entity.rev_recommendation, entity.rev_obs, entity.rev_fk_cat_uuid) for entity in archived]
+    assert pages[0].rev_created == datetime(2026, 4, 28, 10, tzinfo=pytz.UTC)
+
+    # Filtro por categoría, y un mes archivado dos veces devuelve cada revisión una vez
+    shutil.copy(tmp_path / "reviews_2026_04_1.seg", tmp_path / "reviews_2026_04_2.seg")
+    os.utime(tmp_path, ns=(0, os.stat(tmp_path).st_mtime_ns + 1))
+    music_reviews = await archive.get_reviews(location.loc_uuid, music.cat_uuid, limit=10)
+    assert [review.rev_created.month for review in music_reviews] == [4, 3]
+    assert music_reviews[0].rev_obs == "Ñandú"
+    assert archive.stats()["segments"] == 3 and archive.stats()["reviews"] == 12
+    assert await archive.get_reviews(location.loc_uuid, limit=10,
+                                     after=ReviewCursor(archived[-1].rev_created - timedelta(days=1),
+                                                        archived[-1].rev_uuid)) == []
@@ -0,0 +1,124 @@
+import json
+import pytest
+import pytest_asyncio
+from datetime import datetime, timedelta
+import pytz
+from app.adapters.primary.serializers.review_schema import ReviewHistoryQuerySchema, stream_review_page
+from app.adapters.secondary.archive.review_archive import ReviewArchive
+from app.adapters.secondary.orm.models import ModelCategory, ModelLocation
+from app.adapters.secondary.orm.repositories.review_history_repository import ReviewHistoryRepository
+from app.adapters.secondary.orm.repositories.review_repository import ReviewRepository
+from app.core.application.usecases.get_review_history_usecase import GetReviewHistoryUseCase
+from app.core.domain.entities.review_cursor_entity import ReviewCursor
+from app.core.domain.entities.review_entity import ReviewEntity
+from app.main_app.archive_reviews import archive_reviews
+
+NOW = datetime(2026, 10, 18, 12, 0, tzinfo=pytz.UTC)
+
+
+@pytest_asyncio.fixture
+async def reviews(database):
+    location = await ModelLocation.create(loc_description="Plaza", loc_status=True)
+    other = await ModelLocation.create(loc_description="Parque", loc_status=True)
+    food = await ModelCategory.create(cat_description="Food", cat_status=True)
+    music = await ModelCategory.create(cat_description="Music", cat_status=True)
+    entities = []
+    # Varias revisiones comparten fecha: el UUID desempata
+    for month, day, category in [(3, 2, food), (3, 2, music), (4, 9, music), (9, 1, food), (9, 1, food),
+                                 (9, 1, music), (10, 5, music), (10, 17, food)]:
+        entity = ReviewEntity.create(f"Review {month}-{day}", location.loc_uuid, category.cat_uuid)
+        entity.rev_created = datetime(2026, month, day, 10, tzinfo=pytz.UTC)
+        entities.append(entity)
+    noise = ReviewEntity.create("Other location", other.loc_uuid, food.cat_uuid)
+    await ReviewRepository().save_many(entities + [noise])
+    return location, food, music, sorted(entities, key=ReviewCursor.sort_key)
+
+
+async def _all_pages(use_case, location, category=None, limit=3):
+    pages, after = [], None
+    while True:
+        page = await use_case.execute(location, category, limit, after)
+        pages.append(page)
+        if len(page) < limit:
+            return pages
+        after = ReviewCursor.from_review(page[-1])
+
+
+@pytest.mark.asyncio
+async def test_history_pages_follow_the_keyset_order(reviews):
+    location, food, music, expected = reviews
+    use_case = GetReviewHistoryUseCase(ReviewHistoryRepository())
+
+    # Páginas de 3 sin repetir ni saltar revisiones, y la última incompleta
+    pages = await _all_pages(use_case, location.loc_uuid)
+    assert [len(page) for page in pages] == [3, 3, 2]
+    assert [review.rev_uuid for page in pages for review in page] == [entity.rev_uuid for entity in expected]
+    assert pages[0][0].rev_created == datetime(2026, 10, 17, 10, tzinfo=pytz.UTC)
+
+    # Filtro por categoría
+    music_pages = await _all_pages(use_case, location.loc_uuid, music.cat_uuid, limit=2)
+    assert [review.rev_uuid for page in music_pages for review in page] == \
+           [entity.rev_uuid for entity in expected if entity.rev_fk_cat_uuid == music.cat_uuid]
+
+    # La respuesta se serializa por partes y la página completa trae el cursor de la siguiente
+    body = json.loads("".join(stream_review_page(pages[0], 3)))
+    assert [review["id"] for review in body["reviews"]] == [str(review.rev_uuid) for review in pages[0]]
+    query = ReviewHistoryQuerySchema().load({"location": str(location.loc_uuid), "limit": "3",
+                                             "cursor": body["next_cursor"]})
+    assert [review.rev_uuid for review in await use_case.execute(**query)] == [review.rev_uuid for review in pages[1]]
+    assert json.loads("".join(stream_review_page([], 3))) == {"reviews": [], "next_cursor": None}
+
+
+@pytest.mark.asyncio
+async def test_history_continues_into_the_archive(reviews, tmp_path):
+    location, food, music, expected = reviews
+
+    # Marzo y abril pasan al archivo
+    await archive_reviews(str(tmp_path), months=4, now=NOW)
+    use_case = GetReviewHistoryUseCase(ReviewHistoryRepository(), ReviewArchive(str(tmp_path)))
+
+    pages = await _all_pages(use_case, location.loc_uuid)
+    assert [review.rev_uuid for page in pages for review in page] == [entity.rev_uuid for entity in expected]
+    assert [review.rev_created.month for review in pages[-1]] == [3, 3]
+
+
+def test_sort_key_tells_every_microsecond_apart():
+    # En el año 9000 un timestamp float ya no distingue microsegundos; la clave entera sí
+    first, second = ReviewEntity.create("A", None, None), ReviewEntity.create("B", None, None)
+    first.rev_created = datetime(9000, 1, 1, 0, 0, 0, 1, tzinfo=pytz.UTC)
+    second.rev_created = datetime(9000, 1, 1, tzinfo=pytz.UTC)
+    if second.rev_uuid > first.rev_uuid:
+        first.rev_uuid, second.rev_uuid = second.rev_uuid, first.rev_uuid
+    assert sorted([second, first], key=ReviewCursor.sort_key) == [first, second]
+    assert ReviewCursor.from_review(first).is_before(second) and not ReviewCursor.from_review(second).is_before(first)
+
+    # Una fecha sin zona horaria es UTC: misma clave que la fecha con zona
+    naive = ReviewEntity.create("C", None, None)
+    naive.rev_uuid, naive.rev_created = second.rev_uuid, datetime(9000, 1, 1)
+    assert ReviewCursor.sort_key(naive) == ReviewCursor.sort_key(second)
+
+
+@pytest.mark.asyncio
+async def test_history_merges_equal_and_adjacent_dates_across_the_archive(database, tmp_path):
+    location = await ModelLocation.create(loc_description="Plaza", loc_status=True)
+    category = await ModelCategory.create(cat_description="Food", cat_status=True)
+    boundary = datetime(2026, 5, 1, tzinfo=pytz.UTC)
+
+    # Fechas iguales y a un microsegundo a ambos lados del límite entre abril (archivado) y mayo
+    entities = []
+    for offset in (-2, -1, -1, -1, 0, 0, 0, 1, 1):
+        entity = ReviewEntity.create(f"Review {offset}", location.loc_uuid, category.cat_uuid)
+        entity.rev_created = boundary + timedelta(microseconds=offset)
+        entities.append(entity)
+    await ReviewRepository().save_many(entities)
+    await archive_reviews(str(tmp_path), months=5, now=NOW)
+
+    # Una revisión de abril vuelve a estar en la base de datos, como durante un archivado en curso
+    archived = [entity for entity in entities if entity.rev_created < boundary]
+    await ReviewRepository().save_many([archived[1]])
+
+    expected = sorted(entities, key=lambda entity: (boundary - entity.rev_created, entity.rev_uuid))
+    use_case = GetReviewHistoryUseCase(ReviewHistoryRepository(), ReviewArchive(str(tmp_path)))
+    for limit in (1, 2, 3, 4):
+        pages = await _all_pages(use_case, location.loc_uuid, limit=limit)
+        assert [review.rev_uuid for page in pages for review in page] == [entity.rev_uuid for entity in expected]
@@ -0,0 +1,67 @@
+import pytest
+import pytest_asyncio
+from datetime import datetime
+import pytz
+from app.adapters.secondary.orm.models import (ModelCategory, ModelLocation, ModelPairReviewState, ModelReview,
+                                               ModelReviewRollup)
+from app.adapters.secondary.orm.repositories.review_repository import ReviewRepository
+from app.adapters.secondary.orm.review_partitions import add_months, apply_review_retention, month_start
+from app.core.domain.entities.review_entity import ReviewEntity
+from app.main_app.backfill_pair_review_state import backfill_pair_review_state
+
+NOW = datetime(2026, 10, 18, 12, 0, tzinfo=pytz.UTC)
+
+
+@pytest_asyncio.fixture
+async def reviews(database):
+    location = await ModelLocation.create(loc_description="Plaza", loc_status=True)
+    category = await ModelCategory.create(cat_description="Food", cat_status=True)
+    created = [
+        datetime(2026, 3, 2, tzinfo=pytz.UTC), datetime(2026, 3, 20, tzinfo=pytz.UTC),
+        datetime(2026, 5, 9, tzinfo=pytz.UTC), datetime(2026, 9, 30, tzinfo=pytz.UTC),
+    ]
+    entities = []
+    for moment in created:
+        entity = ReviewEntity.create("Good", location.loc_uuid, category.cat_uuid)
+        entity.rev_created = moment
+        entities.append(entity)
+    await ReviewRepository().save_many(entities)
+    return location, category
+
+
+def test_month_arithmetic_works_in_utc():
+    month = month_start(datetime(2026, 1, 31, 23, 30, tzinfo=pytz.timezone("America/Bogota")))
+
+    # 23:30 en Bogotá ya es febrero en UTC
+    assert month == datetime(2026, 2, 1, tzinfo=pytz.UTC)
+    assert add_months(month, -3) == datetime(2025, 11, 1, tzinfo=pytz.UTC)
+    assert add_months(month, 11) == datetime(2027, 1, 1, tzinfo=pytz.UTC)
+
+
+@pytest.mark.asyncio
+async def test_retention_rolls_up_old_months_before_removing_them(reviews):
+    location, category = reviews
+
+    # Sin particiones (SQLite) solo se pueden borrar: el modo detach no elimina nada
+    assert await apply_review_retention(retention_months=4, mode="detach", now=NOW) == []
+    with pytest.raises(ValueError):
+        await apply_review_retention(retention_months=4, mode="archive", now=NOW)
+
+    removed = await apply_review_retention(retention_months=4, mode="drop", now=NOW)
+
+    # Se conservan octubre y los cuatro meses anteriores (junio a septiembre)
+    assert removed == ["review_p2026_03", "review_p2026_05"]
+    assert await ModelReview.all().values_list("rev_created", flat=True) == [datetime(2026, 9, 30, tzinfo=pytz.UTC)]
+    rollups = await ModelReviewRollup.all().order_by("rro_month")
+    assert [(rollup.rro_month.month, rollup.rro_review_count) for rollup in rollups] == [(3, 2), (5, 1)]
+    assert rollups[0].rro_first_review == datetime(2026, 3, 2, tzinfo=pytz.UTC)
+    assert rollups[0].rro_last_review == datetime(2026, 3, 20, tzinfo=pytz.UTC)
+
+    # El estado de los pares no cambia, y reconstruirlo cuenta las revisiones resumidas
+    await backfill_pair_review_state()
+    state = await ModelPairReviewState.get(prs_fk_loc_uuid_id=location.loc_uuid, prs_fk_cat_uuid_id=category.cat_uuid)
+    assert state.prs_review_count == 4
+    assert state.prs_last_review == datetime(2026, 9, 30, tzinfo=pytz.UTC)
+
+    # Aplicarla otra vez no hace nada
+    assert await apply_review_retention(retention_months=4, mode="drop", now=NOW) == []
@@ -0,0 +1,61 @@
+import asyncio
+import pytest
+import uuid
+from unittest.mock import AsyncMock
+from app.adapters.secondary.queue.write_behind_review_repository import WriteBehindReviewRepository
+from app.core.domain.entities.review_entity import ReviewEntity
+from app.core.domain.exceptions.exceptions import ReviewQueueFullError
+
+
+@pytest.mark.asyncio
+async def test_write_behind_sheds_load_and_flushes_on_close():
+    loc_uuid, cat_uuid = uuid.uuid4(), uuid.uuid4()
+    mock_repository = AsyncMock()
+    mock_repository.get_existing_references.return_value = ({loc_uuid}, {cat_uuid})
+    mock_cache = AsyncMock()
+    # Intervalo largo: nada se inserta hasta el cierre
+    queue = WriteBehindReviewRepository(mock_repository, mock_cache, max_size=3, batch_size=2,
+                                        flush_interval_ms=60000)
+
+    reviews = [ReviewEntity.create("Great", loc_uuid, cat_uuid) for _ in range(2)]
+    reviews.append(ReviewEntity.create("Missing", uuid.uuid4(), cat_uuid))
+    for review in reviews:
+        await queue.save(review)
+    with pytest.raises(ReviewQueueFullError):
+        await queue.save(ReviewEntity.create("Overflow", loc_uuid, cat_uuid))
+
+    await queue.close()
+
+    # Todo lo encolado se inserta, salvo la revisión de una ubicación inexistente
+    saved = [review for call in mock_repository.save_many.await_args_list for review in call.args[0]]
+    assert saved == reviews[:2]
+    assert queue.stats()["depth"] == 0 and queue.stats()["dropped"] == 1 and queue.stats()["rejected"] == 1
+    mock_cache.invalidate.assert_awaited()
+    with pytest.raises(ReviewQueueFullError):
+        await queue.save(reviews[0])
+
+
+@pytest.mark.asyncio
+async def test_write_behind_retries_a_failed_batch():
+    loc_uuid, cat_uuid = uuid.uuid4(), uuid.uuid4()
+    mock_repository = AsyncMock()
+    mock_repository.get_existing_references.return_value = ({loc_uuid}, {cat_uuid})
+    # La base de datos falla en el primer intento y responde en el segundo
+    mock_repository.save_many.side_effect = [ConnectionError("database is down"), None]
+    queue = WriteBehindReviewRepository(mock_repository, max_size=10, batch_size=2, flush_interval_ms=10,
+                                        retry_base_ms=10, retry_max_ms=20)
+
+    reviews = [ReviewEntity.create("Great", loc_uuid, cat_uuid) for _ in range(2)]
+    for review in reviews:
+        await queue.save(review)
+    for _ in range(100):
+        if queue.stats()["flushed"] == 2:
+            break
+        await asyncio.sleep(0.01)
+    await queue.close()
+
+    # El lote se reintenta entero y ninguna revisión aceptada se pierde
+    assert [call.args[0] for call in mock_repository.save_many.await_args_list] == [reviews, reviews]
+    stats = queue.stats()
+    assert stats["flushed"] == 2 and stats["retries"] == 1
+    assert stats["dropped"] == 0 and stats["failed"] == 0 and stats["flushes"] == 1